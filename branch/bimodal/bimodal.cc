@@ -10,3 +10,12 @@ void bimodal::last_branch_result(champsim::address ip, champsim::address branch_
 {
   bimodal_table[hash(ip)] += taken ? 1 : -1;
 }
+
+void bimodal::checkpoint(champsim::checkpoint::archive& ar)
+{
+  for (auto& counter : bimodal_table) {
+    auto value = counter.value();
+    ar.io(value);
+    counter = value;
+  }
+}
@@ -4,6 +4,7 @@
 #include <array>
 
 #include "address.h"
+#include "checkpoint.h"
 #include "modules.h"
 #include "msl/fwcounter.h"
 
@@ -23,6 +24,8 @@ public:
   // void initialize_branch_predictor();
   bool predict_branch(champsim::address ip);
   void last_branch_result(champsim::address ip, champsim::address branch_target, bool taken, uint8_t branch_type);
+
+  void checkpoint(champsim::checkpoint::archive& ar);
 };
 
 #endif
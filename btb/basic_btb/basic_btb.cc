@@ -46,3 +46,12 @@ void basic_btb::update_btb(champsim::address ip, champsim::address branch_target
 
   direct.update(ip, branch_target, branch_type);
 }
+
+void basic_btb::checkpoint(champsim::checkpoint::archive& ar)
+{
+  ar.io(ras.stack);
+  ar.io(ras.call_size_trackers);
+  ar.io(indirect.predictor);
+  ar.io(indirect.conditional_history);
+  direct.BTB.checkpoint(ar);
+}
@@ -34,6 +34,14 @@ struct direct_predictor {
       using namespace champsim::data::data_literals;
       return ip_tag.slice_upper<2_b>();
     }
+
+    template <typename Archive>
+    void checkpoint(Archive& ar)
+    {
+      ar.io(ip_tag);
+      ar.io(target);
+      ar.io(type);
+    }
   };
 
   champsim::msl::lru_table<btb_entry_t> BTB{sets, ways};
@@ -89,6 +89,33 @@ def try_int(val):
     except Exception as exc:
         raise TypeError from exc
 
+def get_build_id(parsed_config):
+    '''
+    The build ID of a parsed configuration, as written to ``_configuration.mk`` and into the generated environment.
+
+    The module list is hashed in a fixed order, so that the ID does not depend on the hash seed of the process.
+
+    :param parsed_config: the result of parsing a configuration file
+    '''
+    executable, elements, modules_to_compile, module_info, config_file = parsed_config
+    text = json.dumps((executable, elements, sorted(modules_to_compile), module_info, config_file), sort_keys=True, default=try_int)
+    return hashlib.shake_128(text.encode('utf-8')).hexdigest(8)
+
+def content_id(parsed_config):
+    '''
+    A digest of what a parsed configuration builds, leaving out what the result is called.
+
+    This is the :func:`get_build_id` without the executable name, with the module list in a fixed
+    order and with paths taken relative to the ChampSim root. Two configurations that differ only in their names (or
+    in the checkout they are built from) share it.
+
+    :param parsed_config: the result of parsing a configuration file
+    '''
+    champsim_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    _, elements, modules_to_compile, module_info, config_file = parsed_config
+    text = json.dumps((elements, sorted(modules_to_compile), module_info, config_file), sort_keys=True, default=try_int)
+    return hashlib.shake_128(text.replace(champsim_root, '').encode('utf-8')).hexdigest(8)
+
 class Fragment:
     '''
     Examines the given config and prepares to write the needed files.
@@ -143,7 +170,7 @@ class Fragment:
             print('Object directory:', objdir_name)
             print('Makefile directory:', makedir_name)
 
-        build_id = hashlib.shake_128(json.dumps(parsed_config, sort_keys=True, default=try_int).encode('utf-8')).hexdigest(8)
+        build_id = get_build_id(parsed_config)
 
         executable_basename, elements, modules_to_compile, module_info, config_file = parsed_config
 
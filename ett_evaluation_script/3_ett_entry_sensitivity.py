@@ -53,6 +53,7 @@ def main():
             "Entries": r["entries"],
             "Error_Rate": r["error_rate"],
             "IPC": m.ipc,
+            "Instructions": m.instructions,
             "ETT_Evictions": m.ett_evictions,
             "Pages_Retired": m.pages_retired,
             "ETT_Used": m.ett_used,
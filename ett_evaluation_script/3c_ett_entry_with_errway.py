@@ -11,6 +11,7 @@ ETT Entry Sensitivity — Per-Workload with Error Way metrics.
 
 import os
 import re
+import sys
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -26,24 +27,22 @@ TARGET_RATES = ["1e-8"]
 
 # Regex patterns
 RE_FNAME = re.compile(r"^ett_sens_entries_(\d+)_(1e-\d+)_(.+)\.txt$")
-RE_IPC = re.compile(r"CPU 0 cumulative IPC:\s+([\d.]+)")
-RE_ETT_EVICTIONS = re.compile(r"ETT Evictions:\s+(\d+)")
-RE_ERRWAY_EVICTIONS = re.compile(r"Error Way Evictions.*?:\s+(\d+)")
-RE_ERRWAY_HITS = re.compile(r"Error Way Hits:\s+(\d+)")
-RE_ERRWAY_FILLS = re.compile(r"Error Way Fills.*?:\s+(\d+)")
 RE_WORKLOAD = re.compile(r"^(\d+\.\w+)")
 
 
+sys.path.insert(0, BASE_DIR)
+from simtools.results import cpu_value, parsed  # noqa: E402
+
+COLUMNS = {"IPC": "ipc", "ETT_Evictions": "ett_evictions", "ErrWay_Evictions": "err_way_evictions",
+           "ErrWay_Hits": "err_way_hits", "ErrWay_Fills": "err_way_fills"}
+
+
 def parse_file(path):
-    with open(path) as f:
-        txt = f.read()
+    stats = parsed(path)
     result = {}
-    for name, regex in [("IPC", RE_IPC), ("ETT_Evictions", RE_ETT_EVICTIONS),
-                         ("ErrWay_Evictions", RE_ERRWAY_EVICTIONS),
-                         ("ErrWay_Hits", RE_ERRWAY_HITS),
-                         ("ErrWay_Fills", RE_ERRWAY_FILLS)]:
-        m = regex.search(txt)
-        result[name] = float(m.group(1)) if m else None
+    for name, field in COLUMNS.items():
+        value = cpu_value(stats, field)
+        result[name] = float(value) if value is not None else None
     return result
 
 
@@ -50,7 +50,7 @@ def main():
             agg[key]["retired"].append(m.pages_retired)
         detail_rows.append({
             "Workload": r["workload"], "Threshold": r["threshold"],
-            "Error_Rate": r["error_rate"], "IPC": m.ipc,
+            "Error_Rate": r["error_rate"], "IPC": m.ipc, "Instructions": m.instructions,
             "Pages_Retired": m.pages_retired,
         })
 
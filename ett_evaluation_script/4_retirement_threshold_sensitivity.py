@@ -51,6 +51,7 @@ def main():
             "Threshold": r["threshold"],
             "Error_Rate": r["error_rate"],
             "IPC": m.ipc,
+            "Instructions": m.instructions,
             "Pages_Retired": m.pages_retired,
             "ETT_Evictions": m.ett_evictions,
         })
@@ -7,10 +7,9 @@ Fig 5: Error Way Capacity (Max Ways) Sensitivity.
 
 import os
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 
-from common_ett import load_errway_capacity, load_llc_baseline, gmean
+from common_ett import load_frame, gmean
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_CSV = os.path.join(SCRIPT_DIR, "5_error_way_capacity.csv")
@@ -21,47 +20,28 @@ WAYS = [1, 4, 8]
 
 
 def main():
+    frame = load_frame("errway_capacity", "llc_baseline")
+
     # ── Baseline ──
-    baseline_recs = load_llc_baseline()
-    baseline_ipc = {}
-    for r in baseline_recs:
-        if r["llc_size"] == "2MB" and r["metrics"].ipc is not None:
-            baseline_ipc[r["workload"]] = r["metrics"].ipc
-    baseline_gmean_val = gmean(list(baseline_ipc.values())) if baseline_ipc else None
+    baseline = frame.select(experiment="llc_baseline", llc_size="2MB").data.dropna(subset=["ipc"])
+    baseline_ipc = baseline.drop_duplicates("workload", keep="last")["ipc"]
+    baseline_gmean_val = gmean(list(baseline_ipc)) if len(baseline_ipc) else None
 
     # ── Load ──
-    recs = load_errway_capacity()
-
-    agg = {}
-    per_workload = []
-    for r in recs:
-        m = r["metrics"]
-        key = (r["ways"], r["error_rate"])
-        if key not in agg:
-            agg[key] = {"ipc": [], "evictions": [], "used_pct": []}
-        if m.ipc is not None:
-            agg[key]["ipc"].append(m.ipc)
-        if m.err_way_evictions is not None:
-            agg[key]["evictions"].append(m.err_way_evictions)
-        if m.err_way_used_pct is not None:
-            agg[key]["used_pct"].append(m.err_way_used_pct)
-        per_workload.append({
-            "Workload": r["workload"],
-            "Max_Ways": r["ways"],
-            "Error_Rate": r["error_rate"],
-            "IPC": m.ipc,
-            "Err_Way_Evictions": m.err_way_evictions,
-            "Err_Way_Used_Pct": m.err_way_used_pct,
-        })
-
-    df = pd.DataFrame(per_workload)
+    runs = frame.select(experiment="errway_capacity")
+
+    df = runs.data[["workload", "max_ways", "rate", "ipc", "instructions", "err_way_evictions", "err_way_used_pct"]]
+    df.columns = ["Workload", "Max_Ways", "Error_Rate", "IPC", "Instructions", "Err_Way_Evictions", "Err_Way_Used_Pct"]
     df.to_csv(OUTPUT_CSV, index=False)
 
-    if not agg:
+    if not len(runs):
         print("No error way capacity data found")
         return
 
-    existing_ways = sorted(set(w for (w, _) in agg.keys()))
+    existing_ways = sorted(runs["max_ways"].astype(int).unique())
+    ipc = runs.pivot("max_ways", "rate", "ipc", agg="gmean").reindex(index=existing_ways, columns=ERROR_RATES).fillna(0.0)
+    evictions = runs.pivot("max_ways", "rate", "err_way_evictions", agg="sum").reindex(
+        index=existing_ways, columns=ERROR_RATES).fillna(0)
 
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 5), sharex=True)
     colors = ["#4A90E2", "#EE5A6F", "#2ECC71", "#F5A623"]
@@ -70,7 +50,7 @@ def main():
 
     # ── IPC (GMEAN) ──
     for idx, er in enumerate(ERROR_RATES):
-        vals = [gmean(agg.get((w, er), {}).get("ipc", [])) for w in existing_ways]
+        vals = ipc[er].to_numpy()
         ax1.plot(x, vals, marker=markers[idx], color=colors[idx], label=er,
                  linewidth=1.5, markersize=5)
 
@@ -86,7 +66,7 @@ def main():
 
     # ── Error Way Evictions (sum) ──
     for idx, er in enumerate(ERROR_RATES):
-        vals = [sum(agg.get((w, er), {}).get("evictions", [0])) for w in existing_ways]
+        vals = evictions[er].to_numpy()
         ax2.bar(x + (idx - len(ERROR_RATES) / 2 + 0.5) * 0.18, vals, 0.18,
                 label=er, color=colors[idx], edgecolor="black", linewidth=0.3)
 
@@ -50,7 +50,7 @@ def main():
             agg[key]["evictions"].append(m.ett_evictions)
         detail_rows.append({
             "Workload": r["workload"], "Entries": r["entries"],
-            "Error_Rate": r["error_rate"], "IPC": m.ipc,
+            "Error_Rate": r["error_rate"], "IPC": m.ipc, "Instructions": m.instructions,
             "ETT_Evictions": m.ett_evictions,
         })
 
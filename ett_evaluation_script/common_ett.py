@@ -3,7 +3,8 @@
 
 import os
 import re
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Optional
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -42,36 +43,9 @@ RE_LLC_BASELINE = re.compile(
     r"^ett_llc_baseline_(?P<size>\d+MB)_(?P<trace>.+)\.txt$"
 )
 
-# ── Metric regexes ──
-RE_IPC = re.compile(r"CPU 0 cumulative IPC:\s+([\d.]+)\s+instructions:\s*(\d+)\s+cycles:\s*(\d+)")
-RE_ERR_WAY_HITS = re.compile(r"Error Way Hits:\s+(\d+)")
-RE_ERR_WAY_FILLS = re.compile(r"Error Way Fills.*?:\s+(\d+)")
-RE_ERR_WAY_HIT_RATE = re.compile(r"Error Way Hit Rate:\s+([\d.]+)%")
-RE_ERR_WAY_EVICTIONS = re.compile(r"Error Way Evictions.*?:\s+(\d+)")
-RE_ERR_WAY_USED = re.compile(r"Used Slots:\s+(\d+)\s+\(([\d.]+)%\)")
-RE_ERR_WAY_ALLOC = re.compile(r"Allocated Error Ways per Set:\s+(\d+)")
-RE_ERR_WAY_MAX = re.compile(r"Max Error Ways per Set:\s+(\d+)")
-
-RE_ETT_ENTRIES_CFG = re.compile(r"ETT Entries:\s+(\d+)")
-RE_ETT_BLOOM_M = re.compile(r"Bloom Filter Size \(m\):\s+(\d+)")
-RE_ETT_RETIRE_THRESH = re.compile(r"Retirement Threshold:\s+(\d+)")
-RE_ETT_TOTAL_ERRORS = re.compile(r"Total DRAM Error Events:\s+(\d+)")
-RE_ETT_NEW_RECORDINGS = re.compile(r"New Error Recordings:\s+(\d+)")
-RE_ETT_FIRST_ERROR = re.compile(r"First Error \(per page\):\s+(\d+)")
-RE_ETT_ADDITIONAL = re.compile(r"Additional Errors:\s+(\d+)")
-RE_ETT_RETIREMENTS = re.compile(r"Page Retirements.*?:\s+(\d+)")
-RE_ETT_ALREADY_KNOWN = re.compile(r"Already Known \(bloom hit\):\s+(\d+)")
-RE_ETT_ACTIVE_PAGES = re.compile(r"Active Pages \(tracked\):\s+(\d+)")
-RE_ETT_SINGLE_ERR = re.compile(r"Single-error pages:\s+(\d+)")
-RE_ETT_MULTI_ERR = re.compile(r"Multi-error pages:\s+(\d+)")
-RE_ETT_USED = re.compile(r"ETT Entries Used:\s+(\d+)\s*/\s*(\d+)")
-RE_ETT_EVICTIONS = re.compile(r"ETT Evictions:\s+(\d+)")
-RE_BF_AVG_OCC = re.compile(r"\[Snapshot.*?\]\s*\n\s*Valid Entries:\s+\d+\s*\n\s*Avg Occupancy:\s+([\d.]+)%")
-RE_BF_FP_RATE = re.compile(r"\[Snapshot.*?\]\s*\n.*?Est\. FP Rate:\s+([\d.]+)%", re.DOTALL)
-RE_PAGES_RETIRED = re.compile(r"Pages Retired:\s+(\d+)")
-RE_LINES_INVALIDATED = re.compile(r"Cache Lines Invalidated:\s+(\d+)")
-
-RE_ROW_BUFFER_MISS = re.compile(r"ROW_BUFFER_MISS:\s+(\d+)")
+# Every metric is read by the shared registry in simtools.results.stats, through the cache of parsed outputs
+sys.path.insert(0, BASE_DIR)
+from simtools.results import cpu_value, parse_dir, parsed  # noqa: E402
 
 WORKLOAD_RE = re.compile(r"^(\d+\.\w+)")
 
@@ -82,6 +56,8 @@ class Metrics:
     ipc: Optional[float] = None
     instructions: Optional[int] = None
     cycles: Optional[int] = None
+    ipc_ci_pct: Optional[float] = None
+    converged: Optional[bool] = None
     # Error way
     err_way_alloc: Optional[int] = None
     err_way_max: Optional[int] = None
@@ -115,200 +91,135 @@ class Metrics:
     rbmpki: Optional[float] = None
 
 
+# The registry's names of the fields named differently here
+RENAMED_FIELDS = {"total_errors": "total_dram_errors", "page_retirements_ett": "page_retirements"}
+METRIC_FIELDS = [f.name for f in fields(Metrics) if f.name != "rbmpki"]
+
+
 def extract_workload(trace: str) -> str:
     m = WORKLOAD_RE.match(trace)
     return m.group(1) if m else trace
 
 
+def metrics_from(stats: dict) -> Metrics:
+    """Build the metrics of a result file from its parsed values."""
+    m = Metrics()
+    for name in METRIC_FIELDS:
+        setattr(m, name, cpu_value(stats, RENAMED_FIELDS.get(name, name)))
+
+    # RBMPKI
+    rb_misses = stats.get("row_buffer_misses", 0)
+    if m.instructions and m.instructions > 0 and rb_misses > 0:
+        m.rbmpki = (rb_misses / m.instructions) * 1000
+
+    return m
+
+
 def extract_metrics(path: str) -> Metrics:
     """Parse a result file and extract all metrics."""
     try:
-        with open(path, "r") as f:
-            txt = f.read()
+        stats = parsed(path)
     except Exception:
         return Metrics()
+    return metrics_from(stats)
 
-    m = Metrics()
 
-    # IPC
-    match = RE_IPC.search(txt)
-    if match:
-        m.ipc = float(match.group(1))
-        m.instructions = int(match.group(2))
-        m.cycles = int(match.group(3))
-
-    # Error way stats
-    _set_int(m, "err_way_alloc", RE_ERR_WAY_ALLOC, txt)
-    _set_int(m, "err_way_max", RE_ERR_WAY_MAX, txt)
-    _set_int(m, "err_way_hits", RE_ERR_WAY_HITS, txt)
-    _set_int(m, "err_way_fills", RE_ERR_WAY_FILLS, txt)
-    _set_float(m, "err_way_hit_rate", RE_ERR_WAY_HIT_RATE, txt)
-    _set_int(m, "err_way_evictions", RE_ERR_WAY_EVICTIONS, txt)
-    match = RE_ERR_WAY_USED.search(txt)
-    if match:
-        m.err_way_used = int(match.group(1))
-        m.err_way_used_pct = float(match.group(2))
-
-    # ETT stats
-    _set_int(m, "ett_entries", RE_ETT_ENTRIES_CFG, txt)
-    _set_int(m, "bloom_m", RE_ETT_BLOOM_M, txt)
-    _set_int(m, "retire_threshold", RE_ETT_RETIRE_THRESH, txt)
-    _set_int(m, "total_errors", RE_ETT_TOTAL_ERRORS, txt)
-    _set_int(m, "new_recordings", RE_ETT_NEW_RECORDINGS, txt)
-    _set_int(m, "first_errors", RE_ETT_FIRST_ERROR, txt)
-    _set_int(m, "additional_errors", RE_ETT_ADDITIONAL, txt)
-    _set_int(m, "page_retirements_ett", RE_ETT_RETIREMENTS, txt)
-    _set_int(m, "already_known", RE_ETT_ALREADY_KNOWN, txt)
-    _set_int(m, "active_pages", RE_ETT_ACTIVE_PAGES, txt)
-    _set_int(m, "single_error_pages", RE_ETT_SINGLE_ERR, txt)
-    _set_int(m, "multi_error_pages", RE_ETT_MULTI_ERR, txt)
-    match = RE_ETT_USED.search(txt)
-    if match:
-        m.ett_used = int(match.group(1))
-        m.ett_total = int(match.group(2))
-    _set_int(m, "ett_evictions", RE_ETT_EVICTIONS, txt)
-    _set_float(m, "bf_avg_occupancy", RE_BF_AVG_OCC, txt)
-    _set_float(m, "bf_fp_rate", RE_BF_FP_RATE, txt)
-    _set_int(m, "pages_retired", RE_PAGES_RETIRED, txt)
-    _set_int(m, "lines_invalidated", RE_LINES_INVALIDATED, txt)
+def record(result) -> dict:
+    """The fields every loader's record holds for a parsed result file."""
+    return {"metrics": metrics_from(result.values), "error": result.error}
 
-    # RBMPKI
-    if m.instructions and m.instructions > 0:
-        rb_misses = sum(int(x) for x in RE_ROW_BUFFER_MISS.findall(txt))
-        if rb_misses > 0:
-            m.rbmpki = (rb_misses / m.instructions) * 1000
 
-    return m
+# ── Loaders ──
+# Each loader parses its files over `jobs` worker processes (None: one per CPU).
+# A record whose file could not be parsed holds empty metrics and the error.
 
+def _err_sweep_axes(match) -> dict:
+    return {"pinning": match.group("pin") == "on", "error_rate": match.group("rate")}
 
-def _set_int(obj, attr, regex, txt):
-    match = regex.search(txt)
-    if match:
-        setattr(obj, attr, int(match.group(1)))
 
+def _ett_entries_axes(match) -> dict:
+    return {"entries": int(match.group("entries")), "error_rate": match.group("rate")}
 
-def _set_float(obj, attr, regex, txt):
-    match = regex.search(txt)
-    if match:
-        setattr(obj, attr, float(match.group(1)))
 
+def _match_retire(fname: str):
+    return RE_RETIRE_ON.match(fname) or RE_RETIRE_OFF.match(fname)
+
+
+def _retire_axes(match) -> dict:
+    return {"pinning": match.re is RE_RETIRE_ON, "threshold": int(match.group("thresh")), "error_rate": match.group("rate")}
+
+
+def _errway_axes(match) -> dict:
+    return {"ways": int(match.group("ways")), "error_rate": match.group("rate")}
 
-# ── Loaders ──
 
-def load_err_sweep(result_dir: str = DIR_ERR_SWEEP) -> List[dict]:
+def _llc_baseline_axes(match) -> dict:
+    return {"llc_size": match.group("size")}
+
+
+# Each experiment: its directory, how its file names are matched, and the axes a file name gives
+EXPERIMENTS = {
+    "err_sweep": (DIR_ERR_SWEEP, RE_ERR_SWEEP.match, _err_sweep_axes),
+    "ett_entries": (DIR_ETT_SENS, RE_ETT_ENTRIES.match, _ett_entries_axes),
+    "retire_threshold": (DIR_ETT_SENS, _match_retire, _retire_axes),
+    "errway_capacity": (DIR_ERRWAY_CAP, RE_ERRWAY.match, _errway_axes),
+    "llc_baseline": (DIR_LLC_BASELINE, RE_LLC_BASELINE.match, _llc_baseline_axes),
+}
+
+# The names ResultsFrame gives the axes named differently here
+FRAME_AXES = {"error_rate": "rate", "ways": "max_ways"}
+
+
+def _runs(experiment: str, result_dir: Optional[str], jobs: Optional[int]):
+    """The axes and parsed result of each file of an experiment."""
+    default_dir, match_name, axes = EXPERIMENTS[experiment]
+    for match, result in parse_dir(result_dir or default_dir, match_name, jobs=jobs):
+        trace = match.group("trace")
+        yield {**axes(match), "trace": trace, "workload": extract_workload(trace)}, result
+
+
+def _load(experiment: str, result_dir: Optional[str], jobs: Optional[int]) -> List[dict]:
+    return [{**axes, **record(result)} for axes, result in _runs(experiment, result_dir, jobs)]
+
+
+def load_err_sweep(result_dir: str = DIR_ERR_SWEEP, jobs: Optional[int] = 1) -> List[dict]:
     """Load 1_error_rate_sweep results."""
-    records = []
-    if not os.path.isdir(result_dir):
-        return records
-    for fname in sorted(os.listdir(result_dir)):
-        match = RE_ERR_SWEEP.match(fname)
-        if not match:
-            continue
-        path = os.path.join(result_dir, fname)
-        metrics = extract_metrics(path)
-        records.append({
-            "pinning": match.group("pin") == "on",
-            "error_rate": match.group("rate"),
-            "trace": match.group("trace"),
-            "workload": extract_workload(match.group("trace")),
-            "metrics": metrics,
-        })
-    return records
-
-
-def load_ett_entries(result_dir: str = DIR_ETT_SENS) -> List[dict]:
+    return _load("err_sweep", result_dir, jobs)
+
+
+def load_ett_entries(result_dir: str = DIR_ETT_SENS, jobs: Optional[int] = 1) -> List[dict]:
     """Load ETT entry sensitivity results."""
-    records = []
-    if not os.path.isdir(result_dir):
-        return records
-    for fname in sorted(os.listdir(result_dir)):
-        match = RE_ETT_ENTRIES.match(fname)
-        if not match:
-            continue
-        path = os.path.join(result_dir, fname)
-        metrics = extract_metrics(path)
-        records.append({
-            "entries": int(match.group("entries")),
-            "error_rate": match.group("rate"),
-            "trace": match.group("trace"),
-            "workload": extract_workload(match.group("trace")),
-            "metrics": metrics,
-        })
-    return records
-
-
-def load_retire_threshold(result_dir: str = DIR_ETT_SENS) -> List[dict]:
+    return _load("ett_entries", result_dir, jobs)
+
+
+def load_retire_threshold(result_dir: str = DIR_ETT_SENS, jobs: Optional[int] = 1) -> List[dict]:
     """Load retirement threshold sensitivity results (pinning ON and OFF)."""
-    records = []
-    if not os.path.isdir(result_dir):
-        return records
-    for fname in sorted(os.listdir(result_dir)):
-        match_on = RE_RETIRE_ON.match(fname)
-        match_off = RE_RETIRE_OFF.match(fname)
-        if match_on:
-            pinning = True
-            thresh = int(match_on.group("thresh"))
-            rate = match_on.group("rate")
-            trace = match_on.group("trace")
-        elif match_off:
-            pinning = False
-            thresh = int(match_off.group("thresh"))
-            rate = match_off.group("rate")
-            trace = match_off.group("trace")
-        else:
-            continue
-        path = os.path.join(result_dir, fname)
-        metrics = extract_metrics(path)
-        records.append({
-            "pinning": pinning,
-            "threshold": thresh,
-            "error_rate": rate,
-            "trace": trace,
-            "workload": extract_workload(trace),
-            "metrics": metrics,
-        })
-    return records
-
-
-def load_errway_capacity(result_dir: str = DIR_ERRWAY_CAP) -> List[dict]:
+    return _load("retire_threshold", result_dir, jobs)
+
+
+def load_errway_capacity(result_dir: str = DIR_ERRWAY_CAP, jobs: Optional[int] = 1) -> List[dict]:
     """Load error way capacity results."""
-    records = []
-    if not os.path.isdir(result_dir):
-        return records
-    for fname in sorted(os.listdir(result_dir)):
-        match = RE_ERRWAY.match(fname)
-        if not match:
-            continue
-        path = os.path.join(result_dir, fname)
-        metrics = extract_metrics(path)
-        records.append({
-            "ways": int(match.group("ways")),
-            "error_rate": match.group("rate"),
-            "trace": match.group("trace"),
-            "workload": extract_workload(match.group("trace")),
-            "metrics": metrics,
-        })
-    return records
-
-
-def load_llc_baseline(result_dir: str = DIR_LLC_BASELINE) -> List[dict]:
+    return _load("errway_capacity", result_dir, jobs)
+
+
+def load_llc_baseline(result_dir: str = DIR_LLC_BASELINE, jobs: Optional[int] = 1) -> List[dict]:
     """Load LLC baseline (no error) results."""
-    records = []
-    if not os.path.isdir(result_dir):
-        return records
-    for fname in sorted(os.listdir(result_dir)):
-        match = RE_LLC_BASELINE.match(fname)
-        if not match:
-            continue
-        path = os.path.join(result_dir, fname)
-        metrics = extract_metrics(path)
-        records.append({
-            "llc_size": match.group("size"),
-            "trace": match.group("trace"),
-            "workload": extract_workload(match.group("trace")),
-            "metrics": metrics,
-        })
-    return records
+    return _load("llc_baseline", result_dir, jobs)
+
+
+def load_frame(*experiments: str, jobs: Optional[int] = 1):
+    """
+    Load experiments (keys of EXPERIMENTS) into one ResultsFrame, a row per result file.
+
+    Its metric columns keep the registry's names (total_dram_errors, page_retirements, ...),
+    and its axes those of ResultsFrame (rate, max_ways, ...).
+    """
+    from simtools.results.frame import ResultsFrame
+    rows = []
+    for experiment in experiments:
+        for axes, result in _runs(experiment, None, jobs):
+            rows.append(({"experiment": experiment, **{FRAME_AXES.get(k, k): v for k, v in axes.items()}}, result))
+    return ResultsFrame.from_parsed(rows)
 
 
 def gmean(values):
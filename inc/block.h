@@ -31,6 +31,18 @@ struct cache_block {
   champsim::address data{};
 
   uint32_t pf_metadata = 0;
+
+  template <typename Archive>
+  void checkpoint(Archive& ar)
+  {
+    ar.io(valid);
+    ar.io(prefetch);
+    ar.io(dirty);
+    ar.io(address);
+    ar.io(v_address);
+    ar.io(data);
+    ar.io(pf_metadata);
+  }
 };
 } // namespace champsim
 
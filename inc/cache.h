@@ -29,9 +29,12 @@
 #include <iterator> // for size
 #include <limits>   // for numeric_limits
 #include <memory>
+#include <optional>
 #include <stdexcept>
 #include <string>
 #include <type_traits>
+#include <typeinfo>
+#include <unordered_set>
 #include <vector>
 
 #include "address.h"
@@ -41,7 +44,9 @@
 #include "cache_stats.h"
 #include "champsim.h"
 #include "channel.h"
+#include "checkpoint.h"
 #include "chrono.h"
+#include "error_stats.h"
 #include "modules.h"
 #include "operable.h"
 #include "util/to_underlying.h" // for to_underlying
@@ -233,6 +238,7 @@ public:
                                                 uint32_t metadata_in) = 0;
     virtual void impl_prefetcher_cycle_operate() = 0;
     virtual void impl_prefetcher_final_stats() = 0;
+    virtual void impl_prefetcher_checkpoint(champsim::checkpoint::archive& ar) = 0;
     virtual void impl_prefetcher_branch_operate(champsim::address ip, uint8_t branch_type, champsim::address branch_target) = 0;
   };
 
@@ -249,6 +255,7 @@ public:
     virtual void impl_replacement_cache_fill(uint32_t triggering_cpu, long set, long way, champsim::address full_addr, champsim::address ip,
                                              champsim::address victim_addr, access_type type) = 0;
     virtual void impl_replacement_final_stats() = 0;
+    virtual void impl_replacement_checkpoint(champsim::checkpoint::archive& ar) = 0;
   };
 
   template <typename... Ps>
@@ -267,6 +274,7 @@ public:
                                                       uint32_t metadata_in) final;
     void impl_prefetcher_cycle_operate() final;
     void impl_prefetcher_final_stats() final;
+    void impl_prefetcher_checkpoint(champsim::checkpoint::archive& ar) final;
     void impl_prefetcher_branch_operate(champsim::address ip, uint8_t branch_type, champsim::address branch_target) final;
   };
 
@@ -290,6 +298,7 @@ public:
     void impl_replacement_cache_fill(uint32_t triggering_cpu, long set, long way, champsim::address full_addr, champsim::address ip,
                                      champsim::address victim_addr, access_type type) final;
     void impl_replacement_final_stats() final;
+    void impl_replacement_checkpoint(champsim::checkpoint::archive& ar) final;
   };
 
   std::unique_ptr<prefetcher_module_concept> pref_module_pimpl;
@@ -315,6 +324,9 @@ public:
   void impl_replacement_final_stats() const;
   // NOLINTEND(readability-make-member-function-const)
 
+  // Save or restore the blocks and the module state of this cache (see checkpoint.h)
+  void checkpoint(champsim::checkpoint::archive& ar);
+
   template <typename... Ps, typename... Rs>
   explicit CACHE(champsim::cache_builder<champsim::cache_builder_module_type_holder<Ps...>, champsim::cache_builder_module_type_holder<Rs...>> b)
       : champsim::operable(b.m_clock_period), upper_levels(b.m_uls), lower_level(b.m_ll), lower_translate(b.m_lt), NAME(b.m_name), NUM_SET(b.get_num_sets()),
@@ -353,11 +365,15 @@ public:
 
   // Error Way 통계 출력
   void print_error_way_stats() const;
+  // The error ways as print_error_way_stats() reports them (for --json); empty unless pinning allocated error ways
+  [[nodiscard]] std::optional<error_way_stats> error_way_snapshot() const;
 
   // Sweep error ways for a retired page and invalidate matching cache lines
   void invalidate_page_error_ways(uint64_t page_base);
 
 private:
+  // The cache-line addresses held in the error ways, and in the normal ways
+  std::pair<std::unordered_set<uint64_t>, std::unordered_set<uint64_t>> error_way_residency() const;
   // 모든 Set의 특정 Way를 Error로 전환
   bool allocate_error_way(long way_idx);
   // Error Way 찾기
@@ -463,6 +479,21 @@ void CACHE::prefetcher_module_model<Ps...>::impl_prefetcher_final_stats()
   std::apply([&](auto&... p) { (..., process_one(p)); }, intern_);
 }
 
+template <typename... Ps>
+void CACHE::prefetcher_module_model<Ps...>::impl_prefetcher_checkpoint(champsim::checkpoint::archive& ar)
+{
+  // A checkpoint only restores into the same prefetchers
+  ar.expect(std::string{typeid(std::tuple<Ps...>).name()}, "prefetchers");
+
+  [[maybe_unused]] auto process_one = [&](auto& p) {
+    using namespace champsim::modules;
+    if constexpr (prefetcher::has_checkpoint<decltype(p), champsim::checkpoint::archive&>)
+      p.checkpoint(ar);
+  };
+
+  std::apply([&](auto&... p) { (..., process_one(p)); }, intern_);
+}
+
 template <typename... Ps>
 void CACHE::prefetcher_module_model<Ps...>::impl_prefetcher_branch_operate(champsim::address ip, uint8_t branch_type, champsim::address branch_target)
 {
@@ -584,6 +615,21 @@ void CACHE::replacement_module_model<Rs...>::impl_replacement_final_stats()
   std::apply([&](auto&... r) { (..., process_one(r)); }, intern_);
 }
 
+template <typename... Rs>
+void CACHE::replacement_module_model<Rs...>::impl_replacement_checkpoint(champsim::checkpoint::archive& ar)
+{
+  // A checkpoint only restores into the same replacement policies
+  ar.expect(std::string{typeid(std::tuple<Rs...>).name()}, "replacement policies");
+
+  [[maybe_unused]] auto process_one = [&](auto& r) {
+    using namespace champsim::modules;
+    if constexpr (replacement::has_checkpoint<decltype(r), champsim::checkpoint::archive&>)
+      r.checkpoint(ar);
+  };
+
+  std::apply([&](auto&... r) { (..., process_one(r)); }, intern_);
+}
+
 #ifdef SET_ASIDE_CHAMPSIM_MODULE
 #undef SET_ASIDE_CHAMPSIM_MODULE
 #define CHAMPSIM_MODULE
@@ -0,0 +1,304 @@
+/*
+ * Post-warmup checkpoints
+ *
+ * A checkpoint holds the state a warmup builds up: cache tags and replacement state, branch predictor and BTB tables,
+ * the page walkers' caches, the page maps of VirtualMemory, the open DRAM rows, and how far each trace was read. A run
+ * started with --checkpoint-in restores it and goes straight to the simulation phase. In-flight state (the ROB, the
+ * queues and MSHRs, outstanding DRAM requests) is not kept: the restored machine starts drained.
+ *
+ * The file is:
+ *   magic "CHMPCKPT", then as varints: version, build ID, geometry hash, geometry (a string), warmup instructions,
+ *   the trace count and per trace its file name and the instructions read from it;
+ *   then sections until the footer, each a name (string) and a length (varint) before its payload;
+ *   footer: the CRC-32 (zlib) of everything before it, as 4 little-endian bytes.
+ * Integers are LEB128 varints (signed ones zigzag-encoded), so the format does not depend on the host.
+ *
+ * The geometry is a description of the simulated machine (cache sizes, DRAM and page table shape); its FNV-1a hash
+ * keys the checkpoint. A checkpoint is only restored into a machine of the same geometry, and each section checks
+ * the sizes and modules it was written with, so a mismatch is reported instead of silently misread. The build ID of the
+ * binary that wrote it tells the checkpoints of machines that share a geometry but not their modules or settings apart.
+ * simtools/runner/checkpoints.py reads the same format.
+ */
+
+#ifndef CHECKPOINT_H
+#define CHECKPOINT_H
+
+#include <array>
+#include <bitset>
+#include <cstdint>
+#include <deque>
+#include <map>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <string_view>
+#include <tuple>
+#include <type_traits>
+#include <utility>
+#include <vector>
+#include <fmt/core.h>
+
+#include "address.h"
+#include "util/type_traits.h"
+
+namespace champsim
+{
+struct environment;
+}
+
+namespace champsim::checkpoint
+{
+inline constexpr std::string_view magic{"CHMPCKPT"};
+inline constexpr uint64_t version = 2;
+
+// A checkpoint that cannot be restored here: another geometry or module, or a damaged file
+class mismatch : public std::runtime_error
+{
+  using std::runtime_error::runtime_error;
+};
+
+namespace detail
+{
+template <typename T>
+struct is_std_array : std::false_type {
+};
+template <typename T, std::size_t N>
+struct is_std_array<std::array<T, N>> : std::true_type {
+};
+
+template <typename T>
+struct is_bitset : std::false_type {
+};
+template <std::size_t N>
+struct is_bitset<std::bitset<N>> : std::true_type {
+};
+} // namespace detail
+
+// Saves into, or loads from, a byte buffer. Components describe their state once, through io(), for both directions.
+class archive
+{
+  bool loading_;
+  std::vector<unsigned char> buffer_;
+  std::size_t cursor_ = 0;
+  std::size_t limit_ = 0;
+
+  archive(bool loading, std::vector<unsigned char> buffer) : loading_(loading), buffer_(std::move(buffer)), limit_(std::size(buffer_)) {}
+
+  void put_varint(uint64_t value)
+  {
+    do {
+      auto byte = static_cast<unsigned char>(value & 0x7f); // NOLINT(readability-magic-numbers)
+      value >>= 7;
+      buffer_.push_back(value != 0 ? (byte | 0x80) : byte); // NOLINT(readability-magic-numbers)
+    } while (value != 0);
+  }
+
+  uint64_t get_varint()
+  {
+    uint64_t value = 0;
+    for (unsigned shift = 0;; shift += 7) {
+      if (cursor_ >= limit_ || shift >= 64) {
+        throw mismatch{"the checkpoint is truncated"};
+      }
+      auto byte = buffer_[cursor_++];
+      value |= static_cast<uint64_t>(byte & 0x7f) << shift; // NOLINT(readability-magic-numbers)
+      if ((byte & 0x80) == 0) {                             // NOLINT(readability-magic-numbers)
+        return value;
+      }
+    }
+  }
+
+  template <typename T>
+  void io_integer(T& value)
+  {
+    if constexpr (std::is_signed_v<T>) {
+      if (loading_) {
+        auto raw = get_varint();
+        value = static_cast<T>(static_cast<int64_t>(raw >> 1) ^ -static_cast<int64_t>(raw & 1));
+      } else {
+        auto wide = static_cast<int64_t>(value);
+        put_varint((static_cast<uint64_t>(wide) << 1) ^ static_cast<uint64_t>(wide >> 63)); // NOLINT(readability-magic-numbers)
+      }
+    } else {
+      if (loading_) {
+        value = static_cast<T>(get_varint());
+      } else {
+        put_varint(static_cast<uint64_t>(value));
+      }
+    }
+  }
+
+  template <typename C>
+  void io_sequence(C& container)
+  {
+    auto count = static_cast<uint64_t>(std::size(container));
+    io(count);
+    if (loading_) {
+      container.clear();
+      container.resize(count);
+    }
+    for (auto& element : container) {
+      io(element);
+    }
+  }
+
+public:
+  static archive for_saving() { return archive{false, {}}; }
+  static archive for_loading(std::vector<unsigned char> bytes) { return archive{true, std::move(bytes)}; }
+
+  [[nodiscard]] bool loading() const { return loading_; }
+  [[nodiscard]] const std::vector<unsigned char>& bytes() const { return buffer_; }
+  [[nodiscard]] bool at_end() const { return cursor_ >= limit_; }
+
+  template <typename T>
+  void io(T& value)
+  {
+    if constexpr (std::is_same_v<T, bool>) {
+      uint8_t raw = value ? 1 : 0;
+      io_integer(raw);
+      value = (raw != 0);
+    } else if constexpr (std::is_enum_v<T>) {
+      auto raw = static_cast<std::underlying_type_t<T>>(value);
+      io(raw);
+      value = static_cast<T>(raw);
+    } else if constexpr (std::is_integral_v<T>) {
+      io_integer(value);
+    } else if constexpr (champsim::is_specialization_v<T, champsim::address_slice>) {
+      static_assert(std::is_constructible_v<typename T::extent_type>, "slices of a dynamic extent need their extent restored by their owner");
+      auto raw = value.template to<uint64_t>();
+      io_integer(raw);
+      value = T{raw};
+    } else if constexpr (std::is_same_v<T, std::string>) {
+      auto length = static_cast<uint64_t>(std::size(value));
+      io(length);
+      if (loading_) {
+        if (length > limit_ - cursor_) {
+          throw mismatch{"the checkpoint is truncated"};
+        }
+        value.assign(reinterpret_cast<const char*>(std::data(buffer_)) + cursor_, length); // NOLINT(cppcoreguidelines-pro-type-reinterpret-cast)
+        cursor_ += length;
+      } else {
+        buffer_.insert(std::end(buffer_), std::begin(value), std::end(value));
+      }
+    } else if constexpr (champsim::is_specialization_v<T, std::optional>) {
+      bool engaged = value.has_value();
+      io(engaged);
+      if (loading_) {
+        value = engaged ? std::optional{typename T::value_type{}} : std::nullopt;
+      }
+      if (engaged) {
+        io(*value);
+      }
+    } else if constexpr (champsim::is_specialization_v<T, std::pair> || champsim::is_specialization_v<T, std::tuple>) {
+      std::apply([this](auto&... elements) { (..., io(elements)); }, value);
+    } else if constexpr (champsim::is_specialization_v<T, std::vector> || champsim::is_specialization_v<T, std::deque>) {
+      io_sequence(value);
+    } else if constexpr (detail::is_std_array<T>::value) {
+      expect(std::size(value), "array length");
+      for (auto& element : value) {
+        io(element);
+      }
+    } else if constexpr (detail::is_bitset<T>::value) {
+      static_assert(T{}.size() <= 64, "bitsets are stored as one integer");
+      auto raw = static_cast<uint64_t>(value.to_ullong());
+      io(raw);
+      value = T{raw};
+    } else if constexpr (champsim::is_specialization_v<T, std::map>) {
+      auto count = static_cast<uint64_t>(std::size(value));
+      io(count);
+      if (loading_) {
+        value.clear();
+        for (uint64_t i = 0; i < count; ++i) {
+          std::pair<typename T::key_type, typename T::mapped_type> entry{};
+          io(entry);
+          value.insert(std::end(value), std::move(entry));
+        }
+      } else {
+        for (auto& [key, mapped] : value) {
+          auto entry = std::pair{key, mapped};
+          io(entry);
+        }
+      }
+    } else {
+      value.checkpoint(*this);
+    }
+  }
+
+  // Write a value that the loading side must have too (a size, a name). Throws mismatch if it does not.
+  template <typename T>
+  void expect(const T& value, std::string_view what)
+  {
+    T stored = value;
+    io(stored);
+    if (loading_ && stored != value) {
+      throw mismatch{fmt::format("{}: the checkpoint has {}, this simulator has {}", what, stored, value)};
+    }
+  }
+
+  // A named, length-prefixed part of the checkpoint. When loading, the body must consume exactly what was saved.
+  template <typename F>
+  void section(const std::string& name, F&& body)
+  {
+    expect(name, "section");
+    if (loading_) {
+      auto length = get_varint();
+      if (length > limit_ - cursor_) {
+        throw mismatch{fmt::format("section {} is truncated", name)};
+      }
+      const auto outer_limit = limit_;
+      limit_ = cursor_ + length;
+      body(*this);
+      if (cursor_ != limit_) {
+        throw mismatch{fmt::format("section {}: {} bytes were saved that this simulator does not read", name, limit_ - cursor_)};
+      }
+      limit_ = outer_limit;
+    } else {
+      auto inner = for_saving();
+      body(inner);
+      put_varint(std::size(inner.buffer_));
+      buffer_.insert(std::end(buffer_), std::begin(inner.buffer_), std::end(inner.buffer_));
+    }
+  }
+};
+
+struct header {
+  uint64_t version = checkpoint::version;
+  uint64_t build_id = 0; // of the binary that wrote the checkpoint
+  uint64_t geometry_hash = 0;
+  std::string geometry;
+  long long warmup_instructions = 0;
+  std::vector<std::pair<std::string, long long>> traces; // file name (without directories), instructions read
+
+  template <typename Archive>
+  void checkpoint(Archive& ar)
+  {
+    ar.io(version);
+    if (version != checkpoint::version) {
+      throw mismatch{fmt::format("checkpoint format version {} (this simulator reads version {})", version, checkpoint::version)};
+    }
+    ar.io(build_id);
+    ar.io(geometry_hash);
+    ar.io(geometry);
+    ar.io(warmup_instructions);
+    ar.io(traces);
+  }
+};
+
+// The description of the simulated machine a checkpoint can only be restored into
+std::string describe(environment& env);
+uint64_t geometry_hash(const std::string& geometry);
+
+// Save the state of a warmed-up environment. trace_names are the traces given on the command line, build_id that of
+// the binary.
+void save(const std::string& path, environment& env, const std::vector<std::string>& trace_names, long long warmup_instructions,
+          uint64_t build_id);
+
+// Read the header of a checkpoint, after checking that the file is whole. Throws mismatch if it is not.
+header read_header(const std::string& path);
+
+// Restore a checkpoint into an initialized environment. Returns its header, which tells how far each trace must be
+// skipped. Throws mismatch if the checkpoint cannot be restored here.
+header restore(const std::string& path, environment& env, const std::vector<std::string>& trace_names);
+} // namespace champsim::checkpoint
+
+#endif
@@ -0,0 +1,91 @@
+/*
+ * Confidence-based early stopping of the simulation phase
+ *
+ * With --stop-at-ci, each core samples its progress every --stop-interval instructions of the simulation phase and
+ * estimates its cumulative IPC (instructions over cycles across the intervals) with a confidence interval. The core's
+ * phase ends once the half-width of that interval is at most the given fraction of the estimate, provided it has
+ * retired --stop-min-instructions and at least min_intervals intervals were sampled. With --stop-on-errors, the rate of
+ * DRAM error events per instruction must converge too; a run that sees no errors then never stops early.
+ *
+ * Cumulative IPC is a ratio of sums, so the interval comes from the delta method for ratio estimators: with per-interval
+ * instructions x_i and cycles y_i, R = sum(x)/sum(y) and Var(R) ~ sum((x_i - R*y_i)^2) / ((n-1) * n * mean(y)^2).
+ * The intervals are treated as independent batches, which holds when they are long next to the program's phases of
+ * locality (the default interval is the heartbeat period).
+ */
+
+#ifndef CONVERGENCE_H
+#define CONVERGENCE_H
+
+#include <cstddef>
+#include <cstdint>
+#include <optional>
+
+namespace champsim::convergence
+{
+// The intervals sampled before the width of the confidence interval means anything
+inline constexpr std::size_t min_intervals = 5;
+
+struct policy {
+  double relative_width = 0; // stop once the half-width is at most this fraction of the estimate
+  double confidence = 0.95;
+  long long min_instructions = 0;
+  long long interval = 10000000; // NOLINT(readability-magic-numbers)
+  bool include_errors = false;
+};
+
+struct estimate {
+  double value = 0;
+  double half_width = 0;
+
+  // The half-width as a fraction of the estimate (infinite while the estimate is zero)
+  [[nodiscard]] double relative() const;
+};
+
+// What a core reports at the end of its phase
+struct summary {
+  double confidence = 0;
+  std::size_t intervals = 0;
+  estimate ipc;
+  std::optional<estimate> error_rate; // DRAM error events per instruction, with --stop-on-errors
+  bool converged = false;
+};
+
+// The ratio sum(x)/sum(y) over samples, with its confidence interval. Constant memory: it keeps only the sums.
+class ratio_estimator
+{
+  std::size_t n = 0;
+  double sum_x = 0, sum_y = 0, sum_xx = 0, sum_xy = 0, sum_yy = 0;
+
+public:
+  void add(double x, double y);
+  [[nodiscard]] std::size_t count() const { return n; }
+  [[nodiscard]] estimate at(double z) const;
+};
+
+// The two-sided standard normal quantile for a confidence level (1.96 for 0.95)
+double z_score(double confidence);
+
+class tracker
+{
+  policy pol;
+  double z;
+  ratio_estimator ipc, errors;
+  long long last_instr = 0, last_cycle = 0, begin_instr = 0;
+  uint64_t last_errors = 0;
+  bool narrow = false; // whether the intervals sampled so far give narrow enough estimates; only a sample changes it
+
+public:
+  explicit tracker(policy p);
+
+  // Start sampling at the beginning of a phase
+  void begin(long long instr, long long cycle, uint64_t error_count);
+  [[nodiscard]] bool due(long long instr) const { return instr - last_instr >= pol.interval; }
+  void sample(long long instr, long long cycle, uint64_t error_count);
+
+  // Checked every cycle: the estimates are only computed when an interval is sampled
+  [[nodiscard]] bool converged(long long instr) const { return narrow && instr - begin_instr >= pol.min_instructions; }
+  [[nodiscard]] summary summarize(long long instr) const;
+};
+} // namespace champsim::convergence
+
+#endif
@@ -2,8 +2,11 @@
 #define CORE_STATS_H
 
 #include <cstdint>
+#include <optional>
 #include <string>
 
+#include "convergence.h"
+
 #include "event_counter.h"
 #include "instruction.h"
 
@@ -18,6 +21,9 @@ struct cpu_stats {
   champsim::stats::event_counter<branch_type> total_branch_types = {};
   champsim::stats::event_counter<branch_type> branch_type_misses = {};
 
+  // With --stop-at-ci, the confidence interval the phase ended with
+  std::optional<champsim::convergence::summary> convergence;
+
   [[nodiscard]] auto instrs() const { return end_instrs - begin_instrs; }
   [[nodiscard]] auto cycles() const { return end_cycles - begin_cycles; }
 };
@@ -29,6 +29,7 @@
 
 #include "address.h"
 #include "channel.h"
+#include "checkpoint.h"
 #include "chrono.h"
 #include "dram_stats.h"
 #include "extent_set.h"
@@ -209,6 +210,9 @@ struct DRAM_CHANNEL final : public champsim::operable {
   void print_deadlock() final;
 
   std::size_t bank_request_capacity() const;
+
+  // Save or restore the open row of each bank (see checkpoint.h). Timing is not kept: a restored channel starts idle.
+  void checkpoint(champsim::checkpoint::archive& ar);
   std::size_t bankgroup_request_capacity() const;
   [[nodiscard]] champsim::data::bytes density() const;
 };
@@ -252,9 +256,12 @@ public:
   void set_vmem(VirtualMemory* vm) { vmem = vm; }
   void set_ptws(std::vector<PageTableWalker*> p) { ptws = p; }
   void set_caches(std::vector<CACHE*> c) { caches = c; }
+  [[nodiscard]] VirtualMemory* get_vmem() const { return vmem; }
 
   [[nodiscard]] champsim::data::bytes size() const;
 
+  void checkpoint(champsim::checkpoint::archive& ar);
+
 };
 
 #endif
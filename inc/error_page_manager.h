@@ -27,6 +27,7 @@
 #include "chrono.h"
 #include "champsim.h"
 #include "care_ecc_cache.h"
+#include "error_stats.h"
 
 enum class ErrorPageManagerMode {
     ALL_ON,
@@ -73,21 +74,6 @@ struct ECTEntry {
     bool valid{false};
 };
 
-// Per-CPU error attribution (multicore mix interpretation).
-// An error is attributed to the CPU whose DRAM read packet consumed it.
-struct PerCpuErrorStats {
-    uint64_t errors_absorbed{0};      // total CYCLE errors consumed by this CPU's packets
-    uint64_t first_errors{0};         // FIRST_ERROR results (pinning ON)
-    uint64_t added_errors{0};         // ADDED_ERROR results (pinning ON)
-    uint64_t already_known{0};        // ALREADY_KNOWN results (pinning ON)
-    uint64_t retirements{0};          // PAGE_RETIRED results (pinning ON)
-    uint64_t baseline_retirements{0}; // retirements triggered via baseline path (pinning OFF)
-    uint64_t care_registered{0};      // CARE: new ECC cache registrations (scheme == care)
-    uint64_t care_dropped{0};         // CARE: errors refused by full ECC cache set
-    uint64_t care_retirements{0};     // CARE: page retirements (both confirm paths)
-    uint64_t care_celog_retirements{0}; // CARE: subset confirmed via MC CE log (untracked repeat CE)
-};
-
 class ErrorPageManager {
 // Global Private Variables
 private:
@@ -397,6 +383,9 @@ public:
     uint64_t get_stat_already_known_count() const { return stat_already_known_count; }
     void add_retirement_invalidated_lines(uint64_t count) { stat_retirement_invalidated_lines += count; }
     void print_error_stats() const;
+    // Snapshot of every counter the [ERROR], [CARE] and ERROR PAGE STATISTICS blocks print (for --json).
+    // CPUs that consumed no error get zeroed attribution, so `cores` has at least num_cpus entries.
+    error_model_stats error_stats(std::size_t num_cpus) const;
 
     // Per-CPU error attribution (stats only, no behavioral effect)
     void record_error_result_cpu(uint32_t cpu_idx, ErrorRecordResult result) {
@@ -454,6 +443,13 @@ public:
         }
     }
     uint64_t get_error_cycle_interval() const { return error_cycle_interval; }
+    // Fork-after-warmup: a sweep point re-applies its settings in a child forked from the group's process, whose
+    // construction already drew the first interval. Rewinding first makes the point draw exactly what a
+    // standalone run of its own binary would (nothing else draws from gen before the simulation phase in CYCLE mode).
+    void rewind_injection_stream() {
+        gen.seed(54321);
+        exp_dist.reset();
+    }
     void set_cpu_clock_period(champsim::chrono::picoseconds period) { cpu_clock_period = period; }
     champsim::chrono::picoseconds get_cpu_clock_period() const { return cpu_clock_period; }
 
@@ -624,6 +620,17 @@ public:
     void remove_current_ppage(champsim::page_number page) { current_ppage.erase(page.to<uint64_t>()); }
     bool is_current_ppage(champsim::page_number page) const { return current_ppage.find(page.to<uint64_t>()) != current_ppage.end(); }
 
+    // Save or restore the physical pages in use (see checkpoint.h)
+    template <typename Archive>
+    void checkpoint(Archive& ar) {
+        std::vector<uint64_t> pages(current_ppage.begin(), current_ppage.end());
+        std::sort(pages.begin(), pages.end());
+        ar.io(pages);
+        if (ar.loading()) {
+            current_ppage = std::unordered_set<uint64_t>(pages.begin(), pages.end());
+        }
+    }
+
     // Utility functions
     size_t get_error_page_count() const { return error_pages.size(); }
     size_t get_current_ppage_count() const { return current_ppage.size(); }
@@ -0,0 +1,120 @@
+#ifndef ERROR_STATS_H
+#define ERROR_STATS_H
+
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <optional>
+#include <string>
+#include <vector>
+
+#include "care_ecc_cache.h"
+
+// Per-CPU error attribution (multicore mix interpretation).
+// An error is attributed to the CPU whose DRAM read packet consumed it.
+struct PerCpuErrorStats {
+  uint64_t errors_absorbed{0};        // total CYCLE errors consumed by this CPU's packets
+  uint64_t first_errors{0};           // FIRST_ERROR results (pinning ON)
+  uint64_t added_errors{0};           // ADDED_ERROR results (pinning ON)
+  uint64_t already_known{0};          // ALREADY_KNOWN results (pinning ON)
+  uint64_t retirements{0};            // PAGE_RETIRED results (pinning ON)
+  uint64_t baseline_retirements{0};   // retirements triggered via baseline path (pinning OFF)
+  uint64_t care_registered{0};        // CARE: new ECC cache registrations (scheme == care)
+  uint64_t care_dropped{0};           // CARE: errors refused by full ECC cache set
+  uint64_t care_retirements{0};       // CARE: page retirements (both confirm paths)
+  uint64_t care_celog_retirements{0}; // CARE: subset confirmed via MC CE log (untracked repeat CE)
+};
+
+// The error ways of a cache (pinning ON), as print_error_way_stats() reports them
+struct error_way_stats {
+  std::string name;
+  long sets = 0;
+  long ways = 0; // allocated per set
+  long max_ways = 0;
+  uint64_t used_slots = 0;
+
+  uint64_t hits = 0;
+  uint64_t fills = 0; // error way misses, filled from DRAM
+  uint64_t evictions = 0;
+
+  // Where the known error addresses reside
+  uint64_t known_addresses = 0;
+  uint64_t pinned = 0;
+  uint64_t in_normal_way = 0;
+  uint64_t not_in_llc = 0;
+};
+
+// The fault population of the clustered and sticky spatial models, and where the consumed errors landed.
+// The arrays are indexed by FaultMode (cell, row, bank).
+struct spatial_fault_stats {
+  uint64_t seed = 0;
+  std::array<uint64_t, 3> faults_created{};
+  std::array<uint64_t, 3> faults_killed{};
+  std::array<uint64_t, 3> manifests{};
+  uint64_t anchor_manifests = 0;
+  uint64_t colocated_faults = 0;
+  uint64_t widened_bank = 0;
+  uint64_t widened_any = 0;
+  uint64_t resampled_manifests = 0;
+  uint64_t pending = 0;
+  uint64_t pending_peak = 0;
+  uint64_t unanchored = 0;
+  uint64_t retired_pages = 0;
+  uint64_t max_manifests_per_fault = 0;
+
+  uint64_t distinct_lines = 0;
+  uint64_t distinct_rows = 0;
+  uint64_t distinct_banks = 0;
+  uint64_t max_errors_per_line = 0;
+  uint64_t max_errors_per_row = 0;
+  uint64_t max_errors_per_bank = 0;
+};
+
+// The CARE comparison scheme: the ECC cache and the retirements it confirmed
+struct care_stats {
+  std::size_t sets = 0;
+  std::size_t ways = 0;
+  std::size_t resident = 0;
+  uint32_t bch_decode_cycles = 0;
+  uint64_t retirements = 0;
+  uint64_t proactive_pages = 0;
+  CareEccCache::Stats cache{};
+};
+
+// Everything the error model reports in text ([ERROR], [LLC], [CARE] and the ERROR PAGE STATISTICS block), taken
+// at the end of a phase. The counters are cumulative over the run.
+struct error_model_stats {
+  std::string mode;          // ALL_ON, RANDOM, CYCLE or OFF
+  std::string spatial_model; // uniform, clustered or sticky
+  bool cache_pinning = false;
+  bool care = false;
+  uint64_t error_cycle_interval = 0;
+  double bit_error_rate = 0;
+  double page_error_rate = 0;
+  uint64_t total_error_accesses = 0;
+
+  // Error recording
+  std::size_t retirement_threshold = 0;
+  uint64_t first_errors = 0;
+  uint64_t added_errors = 0;
+  uint64_t retirements = 0;
+  uint64_t already_known = 0;
+  uint64_t lines_invalidated = 0;
+  std::size_t active_pages = 0;
+  std::size_t multi_error_pages = 0;
+
+  // Known error addresses: still tracked, and taken offline by a retirement
+  std::size_t tracked_addresses = 0;
+  std::size_t retired_addresses = 0;
+
+  // Retirement without pinning
+  std::size_t baseline_retirement_threshold = 0;
+  uint64_t baseline_retirements = 0;
+
+  std::vector<PerCpuErrorStats> cores;
+  std::vector<error_way_stats> error_ways;
+  std::optional<spatial_fault_stats> spatial;
+  std::optional<care_stats> care_scheme;
+};
+
+#endif
@@ -0,0 +1,78 @@
+/*
+ * Fork-after-warmup for error sweeps
+ *
+ * The points of an error sweep differ only in Error Page Manager settings, and injection is off during warmup, so
+ * every point's warmup is the same simulation. A fork group simulates it once, then fork()s one child per point;
+ * each child applies its settings through the ErrorPageManager setters and runs the simulation phase into its
+ * own output file. Copy-on-write keeps the children's memory shared until they diverge.
+ *
+ * The points are listed in a JSON file:
+ *   {"points": [{"output": "results/.../pin_on_1e-5_mcf.txt", "error_page_manager": {"error_cycle_interval": 144000000}},
+ *               ...]}
+ * with "error_page_manager" holding only the keys in settable_keys (as in the configuration file). A point may also
+ * name a "json" file, which receives its statistics when the group runs with --json.
+ */
+
+#ifndef FORK_SWEEP_H
+#define FORK_SWEEP_H
+
+#include <cstdio>
+#include <string>
+#include <utility>
+#include <vector>
+#include <nlohmann/json.hpp>
+#include <sys/types.h>
+
+class ErrorPageManager;
+
+namespace champsim::fork_sweep
+{
+// The error_page_manager keys a point may set. The others either act during warmup or are fixed at build time, so
+// they must be the same for every point of a group.
+extern const std::vector<std::string> settable_keys;
+
+struct point {
+  std::string output;
+  nlohmann::json error_page_manager;
+  std::string json{}; // where the point writes its --json statistics, if not into its output
+};
+
+// Read and validate a point list. Throws std::runtime_error naming the first problem.
+std::vector<point> read_points(const std::string& path);
+
+// Apply a point's settings to the (warmed-up) Error Page Manager
+void apply(ErrorPageManager& epm, const nlohmann::json& settings);
+
+class group
+{
+  std::vector<point> points_;
+  std::FILE* prologue_ = nullptr; // the output of the warmup, which begins every point's output
+  int group_stdout_ = -1;
+  std::vector<std::pair<pid_t, std::size_t>> children_;
+  const point* current_ = nullptr; // in a child: the point it simulates
+
+  void copy_prologue(int fd) const;
+  void enter_point(const point& p);
+
+public:
+  explicit group(std::vector<point> points);
+  group(const group&) = delete;
+  group& operator=(const group&) = delete;
+  ~group();
+
+  // Hold standard output back until the warmup ends
+  void begin_warmup();
+
+  // Fork one child per point. Returns true in a child, which then continues the simulation as its point, and false
+  // in the group's process once every child is started.
+  bool fork_points();
+
+  // In the group's process: wait for every child. Returns the exit status of the group.
+  int wait();
+
+  // In a child: the file its point names for the JSON statistics, or an empty string for its output
+  [[nodiscard]] std::string json_output() const;
+};
+} // namespace champsim::fork_sweep
+
+#endif
@@ -22,7 +22,11 @@
 #include <iostream>
 #include <lzma.h>
 #include <memory>
+#include <utility>
 #include <zlib.h>
+#include <zstd.h>
+
+#include "util/detect.h"
 
 namespace champsim
 {
@@ -40,6 +44,22 @@ struct end_deleter {
     delete s;
   }
 };
+
+template <typename T>
+using pending_output_t = decltype(T::pending_output(std::declval<typename T::inflate_state_type&>()));
+
+/*
+ * Some decoders buffer output internally, so they may still produce data after the input has been consumed.
+ */
+template <typename T>
+bool has_pending_output(typename T::inflate_state_type& x)
+{
+  if constexpr (champsim::is_detected_v<pending_output_t, T>) {
+    return T::pending_output(x);
+  } else {
+    return false;
+  }
+}
 } // namespace detail
 
 struct bzip2_tag_t {
@@ -180,6 +200,97 @@ struct lzma_tag_t {
     return state;
   }
 };
+
+template <int level = 3>
+struct zstd_tag_t {
+  // libzstd takes its buffers by argument rather than in the context, so mirror the fields the other libraries keep
+  struct state_type {
+    const uint8_t* next_in = nullptr;
+    std::size_t avail_in = 0;
+    uint8_t* next_out = nullptr;
+    std::size_t avail_out = 0;
+    std::size_t total_out = 0;
+    bool output_pending = false;
+    ::ZSTD_CCtx* cctx = nullptr;
+    ::ZSTD_DCtx* dctx = nullptr;
+  };
+
+  struct state_deleter {
+    void operator()(state_type* s)
+    {
+      ::ZSTD_freeCCtx(s->cctx);
+      ::ZSTD_freeDCtx(s->dctx);
+      delete s;
+    }
+  };
+
+  using in_char_type = uint8_t;
+  using out_char_type = uint8_t;
+  using deflate_state_type = std::unique_ptr<state_type, state_deleter>;
+  using inflate_state_type = std::unique_ptr<state_type, state_deleter>;
+  using status_type = status_t;
+
+  static void advance(state_type& x, const ::ZSTD_inBuffer& in, const ::ZSTD_outBuffer& out)
+  {
+    x.next_in += in.pos;
+    x.avail_in -= in.pos;
+    x.next_out += out.pos;
+    x.avail_out -= out.pos;
+    x.total_out += out.pos;
+  }
+
+  static status_type deflate(deflate_state_type& x, bool flush)
+  {
+    ::ZSTD_inBuffer in{x->next_in, x->avail_in, 0};
+    ::ZSTD_outBuffer out{x->next_out, x->avail_out, 0};
+    auto ret = ::ZSTD_compressStream2(x->cctx, &out, &in, flush ? ZSTD_e_end : ZSTD_e_continue);
+    advance(*x, in, out);
+    if (::ZSTD_isError(ret)) {
+      return status_type::ERROR;
+    }
+    if (flush && ret == 0) {
+      return status_type::END;
+    }
+    return status_type::CAN_CONTINUE;
+  }
+
+  static status_type inflate(inflate_state_type& x)
+  {
+    ::ZSTD_inBuffer in{x->next_in, x->avail_in, 0};
+    ::ZSTD_outBuffer out{x->next_out, x->avail_out, 0};
+    auto ret = ::ZSTD_decompressStream(x->dctx, &out, &in);
+    advance(*x, in, out);
+
+    // A full output buffer may leave decoded data behind in the context
+    x->output_pending = (out.pos == out.size);
+    if (::ZSTD_isError(ret)) {
+      return status_type::ERROR;
+    }
+    if (ret == 0) {
+      return status_type::END;
+    }
+    return status_type::CAN_CONTINUE;
+  }
+
+  static bool pending_output(inflate_state_type& x) { return x->output_pending; }
+
+  static deflate_state_type new_deflate_state()
+  {
+    deflate_state_type state{new state_type};
+    state->cctx = ::ZSTD_createCCtx();
+    assert(state->cctx != nullptr);
+    ::ZSTD_CCtx_setParameter(state->cctx, ZSTD_c_compressionLevel, level);
+    return state;
+  }
+
+  static inflate_state_type new_inflate_state()
+  {
+    inflate_state_type state{new state_type};
+    state->dctx = ::ZSTD_createDCtx();
+    assert(state->dctx != nullptr);
+    return state;
+  }
+};
 } // namespace decomp_tags
 
 template <typename Tag, typename StreamType = std::ifstream>
@@ -242,7 +353,7 @@ auto inf_istream<T, S>::inf_streambuf<I>::underflow() -> int_type
   strm->next_out = uns_out_buf.data();
   do {
     // Check to see if we have consumed all available input
-    if (strm->avail_in == 0) {
+    if (strm->avail_in == 0 && !decomp_tags::detail::has_pending_output<T>(strm)) {
       // Check to see if the input stream is sane
       if (src->fail()) {
         this->setg(this->out_buf.data(), this->out_buf.data(), this->out_buf.data());
@@ -61,6 +61,11 @@ struct branch_predictor : public bound_to<O3_CPU> {
   template <typename, typename...>
   static auto predict_branch_member_impl(long) -> std::false_type;
 
+  template <typename T, typename... Args>
+  static auto checkpoint_member_impl(int) -> decltype(std::declval<T>().checkpoint(std::declval<Args>()...), std::true_type{});
+  template <typename, typename...>
+  static auto checkpoint_member_impl(long) -> std::false_type;
+
   template <typename T, typename... Args>
   constexpr static bool has_initialize = decltype(initialize_member_impl<T, Args...>(0))::value;
 
@@ -69,6 +74,9 @@ struct branch_predictor : public bound_to<O3_CPU> {
 
   template <typename T, typename... Args>
   constexpr static bool has_predict_branch = decltype(predict_branch_member_impl<T, Args...>(0))::value;
+
+  template <typename T, typename... Args>
+  constexpr static bool has_checkpoint = decltype(checkpoint_member_impl<T, Args...>(0))::value;
 };
 
 struct btb : public bound_to<O3_CPU> {
@@ -89,6 +97,11 @@ struct btb : public bound_to<O3_CPU> {
   template <typename, typename...>
   static auto predict_branch_member_impl(long) -> std::false_type;
 
+  template <typename T, typename... Args>
+  static auto checkpoint_member_impl(int) -> decltype(std::declval<T>().checkpoint(std::declval<Args>()...), std::true_type{});
+  template <typename, typename...>
+  static auto checkpoint_member_impl(long) -> std::false_type;
+
   template <typename T, typename... Args>
   constexpr static bool has_initialize = decltype(initialize_member_impl<T, Args...>(0))::value;
 
@@ -97,6 +110,9 @@ struct btb : public bound_to<O3_CPU> {
 
   template <typename T, typename... Args>
   constexpr static bool has_btb_prediction = decltype(predict_branch_member_impl<T, Args...>(0))::value;
+
+  template <typename T, typename... Args>
+  constexpr static bool has_checkpoint = decltype(checkpoint_member_impl<T, Args...>(0))::value;
 };
 
 struct prefetcher : public bound_to<CACHE> {
@@ -134,6 +150,11 @@ struct prefetcher : public bound_to<CACHE> {
   template <typename, typename...>
   static auto branch_operate_member_impl(long) -> std::false_type;
 
+  template <typename T, typename... Args>
+  static auto checkpoint_member_impl(int) -> decltype(std::declval<T>().checkpoint(std::declval<Args>()...), std::true_type{});
+  template <typename, typename...>
+  static auto checkpoint_member_impl(long) -> std::false_type;
+
   template <typename T, typename... Args>
   constexpr static bool has_initialize = decltype(initiailize_memory_impl<T, Args...>(0))::value;
 
@@ -151,6 +172,9 @@ struct prefetcher : public bound_to<CACHE> {
 
   template <typename T, typename... Args>
   constexpr static bool has_branch_operate = decltype(branch_operate_member_impl<T, Args...>(0))::value;
+
+  template <typename T, typename... Args>
+  constexpr static bool has_checkpoint = decltype(checkpoint_member_impl<T, Args...>(0))::value;
 };
 
 struct replacement : public bound_to<CACHE> {
@@ -181,6 +205,11 @@ struct replacement : public bound_to<CACHE> {
   template <typename, typename...>
   static auto final_stats_member_impl(long) -> std::false_type;
 
+  template <typename T, typename... Args>
+  static auto checkpoint_member_impl(int) -> decltype(std::declval<T>().checkpoint(std::declval<Args>()...), std::true_type{});
+  template <typename, typename...>
+  static auto checkpoint_member_impl(long) -> std::false_type;
+
   template <typename T, typename... Args>
   constexpr static bool has_initialize = decltype(initialize_member_impl<T, Args...>(0))::value;
 
@@ -195,6 +224,9 @@ struct replacement : public bound_to<CACHE> {
 
   template <typename T, typename... Args>
   constexpr static bool has_final_stats = decltype(final_stats_member_impl<T, Args...>(0))::value;
+
+  template <typename T, typename... Args>
+  constexpr static bool has_checkpoint = decltype(checkpoint_member_impl<T, Args...>(0))::value;
 };
 } // namespace champsim::modules
 
@@ -179,6 +179,18 @@ public:
     return hit->data;
   }
 
+  // Save or restore the entries and their LRU order (see checkpoint.h)
+  template <typename Archive>
+  void checkpoint(Archive& ar)
+  {
+    ar.expect(std::size(block), "table entries");
+    ar.io(access_count);
+    for (auto& b : block) {
+      ar.io(b.last_used);
+      ar.io(b.data);
+    }
+  }
+
   lru_table(std::size_t sets, std::size_t ways, SetProj set_proj, TagProj tag_proj)
       : set_projection(set_proj), tag_projection(tag_proj), NUM_SET(static_cast<diff_type>(sets)), NUM_WAY(static_cast<diff_type>(ways)), block(sets * ways)
   {
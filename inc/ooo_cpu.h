@@ -30,12 +30,15 @@
 #include <optional>
 #include <queue>
 #include <stdexcept>
+#include <string>
 #include <type_traits>
+#include <typeinfo>
 #include <vector>
 
 #include "bandwidth.h"
 #include "champsim.h"
 #include "channel.h"
+#include "checkpoint.h"
 #include "core_builder.h"
 #include "core_stats.h"
 #include "instruction.h"
@@ -98,6 +101,9 @@ public:
 
   bool show_heartbeat = true;
 
+  // With --stop-at-ci, decides when the simulation phase has run long enough
+  std::optional<champsim::convergence::tracker> convergence;
+
   using stats_type = cpu_stats;
 
   stats_type roi_stats{}, sim_stats{};
@@ -182,6 +188,7 @@ public:
   [[nodiscard]] auto roi_cycle() const { return roi_stats.cycles(); }
   [[nodiscard]] auto sim_instr() const { return num_retired - begin_phase_instr; }
   [[nodiscard]] auto sim_cycle() const { return (current_time.time_since_epoch() / clock_period) - sim_stats.begin_cycles; }
+  [[nodiscard]] bool converged() const { return !warmup && convergence.has_value() && convergence->converged(num_retired); }
 
   void print_deadlock() final;
 
@@ -193,6 +200,7 @@ public:
     virtual void impl_initialize_branch_predictor() = 0;
     virtual void impl_last_branch_result(champsim::address ip, champsim::address target, bool taken, uint8_t branch_type) = 0;
     virtual bool impl_predict_branch(champsim::address ip, champsim::address predicted_target, bool always_taken, uint8_t branch_type) = 0;
+    virtual void impl_branch_checkpoint(champsim::checkpoint::archive& ar) = 0;
   };
 
   struct btb_module_concept {
@@ -201,6 +209,7 @@ public:
     virtual void impl_initialize_btb() = 0;
     virtual void impl_update_btb(champsim::address ip, champsim::address predicted_target, bool taken, uint8_t branch_type) = 0;
     virtual std::pair<champsim::address, bool> impl_btb_prediction(champsim::address ip, uint8_t branch_type) = 0;
+    virtual void impl_btb_checkpoint(champsim::checkpoint::archive& ar) = 0;
   };
 
   template <typename... Bs>
@@ -211,6 +220,7 @@ public:
     void impl_initialize_branch_predictor() final;
     void impl_last_branch_result(champsim::address ip, champsim::address target, bool taken, uint8_t branch_type) final;
     [[nodiscard]] bool impl_predict_branch(champsim::address ip, champsim::address predicted_target, bool always_taken, uint8_t branch_type) final;
+    void impl_branch_checkpoint(champsim::checkpoint::archive& ar) final;
   };
 
   template <typename... Ts>
@@ -221,6 +231,7 @@ public:
     void impl_initialize_btb() final;
     void impl_update_btb(champsim::address ip, champsim::address predicted_target, bool taken, uint8_t branch_type) final;
     [[nodiscard]] std::pair<champsim::address, bool> impl_btb_prediction(champsim::address ip, uint8_t branch_type) final;
+    void impl_btb_checkpoint(champsim::checkpoint::archive& ar) final;
   };
 
   std::unique_ptr<branch_module_concept> branch_module_pimpl;
@@ -236,6 +247,9 @@ public:
   [[nodiscard]] std::pair<champsim::address, bool> impl_btb_prediction(champsim::address ip, uint8_t branch_type) const;
   // NOLINTEND(readability-make-member-function-const)
 
+  // Save or restore the DIB and the branch predictor and BTB state of this core (see checkpoint.h)
+  void checkpoint(champsim::checkpoint::archive& ar);
+
   template <typename... Bs, typename... Ts>
   explicit O3_CPU(champsim::core_builder<champsim::core_builder_module_type_holder<Bs...>, champsim::core_builder_module_type_holder<Ts...>> b)
       : champsim::operable(b.m_clock_period), cpu(b.m_cpu),
@@ -369,6 +383,36 @@ std::pair<champsim::address, bool> O3_CPU::btb_module_model<Ts...>::impl_btb_pre
   return return_type{};
 }
 
+template <typename... Bs>
+void O3_CPU::branch_module_model<Bs...>::impl_branch_checkpoint(champsim::checkpoint::archive& ar)
+{
+  // A checkpoint only restores into the same branch predictors
+  ar.expect(std::string{typeid(std::tuple<Bs...>).name()}, "branch predictors");
+
+  [[maybe_unused]] auto process_one = [&](auto& b) {
+    using namespace champsim::modules;
+    if constexpr (branch_predictor::has_checkpoint<decltype(b), champsim::checkpoint::archive&>)
+      b.checkpoint(ar);
+  };
+
+  std::apply([&](auto&... b) { (..., process_one(b)); }, intern_);
+}
+
+template <typename... Ts>
+void O3_CPU::btb_module_model<Ts...>::impl_btb_checkpoint(champsim::checkpoint::archive& ar)
+{
+  // A checkpoint only restores into the same BTBs
+  ar.expect(std::string{typeid(std::tuple<Ts...>).name()}, "BTBs");
+
+  [[maybe_unused]] auto process_one = [&](auto& t) {
+    using namespace champsim::modules;
+    if constexpr (btb::has_checkpoint<decltype(t), champsim::checkpoint::archive&>)
+      t.checkpoint(ar);
+  };
+
+  std::apply([&](auto&... t) { (..., process_one(t)); }, intern_);
+}
+
 #ifdef SET_ASIDE_CHAMPSIM_MODULE
 #undef SET_ASIDE_CHAMPSIM_MODULE
 #define CHAMPSIM_MODULE
@@ -18,6 +18,7 @@
 #define PHASE_INFO_H
 
 #include <cstdint>
+#include <functional>
 #include <memory>
 #include <string>
 #include <string_view>
@@ -26,6 +27,7 @@
 #include "cache_stats.h"
 #include "core_stats.h"
 #include "dram_stats.h"
+#include "error_stats.h"
 
 namespace champsim
 {
@@ -44,6 +46,14 @@ struct phase_stats {
   std::vector<O3_CPU::stats_type> roi_cpu_stats, sim_cpu_stats;
   std::vector<CACHE::stats_type> roi_cache_stats, sim_cache_stats;
   std::vector<DRAM_CHANNEL::stats_type> roi_dram_stats, sim_dram_stats;
+  error_model_stats error_model;
+};
+
+// Where the caller of champsim::main() can act on the simulation: once the environment is initialized, and at the end
+// of each phase, where returning false stops the simulation
+struct phase_hooks {
+  std::function<void()> after_initialize = [] {};
+  std::function<bool(const phase_info&)> after_phase = [](const phase_info&) { return true; };
 };
 
 } // namespace champsim
@@ -26,6 +26,7 @@
 #include "address.h"
 #include "bandwidth.h"
 #include "channel.h"
+#include "checkpoint.h"
 #include "operable.h"
 #include "ptw_builder.h"
 #include "util/lru_table.h"
@@ -38,6 +39,14 @@ class PageTableWalker : public champsim::operable
     champsim::address vaddr;
     champsim::address ptw_addr;
     std::size_t level;
+
+    template <typename Archive>
+    void checkpoint(Archive& ar)
+    {
+      ar.io(vaddr);
+      ar.io(ptw_addr);
+      ar.io(level);
+    }
   };
 
   struct pscl_indexer {
@@ -104,6 +113,9 @@ public:
   // Returns the lowest cached level in PSC for the given virtual address
   // Returns std::nullopt if no level is cached
   [[nodiscard]] std::optional<std::size_t> get_psc_cached_level(champsim::address vaddr) const;
+
+  // Save or restore the paging-structure caches (see checkpoint.h)
+  void checkpoint(champsim::checkpoint::archive& ar);
 };
 
 #endif
@@ -0,0 +1,130 @@
+/*
+ *    Copyright 2023 The ChampSim Contributors
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#ifndef SHM_ISTREAM_H
+#define SHM_ISTREAM_H
+
+#include <atomic>
+#include <cstdint>
+#include <ios>
+#include <memory>
+#include <string>
+#include <string_view>
+
+namespace champsim
+{
+/*
+ * The layout of a trace fan-out segment, shared with simtools/runner/trace_server.py.
+ *
+ * A trace server decodes a trace once and writes the bytes into a ring of `capacity` bytes that follows the header.
+ * Byte `p` of the trace lives at ring offset `p % capacity`. The server announces a write by advancing `reserve_pos`
+ * before copying and `write_pos` after, then bumps `write_seq` (a futex word) to wake waiting consumers. It never
+ * reserves past the slowest active consumer's cursor plus `capacity`; a consumer that holds it back for too long is
+ * marked evicted and continues with a private decoder.
+ */
+namespace shm_trace
+{
+constexpr uint64_t MAGIC = 0x314d485352545343ULL; // "CSTRSHM1"
+constexpr uint32_t VERSION = 1;
+constexpr std::size_t HEADER_SIZE = 4096;
+constexpr std::size_t SLOT_OFFSET = 128;
+constexpr std::size_t MAX_CONSUMERS = 64;
+constexpr std::string_view PREFIX = "shm:";
+
+enum slot_state : uint32_t { FREE = 0, ACTIVE = 1, EVICTED = 2, DONE = 3 };
+
+struct consumer_slot {
+  std::atomic<uint32_t> state;
+  uint32_t pad;
+  std::atomic<uint64_t> pid;
+  std::atomic<uint64_t> cursor;
+  uint64_t reserved;
+};
+
+struct header {
+  std::atomic<uint64_t> magic;
+  uint32_t version;
+  uint32_t pad0;
+  uint64_t capacity;
+  uint64_t max_consumers;
+  std::atomic<uint64_t> reserve_pos;
+  std::atomic<uint64_t> write_pos;
+  std::atomic<uint32_t> eof;
+  std::atomic<uint32_t> server_waiting;
+  std::atomic<uint32_t> write_seq;
+  std::atomic<uint32_t> read_seq;
+  uint64_t server_pid;
+};
+
+static_assert(std::atomic<uint64_t>::is_always_lock_free);
+static_assert(std::atomic<uint32_t>::is_always_lock_free);
+static_assert(sizeof(consumer_slot) == 32);
+static_assert(sizeof(header) <= SLOT_OFFSET);
+static_assert(SLOT_OFFSET + MAX_CONSUMERS * sizeof(consumer_slot) <= HEADER_SIZE);
+} // namespace shm_trace
+
+/*
+ * A trace source that reads from a fan-out segment, falling back to decoding the trace itself.
+ *
+ * It is named by a descriptor `shm:<segment>:<trace path>`. If the segment is missing, the trace has already advanced
+ * past its beginning, the server dies, or this consumer is evicted, the trace at `<trace path>` is opened privately and
+ * the bytes already consumed are skipped, so the reader sees one uninterrupted stream in every case.
+ */
+class shm_istream
+{
+public:
+  struct byte_source {
+    virtual ~byte_source() = default;
+    virtual void read(char* s, std::streamsize count) = 0;
+    [[nodiscard]] virtual std::streamsize gcount() const = 0;
+    [[nodiscard]] virtual bool eof() const = 0;
+  };
+
+  explicit shm_istream(std::string descriptor);
+
+  shm_istream& read(char* s, std::streamsize count);
+  [[nodiscard]] bool eof() const { return eof_; }
+  [[nodiscard]] std::streamsize gcount() const { return gcount_; }
+
+  // Whether the stream is still served by the shared segment
+  [[nodiscard]] bool is_shared() const { return mapping != nullptr; }
+
+  static bool is_descriptor(std::string_view fname) { return fname.substr(0, std::size(shm_trace::PREFIX)) == shm_trace::PREFIX; }
+
+private:
+  struct mapping_deleter {
+    std::size_t length;
+    shm_trace::consumer_slot* slot;
+    void operator()(shm_trace::header* hdr);
+  };
+
+  std::string fallback_path;
+  std::unique_ptr<shm_trace::header, mapping_deleter> mapping{nullptr, mapping_deleter{0, nullptr}};
+  std::unique_ptr<byte_source> fallback;
+  uint64_t cursor = 0;
+  std::streamsize gcount_ = 0;
+  bool eof_ = false;
+
+  bool attach(const std::string& segment);
+  void switch_to_private();
+  std::size_t read_shared(char* s, std::size_t count);
+  bool wait_for_data(uint64_t write_pos);
+};
+
+std::unique_ptr<shm_istream::byte_source> open_private_trace(const std::string& fname);
+} // namespace champsim
+
+#endif
@@ -28,6 +28,7 @@
 
 #include "address.h"
 #include "champsim.h"
+#include "checkpoint.h"
 #include "chrono.h"
 #include "error_page_manager.h"
 
@@ -151,6 +152,12 @@ public:
    * :returns: An optional containing the virtual page number if found, otherwise empty.
    */
   std::optional<champsim::page_number> get_vpage_for_ppage(uint32_t cpu_num, champsim::page_number paddr) const;
+
+  /**
+   * Save or restore the page maps, the page table and the free list (see checkpoint.h).
+   * The free list is rebuilt the way the constructor builds it, then trimmed to the saved length, so only its length is stored.
+   */
+  void checkpoint(champsim::checkpoint::archive& ar);
 };
 
 #endif
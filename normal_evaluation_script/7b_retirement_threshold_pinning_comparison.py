@@ -20,6 +20,7 @@ from matplotlib import rcParams
 from matplotlib.patches import Patch
 
 from common_normal import extract_metrics, extract_workload, gmean
+from simtools.results import cpu_value, parsed  # common_normal puts the repo root on sys.path
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(SCRIPT_DIR)
@@ -41,9 +42,6 @@ RE_FNAME = re.compile(
     r"^retire_(?P<mode>on|off)_(?P<thr>\d+)_(?P<rate>1e-\d+)_(?P<trace>.+)\.txt$"
 )
 RE_BASELINE = re.compile(r"^llc_baseline_(?P<size>\d+MB)_(?P<trace>.+)\.txt$")
-RE_IPC = re.compile(r"CPU 0 cumulative IPC:\s+([\d.]+)\s+instructions:")
-RE_PIN_OFF_RETIRED = re.compile(r"Baseline Page Retirements:\s+(\d+)")
-RE_PIN_ON_RETIRED = re.compile(r"Pages Retired:\s+(\d+)")
 
 REF_SIZE = "2MB"
 RATES = ["1e-5", "1e-6", "1e-7", "1e-8"]
@@ -78,20 +76,15 @@ def short_name(workload: str) -> str:
 
 def parse_threshold_run(path, mode):
     try:
-        with open(path, "r") as f:
-            txt = f.read()
+        stats = parsed(path)
     except Exception:
         return {"ipc": 0.0, "completed": False, "retired_pages": 0}
 
-    ipc_matches = RE_IPC.findall(txt)
-    ipc = float(ipc_matches[-1]) if ipc_matches else 0.0
-    completed = len(ipc_matches) > 0
+    ipc = cpu_value(stats, "ipc")
+    completed = ipc is not None
+    ipc = ipc if completed else 0.0
 
-    if mode == "off":
-        retired_matches = RE_PIN_OFF_RETIRED.findall(txt)
-    else:
-        retired_matches = RE_PIN_ON_RETIRED.findall(txt)
-    retired = int(retired_matches[-1]) if retired_matches else 0
+    retired = stats.get("baseline_page_retirements" if mode == "off" else "pages_retired", 0)
 
     return {"ipc": ipc, "completed": completed, "retired_pages": retired}
 
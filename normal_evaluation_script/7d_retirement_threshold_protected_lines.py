@@ -26,6 +26,7 @@ from matplotlib import rcParams
 from matplotlib.ticker import PercentFormatter
 
 from common_normal import extract_metrics, extract_workload, gmean
+from simtools.results import cpu_value, parsed  # common_normal puts the repo root on sys.path
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(SCRIPT_DIR)
@@ -46,11 +47,6 @@ OUTPUT_PDF = os.path.join(
 RE_FNAME = re.compile(
     r"^retire_on_(?P<thr>\d+)_(?P<rate>1e-\d+)_(?P<trace>.+)\.txt$"
 )
-RE_COMPLETE = re.compile(r"Simulation complete")
-RE_IPC = re.compile(r"CPU 0 cumulative IPC:\s+([\d.]+)\s+instructions:")
-RE_USED_SLOTS = re.compile(r"Used Slots:\s+(\d+)\s+\(([\d.]+)%\)")
-RE_KNOWN = re.compile(r"Total Known Error Addresses:\s+(\d+)")
-RE_PINNED = re.compile(r"Pinned in Error Way:\s+(\d+)\s+\(([\d.]+)%\)")
 RE_BASELINE = re.compile(r"^llc_baseline_(?P<size>\d+MB)_(?P<trace>.+)\.txt$")
 
 THRESHOLDS = [4, 8, 16, 32]
@@ -88,19 +84,13 @@ def setup_style():
 
 
 def parse_result(path):
-    with open(path, "r", errors="replace") as f:
-        txt = f.read()
-
-    used_match = RE_USED_SLOTS.search(txt)
-    known_match = RE_KNOWN.search(txt)
-    pinned_match = RE_PINNED.search(txt)
-    completed = bool(RE_COMPLETE.search(txt))
-
-    used_slots = int(used_match.group(1)) if used_match else None
-    known_addrs = int(known_match.group(1)) if known_match else None
-    pinned_count = int(pinned_match.group(1)) if pinned_match else None
-    ipc_matches = RE_IPC.findall(txt)
-    ipc = float(ipc_matches[-1]) if ipc_matches else 0.0
+    stats = parsed(path)
+
+    completed = bool(stats.get("complete"))
+    used_slots = stats.get("err_way_used")
+    known_addrs = stats.get("total_known_errors")
+    pinned_count = stats.get("pinned_count")
+    ipc = cpu_value(stats, "ipc") or 0.0
 
     coverage = math.nan
     if completed and used_slots is not None and known_addrs and known_addrs > 0:
@@ -29,6 +29,7 @@ from matplotlib import rcParams
 from matplotlib.ticker import NullLocator
 
 from common_normal import extract_workload
+from simtools.results import cpu_value, parsed  # common_normal puts the repo root on sys.path
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(SCRIPT_DIR)
@@ -41,10 +42,6 @@ OUTPUT_PDF = os.path.join(SCRIPT_DIR, "fig8_capacity_waste.pdf")
 
 RE_PIN_ON = re.compile(r"^pin_on_(?P<rate>1e-\d+)_(?P<trace>.+)\.txt$")
 RE_OFFLINE = re.compile(r"^retire_off_2_(?P<rate>1e-\d+)_(?P<trace>.+)\.txt$")
-RE_IPC = re.compile(r"CPU 0 cumulative IPC:\s+([\d.]+)\s+instructions:")
-RE_PAGE_SIZE = re.compile(r"Page size:\s+(\d+)")
-RE_PIN_OFF_RETIRED = re.compile(r"Baseline Page Retirements:\s+(\d+)")
-RE_PIN_ON_RETIRED = re.compile(r"Pages Retired:\s+(\d+)")
 
 RATES = ["1e-5", "1e-6", "1e-7", "1e-8"]  # benign → harsh
 
@@ -59,24 +56,16 @@ def parse_run(path, mode):
     """Return (retired_pages, page_size, completed?) — completed means the ROI
     IPC line is present (the simulator did not panic out)."""
     try:
-        with open(path, "r") as f:
-            txt = f.read()
+        stats = parsed(path)
     except Exception:
         return None, None, False
 
-    # Grab the last IPC line (ROI section prints cumulative IPC). Presence of a
-    # numeric match means the run reached the ROI end and reported results.
-    ipc_matches = RE_IPC.findall(txt)
-    completed = len(ipc_matches) > 0
+    # The ROI section prints the cumulative IPC. Its presence means the run
+    # reached the ROI end and reported results.
+    completed = cpu_value(stats, "ipc") is not None
+    page_size = stats.get("page_size")
 
-    ps_m = RE_PAGE_SIZE.search(txt)
-    page_size = int(ps_m.group(1)) if ps_m else None
-
-    if mode == "off":
-        matches = RE_PIN_OFF_RETIRED.findall(txt)
-    else:
-        matches = RE_PIN_ON_RETIRED.findall(txt)
-    retired = int(matches[-1]) if matches else 0
+    retired = stats.get("baseline_page_retirements" if mode == "off" else "pages_retired", 0)
 
     return retired, page_size, completed
 
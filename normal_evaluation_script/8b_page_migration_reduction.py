@@ -27,6 +27,7 @@ from matplotlib import rcParams
 from matplotlib.patches import Patch
 
 from common_normal import extract_metrics, extract_workload
+from simtools.results import cpu_value, parsed  # common_normal puts the repo root on sys.path
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR = os.path.dirname(SCRIPT_DIR)
@@ -47,9 +48,6 @@ OUTPUT_PDF = os.path.join(SCRIPT_DIR, "fig8b_page_migration_reduction.pdf")
 RE_PIN_ON = re.compile(r"^pin_on_(?P<rate>1e-\d+)_(?P<trace>.+)\.txt$")
 RE_OFFLINE = re.compile(r"^retire_off_2_(?P<rate>1e-\d+)_(?P<trace>.+)\.txt$")
 RE_BASELINE = re.compile(r"^llc_baseline_(?P<size>\d+MB)_(?P<trace>.+)\.txt$")
-RE_IPC = re.compile(r"CPU 0 cumulative IPC:\s+([\d.]+)\s+instructions:")
-RE_PIN_OFF_RETIRED = re.compile(r"Baseline Page Retirements:\s+(\d+)")
-RE_PIN_ON_RETIRED = re.compile(r"Pages Retired:\s+(\d+)")
 
 REF_SIZE = "2MB"
 RATES = ["1e-5", "1e-6", "1e-7", "1e-8"]
@@ -83,17 +81,12 @@ def setup_style():
 
 def parse_run(path, mode):
     try:
-        with open(path, "r") as f:
-            txt = f.read()
+        stats = parsed(path)
     except Exception:
         return 0, False
 
-    completed = bool(RE_IPC.search(txt))
-    if mode == "off":
-        matches = RE_PIN_OFF_RETIRED.findall(txt)
-    else:
-        matches = RE_PIN_ON_RETIRED.findall(txt)
-    migrated_pages = int(matches[-1]) if matches else 0
+    completed = cpu_value(stats, "ipc") is not None
+    migrated_pages = stats.get("baseline_page_retirements" if mode == "off" else "pages_retired", 0)
     return migrated_pages, completed
 
 
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Dump raw simulation metrics from results/normal_evaluation/ into one XLSX.
+"""Dump raw simulation metrics from results/normal_evaluation/ into Parquet and one XLSX.
 
 Sheet 1 (Definitions): glossary for every column appearing in later sheets,
   plus a short experiment overview.
@@ -7,19 +7,26 @@ Sheets 2..N: one per experiment subdirectory of results/normal_evaluation/.
   Each row is one sim run; columns are the run's configuration + every metric
   parsed from the .txt output that any figure ever consumes.
 
+The result files that changed since the results cache last read them are
+parsed over --jobs processes first; the sheets are then built in parallel, one
+per worker, from the cache. Each sheet is written as a Parquet file, and the
+workbook is streamed a row at a time (simtools.results.export).
+
 Run:
-    python3 normal_evaluation_script/export_normal_evaluation.py
+    python3 normal_evaluation_script/export_normal_evaluation.py [--jobs N] [--no-xlsx]
 Output:
+    normal_evaluation_script/export/normal_evaluation_raw/<sheet>.parquet
     normal_evaluation_script/export/normal_evaluation_raw.xlsx
 """
 
 from __future__ import annotations
 
+import argparse
 import os
 import re
 import sys
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -27,73 +34,115 @@ BASE_DIR = os.path.dirname(SCRIPT_DIR)
 RESULTS_ROOT = os.path.join(BASE_DIR, "results", "normal_evaluation")
 OUT_DIR = os.path.join(SCRIPT_DIR, "export")
 OUT_XLSX = os.path.join(OUT_DIR, "normal_evaluation_raw.xlsx")
+OUT_PARQUET = os.path.join(OUT_DIR, "normal_evaluation_raw")
 
 
 # ---------------------------------------------------------------------------
-# Filename parsers — pull the configuration columns out of each result name.
+# Configuration columns — each result is named <executable>_<trace>.txt, and
+# the binary's configuration comes from the index of sim_configs/
+# (simtools.results.configs). The sweep labels that are not configuration
+# values (the CE rate, the nominal LLC size) are tokens of the executable name.
 # ---------------------------------------------------------------------------
 
-TRACE = r"(?P<trace>\d+\.[A-Za-z0-9_]+-\d+B)\.txt$"
-
-_RETIRE_RE = re.compile(rf"^retire_(?P<pinning>on|off)_(?P<retirement_threshold>\d+)_(?P<error_rate>1e-\d+)_{TRACE}")
-
-FILENAME_PARSERS: Dict[str, re.Pattern] = {
-    "1_error_rate_sweep":              re.compile(rf"^pin_(?P<pinning>on|off)_(?P<error_rate>1e-\d+)_{TRACE}"),
-    "2_retirement_threshold":          _RETIRE_RE,
-    "2_retirement_threshold_only2":    _RETIRE_RE,
-    "2_retirement_threshold_only32":   _RETIRE_RE,
-    "2_retirement_threshold_4_8_16":   _RETIRE_RE,
-    "3_error_way_capacity":            re.compile(rf"^errway_(?P<allocated_error_ways>\d+)w_(?P<error_rate>1e-\d+)_{TRACE}"),
-    "4_llc_size_baseline":             re.compile(rf"^llc_baseline_(?P<llc_size_mb>\d+)MB_{TRACE}"),
-    "5_llc_size_sensitivity":          re.compile(rf"^llc_(?P<llc_size_mb>\d+)MB_(?P<error_rate>1e-\d+)_{TRACE}"),
-    "6_llc_way_sweep":                 re.compile(rf"^sweep_(?P<llc_size_mb>\d+)MB_w(?P<allocated_error_ways>\d+)_(?P<error_rate>1e-\d+)_{TRACE}"),
-    "7_no_error_way_sweep":            re.compile(rf"^noerr_(?P<llc_size_mb>\d+)MB_w(?P<llc_ways>\d+)_{TRACE}"),
+CONFIG_ROOT = os.path.join(BASE_DIR, "sim_configs", "normal_evaluation")
+
+TRACE_RE = re.compile(r"^\d+\.[A-Za-z0-9_]+-\d+B$")
+RATE_TOKEN_RE = re.compile(r"(?:^|_)(1e-\d+)(?=_|$)")
+LLC_SIZE_TOKEN_RE = re.compile(r"(?:^|_)(\d+)MB(?=_|$)")
+
+EPM = "error_page_manager."
+
+
+def _token(pattern: re.Pattern, executable: str, convert=str):
+    m = pattern.search(executable)
+    return convert(m.group(1)) if m else None
+
+
+def _retirement_threshold(config: Dict[str, object]):
+    # pinning OFF retires pages through the baseline (page-offline) threshold
+    if config.get(EPM + "cache_pinning"):
+        return config.get(EPM + "retirement_threshold")
+    return config.get(EPM + "baseline_retirement_threshold")
+
+
+CONFIG_COLUMNS: Dict[str, Callable[[str, Dict[str, object]], object]] = {
+    "pinning":              lambda exe, config: "on" if config.get(EPM + "cache_pinning") else "off",
+    "retirement_threshold": lambda exe, config: _retirement_threshold(config),
+    "allocated_error_ways": lambda exe, config: config.get(EPM + "max_error_ways_per_set"),
+    "llc_ways":             lambda exe, config: config.get("LLC.ways"),
+    "error_rate":           lambda exe, config: _token(RATE_TOKEN_RE, exe),
+    "llc_size_mb":          lambda exe, config: _token(LLC_SIZE_TOKEN_RE, exe, int),
 }
 
 WORKLOAD_RE = re.compile(r"^(\d+\.\w+)")  # matches "602.gcc_s" — stops at "-" before the simpoint count
 
 
 # ---------------------------------------------------------------------------
-# Metric regexes — same patterns the figure scripts use, kept in one place.
+# Metric columns — read by the registry the figure scripts share
+# (simtools.results.stats), mapped onto this workbook's column names.
 # ---------------------------------------------------------------------------
 
-RE_ROI = re.compile(r"CPU 0 cumulative IPC:\s+([\d.]+)\s+instructions:\s+(\d+)\s+cycles:\s+(\d+)")
-RE_BR = re.compile(r"CPU 0 Branch Prediction Accuracy:\s+([\d.]+)%\s+MPKI:\s+([\d.]+)")
-RE_LLC_LOAD = re.compile(r"cpu0->LLC LOAD\s+ACCESS:\s+(\d+)\s+HIT:\s+(\d+)\s+MISS:\s+(\d+)")
-RE_LLC_TOTAL = re.compile(r"cpu0->LLC TOTAL\s+ACCESS:\s+(\d+)\s+HIT:\s+(\d+)\s+MISS:\s+(\d+)")
-RE_ROW_BUFFER_MISS = re.compile(r"ROW_BUFFER_MISS:\s+(\d+)")
-RE_PAGE_SIZE = re.compile(r"Page size:\s+(\d+)")
-
-# Error model
-RE_ERR_INTERVAL = re.compile(r"Error cycle interval:\s+(\d+)\s+cycles")
-RE_ERR_PER_INT = re.compile(r"Errors per interval:\s+(\d+)")
-RE_TOTAL_ERR = re.compile(r"Total Error Accesses:\s+(\d+)")
-RE_TOTAL_DRAM_ERROR_EVENTS = re.compile(r"\[ERROR\]\s+Total DRAM Error Events:\s+(\d+)")
-RE_TOTAL_KNOWN = re.compile(r"Total Known Error Addresses:\s+(\d+)")
-RE_BASELINE_RETIRE = re.compile(r"Baseline Retirement Threshold:\s+(\d+)")
-RE_BASELINE_PAGES = re.compile(r"Baseline Page Retirements:\s+(\d+)")
-RE_ERROR_THRESH = re.compile(r"\[ERROR\]\s+Retirement Threshold:\s+(\d+)")
-RE_ERROR_PAGES_NTH = re.compile(r"\[ERROR\]\s+Page Retirements \(\d+(?:th|st|nd|rd) err\):\s+(\d+)")
-RE_ERROR_PAGES_RETIRED = re.compile(r"\[ERROR\]\s+Pages Retired:\s+(\d+)")
-
-# LLC error-way bookkeeping (only emitted when pinning is ON)
-RE_ALLOC = re.compile(r"\[LLC\]\s+Allocated Error Ways per Set:\s+(\d+)")
-RE_MAX = re.compile(r"\[LLC\]\s+Max Error Ways per Set:\s+(\d+)")
-RE_TOTAL_SLOTS = re.compile(r"\[LLC\]\s+Total Error Way Slots:\s+(\d+)")
-RE_USED_SLOTS = re.compile(r"\[LLC\]\s+Used Slots:\s+(\d+)\s+\(([\d.]+)%\)")
-RE_UNUSED_SLOTS = re.compile(r"\[LLC\]\s+Unused Slots:\s+(\d+)\s+\(([\d.]+)%\)")
-RE_EW_HITS = re.compile(r"\[LLC\]\s+Error Way Hits:\s+(\d+)")
-RE_EW_FILLS = re.compile(r"\[LLC\]\s+Error Way Fills.*?:\s+(\d+)")
-RE_EW_HITRATE = re.compile(r"\[LLC\]\s+Error Way Hit Rate:\s+([\d.]+)%")
-RE_EW_EVICT = re.compile(r"\[LLC\]\s+Error Way Evictions.*?:\s+(\d+)")
-RE_PINNED = re.compile(r"\[LLC\]\s+Pinned in Error Way:\s+(\d+)\s+\(([\d.]+)%\)")
-RE_IN_NORMAL_WAY = re.compile(r"\[LLC\]\s+In Normal Way \(unprotected\):\s+(\d+)")
-RE_NOT_IN_LLC = re.compile(r"\[LLC\]\s+Not in LLC \(DRAM exposed\):\s+(\d+)")
-
-# Pinning OFF: Baseline Protection Coverage block (only in 2_retirement_threshold_*
-# subsidiary dirs — the simulator added this block in newer reruns).
-RE_BASELINE_RETIRED = re.compile(r"\[LLC\]\s+Retired \(page offline\):\s+(\d+)\s+\(([\d.]+)%\)")
-RE_BASELINE_LIVE = re.compile(r"\[LLC\]\s+Live \(still tracked\):\s+(\d+)")
+sys.path.insert(0, BASE_DIR)
+import pandas as pd  # noqa: E402
+
+from simtools.results import cpu_value, parse_many, parsed, refresh  # noqa: E402
+from simtools.results.configs import ConfigIndex  # noqa: E402
+from simtools.results.export import (build_tables, header_row, open_workbook, save_workbook,  # noqa: E402
+                                     write_parquet, write_sheet)
+from simtools.results.frame import METRIC_DTYPES  # noqa: E402
+
+METRIC_COLUMNS = {
+    "ipc": "ipc",
+    "instructions": "instructions",
+    "cycles": "cycles",
+    "branch_accuracy_pct": "branch_accuracy_pct",
+    "branch_mpki": "branch_mpki",
+    "llc_load_access": "llc_load_access",
+    "llc_load_hit": "llc_load_hit",
+    "llc_load_miss": "llc_load_miss",
+    "llc_total_access": "llc_access",
+    "llc_total_hit": "llc_hit",
+    "llc_total_miss": "llc_miss",
+    "page_size_bytes": "page_size",
+    # error model
+    "error_cycle_interval": "error_cycle_interval",
+    "errors_per_interval": "errors_per_interval",
+    "total_error_accesses": "total_error_accesses",
+    "total_dram_error_events": "total_dram_errors",
+    "total_known_error_addresses": "total_known_errors",
+    "baseline_retirement_threshold": "baseline_retirement_threshold",
+    "baseline_page_retirements": "baseline_page_retirements",
+    "error_retirement_threshold": "retire_threshold",
+    "page_retirements_nth_err": "page_retirements",
+    "pages_retired": "pages_retired",
+    # LLC error-way bookkeeping (only emitted when pinning is ON)
+    "allocated_error_ways_per_set": "err_way_alloc",
+    "max_error_ways_per_set": "err_way_max",
+    "total_error_way_slots": "err_way_total_slots",
+    "used_slots": "err_way_used",
+    "used_slots_pct": "err_way_used_pct",
+    "unused_slots": "err_way_unused",
+    "unused_slots_pct": "err_way_unused_pct",
+    "error_way_hits": "err_way_hits",
+    "error_way_fills": "err_way_fills",
+    "error_way_hit_rate_pct": "err_way_hit_rate",
+    "error_way_evictions": "err_way_evictions",
+    "pinned_in_error_way": "pinned_count",
+    "pinned_in_error_way_pct": "pinned_pct",
+    "in_normal_way_unprotected": "in_normal_way",
+    "not_in_llc_dram_exposed": "not_in_llc",
+    # Pinning OFF: Baseline Protection Coverage block (only in 2_retirement_threshold_*
+    # subsidiary dirs — the simulator added this block in newer reruns).
+    "baseline_retired_count_page_offline": "pin_off_retired_count",
+    "baseline_retired_pct_page_offline": "pin_off_retired_pct",
+    "baseline_live_still_tracked": "pin_off_live_count",
+}
+
+# The type of each typed column: integer columns stay integers (nullable) where
+# some runs lack them, rather than becoming floats
+COLUMN_DTYPES = {column: METRIC_DTYPES[field] for column, field in METRIC_COLUMNS.items() if METRIC_DTYPES.get(field)}
+COLUMN_DTYPES.update({name: "Int64" for name in (
+    "retirement_threshold", "allocated_error_ways", "llc_ways", "llc_size_mb", "retired_lines_inferred")})
 
 
 # ---------------------------------------------------------------------------
@@ -147,7 +196,7 @@ DERIVED_PROTECTION_COLS = [
 class ExperimentSpec:
     dirname: str               # subdir under results/normal_evaluation/
     sheet: str                 # sheet name (<=31 chars)
-    config_cols: List[str]     # config columns from the filename (in display order)
+    config_cols: List[str]     # columns of CONFIG_COLUMNS (in display order)
     metric_cols: List[str]     # metric columns (in display order)
     sort_keys: List[str]       # columns to sort by inside the sheet
     summary: str               # one-line description used on the Definitions sheet
@@ -245,12 +294,12 @@ EXPERIMENTS: List[ExperimentSpec] = [
 GLOSSARY: List[Tuple[str, str, str]] = [
     # (column, units / type, description)
 
-    # --- configuration columns (from filename) ---
+    # --- configuration columns (from the binary's sim_configs entry) ---
     ("pinning",                "on / off",  "LLC Cache Pinning state. 'on' = error lines pinned into reserved high-index ways; 'off' = conventional LLC."),
     ("retirement_threshold",   "int",       "Page-offline retirement threshold (errors-per-page before the page is retired). In 2_retirement_threshold; with pinning=off, thr=2 is the 'Conventional Page Offline' baseline."),
     ("error_rate",             "string",    "Per-access DRAM error injection rate. '1e-5' is benign, '1e-8' is harsh (see Mean-Time-Between-CE column in Definitions)."),
     ("allocated_error_ways",   "int",       "Number of LLC ways reserved for error data (used by 3_error_way_capacity and 6_llc_way_sweep)."),
-    ("llc_size_mb",            "MB",        "LLC total capacity for this run."),
+    ("llc_size_mb",            "MB",        "Nominal LLC capacity the binary is named after (in 7_no_error_way_sweep, the LLC keeps that size's sets and varies its ways)."),
     ("llc_ways",               "int",       "LLC associativity (only set in 7_no_error_way_sweep, where 'w<n>' means ways, not error ways)."),
 
     # --- per-run identity ---
@@ -325,138 +374,32 @@ GLOSSARY_KEYS = {row[0] for row in GLOSSARY}
 # Parsing helpers
 # ---------------------------------------------------------------------------
 
-def _last(rx: re.Pattern, text: str):
-    """Sim output is duplicated (mid-run + end-of-ROI dumps); always take the last match."""
-    matches = list(rx.finditer(text))
-    return matches[-1] if matches else None
-
-
 def parse_result_file(path: str) -> Dict[str, object]:
     """Pull every column listed in GLOSSARY (where present) out of one .txt result."""
-    with open(path, "r", errors="replace") as f:
-        text = f.read()
+    return result_columns(parsed(path))
 
+
+def result_columns(stats: Dict[str, object]) -> Dict[str, object]:
+    """The GLOSSARY columns (where present) of one result's parsed values.
+
+    Sim output is duplicated (mid-run + end-of-ROI dumps); the registry keeps the
+    last value of each metric.
+    """
     out: Dict[str, object] = {}
-    out["panic"] = "Simulation CPU 0 panic" in text
-
-    m = _last(RE_ROI, text)
-    if m:
-        out["ipc"] = float(m.group(1))
-        out["instructions"] = int(m.group(2))
-        out["cycles"] = int(m.group(3))
-
-    m = _last(RE_BR, text)
-    if m:
-        out["branch_accuracy_pct"] = float(m.group(1))
-        out["branch_mpki"] = float(m.group(2))
-
-    m = _last(RE_LLC_LOAD, text)
-    if m:
-        out["llc_load_access"] = int(m.group(1))
-        out["llc_load_hit"] = int(m.group(2))
-        out["llc_load_miss"] = int(m.group(3))
-
-    m = _last(RE_LLC_TOTAL, text)
-    if m:
-        out["llc_total_access"] = int(m.group(1))
-        out["llc_total_hit"] = int(m.group(2))
-        out["llc_total_miss"] = int(m.group(3))
+    out["panic"] = 0 in stats.get("panic", {})
+    for column, field in METRIC_COLUMNS.items():
+        value = cpu_value(stats, field)
+        if value is not None:
+            out[column] = value
 
     if out.get("instructions") and out.get("llc_load_miss") is not None:
         out["llc_load_mpki"] = out["llc_load_miss"] * 1000.0 / out["instructions"]
 
     if out.get("instructions"):
-        rb_misses = sum(int(x) for x in RE_ROW_BUFFER_MISS.findall(text))
+        rb_misses = stats.get("row_buffer_misses", 0)
         if rb_misses > 0:
             out["rbmpki"] = rb_misses * 1000.0 / out["instructions"]
 
-    m = _last(RE_PAGE_SIZE, text)
-    if m:
-        out["page_size_bytes"] = int(m.group(1))
-
-    # error model
-    m = _last(RE_ERR_INTERVAL, text)
-    if m:
-        out["error_cycle_interval"] = int(m.group(1))
-    m = _last(RE_ERR_PER_INT, text)
-    if m:
-        out["errors_per_interval"] = int(m.group(1))
-    m = _last(RE_TOTAL_ERR, text)
-    if m:
-        out["total_error_accesses"] = int(m.group(1))
-    m = _last(RE_TOTAL_DRAM_ERROR_EVENTS, text)
-    if m:
-        out["total_dram_error_events"] = int(m.group(1))
-    m = _last(RE_TOTAL_KNOWN, text)
-    if m:
-        out["total_known_error_addresses"] = int(m.group(1))
-
-    m = _last(RE_BASELINE_RETIRE, text)
-    if m:
-        out["baseline_retirement_threshold"] = int(m.group(1))
-    m = _last(RE_BASELINE_PAGES, text)
-    if m:
-        out["baseline_page_retirements"] = int(m.group(1))
-    m = _last(RE_ERROR_THRESH, text)
-    if m:
-        out["error_retirement_threshold"] = int(m.group(1))
-    m = _last(RE_ERROR_PAGES_NTH, text)
-    if m:
-        out["page_retirements_nth_err"] = int(m.group(1))
-    m = _last(RE_ERROR_PAGES_RETIRED, text)
-    if m:
-        out["pages_retired"] = int(m.group(1))
-
-    # error-way bookkeeping
-    m = _last(RE_ALLOC, text)
-    if m:
-        out["allocated_error_ways_per_set"] = int(m.group(1))
-    m = _last(RE_MAX, text)
-    if m:
-        out["max_error_ways_per_set"] = int(m.group(1))
-    m = _last(RE_TOTAL_SLOTS, text)
-    if m:
-        out["total_error_way_slots"] = int(m.group(1))
-    m = _last(RE_USED_SLOTS, text)
-    if m:
-        out["used_slots"] = int(m.group(1))
-        out["used_slots_pct"] = float(m.group(2))
-    m = _last(RE_UNUSED_SLOTS, text)
-    if m:
-        out["unused_slots"] = int(m.group(1))
-        out["unused_slots_pct"] = float(m.group(2))
-    m = _last(RE_EW_HITS, text)
-    if m:
-        out["error_way_hits"] = int(m.group(1))
-    m = _last(RE_EW_FILLS, text)
-    if m:
-        out["error_way_fills"] = int(m.group(1))
-    m = _last(RE_EW_HITRATE, text)
-    if m:
-        out["error_way_hit_rate_pct"] = float(m.group(1))
-    m = _last(RE_EW_EVICT, text)
-    if m:
-        out["error_way_evictions"] = int(m.group(1))
-    m = _last(RE_PINNED, text)
-    if m:
-        out["pinned_in_error_way"] = int(m.group(1))
-        out["pinned_in_error_way_pct"] = float(m.group(2))
-    m = _last(RE_IN_NORMAL_WAY, text)
-    if m:
-        out["in_normal_way_unprotected"] = int(m.group(1))
-    m = _last(RE_NOT_IN_LLC, text)
-    if m:
-        out["not_in_llc_dram_exposed"] = int(m.group(1))
-
-    # Pin OFF Baseline Protection Coverage block (subsidiary 2_retirement_threshold_* dirs)
-    m = _last(RE_BASELINE_RETIRED, text)
-    if m:
-        out["baseline_retired_count_page_offline"] = int(m.group(1))
-        out["baseline_retired_pct_page_offline"] = float(m.group(2))
-    m = _last(RE_BASELINE_LIVE, text)
-    if m:
-        out["baseline_live_still_tracked"] = int(m.group(1))
-
     # --- derived columns (fig9 protected_lines_pct) -------------------------
     pinned = out.get("pinned_in_error_way")
     live = out.get("total_known_error_addresses")
@@ -478,38 +421,18 @@ def parse_result_file(path: str) -> Dict[str, object]:
     return out
 
 
-def _coerce_config_value(key: str, raw: str):
-    """Numeric config fields stay numeric; rate-like fields stay as strings for filter clarity."""
-    if key == "error_rate":
-        return raw
-    if key == "pinning":
-        return raw
-    try:
-        return int(raw)
-    except ValueError:
-        try:
-            return float(raw)
-        except ValueError:
-            return raw
-
-
-def parse_experiment(exp: ExperimentSpec) -> List[Dict[str, object]]:
-    parser = FILENAME_PARSERS[exp.dirname]
+def experiment_files(exp: ExperimentSpec, index: ConfigIndex) -> Tuple[List[Dict[str, object]], List[str]]:
+    """The identity and configuration columns of each result file of an experiment, and its path."""
     d = os.path.join(RESULTS_ROOT, exp.dirname)
     rows: List[Dict[str, object]] = []
-    if not os.path.isdir(d):
-        print(f"[skip] missing dir: {d}", file=sys.stderr)
-        return rows
-
+    paths: List[str] = []
     for fn in sorted(os.listdir(d)):
         if not fn.endswith(".txt") or fn == "run_log.txt":
             continue
-        m = parser.match(fn)
-        if not m:
+        executable, trace = index.split(fn)
+        if executable is None or not TRACE_RE.match(trace):
             print(f"[warn] unrecognized filename: {exp.dirname}/{fn}", file=sys.stderr)
             continue
-        parts = m.groupdict()
-        trace = parts.pop("trace")
         wm = WORKLOAD_RE.match(trace)
         workload = wm.group(1) if wm else trace
 
@@ -518,17 +441,30 @@ def parse_experiment(exp: ExperimentSpec) -> List[Dict[str, object]]:
             "trace": trace,
             "filename": fn,
         }
-        for k, v in parts.items():
-            row[k] = _coerce_config_value(k, v)
+        config = index[executable].config
+        for col in exp.config_cols:
+            row[col] = CONFIG_COLUMNS[col](executable, config)
 
-        row.update(parse_result_file(os.path.join(d, fn)))
         rows.append(row)
+        paths.append(os.path.join(d, fn))
+    return rows, paths
+
 
+def experiment_table(task: Tuple[ExperimentSpec, List[Dict[str, object]], List[str]]) -> "pd.DataFrame":
+    """The sheet of an experiment: its rows of experiment_files, with the
+    metrics of each result read from the cache, in the sheet's columns and order."""
+    exp, rows, paths = task
+    for row, result in zip(rows, parse_many(paths)):
+        if result.error is not None:
+            print(f"[warn] unreadable result: {exp.dirname}/{row['filename']}: {result.error}", file=sys.stderr)
+            continue
+        row.update(result_columns(result.values))
+
+    columns = exp.config_cols + exp.metric_cols
+    table = pd.DataFrame.from_records(rows, columns=columns)
+    table = table.astype({col: COLUMN_DTYPES[col] for col in columns if col in COLUMN_DTYPES})
     # stable sort by the experiment's sort keys
-    def sort_key(r):
-        return tuple((r.get(k) is None, r.get(k)) for k in exp.sort_keys)
-    rows.sort(key=sort_key)
-    return rows
+    return table.sort_values(exp.sort_keys, na_position="last", kind="stable", ignore_index=True)
 
 
 # ---------------------------------------------------------------------------
@@ -543,113 +479,109 @@ MTBCE_TABLE = [
 ]
 
 
-def build_xlsx(out_path: str) -> int:
-    try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Alignment, Font, PatternFill
-        from openpyxl.utils import get_column_letter
-    except ImportError:
-        print("openpyxl not installed. Install with: pip install openpyxl", file=sys.stderr)
-        return 1
+# Number formats of the sheets' columns (the Parquet files keep full values)
+FORMATS = {"ipc": "0.0000", "branch_mpki": "0.000", "llc_load_mpki": "0.000", "rbmpki": "0.000",
+           "protected_lines_pct": "0.00"}
+
 
-    wb = Workbook()
+def write_definitions(wb, tables: Dict[str, "pd.DataFrame"]) -> None:
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Font
+
+    defs = wb.create_sheet("Definitions")
     title_font = Font(bold=True, size=12)
     section_font = Font(bold=True, color="333333")
-    header_font = Font(bold=True)
-    header_fill = PatternFill("solid", fgColor="E8EDF5")
     wrap = Alignment(vertical="top", wrap_text=True)
 
-    # ---- Definitions sheet -----------------------------------------------
-    defs = wb.active
-    defs.title = "Definitions"
+    def row(*values, font=None):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(defs, value=value)
+            cell.alignment = wrap
+            if font is not None:
+                cell.font = font
+            cells.append(cell)
+        defs.append(cells)
+
+    def header(*names):
+        cells = header_row(defs, names)
+        for cell in cells:
+            cell.alignment = wrap
+        defs.append(cells)
+
+    defs.column_dimensions["A"].width = 34
+    defs.column_dimensions["B"].width = 22
+    defs.column_dimensions["C"].width = 110
+    defs.freeze_panes = "A2"
 
-    defs.append(["normal_evaluation raw data — column glossary"])
-    defs["A1"].font = title_font
+    row("normal_evaluation raw data — column glossary", font=title_font)
     defs.append([])
 
-    defs.append(["Experiments (one sheet per row)"])
-    defs.cell(row=defs.max_row, column=1).font = section_font
-    defs.append(["sheet", "results subdirectory", "what's in it"])
-    for cell in defs[defs.max_row]:
-        cell.font = header_font
-        cell.fill = header_fill
+    row("Experiments (one sheet per row)", font=section_font)
+    header("sheet", "results subdirectory", "what's in it")
     for exp in EXPERIMENTS:
-        d = os.path.join(RESULTS_ROOT, exp.dirname)
-        if not os.path.isdir(d):
-            continue
-        n_files = sum(1 for x in os.listdir(d) if x.endswith(".txt") and x != "run_log.txt")
-        if n_files == 0:
-            continue
-        defs.append([exp.sheet, f"results/normal_evaluation/{exp.dirname}/", exp.summary])
+        if exp.sheet in tables:
+            row(exp.sheet, f"results/normal_evaluation/{exp.dirname}/", exp.summary)
 
     defs.append([])
-    defs.append(["Error rate → Mean Time Between CEs"])
-    defs.cell(row=defs.max_row, column=1).font = section_font
-    defs.append(["error_rate", "MTBCE (trace timeline)", "rate (errors/hour)"])
-    for cell in defs[defs.max_row]:
-        cell.font = header_font
-        cell.fill = header_fill
+    row("Error rate → Mean Time Between CEs", font=section_font)
+    header("error_rate", "MTBCE (trace timeline)", "rate (errors/hour)")
     for rate, mtbce, per_hour in MTBCE_TABLE:
-        defs.append([rate, mtbce, per_hour])
+        row(rate, mtbce, per_hour)
 
     defs.append([])
-    defs.append(["Column glossary"])
-    defs.cell(row=defs.max_row, column=1).font = section_font
-    defs.append(["column", "units / type", "meaning"])
-    for cell in defs[defs.max_row]:
-        cell.font = header_font
-        cell.fill = header_fill
+    row("Column glossary", font=section_font)
+    header("column", "units / type", "meaning")
     for name, units, desc in GLOSSARY:
-        defs.append([name, units, desc])
+        row(name, units, desc)
 
-    defs.column_dimensions["A"].width = 34
-    defs.column_dimensions["B"].width = 22
-    defs.column_dimensions["C"].width = 110
-    for row in defs.iter_rows(min_row=1):
-        for cell in row:
-            cell.alignment = wrap
-    defs.freeze_panes = "A2"
 
-    # ---- One sheet per experiment ----------------------------------------
+def export(jobs: Optional[int] = 1, xlsx: bool = True) -> int:
+    index = ConfigIndex.build(CONFIG_ROOT)
+    tasks = []
     for exp in EXPERIMENTS:
         if not os.path.isdir(os.path.join(RESULTS_ROOT, exp.dirname)):
             print(f"[skip] missing dir: results/normal_evaluation/{exp.dirname}", file=sys.stderr)
             continue
-        rows = parse_experiment(exp)
+        rows, paths = experiment_files(exp, index)
         if not rows:
             print(f"[skip] empty dir: results/normal_evaluation/{exp.dirname}", file=sys.stderr)
             continue
-        ws = wb.create_sheet(exp.sheet[:31])
-
-        columns = exp.config_cols + exp.metric_cols
         # warn on any unknown column (would mean a glossary gap)
-        for col in columns:
+        for col in exp.config_cols + exp.metric_cols:
             if col not in GLOSSARY_KEYS:
                 print(f"[warn] {exp.sheet}: column '{col}' not in Definitions glossary", file=sys.stderr)
+        tasks.append((exp, rows, paths))
 
-        ws.append(columns)
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-
-        for r in rows:
-            ws.append([r.get(c) for c in columns])
+    n = refresh([path for _, _, paths in tasks for path in paths], jobs=jobs)
+    print(f"Parsed {n} new or changed result files")
+    tables = dict(zip([exp.sheet for exp, _, _ in tasks], build_tables(experiment_table, tasks, jobs)))
+    write_parquet(tables, OUT_PARQUET)
+    print(f"Wrote {OUT_PARQUET}/ ({len(tables)} tables)")
+    if not xlsx:
+        return 0
 
-        for col_idx, name in enumerate(columns, start=1):
-            ws.column_dimensions[get_column_letter(col_idx)].width = max(12, min(28, len(name) + 2))
-
-        ws.freeze_panes = "A2"
-        last_col_letter = get_column_letter(len(columns))
-        ws.auto_filter.ref = f"A1:{last_col_letter}{1 + len(rows)}"
-
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    wb.save(out_path)
-    print(f"Wrote {out_path}")
+    try:
+        wb = open_workbook()
+    except ImportError:
+        print("openpyxl not installed. Install with: pip install openpyxl", file=sys.stderr)
+        return 1
+    write_definitions(wb, tables)
+    for sheet, table in tables.items():
+        write_sheet(wb, sheet, table, formats=FORMATS)
+    save_workbook(wb, OUT_XLSX)
+    print(f"Wrote {OUT_XLSX}")
     return 0
 
 
 def main() -> int:
-    return build_xlsx(OUT_XLSX)
+    parser = argparse.ArgumentParser(description="Dump raw normal_evaluation metrics into Parquet and one XLSX")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes parsing the result files and building the sheets (0: one per CPU)")
+    parser.add_argument("--no-xlsx", action="store_true",
+                        help="Write the Parquet files only")
+    args = parser.parse_args()
+    return export(jobs=args.jobs or None, xlsx=not args.no_xlsx)
 
 
 if __name__ == "__main__":
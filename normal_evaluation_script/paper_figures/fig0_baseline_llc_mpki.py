@@ -32,6 +32,13 @@ SUITES = ["SPEC", "GAP"]
 SUITE_COLOR = {"SPEC": "#2E6FDB", "GAP": "#E5487E"}
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_{size}_w{ways}",
+     "axes": {"size": ["2MB"], "ways": [16]}, "suites": ["SPEC", "GAP"]},
+]
+
+
 def short_name(workload):
     m = re.match(r"^\d+\.([A-Za-z0-9]+?)(?:_s)?$", workload)
     return m.group(1) if m else workload
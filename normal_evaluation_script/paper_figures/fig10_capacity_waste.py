@@ -41,6 +41,15 @@ COLOR_PIN = "#2E6FDB"
 COLOR_OFFLINE = "#E5487E"
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["on"], "threshold": [32], "rate": ["1e-5", "1e-6", "1e-7", "1e-8"]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["off"], "threshold": [2], "rate": ["1e-5", "1e-6", "1e-7", "1e-8"]}, "suites": ["SPEC", "GAP"]},
+]
+
+
 def load_sweep():
     df = load_xlsx_sheet("Threshold sweep")
     out = {}
@@ -35,6 +35,13 @@ SUITES = ["SPEC", "GAP"]
 SUITE_COLOR = {"SPEC": "#2E6FDB", "GAP": "#E5487E"}
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_{size}_w{ways}",
+     "axes": {"size": ["2MB"], "ways": [8, 9, 10, 11, 12, 13, 14, 15, 16]}, "suites": ["SPEC", "GAP"]},
+]
+
+
 def setup_style():
     rcParams.update({
         "font.family": "sans-serif",
@@ -63,6 +63,17 @@ RATE_STYLE = {
 }
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_{size}_w{ways}",
+     "axes": {"size": ["2MB"], "ways": [16]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["on", "off"], "threshold": [2, 4, 8, 16, 32], "rate": ["1e-5", "1e-6", "1e-7", "1e-8"]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["on", "off"], "threshold": [256], "rate": ["1e-8"]}, "suites": ["SPEC"]},
+]
+
+
 def setup_style():
     rcParams.update({
         "font.family": "sans-serif",
@@ -18,6 +18,7 @@ Output: fig12c_ue_vulnerable_lines_thr256.{csv,png,pdf}
 
 import os
 import re
+import sys
 
 import numpy as np
 import matplotlib.pyplot as plt
@@ -42,11 +43,8 @@ TRACES = [
     "654.roms_s-1007B",
 ]
 
-RE_TOTAL_KNOWN = re.compile(r"Total Known Error Addresses:\s+(\d+)")
-RE_NOT_IN_LLC = re.compile(r"Not in LLC \(DRAM exposed\):\s+(\d+)")
-RE_IN_NORMAL = re.compile(r"In Normal Way \(unprotected\):\s+(\d+)")
-RE_LIVE = re.compile(r"Live \(still tracked\):\s+(\d+)")
-RE_COMPLETE = re.compile(r"Simulation complete")
+sys.path.insert(0, CHAMPSIM_DIR)
+from simtools.results import parsed  # noqa: E402
 
 COLOR_ON = "#2E6FDB"
 COLOR_OFF = "#E5487E"
@@ -54,6 +52,13 @@ EDGE = "black"
 FLOOR = 0.6  # log-scale placeholder height for a true 0
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["on", "off"], "threshold": [256], "rate": ["1e-8"]}, "suites": ["SPEC"]},
+]
+
+
 def setup_style():
     rcParams.update({
         "font.family": "sans-serif",
@@ -71,25 +76,19 @@ def short(trace):
 
 def read(path):
     try:
-        with open(path, "r", errors="replace") as f:
-            return f.read()
+        return parsed(path)
     except OSError:
-        return None
+        return {}
 
 
 def exposed_counts(trace):
-    on_txt = read(os.path.join(DATA_DIR, f"retire_on_{THR}_{RATE}_{trace}.txt"))
-    off_txt = read(os.path.join(DATA_DIR, f"retire_off_{THR}_{RATE}_{trace}.txt"))
+    on = read(os.path.join(DATA_DIR, f"retire_on_{THR}_{RATE}_{trace}.txt"))
+    off = read(os.path.join(DATA_DIR, f"retire_off_{THR}_{RATE}_{trace}.txt"))
     on_exp = off_exp = None
-    if on_txt and RE_COMPLETE.search(on_txt):
-        nil = RE_NOT_IN_LLC.search(on_txt)
-        nin = RE_IN_NORMAL.search(on_txt)
-        if nil and nin:
-            on_exp = int(nil.group(1)) + int(nin.group(1))
-    if off_txt and RE_COMPLETE.search(off_txt):
-        live = RE_LIVE.search(off_txt)
-        if live:
-            off_exp = int(live.group(1))
+    if on.get("complete") and "not_in_llc" in on and "in_normal_way" in on:
+        on_exp = on["not_in_llc"] + on["in_normal_way"]
+    if off.get("complete") and "pin_off_live_count" in off:
+        off_exp = off["pin_off_live_count"]
     return on_exp, off_exp
 
 
@@ -51,6 +51,15 @@ MARKER_COLOR = "#222222"
 WAY_MARKER = {1: "o", 2: "s", 4: "^", 8: "D"}
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_{size}_w{ways}",
+     "axes": {"size": ["2MB"], "ways": [16]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "6_llc_way_sweep", "binary": "sweep_{size}_w{ways}_{rate}",
+     "axes": {"size": ["2MB"], "ways": [1, 2, 4, 8], "rate": ["1e-8"]}, "suites": ["SPEC", "GAP"]},
+]
+
+
 def short_workload_label(workload):
     label = workload.split(".", 1)[1] if "." in workload else workload
     return label[:-2] if label.endswith("_s") else label
@@ -42,6 +42,15 @@ COLOR_PROT = "#d62728"
 EDGE = "black"
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_{size}_w{ways}",
+     "axes": {"size": ["2MB"], "ways": [16]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "6_llc_way_sweep", "binary": "sweep_{size}_w{ways}_{rate}",
+     "axes": {"size": ["2MB"], "ways": [1, 2, 4, 6, 8, 10, 12], "rate": ["1e-8"]}, "suites": ["SPEC", "GAP"]},
+]
+
+
 def setup_style():
     rcParams.update({
         "font.family": "sans-serif",
@@ -58,6 +58,17 @@ PIN_OFF_COLOR = "#d62728"
 PIN_OFF_MARKER = "*"
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_{size}_w{ways}",
+     "axes": {"size": ["2MB"], "ways": [16]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["off"], "threshold": [32], "rate": ["1e-8"]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "6_llc_way_sweep", "binary": "sweep_{size}_w{ways}_{rate}",
+     "axes": {"size": ["2MB"], "ways": [1, 2, 4, 8], "rate": ["1e-8"]}, "suites": ["SPEC", "GAP"]},
+]
+
+
 def short_workload_label(workload):
     label = workload.split(".", 1)[1] if "." in workload else workload
     return label[:-2] if label.endswith("_s") else label
@@ -38,6 +38,14 @@ COLOR_2MB = "#0072B2"
 EDGE = "black"
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"family": "normal_evaluation_0506", "experiment": "baseline", "binary": "champsim_{page}_32gb",
+     "axes": {"page": ["4kb", "2mb"]}},
+    {"experiment": "4_llc_size_baseline", "binary": "llc_baseline_{size}", "axes": {"size": ["2MB"]}},
+]
+
+
 def short_name(workload: str) -> str:
     m = re.match(r"^\d+\.([A-Za-z0-9]+?)(?:_s)?$", workload)
     return m.group(1) if m else workload
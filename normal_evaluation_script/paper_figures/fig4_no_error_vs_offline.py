@@ -48,6 +48,15 @@ COLOR_WASTE = "#222222"
 PAGE_SIZE_MB = 2.0
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_{size}_w{ways}",
+     "axes": {"size": ["2MB"], "ways": [16]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["off"], "threshold": [2], "rate": ["1e-5", "1e-6", "1e-7", "1e-8"]}, "suites": ["SPEC", "GAP"]},
+]
+
+
 def load_capacity_waste():
     """Per-(suite, rate) mean offline capacity waste (MB), from fig10 CSV."""
     if not os.path.isfile(WASTE_CSV):
@@ -57,6 +57,17 @@ COLOR_OFFLINE = "#D55E00"
 EDGE = "black"
 
 
+# The runs this figure is drawn from, for `python3 -m simtools.runner prioritize`
+INPUTS = [
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_{size}_w{ways}",
+     "axes": {"size": ["2MB"], "ways": [16]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["on"], "threshold": [32], "rate": ["1e-5", "1e-6", "1e-7", "1e-8"]}, "suites": ["SPEC", "GAP"]},
+    {"experiment": "2_retirement_threshold", "binary": "retire_{mode}_{threshold}_{rate}",
+     "axes": {"mode": ["off"], "threshold": [2], "rate": ["1e-5", "1e-6", "1e-7", "1e-8"]}, "suites": ["SPEC", "GAP"]},
+]
+
+
 def short_name(workload: str) -> str:
     match = re.match(r"^\d+\.([A-Za-z0-9]+?)(?:_s)?$", workload)
     return match.group(1) if match else workload
@@ -2,7 +2,10 @@
 """
 Generate raw_data.xlsx from results/normal_evaluation/ .txt files.
 
-Output: raw_data.xlsx with three sheets:
+Usage: python3 generate_raw_data.py [--jobs N] [--no-xlsx]
+
+Output: raw_data/<sheet>.parquet, one per sheet (what common_normal's
+load_xlsx_sheet reads first), and raw_data.xlsx with the same sheets:
   - "Threshold sweep"       — 2_retirement_threshold/ (pin_on and pin_off,
                               thresholds 2/4/8/16/32, rates 1e-5..1e-8)
   - "Max error way sweep"   — 6_llc_way_sweep/ filtered to llc_size=2MB
@@ -10,16 +13,24 @@ Output: raw_data.xlsx with three sheets:
                               rates 1e-5..1e-8)
   - "Way sweep in No error" — 7_no_error_way_sweep/ (llc_size 2MB/4MB,
                               llc_ways 8..16)
+  - "Multicore"             — multicore/1_error_rate_sweep/, a row per CPU
+
+The result files that changed since the results cache last read them are
+parsed over --jobs processes first; each sheet is then built by a worker of
+its own from the cache, and the workbook is streamed a row at a time.
 """
 
+import argparse
 import os
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Optional
 
-from openpyxl import Workbook
+import pandas as pd
 
 from common_normal import extract_workload, suite_of
+from simtools.results import cpu_value, parse_many, refresh  # common_normal puts the repo root on sys.path
+from simtools.results.export import build_tables, open_workbook, save_workbook, write_parquet, write_sheet
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 RESULTS_ROOT = os.path.join(SCRIPT_DIR, "results")
@@ -29,6 +40,7 @@ RESULTS_ROOT = os.path.join(SCRIPT_DIR, "results")
 REPO_RESULTS = os.path.normpath(
     os.path.join(SCRIPT_DIR, "..", "..", "results", "normal_evaluation"))
 OUTPUT_XLSX = os.path.join(SCRIPT_DIR, "raw_data.xlsx")
+OUTPUT_PARQUET = os.path.join(SCRIPT_DIR, "raw_data")
 
 
 # Non-SPEC suites live in per-suite suffixed dirs (results tree convention):
@@ -54,27 +66,20 @@ def resolve_sources(base_name, gap_name=None):
     return dirs
 
 
-def iter_result_files(dirs):
-    """Yield (dirpath, filename) for every result dir, sorted by name."""
-    for src in dirs:
-        for fname in sorted(os.listdir(src)):
-            yield src, fname
+def result_files(dirs, match):
+    """(match, path) of every result file whose name matches, dir by dir and
+    sorted by name."""
+    return [(m, os.path.join(src, fname))
+            for src in dirs for fname in sorted(os.listdir(src))
+            for m in (match(fname),) if m]
 
-RE_IPC = re.compile(
-    r"CPU 0 cumulative IPC:\s+([\d.]+)\s+instructions:\s*(\d+)\s+cycles:\s*(\d+)"
-)
-RE_LLC_MISS = re.compile(
-    r"cpu0->LLC TOTAL\s+ACCESS:\s+(\d+)\s+HIT:\s+(\d+)\s+MISS:\s+(\d+)"
-)
-RE_TOTAL_KNOWN_ERR = re.compile(r"Total Known Error Addresses:\s+(\d+)")
-RE_PINNED = re.compile(r"Pinned in Error Way:\s+(\d+)\s+\(([\d.]+)%\)")
-RE_TOTAL_ERRORS = re.compile(r"Total DRAM Error Events:\s+(\d+)")
-RE_PAGES_RETIRED = re.compile(r"Pages Retired:\s+(\d+)")
-RE_BASELINE_PAGE_RETIRED = re.compile(r"Baseline Page Retirements:\s+(\d+)")
-RE_PIN_OFF_RETIRED = re.compile(
-    r"Retired \(page offline\):\s+(\d+)\s+\(([\d.]+)%\)"
-)
-RE_PIN_OFF_LIVE = re.compile(r"Live \(still tracked\):\s+(\d+)")
+
+def iter_results(dirs, match, jobs=1):
+    """Yield (match, parsed result) for every result file whose name matches,
+    dir by dir and sorted by name. Files are parsed over `jobs` processes."""
+    matches = result_files(dirs, match)
+    results = parse_many([path for _, path in matches], jobs=jobs)
+    return zip([m for m, _ in matches], results)
 
 
 @dataclass
@@ -91,48 +96,8 @@ class Metrics:
     pin_off_live_count: Optional[int] = None
 
 
-def _set_int(obj, attr, regex, txt):
-    match = regex.search(txt)
-    if match:
-        setattr(obj, attr, int(match.group(1)))
-
-
-def extract_metrics(path: str) -> Metrics:
-    try:
-        with open(path, "r") as f:
-            txt = f.read()
-    except Exception:
-        return Metrics()
-
-    m = Metrics()
-
-    match = RE_IPC.search(txt)
-    if match:
-        m.ipc = float(match.group(1))
-        m.instructions = int(match.group(2))
-
-    llc_match = RE_LLC_MISS.search(txt)
-    if llc_match:
-        m.llc_miss = int(llc_match.group(3))
-
-    _set_int(m, "total_known_errors", RE_TOTAL_KNOWN_ERR, txt)
-    pinned_match = RE_PINNED.search(txt)
-    if pinned_match:
-        m.pinned_count = int(pinned_match.group(1))
-
-    _set_int(m, "total_dram_errors", RE_TOTAL_ERRORS, txt)
-    _set_int(m, "pages_retired", RE_PAGES_RETIRED, txt)
-
-    baseline_retire_matches = RE_BASELINE_PAGE_RETIRED.findall(txt)
-    if baseline_retire_matches:
-        m.baseline_page_retirements = int(baseline_retire_matches[-1])
-
-    pin_off_match = RE_PIN_OFF_RETIRED.search(txt)
-    if pin_off_match:
-        m.pin_off_retired_count = int(pin_off_match.group(1))
-    _set_int(m, "pin_off_live_count", RE_PIN_OFF_LIVE, txt)
-
-    return m
+def metrics_from(stats: dict) -> Metrics:
+    return Metrics(**{f.name: cpu_value(stats, f.name) for f in fields(Metrics)})
 
 DEFAULT_PIN_ON_MAX_WAY = 8
 
@@ -225,20 +190,21 @@ def threshold_row(m, workload, pin_mode, rate, threshold):
 THRESHOLD_SWEEP_POINTS = {2, 4, 8, 16, 32}
 
 
-def collect_threshold_sweep():
-    dirs = resolve_sources("2_retirement_threshold")
+def _match_threshold_point(fname):
+    match = RE_RETIRE.match(fname)
+    if match and int(match.group("threshold")) in THRESHOLD_SWEEP_POINTS:
+        return match
+    return None
+
+
+def collect_threshold_sweep(jobs=1):
     rows = []
-    for src, fname in iter_result_files(dirs):
-        match = RE_RETIRE.match(fname)
-        if not match:
-            continue
+    for match, result in iter_results(*sheet_sources("Threshold sweep"), jobs):
         pin_mode = match.group("mode")
         threshold = int(match.group("threshold"))
-        if threshold not in THRESHOLD_SWEEP_POINTS:
-            continue
         rate = match.group("rate")
         workload = extract_workload(match.group("trace"))
-        m = extract_metrics(os.path.join(src, fname))
+        m = metrics_from(result.values)
         rows.append(threshold_row(m, workload, pin_mode, rate, threshold))
     rows.sort(key=lambda r: (
         PIN_MODE_ORDER.get(r[1], 99), r[0],
@@ -247,19 +213,20 @@ def collect_threshold_sweep():
     return rows
 
 
-def collect_max_error_way_sweep():
-    dirs = resolve_sources("6_llc_way_sweep")
+def _match_2mb_sweep(fname):
+    match = RE_SWEEP.match(fname)
+    if match and match.group("llc_size") == "2MB":
+        return match
+    return None
+
+
+def collect_max_error_way_sweep(jobs=1):
     rows = []
-    for src, fname in iter_result_files(dirs):
-        match = RE_SWEEP.match(fname)
-        if not match:
-            continue
-        if match.group("llc_size") != "2MB":
-            continue
+    for match, result in iter_results(*sheet_sources("Max error way sweep"), jobs):
         max_way = int(match.group("max_ways"))
         rate = match.group("rate")
         workload = extract_workload(match.group("trace"))
-        m = extract_metrics(os.path.join(src, fname))
+        m = metrics_from(result.values)
         row = threshold_row(m, workload, "on", rate, 32)
         row[4] = max_way
         rows.append(row)
@@ -269,23 +236,34 @@ def collect_max_error_way_sweep():
     return rows
 
 
-def collect_noerr_way_sweep():
-    dirs = resolve_sources("7_no_error_way_sweep")
+def collect_noerr_way_sweep(jobs=1):
     rows = []
-    for src, fname in iter_result_files(dirs):
-        match = RE_NOERR.match(fname)
-        if not match:
-            continue
+    for match, result in iter_results(*sheet_sources("Way sweep in No error"), jobs):
         llc_size = match.group("llc_size")
         ways = int(match.group("ways"))
         workload = extract_workload(match.group("trace"))
-        m = extract_metrics(os.path.join(src, fname))
+        m = metrics_from(result.values)
         rows.append([workload, llc_size, ways, m.ipc, llc_mpki(m),
                      suite_of(workload), m.ipc is not None])
     rows.sort(key=lambda r: (r[1], r[0], r[2]))
     return rows
 
 
+# The result files of each single-core sheet: its experiment, and the file
+# names it keeps
+SOURCES = {
+    "Threshold sweep": ("2_retirement_threshold", _match_threshold_point),
+    "Max error way sweep": ("6_llc_way_sweep", _match_2mb_sweep),
+    "Way sweep in No error": ("7_no_error_way_sweep", RE_NOERR.match),
+}
+
+
+def sheet_sources(sheet):
+    """(dirs, match) of the result files of a single-core sheet."""
+    base_name, match = SOURCES[sheet]
+    return resolve_sources(base_name), match
+
+
 # ── Multicore sheet (4-core SPEC mixes, results/multicore/1_error_rate_sweep) ──
 # One row per (mix, scheme, cpu); mix-level metrics (weighted_speedup, sum_ipc,
 # retirement totals) are repeated on each of the mix's four rows for easy
@@ -312,13 +290,6 @@ MULTICORE_MIXES = {
 MULTICORE_MIX_ORDER = ["M1", "M2", "M3", "M4", "C1", "C2", "C3", "C4", "H1", "H2"]
 MULTICORE_NUM_CPUS = 4
 
-RE_MC_CPU_IPC = re.compile(
-    r"^CPU (?P<cpu>\d) cumulative IPC:\s+(?P<ipc>[\d.]+)\s+instructions:\s*(?P<instr>\d+)")
-RE_MC_COMPLETE = re.compile(r"^Simulation complete CPU (?P<cpu>\d)")
-RE_MC_PERCPU_ERR = re.compile(
-    r"\[ERROR\]\s+CPU (?P<cpu>\d): absorbed=(?P<absorbed>\d+) first=\d+ added=\d+ "
-    r"known=\d+ retired=(?P<retired>\d+) baseline_retired=(?P<bretired>\d+)")
-
 MULTICORE_HEADER = [
     "mix", "scheme", "pin_mode", "error_rate", "cpu", "workload",
     "ipc", "norm_ipc", "weighted_speedup", "sum_ipc",
@@ -327,54 +298,40 @@ MULTICORE_HEADER = [
 ]
 
 
-def parse_multicore_run(path):
+def multicore_run(stats):
     """Last-match per-CPU IPC (ROI block), completion, and error stats."""
-    run = {"ipc": {}, "complete": set(), "absorbed": {}, "retired_cpu": {},
-           "total_errors": None, "pages_retired": None, "baseline_retired": None}
-    try:
-        with open(path, errors="replace") as f:
-            for line in f:
-                m = RE_MC_CPU_IPC.match(line)
-                if m:
-                    run["ipc"][int(m.group("cpu"))] = float(m.group("ipc"))
-                    continue
-                m = RE_MC_COMPLETE.match(line)
-                if m:
-                    run["complete"].add(int(m.group("cpu")))
-                    continue
-                m = RE_MC_PERCPU_ERR.search(line)
-                if m:
-                    c = int(m.group("cpu"))
-                    run["absorbed"][c] = int(m.group("absorbed"))
-                    run["retired_cpu"][c] = (int(m.group("retired"))
-                                             + int(m.group("bretired")))
-                    continue
-                for key, rx in (("total_errors", RE_TOTAL_ERRORS),
-                                ("pages_retired", RE_PAGES_RETIRED)):
-                    m2 = rx.search(line)
-                    if m2:
-                        run[key] = int(m2.group(1))
-                        break
-                else:
-                    m2 = RE_BASELINE_PAGE_RETIRED.search(line)
-                    if m2:
-                        run["baseline_retired"] = int(m2.group(1))
-    except OSError:
-        pass
-    return run
-
-
-def collect_multicore():
+    retired = stats.get("retired_cpu", {})
+    baseline_retired = stats.get("baseline_retired_cpu", {})
+    return {
+        "ipc": stats.get("ipc", {}),
+        "complete": set(stats.get("complete", {})),
+        "absorbed": stats.get("errors_absorbed", {}),
+        "retired_cpu": {c: retired[c] + baseline_retired.get(c, 0) for c in retired},
+        "total_errors": stats.get("total_dram_errors"),
+        "pages_retired": stats.get("pages_retired"),
+        "baseline_retired": stats.get("baseline_page_retirements"),
+    }
+
+
+def multicore_files():
+    """(mix, scheme, path) of every multicore run of the sheet that exists."""
     base = os.path.normpath(MULTICORE_DIR)
     if not os.path.isdir(base):
         return []
+    return [(mix, scheme, path)
+            for mix in MULTICORE_MIX_ORDER for scheme in MULTICORE_SCHEMES
+            for path in (os.path.join(base, f"champsim_4core_8mb_{scheme}_{mix}.txt"),)
+            if os.path.isfile(path)]
+
+
+def collect_multicore(jobs=1):
+    files = multicore_files()
+    runs_of = {mix: {} for mix in MULTICORE_MIX_ORDER}
+    for (mix, scheme, _), result in zip(files, parse_many([path for _, _, path in files], jobs=jobs)):
+        runs_of[mix][scheme] = multicore_run(result.values)
     rows = []
     for mix in MULTICORE_MIX_ORDER:
-        runs = {}
-        for scheme in MULTICORE_SCHEMES:
-            path = os.path.join(base, f"champsim_4core_8mb_{scheme}_{mix}.txt")
-            if os.path.isfile(path):
-                runs[scheme] = parse_multicore_run(path)
+        runs = runs_of[mix]
         noerr = runs.get("noerr")
         for scheme in MULTICORE_SCHEMES:
             run = runs.get(scheme)
@@ -406,36 +363,55 @@ def collect_multicore():
     return rows
 
 
-def write_sheet(wb, name, header, data_rows):
-    ws = wb.create_sheet(title=name)
-    ws.append(header)
-    for row in data_rows:
-        ws.append(row)
-
-
-def main():
-    wb = Workbook()
-    wb.remove(wb.active)
+# Each sheet: its header, and the function collecting its rows
+SHEETS = {
+    "Threshold sweep": (THRESHOLD_HEADER, collect_threshold_sweep),
+    "Max error way sweep": (MAX_WAY_HEADER, collect_max_error_way_sweep),
+    "Way sweep in No error": (NOERR_HEADER, collect_noerr_way_sweep),
+    "Multicore": (MULTICORE_HEADER, collect_multicore),
+}
 
-    threshold_rows = collect_threshold_sweep()
-    write_sheet(wb, "Threshold sweep", THRESHOLD_HEADER, threshold_rows)
-    print(f"  Threshold sweep:       {len(threshold_rows)} rows")
+# Number formats of the xlsx columns (the Parquet files keep full values)
+FORMATS = {
+    "ipc": "0.0000", "llc_mpki": "0.000", "protected_lines_pct": "0.00",
+    "norm_ipc": "0.0000", "weighted_speedup": "0.0000", "sum_ipc": "0.0000",
+}
 
-    max_way_rows = collect_max_error_way_sweep()
-    write_sheet(wb, "Max error way sweep", MAX_WAY_HEADER, max_way_rows)
-    print(f"  Max error way sweep:   {len(max_way_rows)} rows")
 
-    noerr_rows = collect_noerr_way_sweep()
-    write_sheet(wb, "Way sweep in No error", NOERR_HEADER, noerr_rows)
-    print(f"  Way sweep in No error: {len(noerr_rows)} rows")
+def sheet_table(name):
+    """The table of a sheet, its results read from the cache."""
+    header, collect = SHEETS[name]
+    return pd.DataFrame(collect(), columns=header)
 
-    multicore_rows = collect_multicore()
-    if multicore_rows:
-        write_sheet(wb, "Multicore", MULTICORE_HEADER, multicore_rows)
-        print(f"  Multicore:             {len(multicore_rows)} rows")
 
-    wb.save(OUTPUT_XLSX)
-    print(f"\nXLSX: {OUTPUT_XLSX}")
+def main():
+    parser = argparse.ArgumentParser(description="Generate raw_data.xlsx")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes parsing the result files and building the sheets (0: one per CPU)")
+    parser.add_argument("--no-xlsx", action="store_true",
+                        help="Write the Parquet files only")
+    args = parser.parse_args()
+    jobs = args.jobs or None
+
+    paths = [path for sheet in SOURCES for _, path in result_files(*sheet_sources(sheet))]
+    paths += [path for _, _, path in multicore_files()]
+    print(f"  Parsed {refresh(paths, jobs=jobs)} new or changed of {len(paths)} result files")
+
+    tables = dict(zip(SHEETS, build_tables(sheet_table, SHEETS, jobs)))
+    if tables["Multicore"].empty:
+        del tables["Multicore"]
+    for name, table in tables.items():
+        print(f"  {name + ':':<22} {len(table)} rows")
+
+    write_parquet(tables, OUTPUT_PARQUET)
+    print(f"\nParquet: {OUTPUT_PARQUET}/")
+    if args.no_xlsx:
+        return
+    wb = open_workbook()
+    for name, table in tables.items():
+        write_sheet(wb, name, table, formats=FORMATS)
+    save_workbook(wb, OUTPUT_XLSX)
+    print(f"XLSX: {OUTPUT_XLSX}")
 
 
 if __name__ == "__main__":
@@ -45,3 +45,9 @@ void lru::update_replacement_state(uint32_t triggering_cpu, long set, long way,
   if (hit && access_type{type} != access_type::WRITE) // Skip this for writeback hits
     last_used_cycles.at((std::size_t)(set * NUM_WAY + way)) = cycle++;
 }
+
+void lru::checkpoint(champsim::checkpoint::archive& ar)
+{
+  ar.io(last_used_cycles);
+  ar.io(cycle);
+}
@@ -24,6 +24,8 @@ public:
   void update_replacement_state(uint32_t triggering_cpu, long set, long way, champsim::address full_addr, champsim::address ip, champsim::address victim_addr,
                                 access_type type, uint8_t hit);
   // void replacement_final_stats()
+
+  void checkpoint(champsim::checkpoint::archive& ar);
 };
 
 #endif
@@ -121,6 +121,7 @@ run_experiment() {
         "${CHAMPSIM_DIR}/bin/${binary}" \
           --warmup-instructions ${WARMUP} \
           --simulation-instructions ${SIM} \
+          --json "${output_file%.txt}.json" \
           "${trace}" > "${output_file}" 2>&1
         local exit_code=$?
         if [[ ${exit_code} -eq 0 ]] && grep -q "Simulation complete" "${output_file}" 2>/dev/null; then
@@ -199,6 +200,7 @@ run_experiments_merged() {
           "${CHAMPSIM_DIR}/bin/${binary}" \
             --warmup-instructions ${WARMUP} \
             --simulation-instructions ${SIM} \
+            --json "${output_file%.txt}.json" \
             "${trace}" > "${output_file}" 2>&1
           local exit_code=$?
           if [[ ${exit_code} -eq 0 ]] && grep -q "Simulation complete" "${output_file}" 2>/dev/null; then
@@ -152,11 +152,13 @@ for mix in "${SELECTED[@]}"; do
         timeout "${RUN_TIMEOUT}" "${CHAMPSIM_DIR}/bin/${binary}" \
           --warmup-instructions "${WARMUP}" \
           --simulation-instructions "${SIM}" \
+          --json "${out%.txt}.json" \
           "${traces[@]}" > "${out}" 2>&1 || ec=$?
       else
         "${CHAMPSIM_DIR}/bin/${binary}" \
           --warmup-instructions "${WARMUP}" \
           --simulation-instructions "${SIM}" \
+          --json "${out%.txt}.json" \
           "${traces[@]}" > "${out}" 2>&1 || ec=$?
       fi
       t1=$(date +%s)
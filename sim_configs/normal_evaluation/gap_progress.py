@@ -38,18 +38,14 @@ RUNNER = os.path.join(SCRIPT_DIR, "run_267_gap.sh")
 RUN_COMMON = os.path.join(SCRIPT_DIR, "run_common.sh")
 RUN_GAP_COMMON = os.path.join(SCRIPT_DIR, "run_gap_common.sh")
 
+sys.path.insert(0, CHAMPSIM_DIR)
+from simtools.progress import (  # noqa: E402
+    RE_COMPLETE_TIME, compute_eta, fmt_dur, parse_heartbeats,
+)
+
 # ---------------------------------------------------------------------------
 # 정규식
 # ---------------------------------------------------------------------------
-# 완전한 heartbeat 한 줄 (instr + 시뮬레이션 경과시간 둘 다 있는 줄)
-RE_HEARTBEAT = re.compile(
-    r"Heartbeat CPU \d+ instructions:\s*(\d+).*?"
-    r"\(Simulation time:\s*(\d+)\s*hr\s*(\d+)\s*min\s*(\d+)\s*sec\)"
-)
-# 완료 줄의 총 소요시간 (heartbeat 없는 작업의 ETA 폴백용)
-RE_COMPLETE_TIME = re.compile(
-    r"Simulation complete.*?\(Simulation time:\s*(\d+)\s*hr\s*(\d+)\s*min\s*(\d+)\s*sec\)"
-)
 RE_QUEUE = re.compile(r'queue_experiment\s+"([^"]+)"\s+"([^"]+)"')
 RE_RUN = re.compile(r'run_experiment\s+"([^"]+)"\s+"([^"]+)"')
 RE_EXE = re.compile(r'"executable_name"\s*:\s*"([^"]+)"')
@@ -206,16 +202,6 @@ def read_tail(path, n):
         return ""
 
 
-def parse_heartbeats(tail):
-    """tail 텍스트에서 (instr, 경과초) 쌍들을 순서대로 반환."""
-    beats = []
-    for m in RE_HEARTBEAT.finditer(tail):
-        instr = int(m.group(1))
-        secs = int(m.group(2)) * 3600 + int(m.group(3)) * 60 + int(m.group(4))
-        beats.append((instr, secs))
-    return beats
-
-
 def analyze_file(path):
     """출력 파일 상태 분석.
     반환 dict: exists, complete, panic, beats(list), last_instr, last_simsec
@@ -256,58 +242,8 @@ def analyze_file(path):
 
 
 # ---------------------------------------------------------------------------
-# 진행률 / ETA 계산
+# 진행률 표시
 # ---------------------------------------------------------------------------
-def compute_eta(beats, last_instr, elapsed, warmup, total):
-    """남은 예상시간(초). 정상/패닉/멈춤 모든 상태에 일관 적용.
-
-    속도 기준 우선순위:
-      (1) sim 단계 평균 속도 — warmup(50M) 종료 직후 첫 heartbeat를 기준점으로
-          (현재instr - 기준instr) / (현재경과 - 기준시각).
-          워밍업이 빠르고 sim이 느린 차이를 제거하고, panic처럼 heartbeat가
-          끊겨도 '지금까지의 평균 진행속도'로 추정할 수 있다.
-      (2) 폴백 — 전체 평균 (last_instr / elapsed).
-    panic은 IPC가 붕괴해 평균 속도가 극히 낮으므로 ETA가 며칠~수십일로
-    크게 나오며, 이는 '사실상 안 끝남'을 그대로 반영한다.
-    """
-    remaining = total - last_instr
-    if remaining <= 0:
-        return 0
-    if not elapsed or elapsed <= 0:
-        return None
-    rate = None
-    if last_instr > warmup and beats:
-        anchor = next((b for b in beats if b[0] >= warmup), None)
-        if anchor:
-            sim_done = last_instr - anchor[0]
-            sim_elapsed = elapsed - anchor[1]
-            if sim_done > 0 and sim_elapsed > 0:
-                rate = sim_done / sim_elapsed
-    if rate is None and last_instr > 0:
-        rate = last_instr / elapsed
-    if not rate or rate <= 0:
-        return None
-    return remaining / rate
-
-
-def fmt_dur(seconds):
-    if seconds is None:
-        return "?"
-    seconds = int(seconds)
-    if seconds < 0:
-        seconds = 0
-    d, rem = divmod(seconds, 86400)
-    h, rem = divmod(rem, 3600)
-    m, s = divmod(rem, 60)
-    if d > 0:
-        return f"{d}d{h:02d}h"
-    if h > 0:
-        return f"{h}h{m:02d}m"
-    if m > 0:
-        return f"{m}m{s:02d}s"
-    return f"{s}s"
-
-
 def fmt_m(instr):
     return f"{instr / 1_000_000:.0f}M"
 
@@ -116,6 +116,7 @@ run_experiment_configs() {
         "${CHAMPSIM_DIR}/bin/${binary}" \
           --warmup-instructions ${WARMUP} \
           --simulation-instructions ${SIM} \
+          --json "${output_file%.txt}.json" \
           "${trace}" > "${output_file}" 2>&1
         local exit_code=$?
         if [[ ${exit_code} -eq 0 ]] && grep -q "Simulation complete" "${output_file}" 2>/dev/null; then
@@ -200,6 +201,7 @@ queue_experiment_configs() {
         "${CHAMPSIM_DIR}/bin/${binary}" \
           --warmup-instructions ${WARMUP} \
           --simulation-instructions ${SIM} \
+          --json "${output_file%.txt}.json" \
           "${trace}" > "${output_file}" 2>&1
         local exit_code=$?
         if [[ ${exit_code} -eq 0 ]] && grep -q "Simulation complete" "${output_file}" 2>/dev/null; then
@@ -0,0 +1,6 @@
+'''
+Run-management and result-analysis helpers for the error-injection experiments.
+
+The shell runners under ``sim_configs/`` remain the reference for how each experiment is laid out on disk; this package
+reads the same layout, so it can be used side by side with them.
+'''
@@ -0,0 +1,472 @@
+'''
+Incremental progress monitor for job manifests.
+
+``sim_configs/normal_evaluation/gap_progress.py`` re-reads the tail of every output file on each refresh and, when a
+panic flood has pushed the last heartbeat out of the tail, the whole file. This monitor instead keeps, for each output
+file, the byte offset it has parsed up to and the heartbeat state gathered so far (the first heartbeat past the warmup,
+which is all :func:`~simtools.progress.compute_eta` needs, and the latest one). Only bytes appended since the previous
+refresh are read, and the state is kept in a small JSON file so that a restarted monitor picks up where it left off.
+
+Any manifest written by ``python3 -m simtools.runner manifest`` can be monitored, whichever family it covers::
+
+    python3 -m simtools.monitor gap.json mixes.json       # refresh every 10 seconds
+    python3 -m simtools.monitor gap.json --once --all     # print once, listing pending jobs too
+    python3 -m simtools.monitor --url http://localhost:8765   # show what a status server reports
+'''
+
+import argparse
+import dataclasses
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import urllib.request
+from typing import Optional
+
+from . import progress
+from .runner import jobs as jobs_mod
+from .runner import registry as registry_mod
+
+STATE_VERSION = 1
+
+RE_HEARTBEAT = re.compile(progress.RE_HEARTBEAT.pattern.encode())
+RE_COMPLETE_TIME = re.compile(progress.RE_COMPLETE_TIME.pattern.encode())
+PANIC_MARKER = b' panic: IPC'
+COMPLETE_MARKER = progress.COMPLETE_MARKER.encode()
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+PANIC = 'panic'
+STALLED = 'stalled'
+FAILED = 'failed'
+KILLED = 'killed'
+
+@dataclasses.dataclass
+class FileState:
+    '''
+    What has been learned from one output file so far.
+
+    :param offset: the end of the last complete line parsed
+    :param inode: the inode the offset refers to; a rewritten file starts over
+    :param mtime: the modification time at the last refresh
+    :param cpus: per CPU, ``[anchor_instr, anchor_sec, last_instr, last_sec]`` where the anchor is the first heartbeat
+        at or past the warmup (None until there is one)
+    :param beat_seen: the modification time of the file when the latest heartbeat was read
+    :param panic_run: panic lines since the last heartbeat
+    :param duration: the simulation time on the completion line
+    '''
+    offset: int = 0
+    inode: Optional[int] = None
+    mtime: float = 0.0
+    cpus: dict = dataclasses.field(default_factory=dict)
+    beat_seen: Optional[float] = None
+    panic_run: int = 0
+    panic_total: int = 0
+    complete: bool = False
+    duration: Optional[int] = None
+
+    @property
+    def last_instr(self):
+        ''' Progress of the slowest CPU. '''
+        if not self.cpus:
+            return 0
+        return min(c[2] for c in self.cpus.values())
+
+    @property
+    def last_sec(self):
+        ''' Simulation time of the latest heartbeat of any CPU. '''
+        if not self.cpus:
+            return 0
+        return max(c[3] for c in self.cpus.values())
+
+    def update(self, path, warmup=0, chunk_size=1 << 22):
+        '''
+        Parse what has been appended to the file since the last call.
+
+        :returns: the number of bytes read
+        '''
+        try:
+            st = os.stat(path)
+        except OSError:
+            if self.inode is not None:
+                self.__init__()
+            return 0
+
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.__init__(inode=st.st_ino)
+        self.mtime = st.st_mtime
+        if st.st_size == self.offset:
+            return 0
+
+        read = 0
+        try:
+            rfp = open(path, 'rb')
+        except OSError:
+            return 0
+        with rfp:
+            rfp.seek(self.offset)
+            carry = b'' # an incomplete last line is read again once its newline arrives
+            while True:
+                chunk = rfp.read(chunk_size)
+                if not chunk:
+                    break
+                read += len(chunk)
+                block = carry + chunk
+                end = block.rfind(b'\n') + 1
+                if end > 0:
+                    self._consume(block[:end], warmup, st.st_mtime)
+                    self.offset += end
+                carry = block[end:]
+        return read
+
+    def _consume(self, block, warmup, mtime):
+        ''' Apply a block of complete lines. Scanning is done a block at a time, not a line at a time. '''
+        last_beat_end = None
+        for m in RE_HEARTBEAT.finditer(block):
+            beat = (int(m.group(2)), progress.hms_to_sec(m.group(3), m.group(4), m.group(5)))
+            cpu = self.cpus.setdefault(m.group(1).decode(), [None, None, 0, 0])
+            if cpu[0] is None and beat[0] >= warmup:
+                cpu[0], cpu[1] = beat
+            cpu[2], cpu[3] = beat
+            last_beat_end = m.end()
+        if last_beat_end is not None:
+            self.beat_seen = mtime
+            self.panic_run = block.count(PANIC_MARKER, last_beat_end)
+        else:
+            self.panic_run += block.count(PANIC_MARKER)
+        self.panic_total += block.count(PANIC_MARKER)
+
+        if COMPLETE_MARKER in block:
+            self.complete = True
+            m = RE_COMPLETE_TIME.search(block)
+            if m:
+                self.duration = progress.hms_to_sec(m.group(1), m.group(2), m.group(3))
+
+    def elapsed(self, now):
+        '''
+        Wall-clock seconds since the simulation started: the time of the latest heartbeat plus the time since it was
+        read. Without any heartbeat this is unknown.
+        '''
+        if self.complete and self.duration is not None:
+            return self.duration
+        if self.beat_seen is None:
+            return None
+        return self.last_sec + max(0.0, now - self.beat_seen)
+
+    def eta(self, elapsed, warmup, total):
+        ''' Remaining seconds for the slowest CPU by :func:`~simtools.progress.compute_eta`, or None. '''
+        if total is None or not self.cpus or elapsed is None:
+            return None
+        etas = []
+        for anchor_instr, anchor_sec, last_instr, _ in self.cpus.values():
+            beats = [(anchor_instr, anchor_sec)] if anchor_instr is not None else []
+            etas.append(progress.compute_eta(beats, last_instr, elapsed, warmup, total))
+        if any(e is None for e in etas):
+            return None
+        return max(etas)
+
+    def to_dict(self):
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, d):
+        fields = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in d.items() if k in fields})
+
+@dataclasses.dataclass
+class JobStatus:
+    '''
+    The monitor's view of one job at one refresh.
+
+    :param eta_source: ``self`` if the ETA comes from the job's own heartbeats, ``peer`` if it is the median duration
+        of the completed jobs of the same experiment less the elapsed time
+    :param frozen: seconds since the output file last changed
+    :param finished: for a completed job, the time its output was last written
+    '''
+    job: jobs_mod.Job
+    state: str
+    last_instr: int = 0
+    elapsed: Optional[float] = None
+    eta: Optional[float] = None
+    eta_source: Optional[str] = None
+    frozen: Optional[float] = None
+    panic_run: int = 0
+    duration: Optional[int] = None
+    finished: Optional[float] = None
+
+    @property
+    def fraction(self):
+        total = self.job.total_instr
+        if self.state == DONE:
+            return 1.0
+        return min(1.0, self.last_instr / total) if total else 0.0
+
+    @property
+    def warming(self):
+        return self.last_instr < (self.job.warmup or 0)
+
+    def to_dict(self):
+        return {
+            'job_id': self.job.job_id, 'experiment': self.job.experiment, 'binary': self.job.binary,
+            'traces': self.job.traces, 'output': self.job.output, 'warmup': self.job.warmup, 'sim': self.job.sim, 'state': self.state,
+            'instructions': self.last_instr, 'total_instructions': self.job.total_instr, 'fraction': self.fraction,
+            'elapsed': self.elapsed, 'eta': self.eta, 'eta_source': self.eta_source, 'frozen': self.frozen,
+            'panic': self.state == PANIC, 'stalled': self.state == STALLED, 'panic_run': self.panic_run,
+            'duration': self.duration, 'finished': self.finished
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        ''' Rebuild a status from :meth:`to_dict`, e.g. as served by :mod:`simtools.status_server`. '''
+        job = jobs_mod.Job(job_id=d['job_id'], experiment=d['experiment'], binary=d['binary'], traces=d['traces'],
+                           output=d['output'], warmup=d['warmup'], sim=d['sim'])
+        return cls(job, d['state'], last_instr=d['instructions'], elapsed=d['elapsed'], eta=d['eta'],
+                   eta_source=d['eta_source'], frozen=d['frozen'], panic_run=d['panic_run'], duration=d['duration'],
+                   finished=d['finished'])
+
+def default_state_path(manifests, results_root=jobs_mod.RESULTS_ROOT):
+    ''' A state file under the results root, named after the set of manifests it describes. '''
+    key = hashlib.sha1('\n'.join(sorted(os.path.abspath(m) for m in manifests)).encode()).hexdigest()[:12]
+    return os.path.join(results_root, '.monitor', f'{key}.json')
+
+class Monitor:
+    '''
+    Progress of the jobs of one or more manifests.
+
+    :param jobs: the :class:`~simtools.runner.jobs.Job` s to follow
+    :param state_path: where to keep the per-file state between runs (None: memory only)
+    :param results_root: the results root whose job registry tells which jobs a runner has started or killed
+    :param stall_min: minutes without a change to the output after which an unfinished job counts as stalled
+    '''
+
+    def __init__(self, jobs, state_path=None, results_root=jobs_mod.RESULTS_ROOT, stall_min=45.0):
+        self.jobs = jobs
+        self.state_path = state_path
+        self.registry = registry_mod.JobRegistry(results_root)
+        self.stall_min = stall_min
+        self.files = self._load()
+        self.bytes_read = 0
+
+    def _load(self):
+        if self.state_path is None:
+            return {}
+        try:
+            with open(self.state_path) as rfp:
+                data = json.load(rfp)
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != STATE_VERSION:
+            return {}
+        return {k: FileState.from_dict(v) for k, v in data.get('files', {}).items()}
+
+    def save(self):
+        ''' Write the per-file state atomically. '''
+        if self.state_path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp = f'{self.state_path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as wfp:
+            json.dump({'version': STATE_VERSION, 'files': {k: v.to_dict() for k, v in self.files.items()}}, wfp)
+        os.replace(tmp, self.state_path)
+
+    def refresh(self, now=None):
+        '''
+        Read the new output of every job and classify it.
+
+        :returns: a list of :class:`JobStatus`, in manifest order
+        '''
+        now = time.time() if now is None else now
+        entries = self.registry.latest()
+
+        self.bytes_read = 0
+        statuses = []
+        for job in self.jobs:
+            fstate = self.files.setdefault(job.output, FileState())
+            self.bytes_read += fstate.update(job.output, job.warmup or 0)
+            statuses.append(self._classify(job, fstate, entries.get(job.job_id, {}), now))
+        self.save()
+
+        self._fill_peer_eta(statuses)
+        return statuses
+
+    def _classify(self, job, fstate, entry, now):
+        if fstate.complete:
+            return JobStatus(job, DONE, last_instr=fstate.last_instr, elapsed=fstate.duration, eta=0, duration=fstate.duration,
+                             finished=fstate.mtime)
+
+        recorded = entry.get('state')
+        if fstate.inode is None:
+            return JobStatus(job, RUNNING if recorded == registry_mod.RUNNING else PENDING)
+
+        elapsed = fstate.elapsed(now)
+        if recorded == registry_mod.RUNNING and entry.get('start'):
+            elapsed = now - entry['start']
+        status = JobStatus(job, RUNNING, last_instr=fstate.last_instr, elapsed=elapsed,
+                           eta=fstate.eta(elapsed, job.warmup or 0, job.total_instr), frozen=now - fstate.mtime,
+                           panic_run=fstate.panic_run)
+        if status.eta is not None:
+            status.eta_source = 'self'
+
+        if recorded in registry_mod.KILLED_STATES:
+            status.state = KILLED
+        elif recorded == registry_mod.FAILED:
+            status.state = FAILED
+        elif fstate.panic_run > 0:
+            status.state = PANIC
+        elif status.frozen > self.stall_min * 60:
+            status.state = STALLED
+        return status
+
+    @staticmethod
+    def _fill_peer_eta(statuses):
+        '''
+        Give running jobs without a heartbeat yet the median duration of their completed peers, less their own
+        elapsed time. Stalled and failed jobs are left without an estimate.
+        '''
+        durations = {}
+        for s in statuses:
+            if s.state == DONE and s.duration:
+                durations.setdefault(s.job.experiment, []).append(s.duration)
+        every = [d for ds in durations.values() for d in ds]
+        for s in statuses:
+            if s.state == RUNNING and s.eta is None and s.last_instr == 0:
+                peers = durations.get(s.job.experiment) or every
+                if peers:
+                    s.eta = max(0.0, statistics.median(peers) - (s.elapsed or 0))
+                    s.eta_source = 'peer'
+
+def summarize(statuses):
+    '''
+    Job counts per experiment and state, in the order experiments first appear.
+
+    :returns: a dict mapping each experiment to a dict of ``total`` and one count per state
+    '''
+    per_experiment = {}
+    for s in statuses:
+        counts = per_experiment.setdefault(s.job.experiment, {'total': 0, PENDING: 0, RUNNING: 0, DONE: 0, PANIC: 0,
+                                                               STALLED: 0, FAILED: 0, KILLED: 0})
+        counts['total'] += 1
+        counts[s.state] += 1
+    return per_experiment
+
+USE_COLOR = sys.stdout.isatty()
+
+def _c(code, s):
+    return f'\033[{code}m{s}\033[0m' if USE_COLOR else s
+
+def _fmt_m(instr):
+    return '?' if instr is None else f'{instr / 1_000_000:.0f}M'
+
+def _bar(frac, width=14):
+    filled = int(round(max(0.0, min(1.0, frac)) * width))
+    return '[' + '#' * filled + '.' * (width - filled) + ']'
+
+def _job_name(job):
+    return os.path.splitext(os.path.basename(job.output))[0]
+
+def render(statuses, show_all=False, interval=None, bytes_read=None):
+    ''' The monitor screen for one refresh. '''
+    lines = []
+    header = _c('1;36', 'ChampSim progress') + f'   {time.strftime("%Y-%m-%d %H:%M:%S")}'
+    if interval:
+        header += _c('90', f'   (every {interval:g}s, Ctrl-C to quit)')
+    lines.append(header)
+    if bytes_read is not None:
+        lines.append(_c('90', f'{len(statuses)} jobs, {bytes_read / (1 << 20):.1f} MiB of new output parsed'))
+    lines.append('=' * 92)
+
+    per_experiment = summarize(statuses)
+    totals = {k: sum(c[k] for c in per_experiment.values()) for k in ('total', DONE, RUNNING, PENDING, PANIC, STALLED, FAILED, KILLED)}
+    pct = 100.0 * totals[DONE] / totals['total'] if totals['total'] else 0.0
+    lines.append(_c('1', '[all]') + f'  done {_c("32", totals[DONE])}/{totals["total"]} ({pct:.1f}%)  '
+                 f'running {_c("36", totals[RUNNING])} · pending {totals[PENDING]} · panic {totals[PANIC]} · '
+                 f'stalled {totals[STALLED]} · failed {totals[FAILED]} · killed {totals[KILLED]}')
+    lines.append('-' * 92)
+    for experiment, counts in per_experiment.items():
+        pct = 100.0 * counts[DONE] / counts['total'] if counts['total'] else 0.0
+        extra = [f'{state} {counts[state]}' for state in (RUNNING, PENDING, PANIC, STALLED, FAILED, KILLED) if counts[state]]
+        lines.append(f'  {experiment:<44} {_c("32", f"{counts[DONE]:>4}")}/{counts["total"]:<4} ({pct:5.1f}%)'
+                     + ('  ' + ' · '.join(extra) if extra else ''))
+
+    active = [s for s in statuses if s.state == RUNNING or (show_all and s.state == PENDING)]
+    lines.append('')
+    lines.append(_c('1', '[running]') + _c('90', '  job / progress / instructions / elapsed → remaining (≈: from completed peers)'))
+    if not active:
+        lines.append(_c('90', '  (none)'))
+    for s in sorted(active, key=lambda s: -s.fraction):
+        if s.state == PENDING:
+            lines.append(_c('90', f'  {_job_name(s.job):<48} pending'))
+            continue
+        state = '/wu' if s.warming else '   '
+        eta = ('≈' if s.eta_source == 'peer' else '~') + progress.fmt_dur(s.eta)
+        lines.append(f'  {_c("36", f"{_job_name(s.job):<48}")}{state} {_bar(s.fraction)} {s.fraction * 100:5.1f}%  '
+                     f'{_fmt_m(s.last_instr):>6}/{_fmt_m(s.job.total_instr):<6} {progress.fmt_dur(s.elapsed):>6} → {_c("32", eta)}')
+
+    trouble = [s for s in statuses if s.state in (PANIC, STALLED, FAILED, KILLED)]
+    if trouble:
+        lines.append('')
+        lines.append(_c('1;31', '[attention: panic / stalled / failed / killed]'))
+        order = {PANIC: 0, STALLED: 1, FAILED: 2, KILLED: 3}
+        for s in sorted(trouble, key=lambda s: order[s.state]):
+            note = {
+                PANIC: f'{s.panic_run} panic lines since the last heartbeat',
+                STALLED: f'no output for {progress.fmt_dur(s.frozen)}',
+                FAILED: 'the runner recorded a failure',
+                KILLED: 'terminated by the watchdog'
+            }[s.state]
+            eta = '∞' if s.eta is None else f'~{progress.fmt_dur(s.eta)}'
+            lines.append(f'  {_c("33" if s.state == STALLED else "31", f"{s.state:<8}")} {_job_name(s.job):<48} '
+                         f'@ {_fmt_m(s.last_instr):>6} ({s.fraction * 100:4.1f}%)  {progress.fmt_dur(s.elapsed):>6} → {eta:>8}  '
+                         f'{_c("90", note)}')
+
+    return '\n'.join(lines)
+
+def fetch(url, timeout=30):
+    ''' The job statuses served by a :mod:`simtools.status_server` at ``url``. '''
+    with urllib.request.urlopen(url.rstrip('/') + '/jobs', timeout=timeout) as response:
+        return [JobStatus.from_dict(d) for d in json.load(response)['jobs']]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m simtools.monitor', description='Follow the progress of job manifests')
+    parser.add_argument('manifests', nargs='*', help='Job manifests written by "python3 -m simtools.runner manifest"')
+    parser.add_argument('--url', help='Show what a status server (python3 -m simtools.status_server) reports instead')
+    parser.add_argument('-i', '--interval', type=float, default=10.0, help='Seconds between refreshes')
+    parser.add_argument('--once', action='store_true', help='Print once and exit')
+    parser.add_argument('--all', action='store_true', help='List pending jobs too')
+    parser.add_argument('--stall-min', type=float, default=45.0,
+                        help='Minutes without new output after which an unfinished job counts as stalled')
+    parser.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    parser.add_argument('--state', help='The state file (default: under <results root>/.monitor)')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        def poll():
+            return render(fetch(args.url), args.all, None if args.once else args.interval)
+    elif args.manifests:
+        jobs = [j for m in args.manifests for j in jobs_mod.load_manifest(m)]
+        monitor = Monitor(jobs, state_path=args.state or default_state_path(args.manifests, args.results_root),
+                          results_root=args.results_root, stall_min=args.stall_min)
+
+        def poll():
+            return render(monitor.refresh(), args.all, None if args.once else args.interval, monitor.bytes_read)
+    else:
+        parser.error('give either manifests or --url')
+
+    try:
+        while True:
+            out = poll()
+            if args.once:
+                print(out)
+                break
+            sys.stdout.write('\033[2J\033[H' + out + '\n')
+            sys.stdout.flush()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        sys.stdout.write('\n')
+
+if __name__ == '__main__':
+    sys.exit(main())
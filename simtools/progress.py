@@ -0,0 +1,128 @@
+'''
+Heartbeat parsing and progress/ETA estimation for ChampSim output files.
+
+This is the logic that ``sim_configs/normal_evaluation/gap_progress.py`` grew for the GAP sweep, lifted out so the
+runner and the monitors share a single definition of "how far along is this run".
+'''
+
+import re
+
+# A complete heartbeat line (both the instruction count and the wall-clock time are present)
+RE_HEARTBEAT = re.compile(
+    r"Heartbeat CPU (\d+) instructions:\s*(\d+).*?"
+    r"\(Simulation time:\s*(\d+)\s*hr\s*(\d+)\s*min\s*(\d+)\s*sec\)"
+)
+
+# Total duration printed on the completion line (ETA fallback for jobs without a heartbeat)
+RE_COMPLETE_TIME = re.compile(
+    r"Simulation complete.*?\(Simulation time:\s*(\d+)\s*hr\s*(\d+)\s*min\s*(\d+)\s*sec\)"
+)
+
+# do_phase() prints this every livelock period once the interval IPC falls below 0.01
+RE_PANIC = re.compile(r"CPU (\d+) panic: IPC")
+
+COMPLETE_MARKER = "Simulation complete"
+
+def hms_to_sec(hr, mn, sec):
+    ''' Convert the ``H hr M min S sec`` triple of a ChampSim time stamp to seconds. '''
+    return int(hr) * 3600 + int(mn) * 60 + int(sec)
+
+def parse_heartbeats(text, cpu=None):
+    '''
+    Return the ``(instructions, elapsed_seconds)`` pairs of every heartbeat in the text, in order.
+
+    :param text: the output text to scan
+    :param cpu: if given, only heartbeats of this CPU are returned
+    '''
+    beats = []
+    for m in RE_HEARTBEAT.finditer(text):
+        if cpu is not None and int(m.group(1)) != cpu:
+            continue
+        beats.append((int(m.group(2)), hms_to_sec(m.group(3), m.group(4), m.group(5))))
+    return beats
+
+def compute_eta(beats, last_instr, elapsed, warmup, total):
+    '''
+    Remaining time in seconds, applied uniformly to healthy, panicking and stalled jobs.
+
+    The rate is taken, in order of preference, from
+      (1) the average speed of the simulation phase, anchored at the first heartbeat past the warmup:
+          ``(last_instr - anchor_instr) / (elapsed - anchor_time)``. This removes the fast-warmup/slow-sim
+          difference and still gives an estimate when heartbeats stop (e.g. during a panic).
+      (2) the overall average ``last_instr / elapsed``.
+
+    A panicking run crawls at a tiny rate, so its ETA comes out as days or weeks, which is exactly the
+    "will not finish" signal we want.
+
+    :returns: seconds remaining, 0 when done, or None when no rate can be established
+    '''
+    remaining = total - last_instr
+    if remaining <= 0:
+        return 0
+    if not elapsed or elapsed <= 0:
+        return None
+    rate = None
+    if last_instr > warmup and beats:
+        anchor = next((b for b in beats if b[0] >= warmup), None)
+        if anchor:
+            sim_done = last_instr - anchor[0]
+            sim_elapsed = elapsed - anchor[1]
+            if sim_done > 0 and sim_elapsed > 0:
+                rate = sim_done / sim_elapsed
+    if rate is None and last_instr > 0:
+        rate = last_instr / elapsed
+    if not rate or rate <= 0:
+        return None
+    return remaining / rate
+
+def fmt_dur(seconds):
+    ''' Short human-readable duration (``3d04h``, ``2h05m``, ``4m10s``, ``9s``); ``?`` for None. '''
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    if seconds < 0:
+        seconds = 0
+    d, rem = divmod(seconds, 86400)
+    h, rem = divmod(rem, 3600)
+    m, s = divmod(rem, 60)
+    if d > 0:
+        return f"{d}d{h:02d}h"
+    if h > 0:
+        return f"{h}h{m:02d}m"
+    if m > 0:
+        return f"{m}m{s:02d}s"
+    return f"{s}s"
+
+def parse_duration(text):
+    '''
+    Parse a budget such as ``36h``, ``90m``, ``2d``, ``45s`` or a bare number of seconds.
+
+    This accepts the same forms as the ``RUN_TIMEOUT`` variable of the shell runners.
+    '''
+    text = str(text).strip()
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+def simulated_kips(text):
+    '''
+    Simulation speed in thousands of retired instructions per wall-clock second, summed over CPUs.
+
+    The instruction counts come from each CPU's last heartbeat; the time is the later of the last heartbeat and the
+    completion line.
+
+    :returns: the speed, or None if the text holds no timed heartbeat
+    '''
+    last = {}
+    for m in RE_HEARTBEAT.finditer(text):
+        last[int(m.group(1))] = (int(m.group(2)), hms_to_sec(m.group(3), m.group(4), m.group(5)))
+    if not last:
+        return None
+    secs = max(t for _, t in last.values())
+    m = RE_COMPLETE_TIME.search(text)
+    if m:
+        secs = max(secs, hms_to_sec(*m.groups()))
+    if secs <= 0:
+        return None
+    return sum(i for i, _ in last.values()) / secs / 1000
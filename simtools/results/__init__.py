@@ -0,0 +1,18 @@
+'''
+Reading simulator outputs into metrics.
+
+:mod:`.stats` holds the registry of every metric the analysis scripts read from a result file, and parses a file for
+all of them in one pass. :mod:`.cache` keeps the parsed metrics of each output across runs, so that unchanged outputs
+are not read again, and :mod:`.parallel` parses the outputs of whole experiments over a pool of processes.
+:mod:`.json_stats` reads the statistics the simulator writes with ``--json`` instead, without patterns.
+:mod:`.frame` holds the metrics of many runs as one columnar table, and :mod:`.multicore` those of multicore runs as a
+row per core, with their speedups (they need pandas, so they are imported on their own), and :mod:`.configs` indexes the configuration each binary was built with, to join onto the runs it wrote.
+:mod:`.heartbeats` extracts the heartbeat series of the runs into numpy arrays, and :mod:`.events` the debug events of
+error timing and location into Parquet tables (these need numpy and pyarrow, and are imported on their own too).
+:mod:`.export` writes the tables the export scripts build to Parquet, and streams them into xlsx workbooks.
+'''
+
+from .stats import METRICS, Metric, Scanner, cpu_value, parse_file, parse_text
+from .cache import PARSER_VERSION, ResultCache, parsed
+from .parallel import Parsed, parse_dir, parse_many, refresh
+from .json_stats import Table, load_json
@@ -0,0 +1,152 @@
+'''
+Command-line interface of the results readers.
+
+Examples::
+
+    # Print the metrics of an output as JSON
+    python3 -m simtools.results stats results/normal_evaluation/1_error_rate_sweep/pin_on_1e-5_605.mcf_s-665B.txt
+
+    # Measure the parse throughput over a whole experiment
+    python3 -m simtools.results stats --time results/normal_evaluation/*/*.txt
+
+    # Parse a whole experiment into the cache ahead of the figure scripts
+    python3 -m simtools.results cache results/normal_evaluation/*/*.txt
+
+    # Drop the cached metrics of outputs that were removed, rerun, or parsed by an older registry
+    python3 -m simtools.results cache --prune
+
+    # Rebuild the index of binary configurations, and show the configuration an output was run with
+    python3 -m simtools.results configs results/normal_evaluation/1_error_rate_sweep/pin_on_1e-5_605.mcf_s-665B.txt
+
+    # Extract the heartbeat series of an experiment into one archive (needs numpy), rereading only changed outputs
+    python3 -m simtools.results heartbeats --out heartbeats.npz --jobs 16 results/normal_evaluation/1_error_rate_sweep/*.txt
+
+    # Write the debug events of outputs as Parquet tables under events/<output name>/ (needs pyarrow)
+    python3 -m simtools.results events --out events --jobs 4 results/debug/*.txt
+'''
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from . import cache as cache_mod
+from . import configs as configs_mod
+from . import stats as stats_mod
+
+def cmd_stats(args):
+    scanner = stats_mod.Scanner.for_fields(*args.field) if args.field else stats_mod.Scanner()
+    total_bytes = 0
+    elapsed = 0.0
+    for path in args.outputs:
+        start = time.perf_counter()
+        values = stats_mod.parse_file(path, scanner)
+        elapsed += time.perf_counter() - start
+        total_bytes += os.path.getsize(path)
+        if not args.time:
+            print(json.dumps({'output': path, **values}))
+    if args.time:
+        rate = total_bytes / 1e6 / max(elapsed, 1e-9)
+        print(f'{len(args.outputs)} outputs, {total_bytes / 1e6:.1f} MB in {elapsed:.3f} s ({rate:.1f} MB/s)')
+    return 0
+
+def cmd_cache(args):
+    cache = cache_mod.ResultCache(args.cache)
+    if args.clear:
+        cache.clear()
+    if args.prune:
+        print(f'Dropped {cache.prune()} stale entries')
+    if args.outputs:
+        cache.get_many(args.outputs)
+        print(f'{len(args.outputs)} outputs: {cache.hits} cached, {cache.misses} parsed')
+    entries = cache.entries()
+    print(f'{cache.path}: {entries.get(cache.version, 0)} entries for parser {cache.version}, '
+          f'{sum(entries.values()) - entries.get(cache.version, 0)} for other versions')
+    return 0
+
+def cmd_configs(args):
+    start = time.perf_counter()
+    index = configs_mod.ConfigIndex.build(args.root, cache_path=args.cache)
+    elapsed = time.perf_counter() - start
+    for path in args.outputs:
+        entry = index.resolve(path)
+        if entry is None:
+            print(json.dumps({'output': path, 'executable': None}))
+        else:
+            print(json.dumps({'output': path, 'executable': entry.executable, 'build_id': entry.build_id, 'source': entry.source,
+                              **entry.config}))
+    print(f'{len(index)} executables from {args.root} in {elapsed:.3f} s', file=sys.stderr)
+    for executable, sources in sorted(index.duplicates.items()):
+        print(f'{executable}: differing configurations in {", ".join(sources)} (using the newest)', file=sys.stderr)
+    return 0
+
+def cmd_heartbeats(args):
+    from . import heartbeats as heartbeats_mod
+    start = time.perf_counter()
+    table, errors = heartbeats_mod.extract(args.outputs, args.out, jobs=args.jobs)
+    elapsed = time.perf_counter() - start
+    for path, error in errors.items():
+        print(f'{path}: {error}', file=sys.stderr)
+    print(f'{len(table)} outputs, {table.offsets[-1]} heartbeats into {args.out} in {elapsed:.3f} s')
+    return 1 if errors else 0
+
+def cmd_events(args):
+    from . import events as events_mod
+    start = time.perf_counter()
+    failed = 0
+    for output, counts, error in events_mod.extract_many(args.outputs, args.out, jobs=args.jobs):
+        if error is not None:
+            failed += 1
+            print(f'{output}: {error}', file=sys.stderr)
+        else:
+            if counts['suppressed']:
+                print(f'{output}: {counts["suppressed"]} event lines were suppressed by its capture; the tables miss them',
+                      file=sys.stderr)
+            print(json.dumps({'output': output, **counts}))
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(os.path.getsize(events_mod.events_path(p)) for p in args.outputs if os.path.exists(events_mod.events_path(p)))
+    print(f'{len(args.outputs)} outputs, {total_bytes / 1e6:.1f} MB in {elapsed:.3f} s ({total_bytes / 1e6 / max(elapsed, 1e-9):.1f} MB/s)',
+          file=sys.stderr)
+    return 1 if failed else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m simtools.results', description='Read metrics from ChampSim outputs')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('stats', help='Print the metrics of outputs as JSON lines')
+    p.add_argument('outputs', nargs='+')
+    p.add_argument('--field', action='append', help='Only read the metrics yielding this field (repeatable)')
+    p.add_argument('--time', action='store_true', help='Report the parse throughput instead of the metrics')
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser('cache', help='Fill, prune or clear the cache of parsed outputs')
+    p.add_argument('outputs', nargs='*', help='Outputs to parse into the cache')
+    p.add_argument('--cache', default=cache_mod.DEFAULT_CACHE_PATH, help='The cache database')
+    p.add_argument('--prune', action='store_true', help='Drop the entries of outputs that were removed or changed')
+    p.add_argument('--clear', action='store_true', help='Drop every entry')
+    p.set_defaults(func=cmd_cache)
+
+    p = sub.add_parser('configs', help='Rebuild the index of binary configurations, and print those of outputs as JSON lines')
+    p.add_argument('outputs', nargs='*', help='Outputs whose configuration to print')
+    p.add_argument('--root', default=configs_mod.SIM_CONFIGS_DIR, help='The directory of configuration files')
+    p.add_argument('--cache', default=cache_mod.DEFAULT_CACHE_PATH, help='The cache database')
+    p.set_defaults(func=cmd_configs)
+
+    p = sub.add_parser('heartbeats', help='Extract the heartbeat series of outputs into an .npz or .parquet archive')
+    p.add_argument('outputs', nargs='+')
+    p.add_argument('--out', required=True, help='The archive; the runs it holds for unchanged outputs are kept')
+    p.add_argument('--jobs', type=int, default=1, help='Worker processes (0 for one per CPU)')
+    p.set_defaults(func=cmd_heartbeats)
+
+    p = sub.add_parser('events', help='Write the debug events of outputs as Parquet tables')
+    p.add_argument('outputs', nargs='+')
+    p.add_argument('--out', required=True, help='The directory to write the tables of each output under')
+    p.add_argument('--jobs', type=int, default=1, help='Worker processes (0 for one per CPU)')
+    p.set_defaults(func=cmd_events)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
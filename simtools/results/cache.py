@@ -0,0 +1,218 @@
+'''
+A persistent cache of parsed outputs.
+
+Every figure and export script reads the metrics of the same thousands of outputs. The cache keeps the metrics of each
+output (see :func:`.stats.parse_file`) in an SQLite database, keyed on the output's real path, size and modification
+time, so an output is only read again once it changes. Each entry also records the version of the parser that produced
+it: a change to the metric registry invalidates every entry, and the outputs are parsed again on their next use.
+
+The database lives at the top of the results tree (``results/.parsed_results.sqlite``). The ``RESULTS_CACHE``
+environment variable names another database, or turns the cache off with ``off``. When the database cannot be opened
+(a read-only results tree, say), outputs are simply parsed each time.
+
+Example::
+
+    values = parsed('results/normal_evaluation/1_error_rate_sweep/pin_on_1e-5_605.mcf_s-665B.txt')
+'''
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+
+from .stats import METRICS, parse_file
+
+CHAMPSIM_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_NAME = '.parsed_results.sqlite'
+DEFAULT_CACHE_PATH = os.environ.get('RESULTS_CACHE') or os.path.join(CHAMPSIM_DIR, 'results', CACHE_NAME)
+DISABLED = 'off'
+
+# Bump when the scanner changes how it reads the registry, or how the cache stores the values
+FORMAT_VERSION = 1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS parsed (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    stats TEXT NOT NULL
+);
+'''
+
+def parser_version(metrics=METRICS):
+    ''' A digest of the metric registry, which changes whenever a metric is added, removed or altered. '''
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode())
+    for m in metrics:
+        types = tuple(getattr(t, '__qualname__', repr(t)) for t in m.types)
+        digest.update(repr((m.fields, m.section, m.pattern, types, m.aggregate, m.after, m.region)).encode())
+    return digest.hexdigest()[:16]
+
+PARSER_VERSION = parser_version()
+
+# JSON keys are strings: the cores of per-core fields are turned back into ints on the way out
+PER_CPU_FIELDS = frozenset(f for m in METRICS if m.per_cpu for f in m.fields)
+
+def _decode(text):
+    values = json.loads(text)
+    for field in PER_CPU_FIELDS.intersection(values):
+        values[field] = {int(cpu): v for cpu, v in values[field].items()}
+    return values
+
+class ResultCache:
+    '''
+    The parsed metrics of outputs, kept across runs.
+
+    :param path: the database, or ``'off'`` to parse every output each time
+    :param version: the parser version entries must match (default: that of :data:`.stats.METRICS`)
+    '''
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, version=PARSER_VERSION):
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._pid = None
+        self._disabled = path == DISABLED
+
+    def _connection(self):
+        ''' The open database, or None when the cache is off or cannot be used. '''
+        if self._pid != os.getpid():
+            # A forked worker opens its own: SQLite connections must not be used across a fork
+            self._conn = None
+        if self._conn is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                fresh = not os.path.exists(self.path)
+                conn = sqlite3.connect(self.path, timeout=60)
+                conn.executescript(SCHEMA)
+                if fresh:
+                    conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                self._conn = conn
+                self._pid = os.getpid()
+            except (OSError, sqlite3.Error):
+                self._disabled = True
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, path):
+        ''' The metrics of one output, parsed again only if the output changed since it was cached. '''
+        return self.get_many([path])[path]
+
+    def get_many(self, paths):
+        '''
+        The metrics of several outputs, with the new entries written in one transaction.
+
+        :returns: a dict from each given path to its metrics
+        :raises OSError: if an output cannot be read
+        '''
+        results, stale = self.lookup(paths)
+        entries = [(path, st, parse_file(path)) for path, st in stale]
+        self.store(entries)
+        results.update((path, values) for path, _, values in entries)
+        return results
+
+    def lookup(self, paths, decode=True):
+        '''
+        Split outputs into those with an entry for their current size and time, and the others.
+
+        :param decode: read the metrics of the outputs found (otherwise only tell them apart, see :meth:`stale`)
+        :returns: a dict from the path of each output found to its metrics, and the ``(path, stat)`` pairs of the
+            outputs to parse (the stat is None for an output that cannot be found)
+        '''
+        conn = self._connection()
+        query = 'SELECT size, mtime_ns, version' + (', stats' if decode else '') + ' FROM parsed WHERE path = ?'
+        found = {}
+        stale = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                st = None
+            if conn is not None and st is not None:
+                row = conn.execute(query, (os.path.realpath(path),)).fetchone()
+                if row is not None and row[:3] == (st.st_size, st.st_mtime_ns, self.version):
+                    self.hits += 1
+                    if decode:
+                        found[path] = _decode(row[3])
+                    continue
+            self.misses += 1
+            stale.append((path, st))
+        return found, stale
+
+    def stale(self, paths):
+        ''' The ``(path, stat)`` pairs of the outputs :meth:`lookup` would have parsed, without decoding the others. '''
+        return self.lookup(paths, decode=False)[1]
+
+    def store(self, entries):
+        '''
+        Keep the metrics of outputs, in one transaction.
+
+        The size and time of each output are those :meth:`lookup` saw before it was read, so an output still being
+        written is read again next time.
+
+        :param entries: ``(path, stat, metrics)`` triples
+        '''
+        conn = self._connection()
+        rows = [(os.path.realpath(path), st.st_size, st.st_mtime_ns, self.version, json.dumps(values))
+                for path, st, values in entries if st is not None]
+        if rows and conn is not None:
+            with contextlib.suppress(sqlite3.Error), conn:
+                conn.executemany('INSERT OR REPLACE INTO parsed (path, size, mtime_ns, version, stats) VALUES (?, ?, ?, ?, ?)',
+                                 rows)
+
+    def entries(self):
+        ''' The number of cached outputs, by parser version. '''
+        conn = self._connection()
+        if conn is None:
+            return {}
+        return dict(conn.execute('SELECT version, COUNT(*) FROM parsed GROUP BY version').fetchall())
+
+    def prune(self):
+        '''
+        Drop the entries of outputs that no longer exist or have changed, and those of other parser versions.
+
+        :returns: the number of entries dropped
+        '''
+        conn = self._connection()
+        if conn is None:
+            return 0
+        stale = []
+        for key, size, mtime_ns, version in conn.execute('SELECT path, size, mtime_ns, version FROM parsed').fetchall():
+            try:
+                st = os.stat(key)
+            except OSError:
+                stale.append((key,))
+                continue
+            if (st.st_size, st.st_mtime_ns, self.version) != (size, mtime_ns, version):
+                stale.append((key,))
+        with conn:
+            conn.executemany('DELETE FROM parsed WHERE path = ?', stale)
+        return len(stale)
+
+    def clear(self):
+        ''' Drop every entry. '''
+        conn = self._connection()
+        if conn is not None:
+            with conn:
+                conn.execute('DELETE FROM parsed')
+
+_default = None
+
+def default_cache():
+    ''' The cache of the results tree (or of ``RESULTS_CACHE``), shared by the whole process. '''
+    global _default
+    if _default is None:
+        _default = ResultCache()
+    return _default
+
+def parsed(path):
+    ''' The metrics of an output (see :func:`.stats.parse_file`), from the default cache when it is unchanged. '''
+    return default_cache().get(path)
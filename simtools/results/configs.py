@@ -0,0 +1,240 @@
+'''
+The configuration of every simulator binary, indexed by its executable name.
+
+Each output is named after the binary that wrote it (``<executable>_<trace>.txt``, as the run scripts write them), and
+each binary is built from a configuration under ``sim_configs/`` that names it with ``executable_name``. A
+:class:`ConfigIndex` maps those names to the flattened configuration (``LLC.ways``, ``error_page_manager.cache_pinning``,
+``ooo_cpu.0.rob_size``, ...), so the parameters of a run come from the configuration it was built with rather than from
+the pattern of its file name, and parameters a name does not spell out are not lost. Where ``_configuration.mk`` names
+the build ID of a binary, the index holds it too.
+
+The flattened configurations are kept in the database of the parsed-results cache (see :mod:`.cache`), keyed on each
+configuration file's path, size and modification time, so rebuilding the index reads only the files that changed.
+:meth:`ConfigIndex.frame` gives the index as a table (it needs pandas), for joining with a :class:`.frame.ResultsFrame`.
+
+Example::
+
+    index = ConfigIndex.build()
+    executable, trace = index.split('pin_on_1e-5_605.mcf_s-665B.txt')
+    index[executable].config['error_page_manager.retirement_threshold']
+'''
+
+import contextlib
+import dataclasses
+import json
+import os
+import re
+import sqlite3
+from typing import Optional
+
+from .cache import CHAMPSIM_DIR, DEFAULT_CACHE_PATH, DISABLED
+
+SIM_CONFIGS_DIR = os.path.join(CHAMPSIM_DIR, 'sim_configs')
+CONFIGURATION_MK = os.path.join(CHAMPSIM_DIR, '_configuration.mk')
+NAME_KEY = 'executable_name'
+SEPARATOR = '.'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS configs (
+    source TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    executable TEXT,
+    config TEXT NOT NULL
+);
+'''
+
+BUILD_ID_RE = re.compile(r'^# Build ID: (?P<build_id>\w+)\n# Executable: (?P<executable>.+)$', re.MULTILINE)
+
+def flatten(config, prefix=''):
+    '''
+    A nested configuration as one level of keys, joined with dots; the items of a list are keyed by their index.
+
+    :returns: a dict from each key to its scalar value
+    '''
+    flat = {}
+    items = config.items() if isinstance(config, dict) else enumerate(config)
+    for key, value in items:
+        name = f'{prefix}{key}'
+        if isinstance(value, (dict, list)) and value:
+            flat.update(flatten(value, name + SEPARATOR))
+        elif not isinstance(value, (dict, list)):
+            flat[name] = value
+    return flat
+
+@dataclasses.dataclass(frozen=True)
+class ConfigEntry:
+    '''
+    The configuration of one binary.
+
+    :param executable: its executable name
+    :param source: the configuration file it was built from
+    :param config: the flattened configuration (see :func:`flatten`), without the executable name
+    :param build_id: the build ID ``_configuration.mk`` gives it, or None
+    '''
+    executable: str
+    source: str
+    config: dict
+    build_id: Optional[str] = None
+
+def read_build_ids(path=CONFIGURATION_MK):
+    ''' The build ID of each executable (by base name) of a generated makefile; empty if there is none. '''
+    try:
+        with open(path) as rfp:
+            text = rfp.read()
+    except OSError:
+        return {}
+    return {os.path.basename(m.group('executable').strip()): m.group('build_id') for m in BUILD_ID_RE.finditer(text)}
+
+def _config_files(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith('.json'):
+                yield os.path.join(dirpath, name)
+
+def _read(path):
+    ''' The executable name and flattened configuration of a file, or None for a file that is not a configuration. '''
+    try:
+        with open(path) as rfp:
+            config = json.load(rfp)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(config, dict) or not isinstance(config.get(NAME_KEY), str):
+        return None
+    config = dict(config)
+    return config.pop(NAME_KEY), flatten(config)
+
+class _Store:
+    ''' The flattened configurations kept in the cache database, or nothing when it cannot be used. '''
+
+    def __init__(self, path):
+        self.conn = None
+        if path == DISABLED:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.conn = sqlite3.connect(path, timeout=60)
+            self.conn.executescript(SCHEMA)
+        except (OSError, sqlite3.Error):
+            self.conn = None
+
+    def rows(self, root):
+        if self.conn is None:
+            return {}
+        prefix = os.path.join(os.path.realpath(root), '')
+        rows = self.conn.execute('SELECT source, size, mtime_ns, executable, config FROM configs WHERE substr(source, 1, ?) = ?',
+                                 (len(prefix), prefix)).fetchall()
+        return {source: row for source, *row in rows}
+
+    def update(self, stored, removed):
+        if self.conn is None or not (stored or removed):
+            return
+        with contextlib.suppress(sqlite3.Error), self.conn:
+            self.conn.executemany('DELETE FROM configs WHERE source = ?', ((source,) for source in removed))
+            self.conn.executemany('INSERT OR REPLACE INTO configs (source, size, mtime_ns, executable, config) VALUES (?, ?, ?, ?, ?)',
+                                  stored)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+class ConfigIndex:
+    '''
+    The configurations of the binaries, by executable name.
+
+    :param entries: a :class:`ConfigEntry` per executable
+    :param duplicates: the configuration files of each executable named by several files with different
+        configurations; the index holds the most recently modified one
+    '''
+
+    def __init__(self, entries, duplicates=None):
+        self.entries = {entry.executable: entry for entry in entries}
+        self.duplicates = duplicates or {}
+
+    @classmethod
+    def build(cls, root=SIM_CONFIGS_DIR, cache_path=DEFAULT_CACHE_PATH, configuration_mk=CONFIGURATION_MK):
+        '''
+        The index of the configuration files under a directory.
+
+        :param cache_path: the database the flattened configurations are kept in, or ``'off'`` to read every file
+        :param configuration_mk: the generated makefile to take build IDs from
+        '''
+        store = _Store(cache_path)
+        try:
+            known = store.rows(root)
+            found, stored = [], []
+            for path in _config_files(root):
+                source = os.path.realpath(path)
+                try:
+                    st = os.stat(source)
+                except OSError:
+                    continue
+                row = known.pop(source, None)
+                if row is not None and tuple(row[:2]) == (st.st_size, st.st_mtime_ns):
+                    executable, config = row[2], json.loads(row[3])
+                else:
+                    read = _read(source)
+                    executable, config = read if read is not None else (None, {})
+                    stored.append((source, st.st_size, st.st_mtime_ns, executable, json.dumps(config)))
+                if executable is not None:
+                    found.append((st.st_mtime_ns, source, executable, config))
+            store.update(stored, known)
+        finally:
+            store.close()
+
+        build_ids = read_build_ids(configuration_mk)
+        chosen, sources = {}, {}
+        for mtime_ns, source, executable, config in sorted(found):
+            if executable in chosen and chosen[executable].config != config:
+                sources.setdefault(executable, [chosen[executable].source]).append(source)
+            chosen[executable] = ConfigEntry(executable, source, config, build_ids.get(executable))
+        return cls(chosen.values(), sources)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, executable):
+        return executable in self.entries
+
+    def __getitem__(self, executable):
+        return self.entries[executable]
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def split(self, filename):
+        '''
+        The executable an output is named after, and the rest of its name.
+
+        The executable is the longest indexed name the file name starts with, followed by ``_``.
+
+        :param filename: the base name of an output, such as ``pin_on_1e-5_605.mcf_s-665B.txt``
+        :returns: ``(executable, rest)`` with the extension dropped from ``rest``, or ``(None, None)``
+        '''
+        stem = os.path.splitext(filename)[0]
+        cut = len(stem)
+        while cut > 0:
+            cut = stem.rfind('_', 0, cut)
+            if cut > 0 and stem[:cut] in self.entries:
+                return stem[:cut], stem[cut + 1:]
+        return None, None
+
+    def resolve(self, path):
+        ''' The :class:`ConfigEntry` of the binary that wrote an output, or None. '''
+        executable, _ = self.split(os.path.basename(path))
+        return self.entries.get(executable)
+
+    def frame(self, keys=None):
+        '''
+        The index as a table: a row per executable, with its ``build_id``, ``source`` and a column per configuration key.
+
+        :param keys: the configuration keys to keep (default: all of them)
+        '''
+        import pandas as pd
+        records = []
+        for entry in self.entries.values():
+            config = entry.config if keys is None else {key: entry.config.get(key) for key in keys}
+            records.append({'executable': entry.executable, 'build_id': entry.build_id, 'source': entry.source, **config})
+        columns = ['executable', 'build_id', 'source', *(keys or ())]
+        return pd.DataFrame.from_records(records, columns=columns if keys is not None or not records else None)
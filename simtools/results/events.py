@@ -0,0 +1,395 @@
+'''
+The debug events of simulator outputs, as typed columnar tables.
+
+Binaries built with ``debug`` print a line per error event, which is the only record of when and where errors
+happened::
+
+    [ERROR_REC] ---- record_error(pa=0x1f2a40) ----
+    [ERROR_REC]   page_base=0x1f2000  cl_addr=0x1f2a40
+    [ERROR_REC]   counter: 1 -> 2  (>= threshold 2)
+    [ERROR_REC]   RETIRE page=0x1f2000:
+    [ERROR_REC]   => PAGE_RETIRED
+    [FAULT] manifest fault 3 mode=ROW cl=0x1f2a40 bank_key=0x12 row=118 (anchor)
+    [ERR_LAT][CYCLE][DYNAMIC][FIRST] type=LOAD addr=0x1f2a40 cpu=0 latency=412 cycles
+
+:func:`extract_events` reads an output once, block by block, and writes a Parquet file per table of :data:`SCHEMAS`
+(``errors``, ``retirements``, ``baseline_retirements``, ``faults``, ``manifests``, ``fault_kills``, ``latencies``),
+one row group per ``row_group_size`` events, so its memory does not grow with the output. Each block is split into an
+array of lines, whose events are selected and parsed a column at a time with pyarrow's compute functions rather than a
+line at a time in Python. The lines of one ``record_error`` call become one row of ``errors``. Every row holds the
+``offset`` of its line in the output, which orders the events of all tables, and the number of ``heartbeat`` lines
+printed before it, which places them on the series of :mod:`.heartbeats`. An output captured with the zstd format (see :mod:`simtools.runner.capture`) keeps its
+debug lines in ``<output>.zst``, which is read instead; a text capture may have suppressed some of them, which
+:func:`extract_events` counts from its notes.
+
+This module needs pyarrow and numpy, which the analysis scripts use already; the runner does not import it.
+
+Example::
+
+    extract_events('results/debug/pin_on_1e-5_605.mcf_s-665B.txt', 'events/mcf')
+    retired = load_events('events/mcf', 'errors').to_pandas().query('outcome == "PAGE_RETIRED"')
+    heatmap = load_events('events/mcf', 'manifests', columns=['bank_key', 'row']).to_pandas().value_counts()
+'''
+
+import concurrent.futures
+import os
+import re
+import shutil
+import subprocess
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from ..runner.capture import DEBUG_TAGS, ZSTD_SUFFIX, zstandard
+
+# The columns every table starts with: where the event's line starts in the output, and how many heartbeat lines
+# were printed before it
+POSITION = (('offset', pa.int64()), ('heartbeat', pa.int64()))
+
+SCHEMAS = {
+    # A record_error call of the pinning path; the counts and threshold are null for an address already known
+    'errors': pa.schema(POSITION + (('pa', pa.uint64()), ('page', pa.uint64()), ('cl', pa.uint64()),
+                                    ('count_before', pa.int32()), ('count_after', pa.int32()),
+                                    ('threshold', pa.int32()), ('outcome', pa.string()))),
+    # Every page retirement, whichever path retired it
+    'retirements': pa.schema(POSITION + (('page', pa.uint64()),)),
+    # The retirements of the baseline path (pinning off), with the error that triggered them
+    'baseline_retirements': pa.schema(POSITION + (('page', pa.uint64()), ('threshold', pa.int32()),
+                                                  ('pa', pa.uint64()))),
+    # The faults of the clustered and sticky models as they are created
+    'faults': pa.schema(POSITION + (('fault', pa.int64()), ('mode', pa.string()), ('chip', pa.int16()),
+                                    ('colocated_bank_key', pa.uint64()))),
+    # Each error a fault manifests as, where it lands; sticky for the hard faults of the sticky model
+    'manifests': pa.schema(POSITION + (('sticky', pa.bool_()), ('fault', pa.int64()), ('mode', pa.string()),
+                                       ('cl', pa.uint64()), ('bank_key', pa.uint64()), ('row', pa.int64()),
+                                       ('anchor', pa.bool_()), ('widened', pa.bool_()))),
+    # Faults that died with the page they were anchored in
+    'fault_kills': pa.schema(POSITION + (('fault', pa.int64()), ('mode', pa.string()), ('page', pa.uint64()))),
+    # The latency each error cost the access that found it
+    'latencies': pa.schema(POSITION + (('path', pa.string()), ('outcome', pa.string()), ('access_type', pa.string()),
+                                       ('addr', pa.uint64()), ('cpu', pa.int16()), ('latency', pa.int64()))),
+}
+
+HEX_DIGITS = np.zeros(256, dtype=np.uint64)
+HEX_DIGITS[np.frombuffer(b'0123456789', dtype=np.uint8)] = np.arange(10)
+HEX_DIGITS[np.frombuffer(b'abcdef', dtype=np.uint8)] = np.arange(10, 16)
+
+def _number(column, base):
+    ''' The digits of each value of a binary array as an integer; null where there are none. '''
+    offsets = np.frombuffer(column.buffers()[1], dtype=np.int64)[column.offset:column.offset + len(column) + 1]
+    lengths = np.diff(offsets)
+    values = np.zeros(len(column), dtype=np.uint64)
+    present = lengths > 0
+    if present.any():
+        data = np.frombuffer(column.buffers()[2], dtype=np.uint8)[offsets[0]:offsets[-1]]
+        # Each digit times the base to the number of digits after it in its value, summed per value
+        places = np.repeat(offsets[1:] - offsets[0], lengths) - np.arange(len(data)) - 1
+        terms = HEX_DIGITS[data] * np.power(np.uint64(base), places.astype(np.uint64))
+        values[present] = np.add.reduceat(terms, (offsets[:-1] - offsets[0])[present])
+    return pa.array(values, mask=~present)
+
+# Converters of a column of captured bytes, a whole column at a time; a group that did not take part gives null
+
+def _hex(column):
+    return _number(column, 16)
+
+def _int(column):
+    return _number(column, 10)
+
+def _str(column):
+    return pc.if_else(pc.equal(pc.binary_length(column), 0), None, column).cast(pa.string())
+
+def _flag(column):
+    return pc.greater(pc.binary_length(column), 0)
+
+def _sticky(column):
+    return pc.equal(column, b'sticky CE')
+
+# The tables whose rows are single lines: the start of the lines, the pattern of their values (a group per column
+# after the position), and a converter per column
+LINE_EVENTS = {
+    'retirements': (b'[ERROR_REC]   RETIRE ', rb'RETIRE page=0x(?P<page>[0-9a-f]+):', (_hex,)),
+    'baseline_retirements': (
+        b'[BASELINE_RETIRE] ',
+        rb'page=0x(?P<page>[0-9a-f]+) retired \(threshold=(?P<threshold>\d+)\) pa=0x(?P<pa>[0-9a-f]+)',
+        (_hex, _int, _hex)),
+    'faults': (
+        b'[FAULT] ',
+        rb'^\[FAULT\] (?:new|birth) fault (?P<fault>\d+) mode=(?P<mode>\w+) chip=(?P<chip>\d+)'
+        rb'(?: colocated->bank_key=0x(?P<colocated_bank_key>[0-9a-f]+))?',
+        (_int, _str, _int, _hex)),
+    'manifests': (
+        b'[FAULT] ',
+        rb'^\[FAULT\] (?P<sticky>manifest|sticky CE) fault (?P<fault>\d+) mode=(?P<mode>\w+) cl=0x(?P<cl>[0-9a-f]+) '
+        rb'bank_key=0x(?P<bank_key>[0-9a-f]+) row=(?P<row>\d+)(?P<anchor> \(anchor\))?(?P<widened> \(widened\))?',
+        (_sticky, _int, _str, _hex, _hex, _int, _flag, _flag)),
+    'fault_kills': (
+        b'[FAULT] ',
+        rb'^\[FAULT\] fault (?P<fault>\d+) \((?P<mode>\w+)\) killed by retirement of page 0x(?P<page>[0-9a-f]+)',
+        (_int, _str, _hex)),
+    'latencies': (
+        b'[ERR_LAT][CYCLE][',
+        rb'^\[ERR_LAT\]\[CYCLE\]\[(?P<path>\w+)\](?:\[(?P<outcome>\w+)\])? (?:type=(?P<access_type>\w+) )?'
+        rb'addr=0x(?P<addr>[0-9a-f]+) cpu=(?P<cpu>\d+) latency=(?P<latency>\d+) cycles',
+        (_str, _str, _str, _hex, _int, _int)),
+}
+
+# The lines of a record_error call, which make one row of errors: the call, the address's page and line (on the next
+# line), the page's counter unless the address was known, and (after the lines of a retirement) the outcome
+RECORD_EVENTS = (
+    (b'[ERROR_REC] ---- record_error(', rb'\(pa=0x(?P<pa>[0-9a-f]+)\)', (_hex,)),
+    (b'[ERROR_REC]   page_base=', rb'page_base=0x(?P<page>[0-9a-f]+)  cl_addr=0x(?P<cl>[0-9a-f]+)', (_hex, _hex)),
+    (b'[ERROR_REC]   counter: ',
+     rb'counter: (?P<count_before>\d+) -> (?P<count_after>\d+)  \((?:>= threshold |threshold=)(?P<threshold>\d+)\)',
+     (_int, _int, _int)),
+    (b'[ERROR_REC]   ',
+     rb'^\[ERROR_REC\]   (?:=> )?(?P<outcome>ALREADY_KNOWN|FIRST_ERROR|ADDED_ERROR|PAGE_RETIRED)\b', (_str,)),
+)
+
+# Blocks end before the last record_error call they would hold, so that its lines (a few, far less than a block) are
+# read together
+RECORD_START = b'\n' + RECORD_EVENTS[0][0]
+
+# The notes of lines a text capture suppressed (see :mod:`simtools.runner.capture`) whose lines were events: the
+# tables miss as many rows
+SUPPRESSED = (b'[capture] suppressed ',
+              rb'^\[capture\] suppressed (?P<lines>\d+) lines like: (?:'
+              + b'|'.join(re.escape(tag) for tag in DEBUG_TAGS + (b'[BASELINE_RETIRE]',)) + b')',
+              (_int,))
+
+HEARTBEAT = b'Heartbeat CPU '
+NEWLINE = ord('\n')
+
+def events_path(output):
+    ''' The file holding the debug lines of an output: its zstd stream when it was captured with one. '''
+    compressed = output + ZSTD_SUFFIX
+    return compressed if os.path.exists(compressed) else output
+
+def _lines(block):
+    ''' The lines of a block as a binary array (each with its newline), and the offset of each in the block. '''
+    ends = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == NEWLINE) + 1
+    if not len(ends) or ends[-1] != len(block):
+        ends = np.append(ends, len(block))
+    offsets = np.concatenate(([0], ends)).astype(np.int64)
+    return pa.Array.from_buffers(pa.large_binary(), len(ends), [None, pa.py_buffer(offsets), pa.py_buffer(block)]), offsets[:-1]
+
+def _extract(lines, start, pattern, converters):
+    '''
+    The values of the lines that begin with ``start`` and match a pattern.
+
+    :returns: the index of each matching line, and an array per group
+    '''
+    index = np.flatnonzero(pc.starts_with(lines, start).to_numpy(zero_copy_only=False))
+    matched = pc.extract_regex(lines.take(index), pattern)
+    valid = matched.is_valid().to_numpy(zero_copy_only=False)
+    if not valid.all():
+        index, matched = index[valid], matched.filter(valid)
+    return index, [convert(field) for convert, field in zip(converters, matched.flatten())]
+
+class _Table:
+    ''' The rows of one table not yet written, as pyarrow tables. '''
+
+    def __init__(self, name, path, row_group_size):
+        self.schema = SCHEMAS[name]
+        self.path = path
+        self.row_group_size = row_group_size
+        self.pending = []
+        self.held = 0
+        self.rows = 0
+        self.writer = None
+
+    def extend(self, columns):
+        batch = pa.table([pa.array(column).cast(t) for column, t in zip(columns, self.schema.types)], schema=self.schema)
+        self.pending.append(batch)
+        self.held += len(batch)
+        if self.held >= self.row_group_size:
+            self.flush()
+
+    def batch(self):
+        return pa.concat_tables(self.pending) if self.pending else self.schema.empty_table()
+
+    def flush(self):
+        if self.path is None or not self.held:
+            return
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, self.schema)
+        self.writer.write_table(self.batch(), row_group_size=self.row_group_size)
+        self.rows += self.held
+        self.pending, self.held = [], 0
+
+    def close(self):
+        self.flush()
+        if self.path is None:
+            self.rows = self.held
+        elif self.writer is None:
+            pq.write_table(self.schema.empty_table(), self.path)
+        else:
+            self.writer.close()
+
+class EventScanner:
+    '''
+    Turn the debug lines of an output into table rows, one block of lines at a time.
+
+    :param out_dir: the directory to write a ``<table>.parquet`` per table in, or None to keep the rows in memory
+    :param row_group_size: the number of rows of a table held before they are written as a row group
+    '''
+
+    def __init__(self, out_dir=None, row_group_size=1 << 18):
+        if out_dir is not None:
+            os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.tables = {name: _Table(name, None if out_dir is None else os.path.join(out_dir, name + '.parquet'),
+                                    row_group_size) for name in SCHEMAS}
+        self.heartbeats = 0
+        self.suppressed = 0
+
+    def feed(self, block, base):
+        '''
+        Scan a block of whole lines.
+
+        :param base: the offset of the block in the output
+        '''
+        if not block:
+            return
+        lines, starts = _lines(block)
+        beats = pc.starts_with(lines, HEARTBEAT).to_numpy(zero_copy_only=False)
+        before = self.heartbeats + np.cumsum(beats) - beats
+
+        def position(index):
+            return [base + starts[index], before[index]]
+
+        for name, (start, pattern, converters) in LINE_EVENTS.items():
+            index, columns = _extract(lines, start, pattern, converters)
+            if len(index):
+                self.tables[name].extend(position(index) + columns)
+
+        (calls, (pa_,)), (located, location), (counted, counts), (ended, (outcome,)) = (
+            _extract(lines, *event) for event in RECORD_EVENTS)
+        if len(calls):
+            # The lines of a call are the first of each kind after it, before the next call (a cut output leaves
+            # one without an outcome); the counter also comes before the outcome
+            following = np.append(calls[1:], len(lines))
+            ends = self._first_after(ended, calls, following)
+            limit = following.copy()
+            limit[ends >= 0] = ended[ends[ends >= 0]]
+            counters = self._first_after(counted, calls, limit)
+            locations = self._first_after(located, calls, following)
+            self.tables['errors'].extend(position(calls) + [pa_] + [self._take(c, locations) for c in location] +
+                                         [self._take(c, counters) for c in counts] + [self._take(outcome, ends)])
+        self.heartbeats += int(beats.sum())
+        _, (suppressed,) = _extract(lines, *SUPPRESSED)
+        self.suppressed += pc.sum(suppressed).as_py() or 0
+
+    @staticmethod
+    def _first_after(index, after, before):
+        ''' The position in ``index`` of its first value after each of ``after`` and before ``before``, or -1. '''
+        if not len(index):
+            return np.full(len(after), -1)
+        found = np.searchsorted(index, after, side='right')
+        return np.where((found < len(index)) & (index[np.minimum(found, len(index) - 1)] < before), found, -1)
+
+    @staticmethod
+    def _take(column, positions):
+        return column.take(pa.array(positions, mask=positions < 0))
+
+    def close(self):
+        ''' Write the rows still held, and the files of the tables without any. '''
+        for table in self.tables.values():
+            table.close()
+
+    def results(self):
+        ''' The rows held in memory, as a pyarrow table per name. '''
+        return {name: table.batch() for name, table in self.tables.items()}
+
+def _blocks(rfp, block_size):
+    ''' The blocks of whole lines of a file, with their offsets; a block ends before its last record_error call. '''
+    base, tail = 0, b''
+    while True:
+        data = rfp.read(block_size)
+        if not data:
+            break
+        data = tail + data
+        cut = data.rfind(RECORD_START) + 1 or data.rfind(b'\n') + 1
+        if cut == 0:
+            tail = data
+            continue
+        yield data[:cut], base
+        base += cut
+        tail = data[cut:]
+    if tail:
+        yield tail, base
+
+def parse_events(data):
+    '''
+    The events of an output held in memory.
+
+    :returns: a dict from each table name of :data:`SCHEMAS` to a pyarrow table
+    '''
+    scanner = EventScanner(row_group_size=float('inf'))
+    scanner.feed(bytes(data), 0)
+    return scanner.results()
+
+def extract_events(output, out_dir, block_size=16 << 20, row_group_size=1 << 18):
+    '''
+    Write the events of an output as a Parquet file per table, reading it once in blocks.
+
+    :param output: the output, or its zstd stream (``.zst``, read with the ``zstandard`` module or the ``zstd`` tool)
+    :param out_dir: the directory of the ``<table>.parquet`` files, created if needed
+    :returns: the number of rows of each table, and under ``suppressed`` the number of event lines a text capture left
+        out of the output (the ``[capture] suppressed`` notes of debug lines), which the tables therefore miss
+    :raises OSError: if the output cannot be read
+    '''
+    path = events_path(output)
+    scanner = EventScanner(out_dir, row_group_size)
+    if path.endswith(ZSTD_SUFFIX) and zstandard is not None:
+        with open(path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True) as rfp:
+            for block, base in _blocks(rfp, block_size):
+                scanner.feed(block, base)
+    elif path.endswith(ZSTD_SUFFIX):
+        proc = subprocess.Popen([shutil.which('zstd') or 'zstd', '-q', '-d', '-c', path], stdout=subprocess.PIPE)
+        try:
+            for block, base in _blocks(proc.stdout, block_size):
+                scanner.feed(block, base)
+        finally:
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise OSError(f'zstd failed to decompress {path}')
+    else:
+        with open(path, 'rb') as rfp:
+            for block, base in _blocks(rfp, block_size):
+                scanner.feed(block, base)
+    scanner.close()
+    return {**{name: table.rows for name, table in scanner.tables.items()}, 'suppressed': scanner.suppressed}
+
+def _extract_one(job):
+    output, out_dir = job
+    try:
+        return output, extract_events(output, out_dir), None
+    except Exception as e:
+        return output, None, f'{type(e).__name__}: {e}'
+
+def extract_many(outputs, out_root, jobs=1):
+    '''
+    Write the events of many outputs, each into ``<out_root>/<output name>/``, over a pool of processes.
+
+    :param jobs: the number of worker processes, or None for one per CPU
+    :returns: an ``(output, row counts, error)`` triple per output, in order; the counts are None for an output that
+        could not be read
+    '''
+    work = [(output, os.path.join(out_root, os.path.splitext(os.path.basename(output))[0])) for output in outputs]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(work) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(work))) as pool:
+            return list(pool.map(_extract_one, work))
+    return [_extract_one(job) for job in work]
+
+def load_events(out_dir, table, columns=None, filters=None):
+    '''
+    A table :func:`extract_events` wrote.
+
+    :param columns: the columns to read (default: all of them)
+    :param filters: row filters, as :func:`pyarrow.parquet.read_table` takes them
+    '''
+    return pq.read_table(os.path.join(out_dir, table + '.parquet'), columns=columns, filters=filters)
@@ -0,0 +1,152 @@
+'''
+Tables of parsed runs written out: a Parquet file per table, and a workbook streamed a row at a time.
+
+The export scripts lay each experiment out as a table (a sheet). :func:`build_tables` builds the tables over a pool
+of processes, one table per task; once :func:`.parallel.refresh` has brought the results cache up to date, a worker
+only reads the metrics of its outputs from the cache. :func:`write_parquet` writes each table to its own Parquet
+file, with its column types: it is the artifact the figure scripts read back (:func:`load_table`). :func:`write_sheet`
+streams a table into a workbook of :func:`open_workbook`, which openpyxl opens in write-only mode: each row is
+serialized as it is appended rather than kept, every cell of it, until the workbook is saved, and the number format
+of a column is held by a single styled cell its values pass through. The time and memory of an export grow linearly
+with its runs.
+
+This module needs pandas and pyarrow, and openpyxl for the workbook; the runner does not import it.
+
+Example::
+
+    tables = dict(zip(SHEETS, build_tables(sheet_table, SHEETS, jobs=16)))
+    write_parquet(tables, 'export/raw')
+    wb = open_workbook()
+    for name, table in tables.items():
+        write_sheet(wb, name, table, formats={'ipc': '0.0000'})
+    save_workbook(wb, 'export/raw.xlsx')
+'''
+
+import concurrent.futures
+import os
+import re
+
+import pandas as pd
+
+# The longest sheet title Excel accepts
+SHEET_TITLE_LIMIT = 31
+
+HEADER_FILL = 'E8EDF5'
+
+def build_tables(build, items, jobs=1):
+    '''
+    The table of each item, built over a pool of processes.
+
+    :param build: a function of an item that returns its table, defined at the top level of a module so that the
+        workers can be sent it
+    :param jobs: the number of worker processes, or None for one per CPU; with 1, the tables are built in this process
+    :returns: the tables, in the order of the items
+    '''
+    items = list(items)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(items) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(items))) as pool:
+            return list(pool.map(build, items))
+    return [build(item) for item in items]
+
+def table_file(name):
+    ''' The file name of a table: its name in lower case, with ``_`` for each run of other characters. '''
+    return re.sub(r'[^0-9a-z.-]+', '_', name.lower()).strip('_') + '.parquet'
+
+def write_parquet(tables, out_dir):
+    '''
+    Write each table to its Parquet file, replacing the file whole.
+
+    :param tables: the DataFrame of each table name
+    :param out_dir: the directory of the files, created if needed
+    :returns: the paths written, in the order of the tables
+    '''
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for name, table in tables.items():
+        path = os.path.join(out_dir, table_file(name))
+        table.to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+        paths.append(path)
+    return paths
+
+def load_table(out_dir, name, columns=None):
+    '''
+    A table :func:`write_parquet` wrote, as a DataFrame.
+
+    :param columns: the columns to read (default: all of them)
+    :raises FileNotFoundError: if the table was not written
+    '''
+    return pd.read_parquet(os.path.join(out_dir, table_file(name)), columns=columns)
+
+def open_workbook():
+    ''' An empty workbook whose sheets are written a row at a time. '''
+    from openpyxl import Workbook
+    return Workbook(write_only=True)
+
+def header_row(ws, names):
+    ''' The cells of a header row of a write-only sheet: bold, on a light fill. '''
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+
+    font, fill = Font(bold=True), PatternFill('solid', fgColor=HEADER_FILL)
+    cells = []
+    for name in names:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font, cell.fill = font, fill
+        cells.append(cell)
+    return cells
+
+def _values(column):
+    ''' The values of a column as Python objects, with None for the missing ones. '''
+    values = column.astype(object)
+    return values.where(column.notna(), None).tolist()
+
+def write_sheet(wb, name, table, formats=None, widths=None, chunk=1 << 14):
+    '''
+    Stream a table into a new sheet of a write-only workbook, under a header row with a filter, frozen in place.
+
+    :param name: the title of the sheet, cut to the length Excel accepts
+    :param formats: the number format of some columns, such as ``{'ipc': '0.0000'}``; the others take Excel's default
+    :param widths: the width of some columns (default: from the length of the column name, between 12 and 28)
+    :param chunk: the number of rows turned into Python values at a time
+    :returns: the sheet
+    '''
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+
+    ws = wb.create_sheet(name[:SHEET_TITLE_LIMIT])
+    columns = [str(column) for column in table.columns]
+    formats, widths = formats or {}, widths or {}
+    # The widths and panes precede the rows in the sheet's file, so they are set before the first row
+    for i, column in enumerate(columns, 1):
+        ws.column_dimensions[get_column_letter(i)].width = widths.get(column, max(12, min(28, len(column) + 2)))
+    ws.freeze_panes = 'A2'
+    if columns:
+        ws.auto_filter.ref = f'A1:{get_column_letter(len(columns))}{len(table) + 1}'
+    ws.append(header_row(ws, columns))
+
+    # A styled cell appended in place of a value is written as it is: one per formatted column carries all its values
+    styled = {}
+    for i, column in enumerate(columns):
+        if column in formats:
+            styled[i] = WriteOnlyCell(ws)
+            styled[i].number_format = formats[column]
+    for start in range(0, len(table), chunk):
+        rows = table.iloc[start:start + chunk]
+        for row in zip(*(_values(rows[column]) for column in rows.columns)):
+            if styled:
+                row = list(row)
+                for i, cell in styled.items():
+                    if row[i] is not None:
+                        cell.value = row[i]
+                        row[i] = cell
+            ws.append(row)
+    return ws
+
+def save_workbook(wb, path):
+    ''' Save a workbook, replacing the file at path whole. '''
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + '.tmp.xlsx'
+    wb.save(tmp)
+    os.replace(tmp, path)
@@ -0,0 +1,232 @@
+'''
+The metrics of many runs as one columnar table.
+
+A :class:`ResultsFrame` holds a row per output: the axes of its configuration (those of :data:`AXES` an experiment has,
+and any other the loader names), the trace it ran and its workload, and a typed column per metric of the registry
+(:data:`.stats.METRICS`). The names repeated across thousands of runs (workloads, traces, rates, experiments) are
+stored as categoricals, ordered by their numeric part, so grouping and pivoting them sorts ``1e-10`` before ``1e-9``
+and ``16MB`` after ``2MB``. Selecting, grouping and pivoting work on whole columns, instead of rebuilding nested dicts such
+as ``data[workload][page_size][rate]`` from a list of records.
+
+This module needs pandas, which the analysis scripts use already; the runner does not import it.
+
+Example::
+
+    frame = ResultsFrame.from_parsed(
+        ({'experiment': 'err_sweep', 'rate': m.group('rate'), 'trace': m.group('trace')}, result)
+        for m, result in parse_dir('results/ett_evaluation/1_error_rate_sweep', RE_ERR_SWEEP.match, jobs=16))
+    ipc = frame.select(rate=['1e-6', '1e-5']).pivot('workload', 'rate', 'ipc')
+'''
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .stats import METRICS, cpu_value
+
+# The configuration of a run, as the experiments vary it
+AXES = ('experiment', 'llc_size', 'max_ways', 'rate', 'threshold', 'pinning', 'suite', 'seed')
+
+# The columns of a frame that describe the run rather than its configuration or metrics
+RUN_COLUMNS = ('trace', 'workload', 'path', 'error', 'executable', 'build_id', 'source')
+
+# Columns stored as categoricals, when a frame has them
+CATEGORICAL = ('experiment', 'llc_size', 'rate', 'suite', 'trace', 'workload', 'executable')
+
+WORKLOAD_RE = re.compile(r'^(\d+\.\w+)')
+NUMBER_RE = re.compile(r'^\d+(?:\.\d+)?(?:e[+-]?\d+)?')
+
+def _dtype(convert):
+    ''' The column type of the values a converter of the registry gives. '''
+    if convert is int:
+        return 'Int64'
+    if convert is float:
+        return 'float64'
+    return None
+
+# The type of each metric's column; the registry's other converters give flags and durations, which keep the type
+# pandas infers for them
+METRIC_DTYPES = {field: _dtype(convert) for m in METRICS for field, convert in zip(m.fields, m.types)}
+METRIC_NAMES = tuple(METRIC_DTYPES)
+
+def workload_of(trace):
+    ''' The workload a trace belongs to (``605.mcf_s`` for ``605.mcf_s-994B.champsimtrace.xz``), or the trace. '''
+    m = WORKLOAD_RE.match(trace)
+    return m.group(1) if m else trace
+
+def _order(value):
+    ''' Sort numerically on a leading number, then by name. '''
+    text = str(value)
+    m = NUMBER_RE.match(text)
+    return (0, float(m.group()), text) if m else (1, 0.0, text)
+
+def _categorical(column):
+    values = column.dropna().unique()
+    return column.astype(pd.CategoricalDtype(sorted(values, key=_order)))
+
+def _encode(data):
+    ''' Store the repeated names of a table as categoricals. '''
+    for name in CATEGORICAL:
+        if name in data.columns:
+            data[name] = _categorical(data[name].astype(object))
+    return data
+
+GMEAN = 'gmean'
+
+def _logs(data, metrics):
+    ''' A table whose metrics are replaced by their logarithm, NaN where they are not positive. '''
+    logs = data.copy(deep=False)
+    for name in ([metrics] if isinstance(metrics, str) else metrics):
+        values = logs[name].astype('float64')
+        logs[name] = np.log(values.where(values > 0))
+    return logs
+
+class ResultsFrame:
+    '''
+    The runs of one or more experiments, a row per output.
+
+    :param data: the table, as built by :meth:`from_parsed`
+    '''
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def from_parsed(cls, rows, metrics=METRIC_NAMES, cpu=0):
+        '''
+        A frame of parsed outputs.
+
+        :param rows: ``(axes, parsed)`` pairs, where ``axes`` is a dict of the run's configuration (holding its
+            ``trace``, from which its ``workload`` is taken unless given) and ``parsed`` a :class:`.parallel.Parsed`
+        :param metrics: the metrics to keep (default: every metric of the registry)
+        :param cpu: the core whose value a per-core metric takes
+        '''
+        rows = list(rows)
+        axes = [config for config, _ in rows]
+        paths = [result.path for _, result in rows]
+        errors = [result.error for _, result in rows]
+        columns = {}
+        wanted = set(metrics)
+        for i, (_, result) in enumerate(rows):
+            for name in wanted.intersection(result.values):
+                column = columns.get(name)
+                if column is None:
+                    column = columns[name] = [None] * len(rows)
+                column[i] = cpu_value(result.values, name, cpu)
+
+        data = pd.DataFrame.from_records(axes) if axes else pd.DataFrame()
+        if 'trace' in data.columns and 'workload' not in data.columns:
+            data['workload'] = data['trace'].map({t: workload_of(t) for t in data['trace'].dropna().unique()})
+        data['path'] = paths
+        data['error'] = errors
+        # A metric no output has is a column of missing values, so that frames of different experiments line up
+        for name in metrics:
+            data[name] = pd.Series(columns.get(name), dtype=METRIC_DTYPES.get(name), index=data.index)
+        return cls(_encode(data))
+
+    @classmethod
+    def concat(cls, frames):
+        ''' The runs of several frames, with the categories of each column merged. '''
+        return cls(_encode(pd.concat([f.data for f in frames], ignore_index=True)))
+
+    @classmethod
+    def read_parquet(cls, path):
+        return cls(_encode(pd.read_parquet(path)))
+
+    def to_parquet(self, path):
+        ''' Write the frame with its column types (needs pyarrow). '''
+        self.data.to_parquet(path, index=False)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, name):
+        return self.data[name]
+
+    @property
+    def metrics(self):
+        ''' The metric columns of the frame. '''
+        return [name for name in self.data.columns if name in METRIC_DTYPES]
+
+    @property
+    def axes(self):
+        ''' The configuration columns of the frame. '''
+        return [name for name in self.data.columns if name not in METRIC_DTYPES and name not in RUN_COLUMNS]
+
+    def select(self, **conditions):
+        '''
+        The runs whose columns meet every condition.
+
+        :param conditions: per column, a value to equal, a list, tuple or set of values to be one of, or a function of
+            the column that gives a boolean mask
+        '''
+        mask = np.ones(len(self.data), dtype=bool)
+        for name, condition in conditions.items():
+            column = self.data[name]
+            if callable(condition):
+                mask &= np.asarray(condition(column), dtype=bool)
+            elif isinstance(condition, (list, tuple, set, frozenset)):
+                mask &= column.isin(list(condition)).to_numpy()
+            else:
+                mask &= (column == condition).fillna(False).to_numpy(dtype=bool)
+        return ResultsFrame(self.data[mask].reset_index(drop=True))
+
+    def ok(self):
+        ''' The runs whose output was parsed. '''
+        return ResultsFrame(self.data[self.data['error'].isna()].reset_index(drop=True))
+
+    def group(self, by, metrics, agg='mean'):
+        '''
+        A row per group of runs, with each metric aggregated over the group.
+
+        :param by: a column, or a list of them
+        :param metrics: a metric, or a list of them
+        :param agg: a pandas aggregation (``mean``, ``sum``, ``count``, ...) or ``gmean``, the geometric mean of the
+            positive values (NaN for a group without any)
+        '''
+        if agg == GMEAN:
+            return np.exp(_logs(self.data, metrics).groupby(by, observed=True, sort=True)[metrics].mean())
+        return self.data.groupby(by, observed=True, sort=True)[metrics].agg(agg)
+
+    def pivot(self, index, columns, values, agg='mean'):
+        '''
+        A table of a metric with the groups of ``index`` down and those of ``columns`` across.
+
+        :param agg: how the runs of a cell combine, as for :meth:`group`
+        '''
+        if agg == GMEAN:
+            return np.exp(_logs(self.data, values).pivot_table(index=index, columns=columns, values=values, aggfunc='mean',
+                                                               observed=True, sort=True))
+        return self.data.pivot_table(index=index, columns=columns, values=values, aggfunc=agg, observed=True, sort=True)
+
+    def normalized(self, metric, baseline, on=('workload',)):
+        '''
+        A metric of each run divided by that of the matching baseline run.
+
+        :param baseline: the frame of the reference runs, a run per value of ``on``
+        :param on: the columns that pair a run with its baseline
+        :returns: a float Series aligned with the rows of this frame, NaN where a run has no baseline
+        '''
+        on = list(on)
+        reference = baseline.data[on + [metric]].drop_duplicates(on, keep='last')
+        keys = self.data[on].astype(object)
+        merged = keys.merge(reference.astype({name: object for name in on}), on=on, how='left')
+        base = merged[metric].astype('float64').to_numpy()
+        return pd.Series(self.data[metric].astype('float64').to_numpy() / base, index=self.data.index, name=metric)
+
+    def with_configs(self, index, keys=None):
+        '''
+        The frame with the configuration of each run joined on, from the binary its output is named after.
+
+        :param index: a :class:`.configs.ConfigIndex`
+        :param keys: the configuration keys to join (default: all of them)
+        :returns: a frame with ``executable``, ``build_id`` and ``source`` columns and a column per key, missing for
+            the runs of binaries the index does not know
+        '''
+        names = self.data['path'].map(os.path.basename)
+        executables = {name: index.split(name)[0] for name in names.unique()}
+        data = self.data.assign(executable=names.map(executables).astype(object))
+        configs = index.frame(keys)
+        return ResultsFrame(_encode(data.merge(configs, on='executable', how='left', sort=False)))
@@ -0,0 +1,325 @@
+'''
+The heartbeat series of simulator outputs, as numpy arrays.
+
+Every core prints a heartbeat line each ``heartbeat_frequency`` retired instructions::
+
+    Heartbeat CPU 0 instructions: 20000003 cycles: 13741222 heartbeat IPC: 1.423 cumulative IPC: 1.412 total_errors: 3 (Simulation time: 00 hr 01 min 12 sec)
+
+so the lines of an output hold the IPC trajectory of the run and the speed of the simulator along it.
+:func:`read_heartbeats` reads them in one pass over the mapped file into :class:`Heartbeats`, a column per value of
+:data:`COLUMNS`. :func:`extract` reads many outputs over a pool of processes into one archive (``.npz``, or Parquet
+with pyarrow) holding the series of every run end to end, and :func:`load` reads it back as a :class:`HeartbeatTable`,
+whose :meth:`~HeartbeatTable.matrix` and :meth:`~HeartbeatTable.resample` give a column of every run as one aligned
+array. An archive records the size and time of each output, so extracting into it again only reads the outputs that
+changed.
+
+This module needs numpy, which the analysis scripts use already; the runner does not import it.
+
+Example::
+
+    extract(glob.glob('results/normal_evaluation/1_error_rate_sweep/*.txt'), 'heartbeats.npz', jobs=16)
+    table = load('heartbeats.npz')
+    ipc = table.matrix('ipc', cpu=0, warmup=False)      # runs x heartbeats, NaN past the end of a run
+    kips = table.matrix('kips', cpu=0)
+'''
+
+import concurrent.futures
+import mmap
+import os
+import re
+
+import numpy as np
+
+from .parallel import _chunks
+
+RE_HEARTBEAT = re.compile(
+    rb'Heartbeat CPU (\d+) instructions: (\d+) cycles: (\d+) heartbeat IPC: (\S+) cumulative IPC: (\S+)'
+    rb'(?: total_errors: (\d+))? \(Simulation time: (\d+) hr (\d+) min (\d+) sec\)')
+
+# The heartbeats before this line belong to the warmup
+WARMUP_COMPLETE = b'\nWarmup complete CPU '
+
+# Each value of a heartbeat, and its type; total_errors is -1 in outputs of simulators that did not print it
+COLUMNS = {
+    'cpu': np.int16,
+    'instructions': np.int64,
+    'cycles': np.int64,
+    'ipc': np.float64,
+    'cumulative_ipc': np.float64,
+    'total_errors': np.int64,
+    'seconds': np.int32,
+    'warmup': np.bool_,
+}
+
+NPZ_SUFFIX = '.npz'
+PARQUET_SUFFIX = '.parquet'
+
+class Heartbeats:
+    '''
+    The heartbeats of one output, in the order they were printed.
+
+    :param columns: an array per column of :data:`COLUMNS`, all of the same length
+    '''
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.columns['cpu'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def cpu(self, cpu):
+        ''' The heartbeats of one core. '''
+        mask = self.columns['cpu'] == cpu
+        return Heartbeats({name: column[mask] for name, column in self.columns.items()})
+
+def _empty():
+    return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+def parse_heartbeats(data):
+    '''
+    The heartbeats of an output.
+
+    :param data: the output, as bytes or a buffer such as an :class:`mmap.mmap`
+    :returns: a :class:`Heartbeats`
+    '''
+    matches = [(m.start(), m.groups()) for m in RE_HEARTBEAT.finditer(data)]
+    if not matches:
+        return Heartbeats(_empty())
+    starts, rows = zip(*matches)
+    cpu, instructions, cycles, ipc, cumulative, errors, hours, minutes, seconds = zip(*rows)
+    warmup_end = data.find(WARMUP_COMPLETE)
+    return Heartbeats({
+        'cpu': np.array([int(v) for v in cpu], dtype=np.int16),
+        'instructions': np.array([int(v) for v in instructions], dtype=np.int64),
+        'cycles': np.array([int(v) for v in cycles], dtype=np.int64),
+        'ipc': np.array([float(v) for v in ipc], dtype=np.float64),
+        'cumulative_ipc': np.array([float(v) for v in cumulative], dtype=np.float64),
+        'total_errors': np.array([int(v) if v else -1 for v in errors], dtype=np.int64),
+        'seconds': np.array([int(h) * 3600 + int(m) * 60 + int(sec) for h, m, sec in zip(hours, minutes, seconds)],
+                            dtype=np.int32),
+        'warmup': np.array(starts, dtype=np.int64) < warmup_end if warmup_end >= 0 else np.zeros(len(rows), dtype=np.bool_),
+    })
+
+def read_heartbeats(path):
+    ''' The heartbeats of an output file, which is mapped rather than read. '''
+    with open(path, 'rb') as rfp:
+        if os.fstat(rfp.fileno()).st_size == 0:
+            return Heartbeats(_empty())
+        with mmap.mmap(rfp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return parse_heartbeats(data)
+
+# Columns computed from the others
+DERIVED = ('kips',)
+
+class HeartbeatTable:
+    '''
+    The heartbeats of many outputs, end to end: the series of run ``i`` is rows ``offsets[i]:offsets[i + 1]``.
+
+    :param paths: the outputs, one per run
+    :param sizes: the size of each output when it was read
+    :param mtimes: the modification time of each output when it was read, in ns
+    :param offsets: where the series of each run starts, and where the last one ends
+    :param columns: an array per column of :data:`COLUMNS`
+    '''
+
+    def __init__(self, paths, sizes, mtimes, offsets, columns):
+        self.paths = list(paths)
+        self.sizes = np.asarray(sizes, dtype=np.int64)
+        self.mtimes = np.asarray(mtimes, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.columns = columns
+
+    @classmethod
+    def from_runs(cls, runs):
+        ''' A table of ``(path, size, mtime_ns, heartbeats)`` runs, in order. '''
+        runs = list(runs)
+        lengths = [len(beats) for _, _, _, beats in runs]
+        columns = {name: np.concatenate([beats[name] for _, _, _, beats in runs]).astype(dtype, copy=False) if runs
+                   else np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        return cls([r[0] for r in runs], [r[1] for r in runs], [r[2] for r in runs],
+                   np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))), columns)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def run(self, i):
+        ''' The :class:`Heartbeats` of one run. '''
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return Heartbeats({name: column[start:end] for name, column in self.columns.items()})
+
+    def runs(self):
+        ''' The run of each heartbeat. '''
+        return np.repeat(np.arange(len(self.paths)), np.diff(self.offsets))
+
+    def column(self, name):
+        '''
+        A column of every heartbeat, stored or derived: ``kips`` is the speed of the simulator since the previous
+        heartbeat of the same run and core, in thousands of instructions per second (NaN when no time passed).
+        '''
+        if name in self.columns:
+            return self.columns[name]
+        if name not in DERIVED:
+            raise KeyError(name)
+        runs, cpus = self.runs(), self.columns['cpu']
+        instructions = self.columns['instructions'].astype(np.float64)
+        seconds = self.columns['seconds'].astype(np.float64)
+        # The previous heartbeat of each run and core: sort stably by (run, cpu), so each group keeps its order
+        order = np.lexsort((cpus, runs))
+        first = np.ones(len(order), dtype=np.bool_)
+        first[1:] = (runs[order][1:] != runs[order][:-1]) | (cpus[order][1:] != cpus[order][:-1])
+        d_instr = np.where(first, instructions[order], np.diff(instructions[order], prepend=0.0))
+        d_sec = np.where(first, seconds[order], np.diff(seconds[order], prepend=0.0))
+        kips = np.empty(len(order))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            kips[order] = np.where(d_sec > 0, d_instr / d_sec / 1000.0, np.nan)
+        return kips
+
+    def _select(self, cpu, warmup):
+        mask = self.columns['cpu'] == cpu
+        if warmup is not None:
+            mask &= self.columns['warmup'] == warmup
+        return mask
+
+    def matrix(self, name, cpu=0, warmup=None):
+        '''
+        A column of every run as one array, aligned on the heartbeat count: row ``i`` holds the values of run ``i``, and
+        column ``k`` its ``k``-th heartbeat (which every run prints after the same number of instructions).
+
+        :param cpu: the core whose heartbeats to take
+        :param warmup: only the heartbeats of the warmup (True) or of the simulation (False); default both
+        :returns: a float array of shape ``(runs, most heartbeats)``, NaN past the end of a shorter run
+        '''
+        mask = self._select(cpu, warmup)
+        runs = self.runs()[mask]
+        values = self.column(name)[mask]
+        position = np.arange(len(runs)) - np.searchsorted(runs, runs, side='left')
+        out = np.full((len(self.paths), position.max() + 1 if len(position) else 0), np.nan)
+        out[runs, position] = values
+        return out
+
+    def resample(self, name, grid, cpu=0, warmup=None, on='instructions'):
+        '''
+        A column of every run interpolated onto common points of another (the retired instructions, by default), for
+        runs whose heartbeats do not line up.
+
+        :param grid: the points, increasing
+        :returns: a float array of shape ``(runs, len(grid))``, NaN outside the span of a run
+        '''
+        grid = np.asarray(grid, dtype=np.float64)
+        mask = self._select(cpu, warmup)
+        runs = self.runs()[mask]
+        x, y = self.column(on)[mask].astype(np.float64), self.column(name)[mask].astype(np.float64)
+        bounds = np.searchsorted(runs, np.arange(len(self.paths) + 1))
+        out = np.full((len(self.paths), len(grid)), np.nan)
+        for i in range(len(self.paths)):
+            xs, ys = x[bounds[i]:bounds[i + 1]], y[bounds[i]:bounds[i + 1]]
+            if len(xs):
+                out[i] = np.interp(grid, xs, ys, left=np.nan, right=np.nan)
+        return out
+
+    def save(self, path):
+        ''' Write the table as ``.npz``, or as Parquet (with pyarrow) for a ``.parquet`` path. '''
+        if path.endswith(PARQUET_SUFFIX):
+            _save_parquet(self, path)
+            return
+        tmp = path + '.tmp' + NPZ_SUFFIX
+        np.savez_compressed(tmp, paths=np.array(self.paths, dtype=str), sizes=self.sizes, mtimes=self.mtimes,
+                            offsets=self.offsets, **self.columns)
+        os.replace(tmp, path)
+
+def _save_parquet(table, path):
+    import json
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    runs = {'paths': table.paths, 'sizes': table.sizes.tolist(), 'mtimes': table.mtimes.tolist()}
+    data = pa.table({'run': table.runs().astype(np.int32), **table.columns},
+                    metadata={'runs': json.dumps(runs)})
+    tmp = path + '.tmp'
+    pq.write_table(data, tmp)
+    os.replace(tmp, path)
+
+def _load_parquet(path):
+    import json
+    import pyarrow.parquet as pq
+    data = pq.read_table(path)
+    runs = json.loads(data.schema.metadata[b'runs'])
+    run = data.column('run').to_numpy()
+    offsets = np.searchsorted(run, np.arange(len(runs['paths']) + 1))
+    columns = {name: data.column(name).to_numpy().astype(dtype, copy=False) for name, dtype in COLUMNS.items()}
+    return HeartbeatTable(runs['paths'], runs['sizes'], runs['mtimes'], offsets, columns)
+
+def load(path):
+    '''
+    The table an :func:`extract` wrote.
+
+    :raises OSError: if it cannot be read
+    '''
+    if path.endswith(PARQUET_SUFFIX):
+        return _load_parquet(path)
+    with np.load(path) as archive:
+        return HeartbeatTable(archive['paths'].tolist(), archive['sizes'], archive['mtimes'], archive['offsets'],
+                              {name: archive[name] for name in COLUMNS})
+
+def _read_chunk(paths):
+    ''' Read outputs in a worker, as ``(heartbeats, error)`` pairs. '''
+    outcomes = []
+    for path in paths:
+        try:
+            outcomes.append((read_heartbeats(path), None))
+        except Exception as e:
+            outcomes.append((None, f'{type(e).__name__}: {e}'))
+    return outcomes
+
+def extract(paths, out=None, jobs=1, chunksize=None):
+    '''
+    The heartbeats of many outputs, read over a pool of processes into one table.
+
+    :param out: the archive to write (``.npz`` or ``.parquet``); the runs it already holds for unchanged outputs are
+        taken from it rather than read again
+    :param jobs: the number of worker processes, or None for one per CPU
+    :returns: the :class:`HeartbeatTable` of the outputs that could be read, in the given order, and a dict from each
+        output that could not to its error
+    '''
+    paths = list(paths)
+    jobs = jobs or os.cpu_count() or 1
+    previous = {}
+    if out is not None and os.path.exists(out):
+        try:
+            old = load(out)
+            previous = {p: (old, i) for i, p in enumerate(old.paths)}
+        except (OSError, ValueError, KeyError):
+            previous = {}
+
+    stats, kept, stale, errors = {}, {}, [], {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            errors[path] = f'{type(e).__name__}: {e}'
+            continue
+        stats[path] = st
+        old = previous.get(path)
+        if old is not None and (old[0].sizes[old[1]], old[0].mtimes[old[1]]) == (st.st_size, st.st_mtime_ns):
+            kept[path] = old[0].run(old[1])
+        else:
+            stale.append(path)
+
+    if jobs > 1 and len(stale) > 1:
+        chunks = _chunks(stale, jobs, chunksize)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+            outcomes = [outcome for chunk in pool.map(_read_chunk, chunks) for outcome in chunk]
+    else:
+        outcomes = _read_chunk(stale)
+    for path, (beats, error) in zip(stale, outcomes):
+        if error is None:
+            kept[path] = beats
+        else:
+            errors[path] = error
+
+    table = HeartbeatTable.from_runs((p, stats[p].st_size, stats[p].st_mtime_ns, kept[p]) for p in paths if p in kept)
+    if out is not None:
+        table.save(out)
+    return table, errors
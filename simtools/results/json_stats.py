@@ -0,0 +1,254 @@
+'''
+The statistics a simulator writes with ``--json``, read without patterns.
+
+The JSON document is a list of phases, the last of which holds the final statistics: the ROI and whole-phase counters
+of each core, cache and DRAM channel, and, under ``error_model``, every counter of the error model (the ``[ERROR]``
+recording and retirement counters, the ``[LLC]`` error ways, the per-CPU attribution, the spatial fault model and the
+CARE ECC cache). The run scripts write it next to the text output, as ``<output>.json``.
+
+:data:`FIELDS` names each value by the key path that leads to it, with ``*`` standing for the index of a core. The
+fields the text registry (:data:`.stats.METRICS`) also reads keep its names, so :func:`load_json` gives the same
+``values`` dict as :func:`.stats.parse_file`, typed by the document rather than by a pattern; the ratios the text prints
+are computed from the counters (see :data:`DERIVED`). As in the text, the address counts of the Baseline Protection
+Coverage block (``pin_off_*`` and ``total_known_errors``) are only given for a run without the LLC's error ways, and the
+coverage of the error ways only for a run with them. :func:`load_dir` reads a directory of documents into a
+:class:`Table`.
+
+Example::
+
+    table = load_dir('results/normal_evaluation/1_error_rate_sweep')
+    for path, absorbed in zip(table.paths, table['errors_absorbed']):
+        ...
+'''
+
+import dataclasses
+import json
+import os
+from typing import Callable, Tuple
+
+JSON_SUFFIX = '.json'
+ANY_CPU = '*'
+
+@dataclasses.dataclass(frozen=True)
+class Field:
+    '''
+    One value of the final phase of a document.
+
+    :param name: the name of the field (that of :data:`.stats.METRICS` where the text output prints it too)
+    :param path: the keys that lead to the value from the phase; a ``*`` key iterates over the cores, and makes the
+        field a ``{cpu: value}`` dict
+    :param type: the type of the value
+    '''
+    name: str
+    path: Tuple[str, ...]
+    type: Callable = int
+
+    @property
+    def per_cpu(self):
+        return ANY_CPU in self.path
+
+def _fields(prefix, names, type=int):
+    ''' Fields named after their last key (or ``(name, key)`` pairs), under a common key path. '''
+    return tuple(Field(*((n, prefix + (n,)) if isinstance(n, str) else (n[0], prefix + (n[1],))), type) for n in names)
+
+MODEL = ('error_model',)
+RECORDING = MODEL + ('recording',)
+LLC_WAYS = MODEL + ('error_ways', 'LLC')
+CORE_ERRORS = MODEL + ('cores', ANY_CPU)
+SPATIAL = MODEL + ('spatial',)
+CARE = MODEL + ('care',)
+
+FIELDS = (
+    # The ROI statistics of each core
+    Field('instructions', ('roi', 'cores', ANY_CPU, 'instructions')),
+    Field('cycles', ('roi', 'cores', ANY_CPU, 'cycles')),
+    Field('llc_load_hit', ('roi', 'LLC', 'LOAD', 'hit', ANY_CPU)),
+    Field('llc_load_miss', ('roi', 'LLC', 'LOAD', 'miss', ANY_CPU)),
+
+    # The configuration of the error model, and the ERROR PAGE STATISTICS block
+    *_fields(MODEL, ('mode', 'spatial_model'), str),
+    *_fields(MODEL, ('cache_pinning', 'care_enabled'), bool),
+    *_fields(MODEL, ('bit_error_rate', 'page_error_rate'), float),
+    *_fields(MODEL, ('error_cycle_interval', 'total_error_accesses')),
+    Field('baseline_retirement_threshold', MODEL + ('baseline', 'retirement_threshold')),
+    Field('baseline_page_retirements', MODEL + ('baseline', 'retirements')),
+
+    # [LLC] error ways (pinning ON)
+    *_fields(LLC_WAYS, (('err_way_alloc', 'ways'), ('err_way_max', 'max_ways'), ('err_way_total_slots', 'total_slots'),
+                        ('err_way_used', 'used_slots'), ('err_way_hits', 'hits'), ('err_way_fills', 'fills'),
+                        ('err_way_evictions', 'evictions'), ('total_known_errors', 'known_addresses'),
+                        ('pinned_count', 'pinned'), 'in_normal_way', 'not_in_llc')),
+
+    # [ERROR] recording and retirement
+    *_fields(RECORDING, (('retire_threshold', 'retirement_threshold'), 'first_errors', ('additional_errors', 'added_errors'),
+                         ('page_retirements', 'retirements'), 'already_known', 'active_pages', 'multi_error_pages',
+                         'lines_invalidated')),
+
+    # [ERROR] per-CPU attribution
+    *_fields(CORE_ERRORS, (('errors_absorbed', 'absorbed'), ('first_errors_cpu', 'first'), ('added_errors_cpu', 'added'),
+                           ('known_errors_cpu', 'known'), ('retired_cpu', 'retired'), ('baseline_retired_cpu', 'baseline_retired'),
+                           ('care_registered_cpu', 'care_registered'), ('care_dropped_cpu', 'care_dropped'),
+                           ('care_retired_cpu', 'care_retired'), ('care_celog_retired_cpu', 'care_celog_retired'))),
+
+    # The clustered and sticky spatial models
+    *(Field(f'{count}_{mode}', SPATIAL + (count, mode)) for count in ('faults_created', 'faults_killed', 'manifests')
+      for mode in ('cell', 'row', 'bank')),
+    *_fields(SPATIAL, ('anchor_manifests', 'colocated_faults', 'widened_bank', 'widened_any', 'resampled_manifests',
+                       ('pending_manifests', 'pending'), 'pending_peak', 'unanchored', ('fault_retired_pages', 'retired_pages'),
+                       'max_manifests_per_fault', 'distinct_lines', 'distinct_rows', 'distinct_banks', 'max_errors_per_line',
+                       'max_errors_per_row', 'max_errors_per_bank')),
+
+    # The CARE ECC cache
+    *_fields(CARE, tuple((f'care_{key}', key) for key in (
+        'sets', 'ways', 'resident', 'bch_decode_cycles', 'retirements', 'proactive_pages', 'registered', 'dropped',
+        'errors_on_tracked', 'decode_reads', 'writes_s1_to_s2', 'reads_s2_to_s3', 'retires', 'retires_celog',
+        'invalidated_entries', 'proactive_triggers', 'gc_accumulations', 'gc_resets', 'gc_peak_value', 'gc_peak_bias'))),
+)
+
+def _pct(part, whole):
+    return 100.0 * part / whole if whole else 0.0
+
+# The fields the text output prints as sums and ratios of other fields: their type, the fields they are computed from,
+# and the computation
+DERIVED = (
+    ('new_recordings', int, ('first_errors', 'additional_errors'), lambda first, added: first + added),
+    ('total_dram_errors', int, ('first_errors', 'additional_errors', 'page_retirements', 'already_known'),
+     lambda first, added, retired, known: first + added + retired + known),
+    ('pages_retired', int, ('page_retirements',), lambda retired: retired),
+    ('single_error_pages', int, ('active_pages', 'multi_error_pages'), lambda active, multi: active - multi),
+    ('err_way_unused', int, ('err_way_total_slots', 'err_way_used'), lambda total, used: total - used),
+    ('err_way_used_pct', float, ('err_way_used', 'err_way_total_slots'), _pct),
+    ('err_way_hit_rate', float, ('err_way_hits', 'err_way_fills'), lambda hits, fills: _pct(hits, hits + fills)),
+    ('pinned_pct', float, ('pinned_count', 'total_known_errors'), _pct),
+    ('pin_off_retired_pct', float, ('pin_off_retired_count', 'pin_off_live_count'), lambda retired, live: _pct(retired, retired + live)),
+)
+
+# The counts of error addresses, which the text prints as the Baseline Protection Coverage block in place of the LLC's
+# error ways (with pinning OFF, or no error ways allocated)
+ADDRESSES = MODEL + ('addresses',)
+
+SCHEMA = {
+    **{f.name: f.type for f in FIELDS},
+    'pin_off_retired_count': int,
+    'pin_off_live_count': int,
+    'ipc': float,
+    'row_buffer_misses': int,
+    **{name: type for name, type, _, _ in DERIVED},
+}
+
+def _walk(node, path):
+    ''' The value at the end of a key path, or None if the document does not have it. '''
+    for key in path:
+        if isinstance(node, dict):
+            node = node.get(key)
+        else:
+            return None
+    return node
+
+def _value(phase, field):
+    if not field.per_cpu:
+        value = _walk(phase, field.path)
+        return None if value is None else field.type(value)
+    i = field.path.index(ANY_CPU)
+    cores = _walk(phase, field.path[:i])
+    if not isinstance(cores, list):
+        return None
+    values = {cpu: _walk(core, field.path[i + 1:]) for cpu, core in enumerate(cores)}
+    return {cpu: field.type(v) for cpu, v in values.items() if v is not None} or None
+
+def values_from(document):
+    '''
+    The fields of a parsed document.
+
+    :param document: the list of phases, as :func:`json.load` returns it
+    :returns: a dict from the name of each field the document holds to its value (a ``{cpu: value}`` dict for per-core
+        fields); an empty dict for a document without phases
+    '''
+    if not document:
+        return {}
+    phase = document[-1]
+    values = {}
+    for field in FIELDS:
+        value = _value(phase, field)
+        if value is not None:
+            values[field.name] = value
+    if 'instructions' in values and 'cycles' in values:
+        values['ipc'] = {cpu: n / values['cycles'][cpu] if values['cycles'].get(cpu) else 0.0
+                         for cpu, n in values['instructions'].items()}
+    addresses = _walk(phase, ADDRESSES)
+    if isinstance(addresses, dict) and _walk(phase, LLC_WAYS) is None:
+        retired, live = int(addresses.get('retired', 0)), int(addresses.get('tracked', 0))
+        values.update(pin_off_retired_count=retired, pin_off_live_count=live, total_known_errors=retired + live)
+    dram = _walk(phase, ('roi', 'DRAM'))
+    if isinstance(dram, list) and dram:
+        values['row_buffer_misses'] = sum(chan.get('RQ ROW_BUFFER_MISS', 0) + chan.get('WQ ROW_BUFFER_MISS', 0) for chan in dram)
+    for name, _, needs, derive in DERIVED:
+        if all(n in values for n in needs):
+            values[name] = derive(*(values[n] for n in needs))
+    return values
+
+def load_json(path):
+    '''
+    The fields of the document a simulator wrote with ``--json``.
+
+    :raises OSError: if the document cannot be read
+    :raises ValueError: if it is not JSON (such as a document the simulator is still writing)
+    '''
+    with open(path) as rfp:
+        return values_from(json.load(rfp))
+
+def json_path(output):
+    ''' The document written next to a text output. '''
+    return os.path.splitext(output)[0] + JSON_SUFFIX
+
+@dataclasses.dataclass
+class Table:
+    '''
+    The fields of several documents, as one column per field of :data:`SCHEMA`.
+
+    :param paths: the documents, one per row
+    :param columns: a list per field, holding None where a document lacks the field
+    :param errors: why each document could not be read, or None
+    '''
+    paths: list
+    columns: dict
+    errors: list
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def row(self, i):
+        ''' The fields of one document, as :func:`load_json` gives them. '''
+        return {name: column[i] for name, column in self.columns.items() if column[i] is not None}
+
+    @classmethod
+    def from_values(cls, paths, values, errors=None):
+        ''' A table of the ``values`` dicts of documents, in the same order. '''
+        return cls(list(paths), {name: [v.get(name) for v in values] for name in SCHEMA}, errors or [None] * len(values))
+
+def load_many(paths):
+    ''' The fields of several documents, as a :class:`Table`; a document that cannot be read has its error. '''
+    paths = list(paths)
+    values, errors = [], []
+    for path in paths:
+        try:
+            values.append(load_json(path))
+            errors.append(None)
+        except (OSError, ValueError) as e:
+            values.append({})
+            errors.append(f'{type(e).__name__}: {e}')
+    return Table.from_values(paths, values, errors)
+
+def load_dir(result_dir, match=None):
+    '''
+    The documents of a directory, in name order.
+
+    :param match: a function of the file name, false for a document to leave out (default: every ``.json`` file)
+    :returns: a :class:`Table`; an empty one if the directory does not exist
+    '''
+    names = sorted(os.listdir(result_dir)) if os.path.isdir(result_dir) else []
+    return load_many(os.path.join(result_dir, name) for name in names
+                     if name.endswith(JSON_SUFFIX) and (match is None or match(name)))
@@ -0,0 +1,132 @@
+'''
+The runs of multicore mixes, a row per core, and the speedup metrics of each run.
+
+A multicore output prints, in its ROI statistics, the trace each core ran (``CPU 1 runs ...``), and per core the IPC,
+the traffic to the LLC and the errors it absorbed (``[ERROR] CPU 1: absorbed=...``); the registry
+(:data:`.stats.METRICS`) reads them as per-core metrics. :func:`per_cpu` lays the runs out as a tidy table of one row per
+(run, core), whatever the number of cores, and :func:`speedups` reduces it to a row per run against the IPC each
+workload reaches alone, taken from any reference: the same mix without errors, or single-core runs of its workloads.
+
+* weighted speedup, the sum over the cores of ``IPC / IPC alone``;
+* harmonic speedup, the number of cores over the sum of ``IPC alone / IPC``;
+* maximum slowdown, the largest ``IPC alone / IPC`` (fairness: 1 when no core suffers);
+* normalized throughput, the sum of the IPCs over that of the IPCs alone.
+
+A run some core of which has no IPC, or no reference, has none of them. Like :mod:`.frame`, this module needs pandas.
+
+Example::
+
+    cores = per_cpu(({'mix': m.group('mix'), 'scheme': m.group('scheme')}, result)
+                    for m, result in parse_dir('results/multicore/1_error_rate_sweep', RE_MIX.match, jobs=16))
+    summary = speedups(cores, cores[cores['scheme'] == 'noerr'], on=('mix', 'cpu'))
+'''
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .frame import METRIC_DTYPES, _encode, workload_of
+from .stats import METRICS
+
+# The per-core metrics of the registry, but for the trace, which the table names after its workload
+PER_CPU_METRICS = tuple(f for m in METRICS if m.per_cpu for f in m.fields if f != 'cpu_trace')
+
+def per_cpu(rows, metrics=PER_CPU_METRICS):
+    '''
+    A table of a row per core of each parsed output.
+
+    :param rows: ``(axes, parsed)`` pairs, as for :meth:`.frame.ResultsFrame.from_parsed`
+    :param metrics: the per-core metrics to keep
+    :returns: a DataFrame with the axes of each run, its position ``run`` in ``rows``, ``path`` and ``error``, then per
+        core its ``cpu``, ``trace`` and ``workload``, the metrics and the ``llc_mpki``, whether the core is ``complete``
+        and whether its run ``completed`` on every core; an output without per-core values has no rows
+    '''
+    axes, runs, cpus = [], [], []
+    fields = [name for name in metrics if name not in ('complete', 'cpu_trace')]
+    columns = {name: [] for name in ('path', 'error', 'cpu_trace', 'complete', *fields)}
+    for i, (config, result) in enumerate(rows):
+        values = result.values
+        cores = sorted({cpu for name in ('cpu_trace', *metrics) for cpu in values.get(name) or ()})
+        n = len(cores)
+        axes += [config] * n
+        runs += [i] * n
+        cpus += cores
+        columns['path'] += [result.path] * n
+        columns['error'] += [result.error] * n
+        complete = values.get('complete') or {}
+        columns['complete'] += [complete.get(cpu, False) for cpu in cores]
+        for name in ('cpu_trace', *fields):
+            value = values.get(name) or {}
+            columns[name] += [value.get(cpu) for cpu in cores]
+
+    data = pd.DataFrame.from_records(axes) if axes else pd.DataFrame()
+    data['run'] = np.array(runs, dtype='int64')
+    data['cpu'] = np.array(cpus, dtype='int16')
+    for name in ('path', 'error'):
+        data[name] = pd.Series(columns[name], dtype=object, index=data.index)
+    traces = pd.Series(columns['cpu_trace'], dtype=object, index=data.index)
+    data['trace'] = traces.map({t: os.path.basename(t) for t in traces.dropna().unique()})
+    data['workload'] = data['trace'].map({t: workload_of(t) for t in data['trace'].dropna().unique()})
+    for name in fields:
+        data[name] = pd.Series(columns[name], dtype=METRIC_DTYPES.get(name), index=data.index)
+    data['complete'] = np.array(columns['complete'], dtype=bool)
+    if 'llc_miss' in data.columns and 'instructions' in data.columns:
+        instructions = data['instructions'].astype('float64')
+        data['llc_mpki'] = data['llc_miss'].astype('float64') * 1000 / instructions.where(instructions > 0)
+    # A run is complete when all its cores are
+    data['completed'] = data.groupby('run', sort=False)['complete'].transform('all').astype(bool)
+    return _encode(data)
+
+def alone(cores, reference, on=('workload',), metric='ipc'):
+    '''
+    The metric of each core's reference, such as its IPC alone.
+
+    :param cores: a table of :func:`per_cpu`
+    :param reference: the table of the reference runs, a row per value of ``on`` (the last one is kept otherwise)
+    :param on: the columns that pair a core with its reference: ``('workload',)`` for single-core runs of the
+        workloads, ``('mix', 'cpu')`` for a run of the same mix
+    :returns: a float Series aligned with the rows of ``cores``, NaN where a core has no reference
+    '''
+    on = list(on)
+    base = reference[on + [metric]].dropna(subset=[metric]).drop_duplicates(on, keep='last')
+    keys = cores[on].astype(object)
+    merged = keys.merge(base.astype({name: object for name in on}), on=on, how='left')
+    return pd.Series(merged[metric].astype('float64').to_numpy(), index=cores.index, name=metric)
+
+def speedups(cores, reference, on=('workload',), metric='ipc'):
+    '''
+    The speedup metrics of each run against the reference of its cores.
+
+    :param cores: a table of :func:`per_cpu`
+    :param reference: the reference runs and ``on``, as for :func:`alone`
+    :returns: a DataFrame indexed by ``run``, with the number of ``cores``, the ``sum_ipc``, ``weighted_speedup``,
+        ``harmonic_speedup``, ``max_slowdown``, ``norm_throughput``, the ``gmean_norm_ipc`` of the cores, and whether
+        the run ``completed``
+    '''
+    ipc = cores[metric].astype('float64').to_numpy()
+    base = alone(cores, reference, on, metric).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = ipc / base
+        slowdown = base / ipc
+    ratio[~(ratio > 0)] = np.nan
+    slowdown[~np.isfinite(slowdown) | ~(slowdown > 0)] = np.nan
+    table = pd.DataFrame({'run': cores['run'].to_numpy(), 'ipc': ipc, 'alone': base, 'ratio': ratio,
+                          'slowdown': slowdown, 'log': np.log(ratio), 'completed': cores['completed'].to_numpy()})
+    groups = table.groupby('run', sort=True)
+    count = groups.size()
+    summary = pd.DataFrame({
+        'cores': count,
+        'sum_ipc': groups['ipc'].sum(min_count=1),
+        'weighted_speedup': groups['ratio'].sum(min_count=1),
+        'harmonic_speedup': count / groups['slowdown'].sum(min_count=1),
+        'max_slowdown': groups['slowdown'].max(),
+        'norm_throughput': groups['ipc'].sum(min_count=1) / groups['alone'].sum(min_count=1),
+        'gmean_norm_ipc': np.exp(groups['log'].mean()),
+    })
+    # The metrics of a run are only defined over all of its cores
+    summary.loc[groups['ipc'].count() < count, 'sum_ipc'] = np.nan
+    summary.loc[groups['ratio'].count() < count, ['weighted_speedup', 'harmonic_speedup', 'max_slowdown',
+                                                  'norm_throughput', 'gmean_norm_ipc']] = np.nan
+    summary['completed'] = groups['completed'].all()
+    return summary
@@ -0,0 +1,112 @@
+'''
+Parsing many outputs at once, over a pool of processes.
+
+The loaders of the analysis scripts read every output of an experiment directory. :func:`parse_many` takes the
+unchanged outputs from the cache (see :mod:`.cache`) and hands the others to worker processes in chunks of files, so a
+results tree that was just extended is read on every core. The results come back in the order of the given paths, and
+an output that cannot be read or parsed is reported with its error instead of as an output without metrics.
+
+Example::
+
+    for match, result in parse_dir('results/ett_evaluation/1_error_rate_sweep', RE_ERR_SWEEP.match, jobs=16):
+        if result.error is None:
+            ...
+'''
+
+import concurrent.futures
+import dataclasses
+import os
+from typing import Optional
+
+from . import cache as cache_mod
+from .stats import parse_file
+
+# Each worker gets a few chunks, so a slow chunk does not hold up the end of the pool
+CHUNKS_PER_JOB = 4
+MAX_CHUNK = 64
+
+@dataclasses.dataclass(frozen=True)
+class Parsed:
+    '''
+    The outcome of parsing one output.
+
+    :param path: the output, as given
+    :param values: its metrics (see :func:`.stats.parse_file`); empty if it could not be parsed
+    :param error: why it could not be parsed, or None
+    '''
+    path: str
+    values: dict
+    error: Optional[str] = None
+
+def _parse_chunk(paths):
+    ''' Parse outputs in a worker, as ``(values, error)`` pairs. '''
+    outcomes = []
+    for path in paths:
+        try:
+            outcomes.append((parse_file(path), None))
+        except Exception as e:
+            outcomes.append(({}, f'{type(e).__name__}: {e}'))
+    return outcomes
+
+def _chunks(items, jobs, chunksize):
+    size = chunksize or min(MAX_CHUNK, max(1, -(-len(items) // (jobs * CHUNKS_PER_JOB))))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _parse_stale(stale, jobs, cache, chunksize):
+    ''' Parse the outputs a cache lookup found stale, and keep the metrics of those that could be read. '''
+    stale_paths = [path for path, _ in stale]
+    if jobs > 1 and len(stale) > 1:
+        chunks = _chunks(stale_paths, jobs, chunksize)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+            results = [outcome for chunk in pool.map(_parse_chunk, chunks) for outcome in chunk]
+    else:
+        results = _parse_chunk(stale_paths)
+    outcomes = dict(zip(stale_paths, results))
+    cache.store((path, st, outcomes[path][0]) for path, st in stale if outcomes[path][1] is None)
+    return outcomes
+
+def parse_many(paths, jobs=1, cache=None, chunksize=None):
+    '''
+    The metrics of several outputs.
+
+    :param jobs: the number of worker processes, or None for one per CPU; with 1, outputs are parsed in this process
+    :param cache: the :class:`.cache.ResultCache` to consult and fill (default: that of the results tree)
+    :param chunksize: the outputs each work item holds (default: spread the outputs over a few items per worker)
+    :returns: a :class:`Parsed` per path, in the same order
+    '''
+    paths = list(paths)
+    cache = cache or cache_mod.default_cache()
+    jobs = jobs or os.cpu_count() or 1
+    found, stale = cache.lookup(paths)
+    outcomes = _parse_stale(stale, jobs, cache, chunksize) if stale else {}
+    return [Parsed(path, found[path]) if path in found else Parsed(path, *outcomes[path]) for path in paths]
+
+def refresh(paths, jobs=1, cache=None, chunksize=None):
+    '''
+    Bring the cache up to date with outputs: parse those that changed over the pool, without reading the others.
+
+    Processes that then read their share of the outputs (one table each, say) only take them from the cache.
+
+    :param jobs: as for :func:`parse_many`
+    :returns: the number of outputs that were parsed
+    '''
+    cache = cache or cache_mod.default_cache()
+    stale = cache.stale(list(paths))
+    if stale:
+        _parse_stale(stale, jobs or os.cpu_count() or 1, cache, chunksize)
+    return len(stale)
+
+def parse_dir(result_dir, match, jobs=1, cache=None):
+    '''
+    The metrics of the outputs of a directory whose names match, in name order.
+
+    :param match: a function of the file name returning a match object, or None for a file to leave out (such as the
+        ``match`` method of a compiled pattern)
+    :returns: ``(match, Parsed)`` pairs; none if the directory does not exist
+    '''
+    if not os.path.isdir(result_dir):
+        return []
+    matches = [(m, os.path.join(result_dir, fname)) for fname in sorted(os.listdir(result_dir))
+               for m in (match(fname),) if m]
+    results = parse_many([path for _, path in matches], jobs=jobs, cache=cache)
+    return [(m, result) for (m, _), result in zip(matches, results)]
@@ -0,0 +1,430 @@
+'''
+The metrics of a simulator output, read in a single pass.
+
+Every metric the analysis scripts read is declared once in :data:`METRICS`: the fields it yields, the section prefix of
+the line it is printed on (``[LLC]``, ``[ERROR]``, ``cpu{cpu}->LLC``, ``CPU {cpu}``, or none), the pattern of the rest
+of that line, the type of each field, and how repeated lines combine (``first``, ``last`` or ``sum``, as for the
+``ROW_BUFFER_MISS`` line of each DRAM channel and queue). A :class:`Scanner` compiles the registry into a single
+regular expression anchored at line starts, so an output is scanned once, in C, and Python only handles the lines
+that carry a metric.
+
+Metrics whose section or pattern contains ``{cpu}`` are per core: their value is a ``{cpu: value}`` dict (see
+:func:`cpu_value`). Two kinds of entries serve outputs of older simulator versions:
+
+* section ``*`` accepts a line with any tag (such as ``[ETT]``) or none, for lines whose prefix is not known;
+* ``after`` only accepts the lines that follow a marker line (such as ``[Snapshot``), up to the next marker.
+
+The final statistics (the phase-end error summary, the ROI statistics, the cache and error reports) are printed after
+the last core finishes its simulation phase, while debug runs print gigabytes of noise before that. So a complete
+output is not scanned whole: each metric declares the ``region`` it is printed in, and :meth:`Scanner.scan_output`
+looks for the final-statistics anchor backwards from the end and scans the ``tail`` after it, the ``head`` printed
+before the simulation starts, and the whole output only for the few metrics printed ``any``-where (such as livelock
+panics). :func:`parse_file` maps the file rather than reading it, so its memory use does not grow with the output.
+
+Two readings differ from those of the scripts' own patterns, which the registry replaced, and explain changes in
+figures made from the same outputs:
+
+* The statistics of each core (``ipc``, ``instructions``, ``cycles``) and its LLC counts (``llc_*``) take the last
+  line, that of the ROI block. A multicore output prints them twice, first under "Total Simulation Statistics", and the
+  ``re.search`` of ``generate_raw_data.extract_metrics``, ``ett_sensitivity`` and ``common_real_final.extract_ipc``
+  took that first line. A single-core output prints only the ROI block, so its values are the same.
+* ``already_known`` reads the ``Already Known:`` line of the ``[ERROR]`` block as well as the ``Already Known (bloom
+  hit):`` line of ETT-era outputs, the only one ``common_ett`` read; outputs of the current simulator now have it.
+
+Example::
+
+    values = parse_file('results/normal_evaluation/1_error_rate_sweep/pin_on_1e-5_605.mcf_s-665B.txt')
+    cpu_value(values, 'ipc'), values.get('err_way_hits')
+'''
+
+import dataclasses
+import mmap
+import os
+import re
+from typing import Callable, Optional, Tuple
+
+AGGREGATES = ('first', 'last', 'sum')
+REGIONS = ('head', 'tail', 'any')
+
+# The last core to finish its simulation phase prints the error summary of the phase, then its "finished" line; the
+# rest of the final statistics follows
+FINISHED = b'\nSimulation finished CPU '
+PHASE_END_SUMMARY = b'\n=== ERROR PAGE STATISTICS ==='
+SUMMARY_REACH = 4096
+# The banner and the configuration are printed before the first heartbeat (or end of warmup)
+HEAD_ENDS = (b'\nHeartbeat CPU ', b'\nWarmup finished CPU ')
+
+def _converged(value):
+    return value == b'converged'
+
+def _present(_):
+    return True
+
+def _text(value):
+    return value.decode()
+
+def _hms(value):
+    hours, minutes, seconds = (int(x) for x in re.findall(rb'\d+', value))
+    return hours * 3600 + minutes * 60 + seconds
+
+@dataclasses.dataclass(frozen=True)
+class Metric:
+    '''
+    One kind of line in an output.
+
+    :param fields: the names of the values the pattern's groups capture, in order (a pattern without groups yields
+        ``True`` for its only field); a group that does not take part in the match leaves its field unset
+    :param section: the literal prefix of the line, ``''`` for none or ``'*'`` for any
+    :param pattern: a regular expression for the rest of the line, after the prefix and any blanks
+    :param types: a converter per field, applied to the captured bytes (``int`` by default)
+    :param aggregate: how the values of several matching lines combine
+    :param after: only accept lines after this marker line (and before the next marker)
+    :param region: where a complete output prints the line: in the final statistics (``tail``), before the simulation
+        starts (``head``), or anywhere
+    '''
+    fields: Tuple[str, ...]
+    section: str
+    pattern: str
+    types: Tuple[Callable, ...] = ()
+    aggregate: str = 'last'
+    after: Optional[str] = None
+    region: str = 'tail'
+
+    def __post_init__(self):
+        if self.aggregate not in AGGREGATES:
+            raise ValueError(f'{self.fields}: unknown aggregate {self.aggregate}')
+        if self.region not in REGIONS:
+            raise ValueError(f'{self.fields}: unknown region {self.region}')
+        if not self.types:
+            object.__setattr__(self, 'types', (int,) * len(self.fields))
+
+    @property
+    def per_cpu(self):
+        return '{cpu}' in self.section or '{cpu}' in self.pattern
+
+METRICS = (
+    # The ROI statistics of each core, after the trace it ran: the last of the two blocks of a multicore output
+    Metric(('cpu_trace',), 'CPU {cpu}', r'runs\s+(\S+)', (_text,)),
+    Metric(('ipc', 'instructions', 'cycles'), 'CPU {cpu}', r'cumulative IPC:\s+([\d.]+)\s+instructions:\s*(\d+)\s+cycles:\s*(\d+)',
+           (float, int, int)),
+    Metric(('branch_accuracy_pct', 'branch_mpki'), 'CPU {cpu}', r'Branch Prediction Accuracy:\s+([\d.]+)%\s+MPKI:\s+([\d.]+)', (float, float)),
+    Metric(('ipc_ci_pct', 'ci_intervals', 'converged'), 'CPU {cpu}',
+           r'IPC confidence interval:\s+\+-([\d.e+-]+|inf)%.*?(\d+) intervals, (converged|not converged)\)', (float, int, _converged)),
+    Metric(('llc_load_access', 'llc_load_hit', 'llc_load_miss'), 'cpu{cpu}->LLC', r'LOAD\s+ACCESS:\s+(\d+)\s+HIT:\s+(\d+)\s+MISS:\s+(\d+)'),
+    Metric(('llc_access', 'llc_hit', 'llc_miss'), 'cpu{cpu}->LLC', r'TOTAL\s+ACCESS:\s+(\d+)\s+HIT:\s+(\d+)\s+MISS:\s+(\d+)'),
+    # The empty group marks the line itself; the simulation time is absent from older outputs
+    Metric(('complete', 'sim_seconds'), '', r'Simulation complete CPU {cpu}\b()(?:.*?\(Simulation time:\s*(\d+ hr \d+ min \d+ sec)\))?',
+           (_present, _hms)),
+    Metric(('panic',), '', r'Simulation CPU {cpu} panic', region='any'),
+
+    # The run's banner and the DRAM statistics
+    Metric(('page_size',), '', r'Page size:\s+(\d+)', aggregate='first', region='head'),
+    Metric(('row_buffer_misses',), '', r'ROW_BUFFER_MISS:\s+(\d+)', aggregate='sum'),
+
+    # The error model
+    Metric(('errors_per_interval',), '[ERROR_PAGE_MANAGER]', r'Errors per interval:\s+(\d+)', region='head'),
+    Metric(('error_cycle_interval',), '[ERROR_PAGE_MANAGER]', r'Error cycle interval:\s+(\d+)\s+cycles', region='head'),
+    Metric(('total_error_accesses',), '', r'Total Error Accesses:\s+(\d+)'),
+    Metric(('baseline_retirement_threshold',), '', r'Baseline Retirement Threshold:\s+(\d+)'),
+    Metric(('baseline_page_retirements',), '', r'Baseline Page Retirements:\s+(\d+)'),
+
+    # [LLC] error-way statistics
+    Metric(('err_way_alloc',), '[LLC]', r'Allocated Error Ways per Set:\s+(\d+)'),
+    Metric(('err_way_max',), '[LLC]', r'Max Error Ways per Set:\s+(\d+)'),
+    Metric(('err_way_total_slots',), '[LLC]', r'Total Error Way Slots:\s+(\d+)'),
+    Metric(('err_way_used', 'err_way_used_pct'), '[LLC]', r'Used Slots:\s+(\d+)\s+\(([\d.]+)%\)', (int, float)),
+    Metric(('err_way_unused', 'err_way_unused_pct'), '[LLC]', r'Unused Slots:\s+(\d+)\s+\(([\d.]+)%\)', (int, float)),
+    Metric(('err_way_hits',), '[LLC]', r'Error Way Hits:\s+(\d+)'),
+    Metric(('err_way_fills',), '[LLC]', r'Error Way Fills.*?:\s+(\d+)'),
+    Metric(('err_way_hit_rate',), '[LLC]', r'Error Way Hit Rate:\s+([\d.]+)%', (float,)),
+    Metric(('err_way_evictions',), '[LLC]', r'Error Way Evictions.*?:\s+(\d+)'),
+    Metric(('total_known_errors',), '[LLC]', r'Total Known Error Addresses:\s+(\d+)'),
+    Metric(('pinned_count', 'pinned_pct'), '[LLC]', r'Pinned in Error Way:\s+(\d+)\s+\(([\d.]+)%\)', (int, float)),
+    Metric(('in_normal_way',), '[LLC]', r'In Normal Way \(unprotected\):\s+(\d+)'),
+    Metric(('not_in_llc',), '[LLC]', r'Not in LLC \(DRAM exposed\):\s+(\d+)'),
+    Metric(('pin_off_retired_count', 'pin_off_retired_pct'), '[LLC]', r'Retired \(page offline\):\s+(\d+)\s+\(([\d.]+)%\)', (int, float)),
+    Metric(('pin_off_live_count',), '[LLC]', r'Live \(still tracked\):\s+(\d+)'),
+
+    # Error recording statistics, printed under [ERROR] (under the ETT's tag by earlier versions)
+    Metric(('retire_threshold',), '*', r'Retirement Threshold:\s+(\d+)'),
+    Metric(('total_dram_errors',), '*', r'Total DRAM Error Events:\s+(\d+)'),
+    Metric(('new_recordings',), '*', r'New Error Recordings:\s+(\d+)'),
+    Metric(('first_errors',), '*', r'First Error \(per page\):\s+(\d+)'),
+    Metric(('additional_errors',), '*', r'Additional Errors:\s+(\d+)'),
+    Metric(('page_retirements',), '*', r'Page Retirements.*?:\s+(\d+)'),
+    # The [ERROR] line, and the "Already Known (bloom hit):" line of ETT-era outputs
+    Metric(('already_known',), '*', r'Already Known.*?:\s+(\d+)'),
+    Metric(('active_pages',), '*', r'Active Pages \(tracked\):\s+(\d+)'),
+    Metric(('single_error_pages',), '*', r'Single-error pages:\s+(\d+)'),
+    Metric(('multi_error_pages',), '*', r'Multi-error pages:\s+(\d+)'),
+    Metric(('pages_retired',), '*', r'Pages Retired:\s+(\d+)'),
+    Metric(('lines_invalidated',), '*', r'Cache Lines Invalidated:\s+(\d+)'),
+    Metric(('errors_absorbed', 'first_errors_cpu', 'added_errors_cpu', 'known_errors_cpu', 'retired_cpu', 'baseline_retired_cpu'), '[ERROR]',
+           r'CPU {cpu}: absorbed=(\d+) first=(\d+) added=(\d+) known=(\d+) retired=(\d+) baseline_retired=(\d+)'),
+
+    # Outputs of earlier simulator versions (ETT and bloom filter, the first error-way report)
+    Metric(('ett_entries',), '*', r'ETT Entries:\s+(\d+)'),
+    Metric(('ett_used', 'ett_total'), '*', r'ETT Entries Used:\s+(\d+)\s*/\s*(\d+)'),
+    Metric(('ett_evictions',), '*', r'ETT Evictions:\s+(\d+)'),
+    Metric(('bloom_m',), '*', r'Bloom Filter Size \(m\):\s+(\d+)'),
+    Metric(('used_error_way_slots', 'used_error_way_slots_pct'), '*', r'Used Error Way Slots:\s+(\d+)\s+\(([\d.]+)%\)', (int, float)),
+    # Bloom filter snapshots were taken during the run
+    Metric(('bf_avg_occupancy',), '*', r'Avg Occupancy:\s+([\d.]+)%', (float,), aggregate='first', after='[Snapshot', region='any'),
+    Metric(('bf_fp_rate',), '*', r'Est\. FP Rate:\s+([\d.]+)%', (float,), aggregate='first', after='[Snapshot', region='any'),
+    Metric(('ett_evict_lines_invalidated',), '*', r'Cache Lines Invalidated:\s+(\d+)', aggregate='first',
+           after='[ETT Eviction Invalidation Detail]'),
+)
+
+# A legacy line may carry one tag of any name, such as [ETT]
+ANY_TAG = r'(?:\[[^\]\n]*\][ \t]*)?'
+
+def _prefix(section):
+    if section == '*':
+        return ANY_TAG
+    return re.escape(section) + r'[ \t]*' if section else ''
+
+def _lead(pattern):
+    ''' The literal character a pattern starts with, as a member of a character class, or None. '''
+    if pattern[:1] == '\\' and pattern[1:2] and not pattern[1].isalnum():
+        lead, rest = pattern[:2], pattern[2:3]
+    elif pattern[:1].isalnum():
+        lead, rest = pattern[:1], pattern[1:2]
+    else:
+        return None
+    return None if rest in ('?', '*', '{') else lead
+
+def _literal(metric):
+    '''
+    Text every line of a metric contains, found much faster than the regular expression is run ('' if there is none:
+    a pattern starting with a group, say).
+    '''
+    if metric.section not in ('', '*'):
+        return metric.section.split('{cpu}')[0]
+    text = metric.pattern.split('{cpu}')[0]
+    run = re.match(r'(?:[^\\.^$*+?{}\[\]|()]|\\\W)*', text).group()
+    if run and text[len(run):len(run) + 1] in ('*', '?', '{'):
+        # The last character is optional
+        run = run[:-2] if run[-2:-1] == '\\' else run[:-1]
+    return re.sub(r'\\(.)', r'\1', run)
+
+def _guard(leads):
+    ''' A lookahead on the first character of a line, or nothing when it may be anything. '''
+    return '' if None in leads else '(?=[' + ''.join(sorted(leads)) + '])'
+
+def _body(metrics):
+    '''
+    The alternatives for some (index, metric) pairs, with the metrics of a literal section grouped behind its prefix so
+    that the prefix is matched once per line, and the characters each alternative can start with. A metric's value
+    groups follow its wrapper group ``m<index>``.
+    '''
+    flat = []
+    grouped = {}
+    for i, metric in metrics:
+        pattern = metric.pattern.replace('{cpu}', r'(\d+)')
+        if '{cpu}' in metric.section:
+            section = re.escape(metric.section).replace(re.escape('{cpu}'), r'(\d+)')
+            flat.append((f'(?P<m{i}>{section}[ \\t]*{pattern})', {_lead(section)}))
+        else:
+            grouped.setdefault(_prefix(metric.section), []).append((f'(?P<m{i}>{pattern})', _lead(pattern)))
+
+    # The optional tag of legacy lines goes last, so that it cannot shadow a known section. Each group checks the
+    # character after its prefix before trying its alternatives one by one
+    for prefix in sorted(grouped, key=lambda prefix: prefix == ANY_TAG):
+        inner = {lead for _, lead in grouped[prefix]}
+        alternatives = _guard(inner) + '(?:' + '|'.join(alternative for alternative, _ in grouped[prefix]) + ')'
+        if prefix == ANY_TAG:
+            leads = inner | {r'\['}
+            flat.append((_guard(leads) + prefix + alternatives, leads))
+        else:
+            flat.append((prefix + alternatives, {_lead(prefix)} if prefix else inner))
+    return flat
+
+class Scanner:
+    '''
+    The registry (or part of it) compiled for a single pass over an output.
+
+    Every alternative follows a newline (the first line is matched on its own), which lets the regular expression engine
+    skip from one line to the next with a fast search for the newline instead of trying each position, and a lookahead
+    on the characters the alternatives start with turns most lines (heartbeats, debug prints) away at once.
+
+    :param metrics: the metrics to look for (default: all of :data:`METRICS`)
+    '''
+    def __init__(self, metrics=METRICS):
+        self.metrics = tuple(metrics)
+        self.markers = tuple(sorted({m.after for m in self.metrics if m.after is not None}))
+        self._widths = [re.compile(m.pattern.replace('{cpu}', r'(\d+)')).groups + ('{cpu}' in m.section) for m in self.metrics]
+
+        # Block-bound metrics come first, so they win on the lines of their block; when the block does not match, the
+        # line is tried again without them
+        bound = [(i, m) for i, m in enumerate(self.metrics) if m.after is not None]
+        free = [(i, m) for i, m in enumerate(self.metrics) if m.after is None]
+        markers = [(f'(?P<k{i}>{re.escape(k)})', {_lead(re.escape(k))}) for i, k in enumerate(self.markers)]
+
+        def compile_(alternatives):
+            if not alternatives:
+                return None, None
+            leads = set().union(*(leads for _, leads in alternatives))
+            body = r'[ \t]*' + _guard(leads) + '(?:' + '|'.join(alternative for alternative, _ in alternatives) + ')'
+            return re.compile(body.encode()), re.compile(b'\n' + body.encode())
+
+        self._head, self._regex = compile_(_body(bound) + markers + _body(free))
+        self._plain_head, self._plain = compile_(_body(free)) if bound else (None, None)
+        self._regions = None
+
+        # A block-bound line only counts after its marker, so the marker is the text to search for
+        literals = [_literal(m) for _, m in free] + list(self.markers)
+        self._literals = tuple(lit.encode() for lit in literals) if all(literals) else None
+
+    @classmethod
+    def for_fields(cls, *fields):
+        ''' A scanner for only the metrics that yield any of these fields. '''
+        wanted = set(fields)
+        return cls(m for m in METRICS if wanted.intersection(m.fields))
+
+    def _matches(self, data, pos, endpos):
+        if pos == 0:
+            first = self._head.match(data, 0, endpos)
+            if first is not None:
+                yield first
+        yield from self._regex.finditer(data, pos, endpos)
+
+    def scan(self, data, pos=0, endpos=None):
+        '''
+        Read every metric of an output, or of the lines of a part of it.
+
+        :param data: the output, as bytes (or str, or a buffer such as an :class:`mmap.mmap`)
+        :param pos: where the part starts: 0, or the position of the newline before its first line
+        :param endpos: where the part ends (default: at the end of the output)
+        :returns: a dict from field name to value, or to a ``{cpu: value}`` dict for per-core metrics; fields whose
+            line does not appear are absent
+        '''
+        if isinstance(data, str):
+            data = data.encode()
+        values = {}
+        if self._regex is None:
+            return values
+        if endpos is None:
+            endpos = len(data)
+        block = None
+        for match in self._matches(data, pos, endpos):
+            name = match.lastgroup
+            if name[0] == 'k':
+                block = self.markers[int(name[1:])]
+                continue
+            metric = self.metrics[int(name[1:])]
+            if metric.after is not None and metric.after != block:
+                plain = self._plain_head if match.re is self._head else self._plain
+                match = plain.match(data, match.start(), endpos) if plain is not None else None
+                if match is None:
+                    continue
+                name = match.lastgroup
+                metric = self.metrics[int(name[1:])]
+            start = match.re.groupindex[name]
+            self._record(values, metric, match.groups()[start:start + self._widths[int(name[1:])]])
+        return values
+
+    def _region(self, region):
+        if self._regions is None:
+            self._regions = {r: Scanner(m for m in self.metrics if m.region == r) for r in REGIONS}
+        return self._regions[region]
+
+    def scan_output(self, data):
+        '''
+        Read every metric of an output, looking for each in its region only (see :attr:`Metric.region`).
+
+        An output without final statistics (a run still going, or one that failed) is scanned whole.
+
+        :param data: as for :meth:`scan`
+        '''
+        if isinstance(data, str):
+            data = data.encode()
+        tail = tail_start(data)
+        if tail is None:
+            return self.scan(data)
+        head = tail
+        for end in HEAD_ENDS:
+            found = data.find(end, 0, head)
+            if found != -1:
+                head = found
+        values = self._region('tail').scan(data, tail)
+        values.update(self._region('head').scan(data, 0, head))
+        anywhere = self._region('any')
+        start = anywhere.first_line(data)
+        if start is not None:
+            values.update(anywhere.scan(data, start))
+        return values
+
+    def first_line(self, data):
+        '''
+        Where the first line that can hold a metric starts (the newline before it, or 0), found with a plain search for
+        the text each metric's lines contain; None if the output has no such line.
+        '''
+        if not self.metrics:
+            return None
+        if self._literals is None:
+            return 0
+        found = [i for i in (data.find(lit) for lit in self._literals) if i != -1]
+        if not found:
+            return None
+        return max(0, data.rfind(b'\n', 0, min(found)))
+
+    @staticmethod
+    def _record(values, metric, groups):
+        cpu = None
+        if metric.per_cpu:
+            cpu, groups = int(groups[0]), groups[1:]
+        try:
+            converted = [None if g is None else t(g) for t, g in zip(metric.types, groups)] if groups else [True]
+        except ValueError:
+            return
+        for field, value in zip(metric.fields, converted):
+            if value is None:
+                continue
+            target, key = (values.setdefault(field, {}), cpu) if metric.per_cpu else (values, field)
+            if metric.aggregate == 'first':
+                target.setdefault(key, value)
+            elif metric.aggregate == 'last':
+                target[key] = value
+            else:
+                target[key] = target.get(key, 0) + value
+
+def tail_start(data):
+    '''
+    Where the final statistics of an output start: the position of the newline before the error summary of the last
+    core to finish, or before its "finished" line. None if no core finished.
+    '''
+    finished = data.rfind(FINISHED)
+    if finished == -1:
+        return None
+    summary = data.rfind(PHASE_END_SUMMARY, max(0, finished - SUMMARY_REACH), finished)
+    return summary if summary != -1 else finished
+
+_scanner = None
+
+def _default_scanner():
+    global _scanner
+    if _scanner is None:
+        _scanner = Scanner()
+    return _scanner
+
+def parse_text(data):
+    ''' Read every metric of :data:`METRICS` from an output held in memory (see :meth:`Scanner.scan_output`). '''
+    return _default_scanner().scan_output(data)
+
+def parse_file(path, scanner=None):
+    '''
+    Read every metric of :data:`METRICS` (or of a given :class:`Scanner`) from an output file.
+
+    The file is mapped, not read: only the pages of the regions scanned are loaded, and none is held on to.
+    '''
+    scanner = scanner or _default_scanner()
+    with open(path, 'rb') as rfp:
+        if os.fstat(rfp.fileno()).st_size == 0:
+            return {}
+        with mmap.mmap(rfp.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return scanner.scan_output(data)
+
+def cpu_value(values, field, cpu=0):
+    ''' The value of a field for one core, whether the field is per core or not. '''
+    value = values.get(field)
+    return value.get(cpu) if isinstance(value, dict) else value
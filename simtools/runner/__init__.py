@@ -0,0 +1,11 @@
+'''
+A Python job runner for the experiment sweeps.
+
+Jobs are described in manifests (:mod:`.jobs`), run through a slot pool (:mod:`.scheduler`), watched for collapse
+(:mod:`.watchdog`) and recorded in a per-results-root registry (:mod:`.registry`).
+'''
+
+from .jobs import Job, load_manifest, write_manifest
+from .registry import JobRegistry, excluded_outputs
+from .scheduler import Runner
+from .watchdog import WatchdogPolicy
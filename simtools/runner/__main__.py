@@ -0,0 +1,538 @@
+'''
+Command-line interface of the job runner.
+
+Examples::
+
+    # Write a manifest for the GAP part of run_267_gap.sh
+    python3 -m simtools.runner manifest -o gap.json --family normal_evaluation --traces gap \\
+        2_retirement_threshold:2_retirement_threshold_gap 6_llc_way_sweep:6_llc_way_sweep_gap
+
+    # The same from the script itself; multicore mixes and the real_final runs are expanded from their scripts
+    python3 -m simtools.runner manifest -o gap.json --traces gap --script sim_configs/normal_evaluation/run_267_gap.sh
+    python3 -m simtools.runner manifest -o mixes.json --family multicore --script sim_configs/multicore/run_mixes.sh M1 C2
+    python3 -m simtools.runner manifest -o real_final.json --family real_final
+
+    # Run it on 38 slots, killing runs that spam 500 panic lines or cannot finish within 48 hours
+    python3 -m simtools.runner run gap.json -j 38 --panic-lines 500 --budget 48h --stall-min 180
+
+    # The same, with every job pinned to its own core and NUMA node; then compare simulation speed
+    python3 -m simtools.runner run gap.json -j 38 --placement
+    python3 -m simtools.runner kips
+
+    # Decompress each trace once into a shared 200 GiB local cache and run the jobs from it
+    python3 -m simtools.runner run gap.json -j 38 --trace-cache /local/trace-cache --trace-cache-size 200G
+    python3 -m simtools.runner trace-cache --trace-cache /local/trace-cache
+
+    # Record a run started by a shell script, and list the jobs the registry knows
+    python3 -m simtools.runner exec -o results/x/y/bin_trace.txt -- bin/bin --warmup-instructions 10 trace.xz
+    python3 -m simtools.runner jobs --state panic --state failed
+
+    # Start the jobs of each trace together and have them share one decoder
+    python3 -m simtools.runner run gap.json -j 38 --fanout 4
+
+    # Simulate the warmup shared by the points of an error sweep once per trace, then fork into the points
+    python3 -m simtools.runner run sweep.json -j 38 --fork 2
+
+    # Keep each result once, link experiments that share a run, and move existing results into the store
+    python3 -m simtools.runner run gap.json -j 38 --store
+    python3 -m simtools.runner store gap.json --adopt
+
+    # Cap panic floods and keep the debug prints of each job in indexed zstd frames next to its output
+    python3 -m simtools.runner run debug.json -j 38 --capture zstd --max-repeats 1000
+    bin/champsim_x --warmup-instructions 10000000 trace.xz | python3 -m simtools.runner capture -o out.txt --format zstd
+
+    # After changing the sources or the configurations, rerun only the results they affect
+    python3 -m simtools.runner stale gap.json -o rerun.json
+    python3 -m simtools.runner run rerun.json -j 38 --force
+
+    # Start the runs of fig13 (then fig11) ahead of everything else, and see when each figure can be rendered
+    python3 -m simtools.runner prioritize gap.json spec.json --figure fig13 --figure fig11
+
+    # Warm up once, then start every run of the same machine and trace from the checkpoint
+    bin/champsim_x --warmup-instructions 200000000 --checkpoint-out ckpt/fotonik3d.ckpt trace.xz
+    bin/champsim_x --checkpoint-in ckpt/fotonik3d.ckpt --simulation-instructions 500000000 trace.xz
+    python3 -m simtools.runner checkpoints gc ckpt --max-age 30d --manifest gap.json
+'''
+
+import argparse
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from .. import monitor as monitor_mod
+from .. import progress
+from . import jobs as jobs_mod
+from . import capture as capture_mod
+from . import checkpoints as checkpoints_mod
+from . import figures as figures_mod
+from . import registry as registry_mod
+from . import staleness
+from .placement import CorePlacer, Topology
+from .result_store import STORE_DIR_NAME, ResultStore
+from .staleness import Provenance
+from .scheduler import Runner, RunningJob
+from .trace_cache import DEFAULT_CACHE_DIR, TraceCache, parse_size
+from .trace_server import TraceServer
+from .watchdog import WatchdogPolicy
+
+def cmd_manifest(args):
+    if args.family == 'multicore':
+        if not args.script:
+            sys.exit('--family multicore needs --script (e.g. sim_configs/multicore/run_mixes.sh)')
+        all_jobs = jobs_mod.multicore_jobs(args.script, mixes=args.experiments or None, warmup=args.warmup, sim=args.sim)
+    elif args.family == 'real_final':
+        all_jobs = jobs_mod.real_final_jobs()
+    else:
+        defaults = jobs_mod.family_defaults(args.family)
+        if args.traces in ('spec', 'gap'):
+            traces = defaults[args.traces]
+        else:
+            traces = args.traces.split(',')
+        warmup = args.warmup if args.warmup is not None else defaults['warmup']
+        sim = args.sim if args.sim is not None else defaults['sim']
+
+        experiments = [spec.partition(':')[::2] for spec in args.experiments]
+        if args.script:
+            experiments.extend(jobs_mod.script_experiments(args.script))
+        if not experiments:
+            sys.exit('No experiments given')
+
+        all_jobs = []
+        for config_dir, result_tag in experiments:
+            all_jobs.extend(jobs_mod.experiment_jobs(args.family, config_dir, result_tag or config_dir, traces, warmup, sim))
+
+    jobs_mod.write_manifest(args.output, all_jobs)
+    print(f'Wrote {len(all_jobs)} jobs to {args.output}')
+
+def _optional_int(value):
+    return None if value in ('none', 'off', '0') else int(value)
+
+def cmd_run(args):
+    all_jobs = []
+    manifest_hashes = {}
+    for manifest in args.manifests:
+        digest = jobs_mod.manifest_hash(manifest)
+        for job in jobs_mod.load_manifest(manifest):
+            all_jobs.append(job)
+            manifest_hashes[job.job_id] = digest
+
+    policy = None
+    if not args.no_watchdog:
+        policy = WatchdogPolicy(panic_lines=args.panic_lines,
+                                budget=progress.parse_duration(args.budget) if args.budget else None,
+                                stall_minutes=args.stall_min, grace=progress.parse_duration(args.grace))
+
+    placer = None
+    if args.placement:
+        placer = CorePlacer(Topology.from_sysfs(), bind_memory=not args.no_membind)
+
+    trace_cache = None
+    if args.trace_cache:
+        trace_cache = TraceCache(args.trace_cache, max_bytes=parse_size(args.trace_cache_size), fmt=args.trace_cache_format)
+
+    store = None
+    if args.store:
+        store = ResultStore(args.store if isinstance(args.store, str) else os.path.join(args.results_root, STORE_DIR_NAME))
+
+    runner = Runner(all_jobs, results_root=args.results_root, max_parallel=args.jobs, policy=policy, poll_interval=args.interval,
+                    retry_killed=args.retry_killed, placer=placer, trace_cache=trace_cache, fanout=args.fanout,
+                    fanout_capacity=args.fanout_capacity << 20, manifest_hashes=manifest_hashes, store=store,
+                    capture=args.capture, max_repeats=args.max_repeats, force=args.force, fork=args.fork)
+    runner.run()
+
+def _option_value(cmd, option):
+    try:
+        return int(cmd[cmd.index(option) + 1])
+    except (ValueError, IndexError):
+        return None
+
+def cmd_exec(args):
+    '''
+    Run one simulator command as a registered job, writing its output to a file.
+
+    This lets the shell runners record their runs in the registry as well. The job id defaults to the one a manifest
+    would give the output file, and the exit status is the simulator's (124 after a timeout, as with timeout(1)).
+    '''
+    command = args.command[1:] if args.command[:1] == ['--'] else args.command
+    if not command:
+        sys.exit('No command given')
+    output = os.path.abspath(args.output)
+    job_id = args.job_id or jobs_mod.make_job_id(os.path.relpath(os.path.dirname(output), args.results_root), output)
+    registry = registry_mod.JobRegistry(args.results_root)
+
+    executable = shutil.which(command[0]) or command[0]
+    job = jobs_mod.Job(job_id=job_id, experiment=None, binary=os.path.basename(executable), traces=[a for a in command[1:] if os.path.isfile(a)],
+                       output=output, warmup=_option_value(command, '--warmup-instructions'),
+                       sim=_option_value(command, '--simulation-instructions'))
+    champsim_dir = os.path.dirname(os.path.dirname(os.path.abspath(executable)))
+    provenance = Provenance(champsim_dir, os.path.join(args.results_root, STORE_DIR_NAME)).of_job(job)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as outfile:
+        outfile.write(staleness.header_line(provenance))
+        outfile.flush()
+        start = time.time()
+        proc = subprocess.Popen(command, stdout=outfile, stderr=subprocess.STDOUT)
+        rj = RunningJob(None, proc, outfile, None, 0, start)
+        registry.record(job_id, registry_mod.RUNNING, output=output, binary=job.binary, traces=job.traces, warmup=job.warmup, sim=job.sim,
+                        host=socket.gethostname(), pid=proc.pid, start=start, **provenance)
+
+        timeout = progress.parse_duration(args.timeout) if args.timeout else float('inf')
+        timed_out = not rj.wait(timeout)
+        if timed_out:
+            proc.terminate()
+            if not rj.wait(10):
+                proc.kill()
+                rj.wait(float('inf'))
+
+    code = rj.proc.returncode
+    if timed_out:
+        state, code = registry_mod.TIMEOUT, 124
+    elif code == 0 and jobs_mod.is_complete(output):
+        state = registry_mod.DONE
+    else:
+        state = registry_mod.FAILED
+    registry.record(job_id, state, exit_code=code, **rj.resources())
+    return code
+
+def cmd_jobs(args):
+    ''' List the registry's jobs, optionally only those in some states. '''
+    registry = registry_mod.JobRegistry(args.results_root)
+    entries = registry.in_state(*args.state) if args.state else registry.latest()
+    for job_id, entry in sorted(entries.items()):
+        if args.experiment and not job_id.startswith(args.experiment):
+            continue
+        wall = progress.fmt_dur(entry['wall_time']) if 'wall_time' in entry else '-'
+        rss = f'{entry["max_rss"] / (1 << 30):.2f}G' if 'max_rss' in entry else '-'
+        print(f'{entry["state"]:<12} {wall:>7} {rss:>7}  {job_id}')
+
+def cmd_store(args):
+    '''
+    Show which jobs of the manifests have a stored result.
+
+    With ``--adopt``, completed outputs that are not in the store yet are moved into it, and outputs that duplicate a
+    stored result become links to it.
+    '''
+    store = ResultStore(args.store or os.path.join(args.results_root, STORE_DIR_NAME))
+    registry = registry_mod.JobRegistry(args.results_root)
+    counts = {}
+    for manifest in args.manifests:
+        for job in jobs_mod.load_manifest(manifest):
+            key = store.key_of(job)
+            if key is None:
+                status = 'no key'
+            elif os.path.islink(job.output) and os.path.realpath(job.output) == os.path.realpath(store.path_of(key)):
+                status = 'linked'
+            elif store.has(key):
+                status = 'stored'
+                if args.adopt and os.path.exists(job.output):
+                    store.link(key, job.output)
+                    registry.record(job.job_id, registry_mod.DONE, output=job.output, store_key=key, reused=True)
+                    status = 'deduplicated'
+            elif jobs_mod.is_complete(job.output):
+                status = 'complete'
+                if args.adopt:
+                    store.ingest(key, job.output, job_id=job.job_id)
+                    registry.record(job.job_id, registry_mod.DONE, output=job.output, store_key=key)
+                    status = 'adopted'
+            else:
+                status = 'missing'
+            counts[status] = counts.get(status, 0) + 1
+            print(f'{status:<13} {key[:12] if key else "-":<12}  {job.job_id}')
+    print(', '.join(f'{n} {status}' for status, n in sorted(counts.items())))
+
+def cmd_stale(args):
+    '''
+    Find the completed jobs of the manifests whose binary, configuration, sources or traces have changed since they ran,
+    print how many of each experiment would be rerun, and write them to a rerun manifest.
+    '''
+    provenance = Provenance(cache_dir=os.path.join(args.results_root, STORE_DIR_NAME))
+    entries = registry_mod.JobRegistry(args.results_root).latest()
+    rerun = []
+    per_experiment = {}
+    for manifest in args.manifests:
+        for job in jobs_mod.load_manifest(manifest):
+            counts = per_experiment.setdefault(job.experiment, {'total': 0, 'current': 0, 'stale': 0, 'missing': 0, 'reasons': {}})
+            counts['total'] += 1
+            if not jobs_mod.is_complete(job.output):
+                counts['missing'] += 1
+                if args.missing:
+                    rerun.append(job)
+                continue
+            reasons = provenance.check(job, provenance.recorded(job, entries.get(job.job_id)))
+            if reasons == [staleness.UNRECORDED] and not args.include_unrecorded:
+                reasons = []
+                counts['reasons'][staleness.UNRECORDED] = counts['reasons'].get(staleness.UNRECORDED, 0) + 1
+            if not reasons:
+                counts['current'] += 1
+                continue
+            counts['stale'] += 1
+            for reason in reasons:
+                counts['reasons'][reason] = counts['reasons'].get(reason, 0) + 1
+            if args.verbose:
+                print(f'{",".join(reasons):<20} {job.job_id}')
+            rerun.append(job)
+
+    print(f'{"experiment":<48} {"total":>6} {"current":>8} {"stale":>6} {"missing":>8}  reasons')
+    for experiment, counts in per_experiment.items():
+        reasons = ', '.join(f'{r} {n}' for r, n in sorted(counts['reasons'].items()))
+        print(f'{experiment:<48} {counts["total"]:>6} {counts["current"]:>8} {counts["stale"]:>6} {counts["missing"]:>8}  {reasons}')
+    if args.output:
+        jobs_mod.write_manifest(args.output, rerun)
+        print(f'Wrote {len(rerun)} jobs to {args.output} (run it with "run --force")')
+
+def cmd_prioritize(args):
+    '''
+    Move the jobs of the given figures to the front of the runners' queues, and report how far each figure's inputs
+    are: the prioritized figures, or without any, every figure that declares its inputs.
+    '''
+    all_jobs = [j for m in args.manifests for j in jobs_mod.load_manifest(m)]
+    if args.clear:
+        figures_mod.write_priorities(args.results_root, [])
+
+    resolved = {}
+    for name in args.figure or []:
+        script = figures_mod.find_figure(name, args.figures_dir)
+        inputs = figures_mod.read_inputs(script)
+        if inputs is None:
+            sys.exit(f'{script} does not declare its INPUTS')
+        resolved[figures_mod.figure_id(script)] = figures_mod.resolve(inputs, all_jobs)
+    if resolved:
+        previous = [(f, ids) for f, ids in figures_mod.read_priorities(args.results_root) if f not in resolved] if args.append else []
+        figures_mod.write_priorities(args.results_root, previous + [(f, [j.job_id for j in jobs]) for f, (jobs, _) in resolved.items()])
+    else:
+        prioritized = [f for f, _ in figures_mod.read_priorities(args.results_root)]
+        for figure, script in figures_mod.declared_figures(args.figures_dir).items():
+            if not prioritized or figure in prioritized:
+                resolved[figure] = figures_mod.resolve(figures_mod.read_inputs(script), all_jobs)
+
+    monitor = monitor_mod.Monitor(all_jobs, results_root=args.results_root)
+    statuses = {s.job.job_id: s for s in monitor.refresh()}
+    print(f'{"figure":<10} {"inputs":>7} {"done":>6} {"running":>8} {"pending":>8} {"ETA":>9}  unmatched')
+    for figure, (jobs, unmatched) in resolved.items():
+        report = figures_mod.figure_progress([statuses[j.job_id] for j in jobs], statuses.values(), args.slots)
+        eta = progress.fmt_dur(report['eta']) if report['eta'] is not None else '?'
+        print(f'{figure:<10} {len(jobs):>7} {report["done"]:>6} {report["running"]:>8} {report["pending"]:>8} {eta:>9}  '
+              f'{", ".join(unmatched) if unmatched else "-"}')
+
+def cmd_checkpoints(args):
+    '''
+    List the checkpoints under the given paths, verify them, or remove the damaged, superseded and expired ones
+    (``gc``). Checkpoints restored by the jobs of ``--manifest`` are kept.
+    '''
+    if args.action == 'gc':
+        keep = checkpoints_mod.referenced(j for m in args.manifest or [] for j in jobs_mod.load_manifest(m))
+        max_age = progress.parse_duration(args.max_age) if args.max_age else None
+        garbage, kept = checkpoints_mod.collect_garbage(args.paths, max_age=max_age, keep=keep)
+        freed = 0
+        for path, reason in garbage:
+            print(f'{"would remove" if args.dry_run else "removed":<13} {path}  ({reason})')
+            freed += os.path.getsize(path)
+            if not args.dry_run:
+                os.remove(path)
+        print(f'{len(garbage)} {"to remove" if args.dry_run else "removed"} ({freed / (1 << 30):.2f}G), {len(kept)} kept')
+        return 0
+
+    failures = 0
+    for path in checkpoints_mod.find_checkpoints(args.paths):
+        if path.endswith('.partial'):
+            continue
+        try:
+            ckpt = checkpoints_mod.read_checkpoint(path, verify=args.action == 'verify')
+        except (OSError, checkpoints_mod.CheckpointError) as e:
+            failures += 1
+            print(f'{"damaged":<8} {path}  ({e})')
+            continue
+        traces = ', '.join(f'{name}@{n}' for name, n in ckpt['traces'])
+        print(f'{ckpt["geometry_hash"]:016x} {ckpt["size"] / (1 << 20):>8.1f}M  warmup {ckpt["warmup"]:<11} {path}  {traces}')
+    return 1 if failures else 0
+
+def cmd_kips(args):
+    ''' Compare the simulation speed of completed jobs run with and without placement. '''
+    groups = {}
+    for entry in registry_mod.JobRegistry(args.results_root).in_state(registry_mod.DONE).values():
+        if entry.get('kips') is None:
+            continue
+        if args.experiment and not entry['job_id'].startswith(args.experiment):
+            continue
+        groups.setdefault(bool(entry.get('placement')), []).append(entry['kips'])
+
+    print(f'{"placement":<10} {"jobs":>6} {"mean KIPS":>10} {"median":>10} {"min":>10} {"max":>10}')
+    for placed in (False, True):
+        vals = groups.get(placed)
+        if not vals:
+            continue
+        print(f'{"on" if placed else "off":<10} {len(vals):>6} {statistics.fmean(vals):>10.1f} {statistics.median(vals):>10.1f} '
+              f'{min(vals):>10.1f} {max(vals):>10.1f}')
+    if groups.get(False) and groups.get(True):
+        print(f'speedup (mean): {statistics.fmean(groups[True]) / statistics.fmean(groups[False]):.3f}x')
+
+def cmd_trace_cache(args):
+    ''' List (or clear) the entries of a trace cache. '''
+    cache = TraceCache(args.trace_cache, max_bytes=parse_size(args.trace_cache_size))
+    if args.clear:
+        cache.clear()
+    entries = sorted(cache.entries().values(), key=lambda e: e['last_used'], reverse=True)
+    total = 0
+    for entry in entries:
+        size = entry['size'] or 0
+        total += size
+        state = 'building' if entry.get('builder') is not None else f'{len(entry["refs"])} refs'
+        print(f'{size / (1 << 30):8.2f} GiB  {state:>9}  {time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["last_used"]))}  '
+              f'{entry["source"]}')
+    print(f'{len(entries)} traces, {total / (1 << 30):.2f} of {cache.max_bytes / (1 << 30):.2f} GiB')
+
+def cmd_capture(args):
+    ''' Write the simulator output arriving on stdin to a capped, indexed output file. '''
+    writer = capture_mod.capture(sys.stdin.buffer, args.output, fmt=args.format, max_repeats=args.max_repeats,
+                                 frame_size=args.frame_size << 20, zstd_level=args.zstd_level, header=args.header)
+    if writer.suppressed:
+        print(f'{args.output}: suppressed {writer.suppressed} of {writer.lines} lines', file=sys.stderr)
+
+def cmd_serve(args):
+    ''' Decode one trace into a shared-memory segment for the simulators reading it. '''
+    server = TraceServer(args.trace, args.segment, capacity=args.capacity << 20, consumers=args.consumers,
+                         attach_timeout=args.attach_timeout, lag_timeout=args.lag_timeout)
+    start = time.time()
+    size = server.serve()
+    print(f'Served {size / (1 << 20):.1f} MiB of {args.trace} in {time.time() - start:.1f} s ({server.evicted} evicted)')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m simtools.runner', description='Run ChampSim experiment jobs')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('manifest', help='Expand experiments into a job manifest')
+    p.add_argument('-o', '--output', required=True, help='The manifest file to write')
+    p.add_argument('--family', default='normal_evaluation',
+                   help='The experiment family under sim_configs/; "multicore" and "real_final" follow their own scripts')
+    p.add_argument('--traces', default='spec', help='"spec", "gap", or a comma-separated list of trace paths')
+    p.add_argument('--warmup', type=int, help='Warmup instructions (default: the family\'s run_common.sh)')
+    p.add_argument('--sim', type=int, help='Simulation instructions (default: the family\'s run_common.sh)')
+    p.add_argument('--script', help='Take the experiments from a runner script; for multicore, the mix script to expand')
+    p.add_argument('experiments', nargs='*', metavar='CONFIG_DIR[:RESULT_TAG]', help='For multicore, the mixes to run')
+    p.set_defaults(func=cmd_manifest)
+
+    p = sub.add_parser('run', help='Run the jobs of one or more manifests')
+    p.add_argument('manifests', nargs='+')
+    p.add_argument('-j', '--jobs', type=int, default=int(os.environ.get('MAX_PARALLEL', 4)), help='Maximum parallel jobs')
+    p.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    p.add_argument('--interval', type=float, default=10.0, help='Seconds between polls')
+    p.add_argument('--no-watchdog', action='store_true', help='Never terminate running jobs')
+    p.add_argument('--panic-lines', type=_optional_int, default=500,
+                   help='Terminate a job after this many consecutive panic lines ("off" to disable)')
+    p.add_argument('--budget', default=os.environ.get('RUN_TIMEOUT'),
+                   help='Per-job wall-clock budget, e.g. 36h; jobs projected to exceed it are terminated')
+    p.add_argument('--grace', default='30m', help='Time before the projected duration is trusted')
+    p.add_argument('--stall-min', type=float, help='Terminate a job after this many minutes without a heartbeat')
+    p.add_argument('--retry-killed', action='store_true', help='Rerun jobs the watchdog previously terminated')
+    p.add_argument('--placement', action='store_true', help='Pin each job to a dedicated core and its NUMA node')
+    p.add_argument('--no-membind', action='store_true', help='With --placement, pin the CPU only and rely on first-touch allocation')
+    p.add_argument('--trace-cache', nargs='?', const=DEFAULT_CACHE_DIR, metavar='DIR',
+                   help=f'Decompress each trace once into this local cache (default: {DEFAULT_CACHE_DIR})')
+    p.add_argument('--trace-cache-size', default='100G', help='The size the trace cache may occupy, e.g. 200G')
+    p.add_argument('--trace-cache-format', default='auto', choices=('auto', 'raw', 'zstd'),
+                   help='How cached traces are stored; "auto" uses zstd when it is installed')
+    p.add_argument('--fanout', type=int, metavar='N',
+                   help='Serve a trace from shared memory to the jobs reading it when at least N of them start together')
+    p.add_argument('--fanout-capacity', type=int, default=256, metavar='MiB', help='The ring size of each trace server')
+    p.add_argument('--fork', type=int, metavar='N',
+                   help='Simulate the warmup once for jobs that differ only in Error Page Manager settings, and fork into them after it, '
+                        'when at least N of them start together')
+    p.add_argument('--force', action='store_true', help='Run every job, including completed ones (e.g. a manifest written by "stale")')
+    p.add_argument('--store', nargs='?', const=True, metavar='DIR',
+                   help='Keep results in a content-addressed store (default: <results root>/.store) and reuse stored ones')
+    p.add_argument('--capture', choices=capture_mod.FORMATS,
+                   help='Pipe each job\'s output through the capture writer; "zstd" keeps the debug prints in compressed frames '
+                        '(it needs the zstandard module or the zstd tool)')
+    p.add_argument('--max-repeats', type=_optional_int, default=1000,
+                   help='With --capture, the consecutive similar lines kept before the rest are suppressed ("none" to keep all)')
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser('exec', help='Run one simulator command and record it in the registry (for the shell runners)')
+    p.add_argument('-o', '--output', required=True, help='The file to write the simulator output to')
+    p.add_argument('--job-id', help='The job id (default: derived from the output path, as in a manifest)')
+    p.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    p.add_argument('--timeout', default=os.environ.get('RUN_TIMEOUT') or None, help='Stop the run after this long, e.g. 36h')
+    p.add_argument('command', nargs=argparse.REMAINDER, help='The simulator command, after "--"')
+    p.set_defaults(func=cmd_exec)
+
+    p = sub.add_parser('jobs', help='List the jobs of the registry')
+    p.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    p.add_argument('--state', action='append', choices=registry_mod.STATES, help='Only jobs in this state (repeatable)')
+    p.add_argument('--experiment', help='Only jobs whose id starts with this prefix')
+    p.set_defaults(func=cmd_jobs)
+
+    p = sub.add_parser('store', help='Show (or adopt) the stored results of the jobs of manifests')
+    p.add_argument('manifests', nargs='+')
+    p.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    p.add_argument('--store', metavar='DIR', help='The store directory (default: <results root>/.store)')
+    p.add_argument('--adopt', action='store_true', help='Move completed outputs into the store and link duplicates')
+    p.set_defaults(func=cmd_store)
+
+    p = sub.add_parser('stale', help='Find completed jobs whose binary, configuration, sources or traces have changed')
+    p.add_argument('manifests', nargs='+')
+    p.add_argument('-o', '--output', help='Write the jobs to rerun to this manifest')
+    p.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    p.add_argument('--missing', action='store_true', help='Also rerun jobs without a complete output')
+    p.add_argument('--include-unrecorded', action='store_true',
+                   help='Also rerun outputs that carry no provenance (written before it was recorded)')
+    p.add_argument('-v', '--verbose', action='store_true', help='List each stale job with its reasons')
+    p.set_defaults(func=cmd_stale)
+
+    p = sub.add_parser('prioritize', help='Start the runs of given figures first, and report when each figure can be rendered')
+    p.add_argument('manifests', nargs='+', help='The manifests the figures\' inputs are resolved against')
+    p.add_argument('--figure', action='append', help='A figure ID (e.g. fig13) or script; repeat in order of urgency')
+    p.add_argument('--append', action='store_true', help='Add the figures after those already prioritized')
+    p.add_argument('--clear', action='store_true', help='Drop the current priorities first')
+    p.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    p.add_argument('--figures-dir', default=figures_mod.FIGURES_DIR, help='Where the figure scripts are')
+    p.add_argument('--slots', type=int, default=int(os.environ.get('MAX_PARALLEL', 4)), help='The slots the runners use, for the ETA')
+    p.set_defaults(func=cmd_prioritize)
+
+    p = sub.add_parser('checkpoints', help='List, verify or clean up post-warmup checkpoints')
+    p.add_argument('action', choices=['list', 'verify', 'gc'])
+    p.add_argument('paths', nargs='+', help='Checkpoint files or directories holding them')
+    p.add_argument('--max-age', help='With gc, also remove checkpoints older than this (e.g. 30d)')
+    p.add_argument('--manifest', action='append', help='With gc, keep the checkpoints the jobs of this manifest restore')
+    p.add_argument('--dry-run', action='store_true', help='With gc, only show what would be removed')
+    p.set_defaults(func=cmd_checkpoints)
+
+    p = sub.add_parser('kips', help='Compare simulation speed (KIPS per job) with and without placement')
+    p.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    p.add_argument('--experiment', help='Only jobs whose id starts with this prefix')
+    p.set_defaults(func=cmd_kips)
+
+    p = sub.add_parser('trace-cache', help='Show the contents of a trace cache')
+    p.add_argument('--trace-cache', default=DEFAULT_CACHE_DIR, metavar='DIR', help='The cache directory')
+    p.add_argument('--trace-cache-size', default='100G', help='The size the trace cache may occupy')
+    p.add_argument('--clear', action='store_true', help='Remove every entry no job is using')
+    p.set_defaults(func=cmd_trace_cache)
+
+    p = sub.add_parser('capture', help='Write simulator output from stdin capped, indexed and optionally compressed')
+    p.add_argument('-o', '--output', required=True, help='The output file')
+    p.add_argument('--format', default='text', choices=capture_mod.FORMATS, help='"zstd" compresses the complete stream into <output>.zst')
+    p.add_argument('--max-repeats', type=_optional_int, default=1000,
+                   help='The consecutive similar lines kept before the rest are suppressed ("none" to keep all)')
+    p.add_argument('--frame-size', type=int, default=4, metavar='MiB', help='The uncompressed size of each zstd frame')
+    p.add_argument('--zstd-level', type=int, default=3, help='The zstd compression level')
+    p.add_argument('--header', help='A line to write before the output (the runner\'s provenance line)')
+    p.set_defaults(func=cmd_capture)
+
+    p = sub.add_parser('serve', help='Serve one trace to several simulators from shared memory')
+    p.add_argument('--segment', required=True, help='The segment name under /dev/shm')
+    p.add_argument('--consumers', type=int, default=1, help='Start once this many simulators have attached')
+    p.add_argument('--capacity', type=int, default=256, metavar='MiB', help='The ring size')
+    p.add_argument('--attach-timeout', type=float, default=60.0, help='Seconds to wait for the consumers to attach')
+    p.add_argument('--lag-timeout', type=float, default=30.0, help='Seconds a slow consumer may hold up the others')
+    p.add_argument('trace')
+    p.set_defaults(func=cmd_serve)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,311 @@
+'''
+A writer for simulator output that compresses, caps and indexes it while the run is in progress.
+
+Runs built with the debug prints (``[ERROR_REC]``, ``[FAULT]``, ``[ERR_LAT]``, ``[NORMAL_WAY_FILL]``) and runs stuck in
+a panic write output files of several gigabytes, which every parser then reads in full. The simulator's output is
+instead piped through an :class:`OutputWriter`, which
+
+* replaces, in the output file, a run of more than ``max_repeats`` lines that differ only in their numbers by a note
+  of how many were dropped (``[capture] suppressed N lines like: ...``), so a panic flood costs a few lines per
+  thousand;
+* records the offset of each section (heartbeats, ``Region of Interest Statistics``, the ``[LLC]``/``[ERROR]``
+  statistics blocks, ``Simulation complete``) in an index next to the output (``<output>.idx``); and
+* with the ``zstd`` format, writes the complete stream as independent zstd frames (``<output>.zst``), listed in the
+  index so that any byte range is read by decompressing only the frames holding it. Nothing is suppressed from it.
+  The output file itself then keeps every line except the debug prints, capped, so the monitor, the watchdog and the
+  statistics parsers read it as before.
+
+With the ``text`` format, the output file holds the whole stream, capped, and the index points into it.
+
+The frames are compressed with the ``zstandard`` module when it is installed, by one compressor kept for the whole
+run, and otherwise by the ``zstd`` tool, one process per frame; the ``zstd`` format needs one of them.
+
+:func:`final_stats` reads the last ``Region of Interest Statistics`` section with one seek when an index exists.
+
+Example::
+
+    bin/champsim_x --warmup-instructions 10000000 trace.xz | python3 -m simtools.runner capture -o out.txt --format zstd
+'''
+
+import bisect
+import json
+import os
+import re
+import shutil
+import subprocess
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+FORMATS = ('text', 'zstd')
+
+# The debug prints that the zstd format keeps out of the output file
+DEBUG_TAGS = (b'[ERROR_REC]', b'[FAULT]', b'[ERR_LAT]', b'[NORMAL_WAY_FILL]')
+
+INDEX_SUFFIX = '.idx'
+ZSTD_SUFFIX = '.zst'
+
+ROI = 'Region of Interest Statistics'
+
+# Lines that start a section, with the name the index gives them
+SECTION_STARTS = ((b'Heartbeat CPU', 'Heartbeat'), (b'Warmup complete', 'Warmup complete'), (ROI.encode(), ROI),
+                  (b'DRAM Statistics', 'DRAM Statistics'), (b'Simulation complete', 'Simulation complete'))
+RE_BLOCK_HEADER = re.compile(rb'^\[(\w+)\] =+ (.+?) =+\s*$')
+
+RE_NUMBER = re.compile(rb'\d+')
+RE_SUPPRESSED = re.compile(r'^\[capture\] suppressed (\d+) lines like: (.*)$')
+
+def zstd_available():
+    ''' Whether frames can be compressed: by the ``zstandard`` module, or the ``zstd`` tool. '''
+    return zstandard is not None or shutil.which('zstd') is not None
+
+def section_name(line):
+    ''' The index name of the section a line starts, or None. '''
+    for prefix, name in SECTION_STARTS:
+        if line.startswith(prefix):
+            return name
+    m = RE_BLOCK_HEADER.match(line)
+    if m:
+        return f'[{m.group(1).decode()}] {m.group(2).decode()}'
+    return None
+
+class OutputWriter:
+    '''
+    Write simulator output line by line, capped, indexed and (optionally) compressed.
+
+    :param output: the output file
+    :param fmt: ``text``, or ``zstd`` to compress the complete stream into ``<output>.zst``
+    :param max_repeats: the number of consecutive similar lines kept before the rest are suppressed, or None to keep all
+    :param frame_size: the uncompressed size of each zstd frame
+    :param zstd_level: the zstd compression level
+    :param header: a line written before the simulator's output (see :func:`~simtools.runner.staleness.header_line`)
+    '''
+
+    def __init__(self, output, fmt='text', max_repeats=1000, frame_size=4 << 20, zstd_level=3, header=None):
+        if fmt not in FORMATS:
+            raise ValueError(f'Unknown output format {fmt!r}')
+        self.zstd = None
+        self._compressor = None
+        if fmt == 'zstd':
+            if zstandard is not None:
+                self._compressor = zstandard.ZstdCompressor(level=zstd_level)
+            else:
+                self.zstd = shutil.which('zstd')
+                if self.zstd is None:
+                    raise ValueError('zstd format requested, but neither the zstandard module nor the zstd tool is installed')
+        self.output = output
+        self.fmt = fmt
+        self.max_repeats = max_repeats
+        self.frame_size = frame_size
+        self.zstd_level = zstd_level
+
+        self.text = open(output, 'wb')
+        self.stream = open(output + ZSTD_SUFFIX, 'wb') if fmt == 'zstd' else None
+        self.pending = bytearray() # the stream not yet compressed into a frame
+        self.stream_offset = 0     # the uncompressed size of the complete stream
+        self.frames = []           # [compressed offset, compressed size, uncompressed offset, uncompressed size]
+        self.sections = []         # [name, stream offset, output file offset]
+        self.lines = 0
+        self.suppressed = 0
+
+        self._last_key = None
+        self._repeats = 0
+        self._held = 0             # similar lines suppressed since the last note
+        self._sample = b''
+        if header:
+            line = header.encode()
+            self._emit(line, self._compress(line))
+
+    def write(self, line):
+        ''' Write one line (bytes, with its newline). '''
+        self.lines += 1
+        # The zstd stream keeps every line: only the output file is capped, and it leaves out the debug prints
+        offset = self._compress(line)
+        if self.stream is not None and line.startswith(DEBUG_TAGS):
+            return
+        key = RE_NUMBER.sub(b'#', line)
+        if key == self._last_key:
+            self._repeats += 1
+            if self.max_repeats is not None and self._repeats > self.max_repeats:
+                self.suppressed += 1
+                self._held += 1
+                self._sample = line
+                if self._held >= self.max_repeats:
+                    self._note()
+                return
+        else:
+            self._note()
+            self._last_key = key
+            self._repeats = 1
+        self._emit(line, offset)
+
+    def _note(self):
+        if self._held:
+            # With the zstd format the note is only in the output file; the stream has the lines themselves
+            note = b'[capture] suppressed %d lines like: %s\n' % (self._held, self._sample.rstrip(b'\n'))
+            self._emit(note, self.stream_offset)
+            self._held = 0
+
+    def _compress(self, line):
+        ''' Add a line to the zstd stream, if any. :returns: its offset in the stream '''
+        offset = self.stream_offset
+        if self.stream is not None:
+            self.pending += line
+            self.stream_offset += len(line)
+            if len(self.pending) >= self.frame_size:
+                self._frame()
+        return offset
+
+    def _emit(self, line, offset):
+        ''' Write a line of the output file, which starts at ``offset`` in the stream. '''
+        name = section_name(line)
+        if name is not None:
+            self.sections.append([name, offset, self.text.tell()])
+        self.text.write(line)
+        if self.stream is None:
+            self.stream_offset += len(line)
+
+    def _frame(self):
+        ''' Compress the pending part of the stream into one frame and update the index. '''
+        if not self.pending:
+            return
+        if self._compressor is not None:
+            data = self._compressor.compress(bytes(self.pending))
+        else:
+            data = subprocess.run([self.zstd, '-q', '-c', f'-{self.zstd_level}'], input=bytes(self.pending),
+                                  capture_output=True, check=True).stdout
+        start = self.stream.tell()
+        self.stream.write(data)
+        self.stream.flush()
+        self.frames.append([start, len(data), self.stream_offset - len(self.pending), len(self.pending)])
+        self.pending.clear()
+        self.text.flush()
+        self.write_index()
+
+    def write_index(self, complete=False):
+        index = {'format': self.fmt, 'complete': complete, 'lines': self.lines, 'suppressed': self.suppressed,
+                 'size': self.stream_offset, 'frames': self.frames, 'sections': self.sections}
+        path = self.output + INDEX_SUFFIX
+        with open(path + '.tmp', 'w') as wfp:
+            json.dump(index, wfp)
+        os.replace(path + '.tmp', path)
+
+    def close(self):
+        self._note()
+        if self.stream is not None:
+            self._frame()
+            self.stream.close()
+        self.text.close()
+        self.write_index(complete=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def capture(infile, output, **kwargs):
+    '''
+    Copy a stream of simulator output (e.g. a pipe) through an :class:`OutputWriter`.
+
+    Lines are written as they arrive, so the output file can be followed while the run is in progress.
+
+    :returns: the writer, closed
+    '''
+    with OutputWriter(output, **kwargs) as writer:
+        for line in iter(infile.readline, b''):
+            writer.write(line)
+            if line.startswith((b'Heartbeat CPU', b'Simulation complete')) or b' panic: IPC' in line:
+                writer.text.flush()
+    return writer
+
+def _decompress(data, sizes):
+    ''' The content of consecutive zstd frames of the given compressed sizes. '''
+    if zstandard is not None:
+        # A frame the zstd tool wrote from a pipe does not hold its content size, which a decompressobj does not need
+        dctx = zstandard.ZstdDecompressor()
+        out, start = [], 0
+        for size in sizes:
+            out.append(dctx.decompressobj().decompress(data[start:start + size]))
+            start += size
+        return b''.join(out)
+    return subprocess.run([shutil.which('zstd') or 'zstd', '-q', '-d', '-c'], input=data, capture_output=True,
+                          check=True).stdout
+
+class CapturedOutput:
+    '''
+    Random access to an output written by an :class:`OutputWriter`.
+
+    Without an index, the output file is taken to be the complete stream, and sections are found by scanning it.
+    '''
+
+    def __init__(self, output):
+        self.output = output
+        try:
+            with open(output + INDEX_SUFFIX) as rfp:
+                self.index = json.load(rfp)
+        except (OSError, ValueError):
+            self.index = None
+
+    @property
+    def compressed(self):
+        return self.index is not None and self.index['format'] == 'zstd'
+
+    def sections(self, name=None):
+        ''' The ``(name, stream offset, output file offset)`` of each section, optionally only those of one name. '''
+        if self.index is not None:
+            found = self.index['sections']
+        else:
+            found = []
+            with open(self.output, 'rb') as rfp:
+                offset = 0
+                for line in rfp:
+                    section = section_name(line)
+                    if section is not None:
+                        found.append([section, offset, offset])
+                    offset += len(line)
+        return [tuple(s) for s in found if name is None or s[0] == name]
+
+    def read(self, offset, length=None):
+        ''' Bytes of the complete stream, decompressing only the frames that hold them. '''
+        if not self.compressed:
+            with open(self.output, 'rb') as rfp:
+                rfp.seek(offset)
+                return rfp.read(-1 if length is None else length)
+
+        frames = self.index['frames']
+        end = self.index['size'] if length is None else min(offset + length, self.index['size'])
+        first = max(0, bisect.bisect_right([f[2] for f in frames], offset) - 1)
+        last = max(first, bisect.bisect_left([f[2] for f in frames], end))
+        held = frames[first:last]
+        if not held:
+            return b''
+        # The frames holding the range are contiguous: they are read, and decompressed, in one go
+        with open(self.output + ZSTD_SUFFIX, 'rb') as rfp:
+            rfp.seek(held[0][0])
+            data = _decompress(rfp.read(held[-1][0] + held[-1][1] - held[0][0]), [f[1] for f in held])
+        base = held[0][2]
+        return data[offset - base:end - base]
+
+    def read_text(self, offset, length=None):
+        ''' Bytes of the output file. '''
+        with open(self.output, 'rb') as rfp:
+            rfp.seek(offset)
+            return rfp.read(-1 if length is None else length)
+
+def final_stats(output):
+    '''
+    The text of an output from its last ``Region of Interest Statistics`` line to the end, or '' if it has none.
+
+    With an index this is one seek into the output file; the statistics are never among the lines kept out of it.
+    '''
+    captured = CapturedOutput(output)
+    try:
+        sections = captured.sections(ROI)
+    except OSError:
+        return ''
+    if not sections:
+        return ''
+    return captured.read_text(sections[-1][2]).decode('utf-8', 'replace')
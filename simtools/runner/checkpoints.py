@@ -0,0 +1,169 @@
+'''
+Post-warmup checkpoints written by the simulator's ``--checkpoint-out`` (see ``inc/checkpoint.h`` for the format).
+
+A checkpoint holds the state a warmup leaves behind, keyed by a hash of the simulated machine's geometry, and a run
+started with ``--checkpoint-in`` restores it instead of simulating the warmup. This module reads their headers, checks
+that they are whole, and removes the ones that are no longer useful: damaged files, checkpoints superseded by a newer
+one of the same binary build, geometry, traces and warmup, and, if asked, old ones. The geometry alone does not name a
+configuration: machines of the same geometry may differ in their modules or error settings, so their checkpoints are
+told apart by the build ID of the binary that wrote them. Checkpoints named by a job's ``--checkpoint-in``
+are always kept.
+'''
+
+import os
+import time
+import zlib
+
+MAGIC = b'CHMPCKPT'
+VERSION = 2
+SUFFIX = '.ckpt'
+FOOTER_SIZE = 4
+
+# How long the file of a save in progress may sit before it is taken for the leftover of a crashed run
+PARTIAL_GRACE = 3600
+
+class CheckpointError(ValueError):
+    pass
+
+def geometry_hash(geometry):
+    ''' The FNV-1a hash of a geometry description, as the simulator computes it. '''
+    value = 0xcbf29ce484222325
+    for byte in geometry.encode():
+        value = ((value ^ byte) * 0x100000001b3) & 0xffffffffffffffff
+    return value
+
+class _Reader:
+    def __init__(self, data, pos=0, end=None):
+        self.data = data
+        self.pos = pos
+        self.end = len(data) if end is None else end
+
+    def varint(self):
+        value = 0
+        shift = 0
+        while True:
+            if self.pos >= self.end or shift >= 64:
+                raise CheckpointError('truncated')
+            byte = self.data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return value
+            shift += 7
+
+    def signed(self):
+        raw = self.varint()
+        return (raw >> 1) ^ -(raw & 1)
+
+    def string(self):
+        length = self.varint()
+        if length > self.end - self.pos:
+            raise CheckpointError('truncated')
+        self.pos += length
+        return bytes(self.data[self.pos - length:self.pos]).decode(errors='replace')
+
+def read_checkpoint(path, verify=True):
+    '''
+    Read the header and the section list of a checkpoint.
+
+    :param verify: check the checksum too (this reads the whole file)
+    :returns: a dict with ``path``, ``size``, ``mtime``, ``version``, ``build_id`` (as 16 hex digits),
+        ``geometry_hash``, ``geometry``, ``warmup``, ``traces`` (``(file name, instructions read)`` pairs) and
+        ``sections`` (``(name, length)`` pairs)
+    :raises CheckpointError: if the file is not a whole checkpoint this module can read
+    '''
+    with open(path, 'rb') as rfp:
+        data = rfp.read()
+    stat = os.stat(path)
+    if len(data) < len(MAGIC) + FOOTER_SIZE or not data.startswith(MAGIC):
+        raise CheckpointError('not a checkpoint')
+    body_end = len(data) - FOOTER_SIZE
+    if verify and zlib.crc32(memoryview(data)[:body_end]) != int.from_bytes(data[body_end:], 'little'):
+        raise CheckpointError('checksum mismatch')
+
+    reader = _Reader(data, len(MAGIC), body_end)
+    version = reader.varint()
+    if version != VERSION:
+        raise CheckpointError(f'format version {version}')
+    ckpt = {'path': path, 'size': stat.st_size, 'mtime': stat.st_mtime, 'version': version}
+    ckpt['build_id'] = f'{reader.varint():016x}'
+    ckpt['geometry_hash'] = reader.varint()
+    ckpt['geometry'] = reader.string()
+    ckpt['warmup'] = reader.signed()
+    ckpt['traces'] = [(reader.string(), reader.signed()) for _ in range(reader.varint())]
+    if verify and geometry_hash(ckpt['geometry']) != ckpt['geometry_hash']:
+        raise CheckpointError('geometry hash mismatch')
+
+    ckpt['sections'] = []
+    while reader.pos < body_end:
+        name = reader.string()
+        length = reader.varint()
+        if length > body_end - reader.pos:
+            raise CheckpointError(f'section {name} is truncated')
+        reader.pos += length
+        ckpt['sections'].append((name, length))
+    return ckpt
+
+def find_checkpoints(paths):
+    ''' The checkpoint files (and leftover partial saves) under the given files and directories. '''
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            for name in sorted(filenames):
+                if name.endswith(SUFFIX) or name.endswith(SUFFIX + '.partial'):
+                    yield os.path.join(dirpath, name)
+
+def referenced(jobs):
+    ''' The checkpoints the jobs restore, as absolute paths. '''
+    refs = set()
+    for job in jobs:
+        args = list(job.args)
+        for i, arg in enumerate(args[:-1]):
+            if arg == '--checkpoint-in':
+                refs.add(os.path.abspath(args[i + 1]))
+    return refs
+
+def collect_garbage(paths, max_age=None, keep=(), now=None):
+    '''
+    Decide which checkpoints can go.
+
+    :param max_age: also drop checkpoints older than this many seconds
+    :param keep: paths that are never dropped (see :func:`referenced`)
+    :returns: ``(path, reason)`` pairs, and the checkpoints that stay
+    '''
+    now = time.time() if now is None else now
+    keep = {os.path.abspath(p) for p in keep}
+    garbage = []
+    valid = []
+    for path in find_checkpoints(paths):
+        if os.path.abspath(path) in keep:
+            continue
+        if path.endswith('.partial'):
+            if now - os.stat(path).st_mtime > PARTIAL_GRACE:
+                garbage.append((path, 'partial'))
+            continue
+        try:
+            valid.append(read_checkpoint(path))
+        except (OSError, CheckpointError) as e:
+            garbage.append((path, f'damaged: {e}'))
+
+    newest = {}
+    for ckpt in sorted(valid, key=lambda c: c['mtime'], reverse=True):
+        key = (ckpt['build_id'], ckpt['geometry_hash'], tuple(ckpt['traces']), ckpt['warmup'])
+        if key in newest:
+            garbage.append((ckpt['path'], f'superseded by {newest[key]["path"]}'))
+        elif max_age is not None and now - ckpt['mtime'] > max_age:
+            garbage.append((ckpt['path'], 'expired'))
+        else:
+            newest[key] = ckpt
+
+    kept = [c for c in valid if c['path'] not in {p for p, _ in garbage}]
+    for path in keep:
+        if os.path.isfile(path):
+            try:
+                kept.append(read_checkpoint(path, verify=False))
+            except (OSError, CheckpointError):
+                pass
+    return garbage, kept
@@ -0,0 +1,173 @@
+'''
+The runs each paper figure is drawn from, and the order in which the runner should start them.
+
+Each figure script under ``normal_evaluation_script/paper_figures`` declares its inputs in a module-level ``INPUTS``
+list, read here with :func:`ast.literal_eval` so that neither the script nor its plotting dependencies are imported::
+
+    INPUTS = [
+        {"experiment": "6_llc_way_sweep", "binary": "sweep_{size}_w{ways}_{rate}",
+         "axes": {"size": ["2MB"], "ways": [1, 2, 4, 8], "rate": ["1e-8"]}, "suites": ["SPEC", "GAP"]},
+    ]
+
+An input names an experiment (the result directory under ``results/<family>``, ``normal_evaluation`` unless
+``"family"`` says otherwise), the binaries as a name pattern over configuration axes (every combination of the axes'
+values), the suites (``SPEC`` results are in the experiment's own directory, the others in ``<experiment>_<suite>``),
+and optionally ``"workloads"``, names a trace must contain.
+
+``prioritize`` resolves the inputs of the requested figures against job manifests and writes their job IDs to
+``priorities.json`` at the top of the results root. A running :class:`~simtools.runner.scheduler.Runner` re-reads it
+whenever it changes and starts the jobs of the first figure first, then those of the second, and so on.
+'''
+
+import ast
+import glob
+import itertools
+import json
+import os
+import statistics
+
+from .. import monitor as monitor_mod
+from . import jobs as jobs_mod
+
+FIGURES_DIR = os.path.join(jobs_mod.CHAMPSIM_DIR, 'normal_evaluation_script', 'paper_figures')
+PRIORITIES_NAME = 'priorities.json'
+
+# The result directory suffix of each suite, as in generate_raw_data.py
+SUITE_SUFFIXES = {'SPEC': '', 'GAP': '_gap', 'XSBENCH': '_xsbench', 'LLAMA': '_llama', 'REDIS': '_redis'}
+
+def find_figure(name, figures_dir=FIGURES_DIR):
+    ''' The script of a figure, given as a path or as its ID (``fig13`` is ``fig13_*.py``). '''
+    if os.path.isfile(name):
+        return name
+    candidates = sorted(glob.glob(os.path.join(figures_dir, f'{name}_*.py'))) + sorted(glob.glob(os.path.join(figures_dir, f'{name}.py')))
+    if not candidates:
+        raise ValueError(f'No figure script for {name!r} in {figures_dir}')
+    return candidates[0]
+
+def figure_id(script):
+    return os.path.basename(script).split('_', 1)[0].removesuffix('.py')
+
+def read_inputs(script):
+    ''' The ``INPUTS`` a figure script declares, or None if it declares none. '''
+    with open(script) as rfp:
+        tree = ast.parse(rfp.read(), filename=script)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == 'INPUTS' for t in node.targets):
+            return ast.literal_eval(node.value)
+    return None
+
+def declared_figures(figures_dir=FIGURES_DIR):
+    ''' The figure scripts that declare their inputs, by figure ID. '''
+    found = {}
+    for script in sorted(glob.glob(os.path.join(figures_dir, 'fig*.py'))):
+        if read_inputs(script) is not None:
+            found.setdefault(figure_id(script), script)
+    return found
+
+def expand_input(entry):
+    '''
+    The experiments and binaries of one declared input.
+
+    :returns: the experiment IDs (``<family>/<result directory>``) and the binary names
+    '''
+    family = entry.get('family', 'normal_evaluation')
+    experiments = [f'{family}/{entry["experiment"]}{SUITE_SUFFIXES[s.upper()]}' for s in entry.get('suites', ['SPEC'])]
+    axes = entry.get('axes', {})
+    names = list(axes)
+    binaries = [entry['binary'].format(**dict(zip(names, values))) for values in itertools.product(*(axes[n] for n in names))]
+    return experiments, binaries
+
+def resolve(inputs, jobs):
+    '''
+    The jobs a figure's inputs refer to.
+
+    :returns: the matching jobs, in manifest order, and the ``experiment/binary`` inputs no job matched
+    '''
+    wanted = {}
+    for entry in inputs:
+        experiments, binaries = expand_input(entry)
+        for experiment in experiments:
+            for binary in binaries:
+                wanted[(experiment, binary)] = entry.get('workloads')
+
+    matched = []
+    seen = set()
+    for job in jobs:
+        key = (job.experiment, job.binary)
+        if key not in wanted:
+            continue
+        workloads = wanted[key]
+        tags = [jobs_mod.trace_tag(t) for t in job.traces]
+        if workloads is not None and not any(w in tag for w in workloads for tag in tags):
+            continue
+        matched.append(job)
+        seen.add(key)
+    return matched, sorted(f'{e}/{b}' for e, b in wanted.keys() - seen)
+
+def write_priorities(results_root, figures):
+    '''
+    Record the jobs to start first.
+
+    :param figures: ``(figure, job IDs)`` pairs, most urgent first
+    '''
+    os.makedirs(results_root, exist_ok=True)
+    path = os.path.join(results_root, PRIORITIES_NAME)
+    with open(path + '.tmp', 'w') as wfp:
+        json.dump({'figures': [{'figure': f, 'jobs': list(ids)} for f, ids in figures]}, wfp, indent=1)
+    os.replace(path + '.tmp', path)
+
+def read_priorities(results_root):
+    ''' The prioritized ``(figure, job IDs)`` pairs, most urgent first. '''
+    try:
+        with open(os.path.join(results_root, PRIORITIES_NAME)) as rfp:
+            data = json.load(rfp)
+    except (OSError, ValueError):
+        return []
+    return [(f['figure'], f['jobs']) for f in data.get('figures', [])]
+
+def priority_ranks(results_root):
+    ''' For each prioritized job ID, the position of the first figure that needs it. '''
+    ranks = {}
+    for rank, (_, job_ids) in enumerate(read_priorities(results_root)):
+        for job_id in job_ids:
+            ranks.setdefault(job_id, rank)
+    return ranks
+
+def figure_progress(statuses, peers, slots):
+    '''
+    How far a figure's inputs are, and how long until all of them are done.
+
+    Pending jobs are assumed to start ahead of everything else (as prioritized), each taking the median duration of
+    the completed jobs of its experiment (or of all the ``peers``), spread over ``slots`` runners' slots.
+
+    :param statuses: the :class:`~simtools.monitor.JobStatus` of each input job
+    :param peers: the statuses of all the jobs of the manifests, for typical durations
+    :returns: counts of done, running and pending jobs, and the ETA in seconds (None if it cannot be told yet)
+    '''
+    durations = {}
+    for s in peers:
+        if s.state == monitor_mod.DONE and s.duration is not None:
+            durations.setdefault(s.job.experiment, []).append(s.duration)
+    overall = [d for ds in durations.values() for d in ds]
+
+    counts = {'done': 0, 'running': 0, 'pending': 0}
+    running_etas = []
+    pending_work = []
+    for s in statuses:
+        if s.state == monitor_mod.DONE:
+            counts['done'] += 1
+        elif s.state in (monitor_mod.RUNNING, monitor_mod.STALLED, monitor_mod.PANIC):
+            counts['running'] += 1
+            running_etas.append(s.eta)
+        else:
+            counts['pending'] += 1
+            typical = durations.get(s.job.experiment) or overall
+            pending_work.append(statistics.median(typical) if typical else None)
+
+    if None in running_etas or None in pending_work:
+        eta = None
+    elif not running_etas and not pending_work:
+        eta = 0.0
+    else:
+        eta = max(max(running_etas, default=0.0), (sum(running_etas) + sum(pending_work)) / max(1, slots))
+    return {**counts, 'eta': eta}
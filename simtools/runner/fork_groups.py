@@ -0,0 +1,119 @@
+'''
+Fork-after-warmup groups.
+
+The points of an error sweep are binaries whose configurations differ only in ``error_page_manager`` settings, and no
+error is injected during warmup, so every point simulates the same warmup. A fork group simulates it once: one of the
+binaries is started with ``--fork-points`` (see ``inc/fork_sweep.h``) and, after the warmup, forks one child per point,
+which applies the point's settings and writes the point's output.
+
+Jobs can share a group when they run the same traces with the same instruction budgets and arguments, and their
+configurations are the same but for the executable name and the :data:`SETTABLE_KEYS` of ``error_page_manager``. The
+Error Page Manager must inject nothing during warmup (``CYCLE`` or ``OFF`` mode).
+'''
+
+import json
+import os
+import re
+
+FORK_DIR_NAME = '.fork'
+
+# The error_page_manager keys a point may set (as in src/fork_sweep.cc), with the value a binary configured without
+# them gets (the member initializers of ErrorPageManager, or the defaults of config/instantiation_file.py)
+SETTABLE_KEYS = {
+    'error_cycle_interval': 0,
+    'retirement_threshold': 32,
+    'baseline_retirement_threshold': 1,
+    'max_error_ways_per_set': 8,
+    'cache_pinning': False,
+    'dynamic_error_latency': True,
+    'error_latency_penalty': 0,
+    'pte_error_latency_penalty': 0,
+    'error_location_stats': False,
+    'debug': 1
+}
+
+# The modes whose injection only starts with the simulation phase (the generated environment defaults to OFF)
+WARMUP_SILENT_MODES = ('CYCLE', 'OFF')
+
+# The line the group's process writes for each child it starts
+RE_FORKED = re.compile(r'^Forked point (\d+) \(pid (\d+)\)', re.M)
+
+def point_settings(config):
+    '''
+    The ``error_page_manager`` settings a point applies after the warmup: all of them, so that nothing is left as the
+    group's binary configured it.
+    '''
+    epm = config.get('error_page_manager', {})
+    return {k: epm.get(k, default) for k, default in SETTABLE_KEYS.items()}
+
+def warmup_key(config):
+    ''' What the warmup of a configuration depends on, as a string; None if its warmup cannot be shared. '''
+    epm = config.get('error_page_manager', {})
+    if epm.get('mode', 'OFF') not in WARMUP_SILENT_MODES:
+        return None
+    shared = {k: v for k, v in config.items() if k not in ('executable_name', 'error_page_manager')}
+    shared['error_page_manager'] = {k: v for k, v in epm.items() if k not in SETTABLE_KEYS}
+    return json.dumps(shared, sort_keys=True)
+
+class ForkGrouper:
+    ''' The fork group key and point settings of jobs, reading each configuration once. '''
+
+    def __init__(self):
+        self._configs = {}
+
+    def _config(self, path):
+        if path not in self._configs:
+            try:
+                with open(path) as rfp:
+                    self._configs[path] = json.load(rfp)
+            except (OSError, ValueError):
+                self._configs[path] = None
+        return self._configs[path]
+
+    def key(self, job):
+        ''' Jobs with the same key can share a fork group; None if the job must run on its own. '''
+        config = self._config(job.config) if job.config is not None else None
+        shared = warmup_key(config) if config is not None else None
+        if shared is None:
+            return None
+        return (tuple(job.traces), job.warmup, job.sim, tuple(job.args), shared)
+
+    def settings(self, job):
+        return point_settings(self._config(job.config))
+
+def write_points(path, points):
+    '''
+    Write the point list of a fork group.
+
+    :param points: ``(output, settings)`` pairs; each point writes its ``--json`` statistics next to its output
+    '''
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'w') as wfp:
+        json.dump({'points': [{'output': os.path.abspath(output), 'error_page_manager': settings,
+                               'json': os.path.splitext(os.path.abspath(output))[0] + '.json'} for output, settings in points]},
+                  wfp, indent=1)
+    os.replace(path + '.tmp', path)
+
+def child_pids(log_path):
+    ''' The process of each point a fork group has started, by point index, from the group's log. '''
+    try:
+        with open(log_path) as rfp:
+            text = rfp.read()
+    except OSError:
+        return {}
+    return {int(point): int(pid) for point, pid in RE_FORKED.findall(text)}
+
+def is_alive(pid):
+    ''' Whether a process is still running (an exited child its parent has not collected yet is not). '''
+    try:
+        with open(f'/proc/{pid}/stat') as rfp:
+            return rfp.read().rpartition(')')[2].split()[0] != 'Z'
+    except OSError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -0,0 +1,395 @@
+'''
+Job descriptions and job manifests.
+
+A job is one simulator invocation: a binary, the traces for each CPU, the instruction budgets and the output file.
+The naming follows the shell runners exactly (``<binary>_<trace_tag>.txt`` under ``results/<family>/<result_tag>``),
+so a manifest generated here points at the same files those scripts produce and skip.
+'''
+
+import dataclasses
+import glob
+import hashlib
+import json
+import os
+import re
+from typing import Optional
+
+CHAMPSIM_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_ROOT = os.path.join(CHAMPSIM_DIR, 'results')
+
+MANIFEST_VERSION = 1
+
+RE_EXE = re.compile(r'"executable_name"\s*:\s*"([^"]+)"')
+RE_ASSIGN = re.compile(r'^\s*(\w+)\s*=\s*"?(\d+)"?\s*$', re.M)
+RE_ASSOC_ITEM = re.compile(r'\[(\w+)\]="([^"]*)"')
+
+# The section header config/makefile.py writes for each configuration into _configuration.mk
+RE_MAKEFILE_BUILD = re.compile(r'^# Build ID: (\w+)\n# Executable: (.+)$', re.M)
+
+# The suffixes stripped by run_common.sh when it forms the output file name. Other trace names (e.g. the GAP
+# ``bc-3.trace.gz``) are kept verbatim.
+TRACE_TAG_SUFFIXES = ('.champsimtrace.xz', '.champsim.trace.gz')
+
+@dataclasses.dataclass
+class Job:
+    job_id: str
+    experiment: str
+    binary: str
+    traces: list
+    output: str
+    warmup: Optional[int]
+    sim: Optional[int]
+    args: list = dataclasses.field(default_factory=list)
+    config: Optional[str] = None
+
+    @property
+    def total_instr(self):
+        ''' Instructions each CPU retires over both phases, or None if the job runs to the end of its traces. '''
+        if self.sim is None:
+            return None
+        return (self.warmup or 0) + self.sim
+
+    @property
+    def result_dir(self):
+        return os.path.dirname(self.output)
+
+    @property
+    def json_output(self):
+        ''' The statistics the simulator writes with ``--json``, next to the output. '''
+        return os.path.splitext(self.output)[0] + '.json'
+
+    def command(self, champsim_dir=CHAMPSIM_DIR, traces=None, json_stats=False):
+        '''
+        The argument vector that runs this job.
+
+        :param traces: read these files instead of the job's traces (e.g. cached decompressed copies)
+        :param json_stats: also write the statistics to :attr:`json_output`
+        '''
+        budgets = []
+        if self.warmup is not None:
+            budgets += ['--warmup-instructions', str(self.warmup)]
+        if self.sim is not None:
+            budgets += ['--simulation-instructions', str(self.sim)]
+        if json_stats:
+            budgets += ['--json', self.json_output]
+        return [
+            os.path.join(champsim_dir, 'bin', self.binary),
+            *budgets,
+            *self.args,
+            *(traces if traces is not None else self.traces)
+        ]
+
+    def to_dict(self):
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, d):
+        fields = {f.name for f in dataclasses.fields(cls)}
+        return cls(**{k: v for k, v in d.items() if k in fields})
+
+def trace_tag(trace):
+    ''' The name a trace contributes to an output file, as formed by run_common.sh. '''
+    base = os.path.basename(trace)
+    for suffix in TRACE_TAG_SUFFIXES:
+        if base.endswith(suffix):
+            return base[:-len(suffix)]
+    return base
+
+def make_job_id(experiment, output):
+    ''' Jobs are identified by their experiment and the stem of their output file. '''
+    return f'{experiment}/{os.path.splitext(os.path.basename(output))[0]}'
+
+def parse_exe_name(config_path):
+    ''' The ``executable_name`` of a configuration file, or None if it does not have one. '''
+    try:
+        with open(config_path) as rfp:
+            m = RE_EXE.search(rfp.read())
+    except OSError:
+        return None
+    return m.group(1) if m else None
+
+def shell_array(path, name, env=None):
+    '''
+    Read the active (uncommented) elements of a bash array assignment ``NAME=( ... )``.
+
+    ``${VAR}`` references are expanded from ``env``; unknown variables are left in place.
+
+    :param path: the shell file to read
+    :param name: the array variable name
+    :param env: a mapping used to expand variables in the elements
+    '''
+    env = env or {}
+    try:
+        with open(path) as rfp:
+            text = rfp.read()
+    except OSError:
+        return []
+
+    # A one-line assignment ``NAME=(a b c)``
+    m = re.search(r'^\s*' + re.escape(name) + r'=\(([^\n)]*)\)', text, re.M)
+    if m:
+        return [_expand(v.strip('"'), env) for v in m.group(1).split('#', 1)[0].split()]
+
+    m = re.search(r'^\s*' + re.escape(name) + r'=\((.*?)^\s*\)', text, re.M | re.S)
+    if not m:
+        return []
+
+    values = []
+    for line in m.group(1).splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        value = line.split('#', 1)[0].strip().strip('"')
+        values.append(_expand(value, env))
+    return values
+
+def shell_assoc(path, name, env=None):
+    '''
+    Read the active elements of a bash associative array ``declare -A NAME=( [key]="value" ... )``.
+
+    :returns: a dict in the order the keys appear
+    '''
+    env = env or {}
+    try:
+        with open(path) as rfp:
+            text = rfp.read()
+    except OSError:
+        return {}
+
+    m = re.search(r'^\s*declare -A ' + re.escape(name) + r'=\((.*?)^\s*\)', text, re.M | re.S)
+    if not m:
+        return {}
+
+    values = {}
+    for line in m.group(1).splitlines():
+        line = line.strip()
+        if line.startswith('#'):
+            continue
+        for key, value in RE_ASSOC_ITEM.findall(line):
+            values[key] = _expand(value, env)
+    return values
+
+def _expand(value, env):
+    ''' Expand ``${VAR}`` and ``${VAR:-default}`` references from ``env``; unknown variables are left in place. '''
+    return re.sub(r'\$\{(\w+)(?::-[^}]*)?\}', lambda v: str(env.get(v.group(1), v.group(0))), value)
+
+def shell_int(path, name, default=None):
+    ''' Read a plain integer assignment ``NAME=123`` from a shell file. '''
+    try:
+        with open(path) as rfp:
+            text = rfp.read()
+    except OSError:
+        return default
+    for var, value in RE_ASSIGN.findall(text):
+        if var == name:
+            return int(value)
+    return default
+
+def family_defaults(family, champsim_dir=CHAMPSIM_DIR):
+    '''
+    The trace lists and instruction budgets a family's ``run_common.sh`` uses.
+
+    :returns: a dict with keys ``spec``, ``gap`` (lists of trace paths), ``warmup`` and ``sim``
+    '''
+    family_dir = os.path.join(champsim_dir, 'sim_configs', family)
+    env = {
+        'CHAMPSIM_DIR': champsim_dir,
+        'TRACE_DIR': os.environ.get('TRACE_DIR', os.path.join(champsim_dir, 'test_traces'))
+    }
+    run_common = os.path.join(family_dir, 'run_common.sh')
+    return {
+        'spec': shell_array(run_common, 'SPEC_TRACES', env),
+        'gap': shell_array(os.path.join(family_dir, 'run_gap_common.sh'), 'GAP_TRACES', env),
+        'warmup': shell_int(run_common, 'WARMUP', 50000000),
+        'sim': shell_int(run_common, 'SIM', 250000000)
+    }
+
+def experiment_jobs(family, config_dir, result_tag, traces, warmup, sim, champsim_dir=CHAMPSIM_DIR, results_root=None):
+    '''
+    Expand one experiment into jobs, in the same order ``run_experiment`` would start them.
+
+    :param family: the experiment family (``normal_evaluation``, ``ett_evaluation``, ...)
+    :param config_dir: the configuration directory under ``sim_configs/<family>``
+    :param result_tag: the result directory under ``results/<family>``
+    :param traces: the trace paths; each job runs a single trace
+    '''
+    results_root = results_root or os.path.join(champsim_dir, 'results')
+    experiment = f'{family}/{result_tag}'
+    result_dir = os.path.join(results_root, family, result_tag)
+    configs = sorted(glob.glob(os.path.join(champsim_dir, 'sim_configs', family, config_dir, '**', '*.json'), recursive=True))
+
+    jobs = []
+    for config in configs:
+        binary = parse_exe_name(config)
+        if binary is None:
+            continue
+        for trace in traces:
+            output = os.path.join(result_dir, f'{binary}_{trace_tag(trace)}.txt')
+            jobs.append(Job(job_id=make_job_id(experiment, output), experiment=experiment, binary=binary, traces=[trace],
+                            output=output, warmup=warmup, sim=sim, config=config))
+    return jobs
+
+RE_SCRIPT_EXPERIMENT = re.compile(r'^\s*(?:run|queue)_experiment\s+"([^"]+)"\s+"([^"]+)"', re.M)
+RE_SCRIPT_MERGED = re.compile(r'^\s*run_experiments_merged\s+(.+)$', re.M)
+
+def script_experiments(path):
+    '''
+    The ``(config_dir, result_tag)`` pairs a runner script starts, in order.
+
+    Both ``run_experiment``/``queue_experiment "<config_dir>" "<result_tag>"`` and ``run_experiments_merged "<a>" "<b>"
+    ...`` (which files each experiment under its own name) are recognized. Commented-out lines are skipped.
+    '''
+    try:
+        with open(path) as rfp:
+            text = rfp.read()
+    except OSError:
+        return []
+
+    found = []
+    for m in RE_SCRIPT_EXPERIMENT.finditer(text):
+        found.append((m.start(), [(m.group(1), m.group(2))]))
+    for m in RE_SCRIPT_MERGED.finditer(text):
+        found.append((m.start(), [(e, e) for e in re.findall(r'"([^"]+)"', m.group(1))]))
+    return [pair for _, pairs in sorted(found) for pair in pairs]
+
+def multicore_jobs(script, mixes=None, warmup=None, sim=None, champsim_dir=CHAMPSIM_DIR, results_root=None):
+    '''
+    Expand a multicore mix script (``sim_configs/multicore/run_mixes*.sh``) into jobs, one per binary and mix.
+
+    The binaries, trace table, mixes and result directory are read from the script itself, so a manifest follows any
+    edit to it. Each job runs the four traces of its mix and writes ``<binary>_<mix>.txt``.
+
+    :param mixes: the mixes to run (default: the script's ``MIX_ORDER``)
+    :param warmup: warmup instructions per core (default: the script's ``WARMUP``)
+    :param sim: simulation instructions per core (default: the script's ``SIM``)
+    '''
+    results_root = results_root or os.path.join(champsim_dir, 'results')
+    env = {
+        'CHAMPSIM_DIR': champsim_dir,
+        'TRACE_DIR': os.environ.get('TRACE_DIR', os.path.join(champsim_dir, 'test_traces'))
+    }
+    binaries = shell_array(script, 'BINARIES', env)
+    trace_names = shell_assoc(script, 'T', env)
+    mix_table = shell_assoc(script, 'MIXES', env)
+    result_dir = os.environ.get('RESULT_DIR') or _shell_default(script, 'RESULT_DIR', env)
+    if result_dir is None:
+        raise ValueError(f'{script}: no RESULT_DIR default')
+    warmup = warmup if warmup is not None else int(_shell_default(script, 'WARMUP', env) or 50000000)
+    sim = sim if sim is not None else int(_shell_default(script, 'SIM', env) or 250000000)
+
+    rel = os.path.relpath(result_dir, results_root)
+    experiment = rel if not rel.startswith('..') else os.path.basename(result_dir)
+    configs = configs_by_binary(os.path.dirname(os.path.abspath(script)))
+
+    jobs = []
+    for mix in (mixes or shell_array(script, 'MIX_ORDER')):
+        if mix not in mix_table:
+            raise ValueError(f'{script}: unknown mix {mix!r}')
+        traces = [os.path.join(env['TRACE_DIR'], trace_names[w]) for w in mix_table[mix].split()]
+        for binary in binaries:
+            output = os.path.join(result_dir, f'{binary}_{mix}.txt')
+            jobs.append(Job(job_id=make_job_id(experiment, output), experiment=experiment, binary=binary, traces=traces,
+                            output=output, warmup=warmup, sim=sim, config=configs.get(binary)))
+    return jobs
+
+def configs_by_binary(directory):
+    ''' The configuration file of each ``executable_name`` found under a directory (the first, if several share it). '''
+    configs = {}
+    for config in sorted(glob.glob(os.path.join(directory, '**', '*.json'), recursive=True)):
+        binary = parse_exe_name(config)
+        if binary is not None:
+            configs.setdefault(binary, config)
+    return configs
+
+def _shell_default(path, name, env):
+    ''' The default of a ``NAME="${NAME:-default}"`` assignment, expanded from ``env``. '''
+    try:
+        with open(path) as rfp:
+            text = rfp.read()
+    except OSError:
+        return None
+    m = re.search(r'^\s*' + re.escape(name) + r'="\$\{' + re.escape(name) + r':-(.*)\}"\s*$', text, re.M)
+    return _expand(m.group(1), env) if m else None
+
+def real_final_selected(config):
+    ''' Whether ``run_real_final_spec.sh`` runs a configuration; it leaves out some no-pinning error rates. '''
+    if '/no_cache_pinning/' in config and config.endswith('_Error_1e-9.json'):
+        return False
+    if '/no_cache_pinning/' in config and '2MBPage' in config and config.endswith('_Error_1e-8.json'):
+        return False
+    return True
+
+def real_final_jobs(champsim_dir=CHAMPSIM_DIR, results_root=None, traces=None):
+    '''
+    Expand ``run_real_final_spec.sh`` into jobs.
+
+    The script passes no instruction budgets, so each job runs to the end of its trace and has no known total.
+
+    :param traces: the trace paths (default: ``test_traces/6*.champsimtrace.xz``)
+    '''
+    results_root = results_root or os.path.join(champsim_dir, 'results')
+    experiment = 'real_final_spec'
+    result_dir = os.path.join(results_root, experiment)
+    if traces is None:
+        traces = sorted(glob.glob(os.path.join(champsim_dir, 'test_traces', '6*.champsimtrace.xz')))
+    configs = sorted(glob.glob(os.path.join(champsim_dir, 'sim_configs', 'real_final', '**', '*.json'), recursive=True))
+
+    binaries = {}
+    for config in filter(real_final_selected, configs):
+        binary = parse_exe_name(config)
+        if binary is not None:
+            binaries.setdefault(binary, config)
+
+    jobs = []
+    for binary, config in binaries.items():
+        for trace in traces:
+            output = os.path.join(result_dir, f'{binary}_{trace_tag(trace)}.txt')
+            jobs.append(Job(job_id=make_job_id(experiment, output), experiment=experiment, binary=binary, traces=[trace],
+                            output=output, warmup=None, sim=None, config=config))
+    return jobs
+
+def build_ids(champsim_dir=CHAMPSIM_DIR):
+    '''
+    The build id of each configured binary, by binary name, as written to ``_configuration.mk`` by ``config.sh``.
+
+    Only the binaries of the most recent configuration run are known.
+    '''
+    try:
+        with open(os.path.join(champsim_dir, '_configuration.mk')) as rfp:
+            text = rfp.read()
+    except OSError:
+        return {}
+    return {os.path.basename(exe.strip()): build_id for build_id, exe in RE_MAKEFILE_BUILD.findall(text)}
+
+def manifest_hash(path):
+    ''' A digest of a manifest file, recorded with each job so a run can be traced back to the manifest that asked for it. '''
+    with open(path, 'rb') as rfp:
+        return hashlib.sha1(rfp.read()).hexdigest()
+
+def write_manifest(path, jobs):
+    ''' Write the jobs as a manifest file. '''
+    with open(path, 'w') as wfp:
+        json.dump({'version': MANIFEST_VERSION, 'jobs': [j.to_dict() for j in jobs]}, wfp, indent=1)
+        wfp.write('\n')
+
+def load_manifest(path):
+    ''' Read the jobs of a manifest file. '''
+    with open(path) as rfp:
+        data = json.load(rfp)
+    if data.get('version') != MANIFEST_VERSION:
+        raise ValueError(f'{path}: unsupported manifest version {data.get("version")}')
+    return [Job.from_dict(d) for d in data['jobs']]
+
+def read_tail(path, tail_bytes=16384):
+    ''' The last ``tail_bytes`` of a file, decoded; empty if the file cannot be read. '''
+    try:
+        with open(path, 'rb') as rfp:
+            rfp.seek(0, os.SEEK_END)
+            rfp.seek(max(0, rfp.tell() - tail_bytes))
+            return rfp.read().decode('utf-8', 'replace')
+    except OSError:
+        return ''
+
+def is_complete(path, tail_bytes=16384):
+    ''' Whether an output file carries the completion marker, the same test as the shell runners' ``grep``. '''
+    return 'Simulation complete' in read_tail(path, tail_bytes)
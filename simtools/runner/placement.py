@@ -0,0 +1,143 @@
+'''
+CPU and NUMA placement of simulator processes.
+
+Each ChampSim process is single-threaded but allocates large LLC and DRAM model arrays. Left to the scheduler, dozens
+of them migrate between cores and sockets and end up with their memory on a remote node. The :class:`CorePlacer`
+gives each job a dedicated core, spreads jobs over the nodes, and keeps SMT siblings idle for as long as there are
+free physical cores. Memory is bound to the core's node with ``numactl`` when it is installed; otherwise the affinity
+is set before ``exec``, so the kernel's default first-touch policy already allocates on the local node.
+'''
+
+import dataclasses
+import os
+import shutil
+
+SYSFS_NODE = '/sys/devices/system/node'
+SYSFS_CPU = '/sys/devices/system/cpu'
+
+def parse_cpulist(text):
+    ''' Expand a kernel CPU list such as ``0-3,8,10-11`` into a list of integers. '''
+    cpus = []
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        lo, _, hi = part.partition('-')
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+def _read(path):
+    try:
+        with open(path) as rfp:
+            return rfp.read()
+    except OSError:
+        return None
+
+@dataclasses.dataclass
+class Topology:
+    '''
+    The CPUs of each NUMA node and the SMT siblings of each CPU.
+
+    :param nodes: ``{node: [cpu, ...]}``
+    :param siblings: ``{cpu: frozenset of the CPUs sharing its physical core, itself included}``
+    '''
+    nodes: dict
+    siblings: dict
+
+    @classmethod
+    def from_sysfs(cls, node_root=SYSFS_NODE, cpu_root=SYSFS_CPU, allowed=None):
+        '''
+        Read the topology from sysfs.
+
+        :param allowed: restrict to these CPUs (default: this process's affinity mask)
+        '''
+        if allowed is None:
+            allowed = os.sched_getaffinity(0)
+        allowed = set(allowed)
+
+        nodes = {}
+        try:
+            entries = os.listdir(node_root)
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.startswith('node') or not entry[4:].isdigit():
+                continue
+            cpulist = _read(os.path.join(node_root, entry, 'cpulist'))
+            cpus = [c for c in parse_cpulist(cpulist or '') if c in allowed]
+            if cpus:
+                nodes[int(entry[4:])] = cpus
+        if not nodes:
+            # Kernels without NUMA support expose no node directory: treat the machine as one node
+            nodes = {0: sorted(allowed)}
+
+        siblings = {}
+        for cpus in nodes.values():
+            for cpu in cpus:
+                text = _read(os.path.join(cpu_root, f'cpu{cpu}', 'topology', 'thread_siblings_list'))
+                siblings[cpu] = frozenset(parse_cpulist(text)) & allowed if text else frozenset((cpu,))
+        return cls(nodes=nodes, siblings=siblings)
+
+    def node_of(self, cpu):
+        return next(n for n, cpus in self.nodes.items() if cpu in cpus)
+
+    @property
+    def physical_cores(self):
+        ''' The distinct sibling groups, i.e. one entry per physical core. '''
+        return set(self.siblings.values())
+
+class CorePlacer:
+    '''
+    Hand out one CPU per job.
+
+    A CPU is chosen so that, in order of preference,
+      (1) its physical core is entirely idle, i.e. no SMT sibling is running a job;
+      (2) its node is the least loaded one;
+      (3) it has the lowest number.
+    Only when every physical core is busy are SMT siblings used.
+
+    :param topology: the :class:`Topology` to place onto
+    :param bind_memory: prefix commands with ``numactl --membind`` when it is available
+    '''
+
+    def __init__(self, topology, bind_memory=True):
+        self.topology = topology
+        self.busy = set()
+        self.numactl = shutil.which('numactl') if bind_memory else None
+
+    def _node_load(self, node):
+        return len(self.busy.intersection(self.topology.nodes[node]))
+
+    def acquire(self):
+        '''
+        Reserve a CPU for a new job.
+
+        :returns: ``(cpu, node)``, or None when every CPU is in use
+        '''
+        free = [(node, cpu) for node, cpus in self.topology.nodes.items() for cpu in cpus if cpu not in self.busy]
+        if not free:
+            return None
+
+        def key(entry):
+            node, cpu = entry
+            sibling_busy = bool(self.busy.intersection(self.topology.siblings.get(cpu, ())))
+            return (sibling_busy, self._node_load(node), cpu)
+
+        node, cpu = min(free, key=key)
+        self.busy.add(cpu)
+        return cpu, node
+
+    def release(self, cpu):
+        self.busy.discard(cpu)
+
+    def command_prefix(self, node):
+        ''' The command prefix that binds a job's memory to ``node``. '''
+        if self.numactl is None:
+            return []
+        return [self.numactl, f'--membind={node}']
+
+    @staticmethod
+    def preexec(cpu):
+        ''' A ``preexec_fn`` pinning the child to ``cpu`` before it executes the simulator. '''
+        def _pin():
+            os.sched_setaffinity(0, {cpu})
+        return _pin
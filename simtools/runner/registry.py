@@ -0,0 +1,211 @@
+'''
+The job registry: a record of every job the runners start, with its lifecycle, resource use and result location.
+
+One registry lives at the top of each results root, as an SQLite database. The ``jobs`` table holds the current view of
+each job, indexed by state and output path. The ``events`` table holds every state change in order. Schedulers,
+monitors and analysis scripts should consult it rather than glob and grep the output files, so that a run the watchdog
+killed is excluded the same way everywhere.
+
+A registry written by earlier versions of the runner (``job_registry.jsonl``) is imported the first time the database
+is opened.
+'''
+
+import contextlib
+import json
+import os
+import sqlite3
+import time
+
+REGISTRY_NAME = 'job_registry.sqlite'
+LEGACY_REGISTRY_NAME = 'job_registry.jsonl'
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+PANIC = 'panic'
+OVER_BUDGET = 'over-budget'
+TIMEOUT = 'timeout'
+
+STATES = (QUEUED, RUNNING, DONE, FAILED, PANIC, OVER_BUDGET, TIMEOUT)
+
+# States a run cannot recover from by itself; its output must not be used as a result. A run stopped by a hard time
+# limit is not among them: like a timed-out run of the shell runners, it is retried.
+KILLED_STATES = (PANIC, OVER_BUDGET)
+
+# Fields with a column of their own; any other field given to record() is kept in the ``extra`` column.
+COLUMNS = ('manifest_hash', 'binary', 'build_id', 'traces', 'warmup', 'sim', 'output', 'host', 'pid', 'start', 'end',
+           'exit_code', 'wall_time', 'cpu_time', 'max_rss', 'reason')
+
+# Fields describing one attempt, cleared when a job is queued again
+ATTEMPT_FIELDS = ('pid', 'start', 'end', 'exit_code', 'wall_time', 'cpu_time', 'max_rss', 'reason')
+
+INSERT_NAMES = ', '.join(f'"{n}"' for n in ('job_id', 'state', 'time', *COLUMNS, 'extra'))
+
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    time REAL NOT NULL,
+    {', '.join(f'"{c}"' for c in COLUMNS)},
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+CREATE INDEX IF NOT EXISTS jobs_output ON jobs (output);
+CREATE INDEX IF NOT EXISTS jobs_binary ON jobs (binary);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    time REAL NOT NULL,
+    fields TEXT
+);
+CREATE INDEX IF NOT EXISTS events_job ON events (job_id);
+'''
+
+class JobRegistry:
+    '''
+    A registry of job states for a results root.
+
+    Each call to :meth:`record` is one transaction, so concurrent runners sharing a results root do not clobber one
+    another, and the full history of a job remains available.
+    '''
+
+    def __init__(self, results_root):
+        self.results_root = results_root
+        self.path = os.path.join(results_root, REGISTRY_NAME)
+
+    @contextlib.contextmanager
+    def _connect(self, write=False):
+        ''' A connection for one transaction. Reading a registry that does not exist yet creates nothing. '''
+        if not write and not os.path.exists(self.path):
+            conn = sqlite3.connect(':memory:')
+            conn.executescript(SCHEMA)
+        else:
+            os.makedirs(self.results_root, exist_ok=True)
+            fresh = not os.path.exists(self.path)
+            conn = sqlite3.connect(self.path, timeout=60)
+            conn.row_factory = sqlite3.Row
+            conn.executescript(SCHEMA)
+            if fresh:
+                conn.execute('PRAGMA journal_mode=WAL')
+                self._import_legacy(conn)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _import_legacy(self, conn):
+        ''' Carry over the entries of a JSON-lines registry into a database that has none yet. '''
+        legacy = os.path.join(self.results_root, LEGACY_REGISTRY_NAME)
+        if not os.path.exists(legacy):
+            return
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if conn.execute('SELECT COUNT(*) FROM events').fetchone()[0] > 0:
+                return
+            with open(legacy) as rfp:
+                for line in rfp:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    job_id, state, stamp = entry.pop('job_id'), entry.pop('state'), entry.pop('time', 0.0)
+                    self._store(conn, job_id, state, stamp, entry)
+
+    @staticmethod
+    def _row_to_dict(row):
+        entry = {k: row[k] for k in row.keys() if k != 'extra' and row[k] is not None}
+        if 'traces' in entry:
+            entry['traces'] = json.loads(entry['traces'])
+        if row['extra']:
+            entry.update(json.loads(row['extra']))
+        return entry
+
+    def _store(self, conn, job_id, state, stamp, fields):
+        row = conn.execute('SELECT * FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        current = self._row_to_dict(row) if row is not None else {}
+        if state == QUEUED:
+            current = {k: v for k, v in current.items() if k in COLUMNS and k not in ATTEMPT_FIELDS}
+        current.update(fields, job_id=job_id, state=state, time=stamp)
+
+        values = {c: current.get(c) for c in COLUMNS}
+        if values['traces'] is not None:
+            values['traces'] = json.dumps(values['traces'])
+        extra = {k: v for k, v in current.items() if k not in COLUMNS and k not in ('job_id', 'state', 'time')}
+        conn.execute(f'INSERT OR REPLACE INTO jobs ({INSERT_NAMES}) VALUES ({", ".join("?" * (len(COLUMNS) + 4))})',
+                     (job_id, state, stamp, *values.values(), json.dumps(extra, sort_keys=True) if extra else None))
+        conn.execute('INSERT INTO events (job_id, state, time, fields) VALUES (?, ?, ?, ?)',
+                     (job_id, state, stamp, json.dumps(fields, sort_keys=True) if fields else None))
+        return current
+
+    def record(self, job_id, state, **fields):
+        '''
+        Record that a job entered the given state. Additional fields are stored with the job; fields not given keep
+        their previous values, except that queueing a job again starts a new attempt.
+
+        :returns: the job's entry after the change
+        '''
+        if state not in STATES:
+            raise ValueError(f'Unknown job state {state!r}')
+        with self._connect(write=True) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            return self._store(conn, job_id, state, time.time(), fields)
+
+    def record_many(self, state, entries):
+        '''
+        Record that several jobs entered the same state, in one transaction.
+
+        :param entries: ``(job_id, fields)`` pairs
+        '''
+        if state not in STATES:
+            raise ValueError(f'Unknown job state {state!r}')
+        with self._connect(write=True) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            stamp = time.time()
+            for job_id, fields in entries:
+                self._store(conn, job_id, state, stamp, fields)
+
+    def history(self, job_id=None):
+        ''' Yield every recorded state change in order, of one job or of all of them. '''
+        with self._connect() as conn:
+            if job_id is None:
+                rows = conn.execute('SELECT * FROM events ORDER BY seq').fetchall()
+            else:
+                rows = conn.execute('SELECT * FROM events WHERE job_id = ? ORDER BY seq', (job_id,)).fetchall()
+        for row in rows:
+            yield {'job_id': row['job_id'], 'state': row['state'], 'time': row['time'], **json.loads(row['fields'] or '{}')}
+
+    def _select(self, where='', params=()):
+        with self._connect() as conn:
+            rows = conn.execute(f'SELECT * FROM jobs {where}', params).fetchall()
+        return {row['job_id']: self._row_to_dict(row) for row in rows}
+
+    def latest(self):
+        ''' The current view of every job. '''
+        return self._select()
+
+    def get(self, job_id):
+        ''' The current entry of one job, or None if it was never recorded. '''
+        return self._select('WHERE job_id = ?', (job_id,)).get(job_id)
+
+    def state_of(self, job_id):
+        return (self.get(job_id) or {}).get('state')
+
+    def in_state(self, *states):
+        ''' The current entries of all jobs whose current state is one of the given states. '''
+        return self._select(f'WHERE state IN ({", ".join("?" * len(states))})', states)
+
+    def by_output(self, output):
+        ''' The current entries of the jobs that write the given output file. '''
+        return self._select('WHERE output = ?', (os.path.abspath(output),))
+
+def excluded_outputs(results_root):
+    '''
+    The absolute output paths of runs that were killed as ``panic`` or ``over-budget``.
+
+    Analysis scripts use this to leave such runs out consistently.
+    '''
+    return {v['output'] for v in JobRegistry(results_root).in_state(*KILLED_STATES).values() if 'output' in v}
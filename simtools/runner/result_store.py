@@ -0,0 +1,185 @@
+'''
+A content-addressed store of simulator outputs.
+
+Several experiments deliberately share runs: the w16 point of the way sweep is the error rate sweep's no-error run,
+and the single-core no-error runs are the multicore alone-references. Rather than copying files between result
+directories (and noting that they were "validated identical"), each completed output is kept once, under a key made
+of everything that determines it:
+
+* the configuration's :func:`~config.filewrite.content_id` (its build ID without the executable name),
+* the content digest of each trace,
+* the warmup and simulation instruction counts and any extra arguments, and
+* the revision of the simulator sources (``src``, ``inc`` and the module directories), including uncommitted edits.
+
+An experiment's output file is then a symbolic link into the store, and a job whose key is already present is linked
+rather than simulated again. Store objects are read-only, so a shell runner that redirects into such a link fails
+instead of overwriting a shared result.
+'''
+
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+
+from . import jobs as jobs_mod
+
+STORE_DIR_NAME = '.store'
+
+# The directories whose contents make up the simulator
+SOURCE_DIRS = ('src', 'inc', 'branch', 'btb', 'prefetcher', 'replacement')
+
+def source_revision(champsim_dir=jobs_mod.CHAMPSIM_DIR):
+    '''
+    An identifier of the simulator sources: the git tree of each source directory, plus a digest of any uncommitted
+    change to them.
+
+    :returns: the identifier, or None outside a git checkout
+    '''
+    def git(*args):
+        return subprocess.run(['git', '-C', champsim_dir, *args], capture_output=True, text=True, check=True).stdout
+
+    dirs = [d for d in SOURCE_DIRS if os.path.isdir(os.path.join(champsim_dir, d))]
+    try:
+        trees = git('rev-parse', *(f'HEAD:{d}' for d in dirs)).split()
+        diff = git('diff', 'HEAD', '--', *dirs)
+        untracked = git('ls-files', '--others', '--exclude-standard', '--', *dirs).split()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    digest = hashlib.sha1('\n'.join(trees).encode())
+    if diff or untracked:
+        digest.update(diff.encode())
+        for path in untracked:
+            with open(os.path.join(champsim_dir, path), 'rb') as rfp:
+                digest.update(path.encode() + b'\0' + rfp.read())
+        return digest.hexdigest()[:16] + '-dirty'
+    return digest.hexdigest()[:16]
+
+def config_id(config_path):
+    ''' The :func:`~config.filewrite.content_id` of a configuration file. '''
+    # Imported here: the configuration package is only needed once a key is asked for
+    import config.filewrite # pylint: disable=import-outside-toplevel
+    import config.parse # pylint: disable=import-outside-toplevel
+    with open(config_path) as rfp:
+        return config.filewrite.content_id(config.parse.parse_config(json.load(rfp)))
+
+@contextlib.contextmanager
+def _digests(cache_dir):
+    ''' The trace digest cache, held under a lock. Digests are keyed by path, size and modification time. '''
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, 'lock'), 'a') as lockfile:
+        fcntl.flock(lockfile, fcntl.LOCK_EX)
+        path = os.path.join(cache_dir, 'trace_digests.json')
+        try:
+            with open(path) as rfp:
+                digests = json.load(rfp)
+        except (OSError, ValueError):
+            digests = {}
+        before = dict(digests)
+        yield digests
+        if digests != before:
+            with open(path + '.tmp', 'w') as wfp:
+                json.dump(digests, wfp, indent=1, sort_keys=True)
+            os.replace(path + '.tmp', path)
+
+def trace_digest(trace, cache_dir):
+    '''
+    The SHA-1 of a trace file's contents, computed once per version of the file.
+
+    :param cache_dir: the directory holding the digests computed so far (the store directory)
+    '''
+    st = os.stat(trace)
+    stamp = f'{os.path.abspath(trace)}:{st.st_size}:{st.st_mtime_ns}'
+    with _digests(cache_dir) as digests:
+        if stamp not in digests:
+            digest = hashlib.sha1()
+            with open(trace, 'rb') as rfp:
+                for chunk in iter(lambda: rfp.read(1 << 22), b''):
+                    digest.update(chunk)
+            digests[stamp] = digest.hexdigest()
+        return digests[stamp]
+
+class ResultStore:
+    '''
+    Completed outputs, stored once per key.
+
+    :param root: the store directory (usually ``<results root>/.store``)
+    :param champsim_dir: the checkout whose sources the revision is taken from
+    '''
+
+    def __init__(self, root, champsim_dir=jobs_mod.CHAMPSIM_DIR):
+        self.root = root
+        self.champsim_dir = champsim_dir
+        self._revision = None
+        self._config_ids = {}
+
+    @property
+    def revision(self):
+        if self._revision is None:
+            self._revision = source_revision(self.champsim_dir)
+        return self._revision
+
+    def trace_digest(self, trace):
+        return trace_digest(trace, self.root)
+
+    def key_of(self, job):
+        '''
+        The key of the output a job produces.
+
+        :returns: the key, or None if the job's configuration, traces or source revision cannot be determined
+        '''
+        if job.config is None or self.revision is None:
+            return None
+        if job.config not in self._config_ids:
+            try:
+                self._config_ids[job.config] = config_id(job.config)
+            except (OSError, ValueError, KeyError):
+                self._config_ids[job.config] = None
+        if self._config_ids[job.config] is None:
+            return None
+        try:
+            traces = [self.trace_digest(t) for t in job.traces]
+        except OSError:
+            return None
+        parts = {'config': self._config_ids[job.config], 'traces': traces, 'warmup': job.warmup, 'sim': job.sim, 'args': job.args,
+                 'revision': self.revision}
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+    def path_of(self, key):
+        return os.path.join(self.root, key[:2], f'{key}.txt')
+
+    def has(self, key):
+        return key is not None and os.path.isfile(self.path_of(key))
+
+    def link(self, key, output):
+        ''' Make ``output`` a symbolic link to the stored object, replacing whatever is there. '''
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        target = os.path.relpath(self.path_of(key), os.path.dirname(os.path.abspath(output)))
+        tmp = f'{output}.{os.getpid()}.link'
+        os.symlink(target, tmp)
+        os.replace(tmp, output)
+
+    def ingest(self, key, output, **meta):
+        '''
+        Move a completed output into the store and leave a link in its place.
+
+        If the key is already present (e.g. the same run finished twice), the stored copy is kept.
+
+        :param meta: recorded next to the object, to tell where it came from
+        '''
+        obj = self.path_of(key)
+        if os.path.realpath(output) == os.path.realpath(obj):
+            return obj
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            tmp = f'{obj}.{os.getpid()}.tmp'
+            shutil.copyfile(output, tmp)
+            os.chmod(tmp, 0o444)
+            with open(os.path.splitext(obj)[0] + '.json', 'w') as wfp:
+                json.dump({'key': key, 'revision': self.revision, 'source': os.path.abspath(output), **meta}, wfp, indent=1, sort_keys=True)
+            os.replace(tmp, obj)
+        self.link(key, output)
+        return obj
@@ -0,0 +1,508 @@
+'''
+A slot-pool job runner with a watchdog.
+
+This is the Python counterpart of ``queue_experiment``/``wait_for_slot`` in the shell runners: at most
+``max_parallel`` simulator processes run at once, a finished job's slot is immediately refilled, and completed
+outputs are skipped. In addition, every running job is watched (:mod:`simtools.runner.watchdog`) and terminated when
+it has collapsed, freeing its slot for the next job. With a :class:`~simtools.runner.placement.CorePlacer`, each job
+is also pinned to its own core and NUMA node. With a :class:`~simtools.runner.trace_cache.TraceCache`, jobs read
+decompressed copies of their traces instead of each decompressing the ``.xz`` files again. With fan-out, jobs that
+run the same trace are started together and read it from one :mod:`~simtools.runner.trace_server`. With a
+:class:`~simtools.runner.result_store.ResultStore`, a job whose result is already stored is linked instead of run, and
+completed outputs are moved into the store. With a capture format, each job's output is piped through
+:mod:`~simtools.runner.capture`, which caps, indexes and (optionally) compresses it. Jobs a figure is waiting for
+(see :mod:`~simtools.runner.figures`) are started before the others. With fork groups, jobs that differ only in
+Error Page Manager settings are started as one process that simulates their shared warmup once and then forks into
+each of them (see :mod:`~simtools.runner.fork_groups`).
+'''
+
+import dataclasses
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+from .. import progress
+from . import capture as capture_mod
+from . import figures
+from . import fork_groups
+from . import jobs as jobs_mod
+from . import registry as registry_mod
+from . import staleness
+from . import trace_server
+from .result_store import STORE_DIR_NAME
+from .watchdog import JobWatch
+
+def _stamp():
+    return time.strftime('%Y-%m-%d %H:%M:%S')
+
+def _python_env():
+    ''' The environment for the runner's own helper processes. '''
+    return dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, (jobs_mod.CHAMPSIM_DIR, os.environ.get('PYTHONPATH')))))
+
+class RunningJob:
+    def __init__(self, job, proc, outfile, watch, seq, start, cpu=None, writer=None, group_log=None, point=None):
+        self.job = job
+        self.proc = proc
+        self.outfile = outfile
+        self.writer = writer
+        self.group_log = group_log
+        self.point = point
+        self.watch = watch
+        self.seq = seq
+        self.start = start
+        self.cpu = cpu
+        self.rusage = None
+
+    def reap(self):
+        ''' Collect the process if it has exited, with its resource use. Returns whether it has. '''
+        if self.proc.returncode is not None:
+            return True
+        try:
+            pid, status, rusage = os.wait4(self.proc.pid, os.WNOHANG)
+        except ChildProcessError:
+            return self.proc.poll() is not None
+        if pid == 0:
+            return False
+        self.proc.returncode = os.waitstatus_to_exitcode(status)
+        self.rusage = rusage
+        return True
+
+    def wait(self, timeout):
+        ''' Wait up to ``timeout`` seconds for the process to exit. Returns whether it has. '''
+        deadline = time.time() + timeout
+        while not self.reap():
+            if time.time() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def resources(self):
+        ''' The registry fields describing what the run used. '''
+        fields = {'end': time.time()}
+        fields['wall_time'] = fields['end'] - self.start
+        if self.rusage is not None:
+            fields['cpu_time'] = self.rusage.ru_utime + self.rusage.ru_stime
+            fields['max_rss'] = self.rusage.ru_maxrss * 1024 # kilobytes on Linux
+        return fields
+
+class Runner:
+    '''
+    Run a list of jobs through a fixed number of slots.
+
+    :param jobs: the :class:`~simtools.runner.jobs.Job` objects to run, in order
+    :param results_root: the results root holding the job registry
+    :param max_parallel: the number of simulator processes to run at once
+    :param policy: the :class:`~simtools.runner.watchdog.WatchdogPolicy`, or None to disable the watchdog
+    :param poll_interval: seconds between polls of the running jobs
+    :param retry_killed: rerun jobs that were previously killed by the watchdog
+    :param champsim_dir: the directory containing ``bin/``
+    :param placer: a :class:`~simtools.runner.placement.CorePlacer`, or None to leave placement to the kernel
+    :param trace_cache: a :class:`~simtools.runner.trace_cache.TraceCache`, or None to read the traces directly
+    :param fanout: start jobs of the same trace in groups served by one trace server when at least this many can start
+        together, or None to have every job decode its own trace
+    :param fanout_capacity: the ring size of each trace server, in bytes
+    :param manifest_hashes: for each job id, the :func:`~simtools.runner.jobs.manifest_hash` of its manifest
+    :param store: a :class:`~simtools.runner.result_store.ResultStore`, or None to keep outputs where they are written
+    :param capture: pipe each job's output through :mod:`~simtools.runner.capture` in this format (``text``, or ``zstd``,
+        which needs the ``zstandard`` module or the ``zstd`` tool), or None to have the simulator write it directly
+    :param max_repeats: with capture, the number of consecutive similar lines kept
+    :param force: run every job, including those whose output is complete (e.g. a manifest of stale jobs)
+    :param fork: start jobs that differ only in Error Page Manager settings as one fork group when at least this many
+        can start together, or None to run every job on its own. Fork groups are not pinned, and their outputs are
+        written without capture.
+    :raises ValueError: if the zstd capture format is requested but cannot be written
+    '''
+
+    def __init__(self, jobs, results_root=jobs_mod.RESULTS_ROOT, max_parallel=4, policy=None, poll_interval=10.0, retry_killed=False,
+                 champsim_dir=jobs_mod.CHAMPSIM_DIR, placer=None, trace_cache=None, fanout=None,
+                 fanout_capacity=256 << 20, manifest_hashes=None, store=None, capture=None,
+                 max_repeats=1000, force=False, fork=None, log=print):
+        self.jobs = list(jobs)
+        self.results_root = results_root
+        self.registry = registry_mod.JobRegistry(results_root)
+        self.max_parallel = max_parallel
+        self.policy = policy
+        self.poll_interval = poll_interval
+        self.retry_killed = retry_killed
+        self.champsim_dir = champsim_dir
+        self.placer = placer
+        self.trace_cache = trace_cache
+        self.fanout = fanout
+        self.fanout_capacity = fanout_capacity
+        self.manifest_hashes = manifest_hashes or {}
+        self.store = store
+        self.store_keys = {}
+        if capture == 'zstd' and not capture_mod.zstd_available():
+            # Fail before any job starts, rather than in the capture process of each
+            raise ValueError('zstd capture requested, but neither the zstandard module nor the zstd tool is installed')
+        self.capture = capture
+        self.max_repeats = max_repeats
+        self.force = force
+        self.fork = fork
+        self.fork_grouper = fork_groups.ForkGrouper()
+        self._priorities_stamp = None
+        self.provenance = staleness.Provenance(champsim_dir, store.root if store is not None else os.path.join(results_root, STORE_DIR_NAME))
+        self.host = socket.gethostname()
+        self.log = log
+        self.running = []
+        self.servers = []
+        self.started = 0
+
+    def _run_log(self, job, msg):
+        ''' Append to the experiment's ``run_log.txt`` in the shell runners' format. '''
+        os.makedirs(job.result_dir, exist_ok=True)
+        with open(os.path.join(job.result_dir, 'run_log.txt'), 'a') as wfp:
+            wfp.write(f'[{_stamp()}] {msg}\n')
+
+    def _label(self, job):
+        return f'{job.binary} x {"+".join(jobs_mod.trace_tag(t) for t in job.traces)}'
+
+    def pending_jobs(self):
+        '''
+        The jobs that still need to run, skipping completed and (unless retrying) killed ones.
+
+        A job the registry knows to be done is skipped without reading its output; outputs written by the shell runners
+        are checked for the completion marker. With a store, a job whose result is stored already gets a link to it.
+        '''
+        entries = self.registry.latest()
+        pending = []
+        for job in self.jobs:
+            state = entries.get(job.job_id, {}).get('state')
+            if self.force:
+                pending.append(job)
+                continue
+            if (state == registry_mod.DONE and os.path.exists(job.output)) or jobs_mod.is_complete(job.output):
+                self.log(f'[{_stamp()}] SKIP (done): {self._label(job)}')
+                continue
+            if state in registry_mod.KILLED_STATES and not self.retry_killed:
+                self.log(f'[{_stamp()}] SKIP (killed): {self._label(job)}')
+                continue
+            if self.store is not None:
+                key = self.store_keys[job.job_id] = self.store.key_of(job)
+                if self.store.has(key):
+                    self.store.link(key, job.output)
+                    self._run_log(job, f'LINK: {self._label(job)} (stored {key[:12]})')
+                    self.log(f'[{_stamp()}] SKIP (stored): {self._label(job)}')
+                    self.registry.record(job.job_id, registry_mod.DONE, output=job.output, binary=job.binary, traces=job.traces,
+                                         warmup=job.warmup, sim=job.sim, store_key=key, reused=True, **self.provenance.of_job(job))
+                    continue
+            pending.append(job)
+        return pending
+
+    def _executable(self, job):
+        return os.path.join(self.champsim_dir, 'bin', job.binary)
+
+    def launch(self, job, segment=None):
+        '''
+        Start one job.
+
+        :param segment: read the (single) trace from this trace server segment
+        '''
+        if not os.access(self._executable(job), os.X_OK):
+            self.log(f'[{_stamp()}] ERROR: Binary not found: bin/{job.binary} (build first)')
+            self.registry.record(job.job_id, registry_mod.FAILED, output=job.output, reason='binary not found')
+            return None
+
+        traces = job.traces
+        if self.trace_cache is not None:
+            traces = [self.trace_cache.acquire(t, job.job_id) for t in job.traces]
+        if segment is not None:
+            traces = [trace_server.descriptor(segment, traces[0])]
+        cmd = job.command(self.champsim_dir, traces, json_stats=True)
+        provenance = self.provenance.of_job(job)
+        cpu = node = preexec = None
+        slot = self.placer.acquire() if self.placer is not None else None
+        if slot is not None:
+            cpu, node = slot
+            cmd = self.placer.command_prefix(node) + cmd
+            preexec = self.placer.preexec(cpu)
+
+        os.makedirs(job.result_dir, exist_ok=True)
+        self.started += 1
+        if os.path.islink(job.output):
+            os.unlink(job.output) # never write through a link into the store
+        outfile = writer = None
+        if self.capture is None:
+            outfile = open(job.output, 'w')
+            outfile.write(staleness.header_line(provenance))
+            outfile.flush()
+            proc = subprocess.Popen(cmd, stdout=outfile, stderr=subprocess.STDOUT, start_new_session=True, preexec_fn=preexec)
+        else:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True, preexec_fn=preexec)
+            # The writer is outside the simulator's process group, so it drains the pipe even after a kill
+            writer = subprocess.Popen([sys.executable, '-m', 'simtools.runner', 'capture', '-o', job.output, '--format', self.capture,
+                                       '--max-repeats', str(self.max_repeats or 'none'), '--header', staleness.header_line(provenance)],
+                                      stdin=proc.stdout, env=_python_env())
+            proc.stdout.close()
+        start = time.time()
+
+        where = f' (cpu {cpu}, node {node})' if cpu is not None else ''
+        self._run_log(job, f'START [{self.started}]: {self._label(job)}{where}')
+        self.log(f'[{_stamp()}] START [{self.started}]: {self._label(job)}{where}')
+        self.registry.record(job.job_id, registry_mod.RUNNING, output=job.output, binary=job.binary, traces=job.traces, pid=proc.pid,
+                             host=self.host, start=start, cpu=cpu, node=node, placement=cpu is not None,
+                             cached_traces=traces if traces != job.traces else None, segment=segment, **provenance)
+
+        watch = JobWatch(job, self.policy, started=start) if self.policy is not None else None
+        return RunningJob(job, proc, outfile, watch, self.started, start, cpu=cpu, writer=writer)
+
+    def launch_group(self, batch):
+        '''
+        Start a fork group: the first job's binary simulates the shared warmup once, then forks into every job of the batch.
+
+        :returns: a :class:`RunningJob` for each job, all sharing the group's process
+        '''
+        lead = batch[0]
+        if not os.access(self._executable(lead), os.X_OK):
+            self.log(f'[{_stamp()}] ERROR: Binary not found: bin/{lead.binary} (build first)')
+            for job in batch:
+                self.registry.record(job.job_id, registry_mod.FAILED, output=job.output, reason='binary not found')
+            return []
+
+        self.started += 1
+        group_id = f'{os.getpid()}-{self.started}'
+        fork_dir = os.path.join(self.results_root, fork_groups.FORK_DIR_NAME)
+        points_path = os.path.join(fork_dir, f'{group_id}.json')
+        log_path = os.path.join(fork_dir, f'{group_id}.log')
+
+        traces = lead.traces
+        if self.trace_cache is not None:
+            for job in batch:
+                traces = [self.trace_cache.acquire(t, job.job_id) for t in job.traces]
+        provenance = {}
+        for job in batch:
+            provenance[job.job_id] = dict(self.provenance.of_job(job), fork_group=group_id, forked_from=lead.binary)
+            os.makedirs(job.result_dir, exist_ok=True)
+            if os.path.islink(job.output):
+                os.unlink(job.output) # never write through a link into the store
+            with open(job.output, 'w') as wfp:
+                wfp.write(staleness.header_line(provenance[job.job_id]))
+        fork_groups.write_points(points_path, [(job.output, self.fork_grouper.settings(job)) for job in batch])
+
+        # Each point names its own JSON file; --json goes last, where it cannot take a trace for its file name
+        cmd = dataclasses.replace(lead, args=[*lead.args, '--fork-points', points_path]).command(self.champsim_dir, traces) + ['--json']
+        logfile = open(log_path, 'w')
+        proc = subprocess.Popen(cmd, stdout=logfile, stderr=subprocess.STDOUT, start_new_session=True)
+        start = time.time()
+        self.log(f'[{_stamp()}] FORK  [{self.started}]: {len(batch)} points of bin/{lead.binary} x '
+                 f'{"+".join(jobs_mod.trace_tag(t) for t in lead.traces)} ({group_id})')
+
+        running = []
+        for point, job in enumerate(batch):
+            self._run_log(job, f'START [{self.started}]: {self._label(job)} (fork group {group_id}, point {point})')
+            self.registry.record(job.job_id, registry_mod.RUNNING, output=job.output, binary=job.binary, traces=job.traces, pid=proc.pid,
+                                 host=self.host, start=start, placement=False, cached_traces=traces if traces != lead.traces else None,
+                                 **provenance[job.job_id])
+            watch = JobWatch(job, self.policy, started=start) if self.policy is not None else None
+            running.append(RunningJob(job, proc, logfile if point == 0 else None, watch, self.started, start, group_log=log_path,
+                                      point=point))
+        return running
+
+    def _release(self, rj):
+        if rj.outfile is not None:
+            rj.outfile.close()
+        if rj.writer is not None:
+            rj.writer.wait()
+        if rj.cpu is not None:
+            self.placer.release(rj.cpu)
+        if self.trace_cache is not None:
+            self.trace_cache.release(rj.job.job_id)
+        return progress.simulated_kips(jobs_mod.read_tail(rj.job.output))
+
+    def _terminate_point(self, rj, grace):
+        ''' Stop the child of a fork group running one point, leaving the other points running. '''
+        pid = fork_groups.child_pids(rj.group_log).get(rj.point)
+        if pid is None:
+            return
+        try:
+            os.kill(pid, signal.SIGTERM)
+            deadline = time.time() + grace
+            while fork_groups.is_alive(pid) and time.time() < deadline:
+                time.sleep(0.05)
+            if fork_groups.is_alive(pid):
+                os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self, rj, verdict, grace=10.0):
+        ''' Stop a job's whole process group, escalating to SIGKILL if it does not exit in time. '''
+        if rj.point is not None:
+            self._terminate_point(rj, grace)
+        else:
+            try:
+                os.killpg(rj.proc.pid, signal.SIGTERM)
+                if not rj.wait(grace):
+                    os.killpg(rj.proc.pid, signal.SIGKILL)
+                    rj.wait(float('inf'))
+            except ProcessLookupError:
+                rj.reap()
+        kips = self._release(rj)
+
+        label = self._label(rj.job)
+        self._run_log(rj.job, f'KILL  [{rj.seq}]: {label} ({verdict.state}: {verdict.reason})')
+        self.log(f'[{_stamp()}] KILL  [{rj.seq}]: {label} ({verdict.state}: {verdict.reason})')
+        self.registry.record(rj.job.job_id, verdict.state, reason=verdict.reason, exit_code=rj.proc.returncode, kips=kips,
+                             **rj.resources())
+
+    def finish(self, rj):
+        kips = self._release(rj)
+        code = rj.proc.returncode
+        label = self._label(rj.job)
+        # A fork group fails if any of its points does; each point is judged by its own output
+        if (code == 0 or rj.point is not None) and jobs_mod.is_complete(rj.job.output):
+            self._run_log(rj.job, f'DONE  [{rj.seq}]: {label}')
+            stored = {}
+            key = self.store_keys.get(rj.job.job_id)
+            if key is not None:
+                self.store.ingest(key, rj.job.output, job_id=rj.job.job_id)
+                stored['store_key'] = key
+            self.registry.record(rj.job.job_id, registry_mod.DONE, exit_code=code, kips=kips, **stored, **rj.resources())
+        else:
+            self._run_log(rj.job, f'FAIL  [{rj.seq}]: {label} (exit={code})')
+            self.log(f'[{_stamp()}] FAIL  [{rj.seq}]: {label} (exit={code})')
+            self.registry.record(rj.job.job_id, registry_mod.FAILED, exit_code=code, kips=kips, **rj.resources())
+
+    def next_batch(self, queue):
+        '''
+        Take the jobs to start next from the queue.
+
+        Without fan-out this is a single job. With fan-out, it is the run of queued single-trace jobs that share the first
+        job's trace, as many as there are free slots. With fork groups, it is the run of queued jobs that can share the
+        first job's warmup, as many as there are free slots.
+        '''
+        self._prioritize(queue)
+        batch = [queue.pop(0)]
+        key = self.fork_grouper.key(batch[0]) if self.fork is not None else None
+        if key is not None:
+            while queue and self.fork_grouper.key(queue[0]) == key and len(self.running) + len(batch) < self.max_parallel:
+                batch.append(queue.pop(0))
+            return batch
+        if self.fanout is None or len(batch[0].traces) != 1:
+            return batch
+        while queue and queue[0].traces == batch[0].traces and len(self.running) + len(batch) < self.max_parallel:
+            batch.append(queue.pop(0))
+        return batch
+
+    def _prioritize(self, queue):
+        ''' Bring the jobs of prioritized figures to the front of the queue, whenever the priorities have changed. '''
+        try:
+            stamp = os.stat(os.path.join(self.results_root, figures.PRIORITIES_NAME)).st_mtime_ns
+        except OSError:
+            stamp = None
+        if stamp == self._priorities_stamp:
+            return
+        self._priorities_stamp = stamp
+        ranks = figures.priority_ranks(self.results_root)
+        queue.sort(key=lambda job: ranks.get(job.job_id, float('inf')))
+        if ranks:
+            self.log(f'[{_stamp()}] PRIORITY: {sum(job.job_id in ranks for job in queue)} queued jobs moved to the front')
+
+    def start_server(self, batch):
+        '''
+        Start a trace server for a batch of jobs that read the same trace.
+
+        :returns: the segment name, or None if the server could not be started
+        '''
+        consumers = sum(os.access(self._executable(job), os.X_OK) for job in batch)
+        if consumers < (self.fanout or 2):
+            return None
+
+        segment = f'champsim-{os.getpid()}-{len(self.servers) + 1}'
+        trace = batch[0].traces[0]
+        if self.trace_cache is not None:
+            trace = self.trace_cache.acquire(trace, segment)
+
+        env = _python_env()
+        os.makedirs(self.results_root, exist_ok=True)
+        with open(os.path.join(self.results_root, 'trace_server.log'), 'a') as logfile:
+            proc = subprocess.Popen([sys.executable, '-m', 'simtools.runner', 'serve', '--segment', segment, '--consumers', str(consumers),
+                                     '--capacity', str(self.fanout_capacity >> 20), trace], stdout=logfile, stderr=subprocess.STDOUT, env=env)
+        self.servers.append((proc, segment))
+
+        # The consumers must find the segment in place, or they all decode privately
+        deadline = time.time() + 10
+        while time.time() < deadline and proc.poll() is None:
+            try:
+                trace_server.Segment.open(segment).close()
+                self.log(f'[{_stamp()}] SERVE: {jobs_mod.trace_tag(batch[0].traces[0])} to {consumers} jobs ({segment})')
+                return segment
+            except (OSError, ValueError):
+                time.sleep(0.05)
+        proc.kill()
+        return None
+
+    def _reap_servers(self):
+        still_running = []
+        for proc, segment in self.servers:
+            if proc.poll() is None:
+                still_running.append((proc, segment))
+            elif self.trace_cache is not None:
+                self.trace_cache.release(segment)
+        self.servers = still_running
+
+    def poll(self):
+        ''' Reap finished jobs and apply the watchdog to the rest. '''
+        still_running = []
+        for rj in self.running:
+            if rj.reap():
+                self.finish(rj)
+                continue
+            verdict = rj.watch.check() if rj.watch is not None else None
+            if verdict is not None:
+                self.terminate(rj, verdict)
+                continue
+            still_running.append(rj)
+        self.running = still_running
+        self._reap_servers()
+
+    def _order(self, queue):
+        '''
+        With fan-out, bring the jobs of each trace together, and with fork groups the jobs that can share a warmup,
+        keeping the order of first appearance.
+        '''
+        if self.fanout is None and self.fork is None:
+            return queue
+        groups = {}
+        for job in queue:
+            key = self.fork_grouper.key(job) if self.fork is not None else None
+            groups.setdefault(key if key is not None else tuple(job.traces), []).append(job)
+        return [job for group in groups.values() for job in group]
+
+    def run(self):
+        ''' Run every pending job to completion (or termination). '''
+        queue = self._order(self.pending_jobs())
+        builds = jobs_mod.build_ids(self.champsim_dir)
+        self.registry.record_many(registry_mod.QUEUED, ((job.job_id, {
+            'output': job.output, 'binary': job.binary, 'build_id': builds.get(job.binary), 'traces': job.traces, 'warmup': job.warmup,
+            'sim': job.sim, 'host': self.host, 'manifest_hash': self.manifest_hashes.get(job.job_id)
+        }) for job in queue))
+        if self.trace_cache is not None:
+            self.log(f'[{_stamp()}] Preparing the trace cache in {self.trace_cache.root}')
+            self.trace_cache.prepare(t for job in queue for t in job.traces)
+
+        try:
+            while queue or self.running:
+                while queue and len(self.running) < self.max_parallel:
+                    batch = self.next_batch(queue)
+                    if self.fork is not None and len(batch) >= max(2, self.fork) and self.fork_grouper.key(batch[0]) is not None:
+                        self.running.extend(self.launch_group(batch))
+                        continue
+                    segment = self.start_server(batch) if len(batch) > 1 else None
+                    for job in batch:
+                        rj = self.launch(job, segment)
+                        if rj is not None:
+                            self.running.append(rj)
+                time.sleep(self.poll_interval if self.running else 0)
+                self.poll()
+            for proc, _ in self.servers:
+                proc.wait()
+            self._reap_servers()
+        except KeyboardInterrupt:
+            for rj in self.running:
+                rj.proc.send_signal(signal.SIGINT)
+            for proc, _ in self.servers:
+                proc.terminate()
+            raise
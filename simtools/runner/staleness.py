@@ -0,0 +1,167 @@
+'''
+Provenance of results, and which of them a change to the simulator, its configurations or the traces has made stale.
+
+Every run records what produced it: the build ID of the binary, the build ID of its configuration file (see
+:func:`config_build_id`), the revision of the simulator sources (see
+:func:`~simtools.runner.result_store.source_revision`) and the digest of each trace. The runner writes this to the
+job's registry entry and as the first line of its output (``# provenance: {...}``), so outputs copied out of a results
+root keep it.
+
+:class:`Provenance` computes the same identities for the current tree, and :meth:`Provenance.check` names what
+differs: a configuration whose build ID has changed since the run (``config``; for jobs without a known
+configuration, or outputs that did not record it, a binary rebuilt from another one is ``binary``), edited sources (``source``) or a regenerated trace (``trace``). Outputs
+without recorded provenance are ``binary`` stale if their binary is newer than they are, and ``unrecorded`` otherwise.
+'''
+
+import json
+import os
+import re
+
+from . import jobs as jobs_mod
+from . import result_store
+
+HEADER_PREFIX = '# provenance: '
+
+# The build ID is a template argument of the generated environment, so its (decimal) value is part of the type's
+# mangled name, which the binary keeps for its type information
+RE_MANGLED_BUILD_ID = re.compile(rb'21generated_environmentILy(\d+)E')
+
+CONFIG = 'config'
+BINARY = 'binary'
+SOURCE = 'source'
+TRACE = 'trace'
+UNRECORDED = 'unrecorded'
+
+def binary_build_id(executable):
+    ''' The build ID compiled into a binary, or None if it cannot be found. '''
+    try:
+        with open(executable, 'rb') as rfp:
+            m = RE_MANGLED_BUILD_ID.search(rfp.read())
+    except OSError:
+        return None
+    return f'{int(m.group(1)):016x}' if m else None
+
+def config_build_id(config_path):
+    '''
+    The build ID a configuration file gives its binary today, when configured by itself with the defaults of
+    ``config.sh``.
+
+    The configure step may be given other module directories than these defaults, so this is only compared with the
+    ID the same function gave when the output was recorded, never with the ID compiled into the binary.
+    '''
+    # Imported here: the configuration package is only needed once a build ID is asked for
+    import config.filewrite # pylint: disable=import-outside-toplevel
+    import config.parse # pylint: disable=import-outside-toplevel
+    with open(config_path) as rfp:
+        parsed = config.parse.parse_config(json.load(rfp), {}, module_dir=[], branch_dir=[], btb_dir=[], pref_dir=[], repl_dir=[],
+                                           compile_all_modules=True)
+    return config.filewrite.get_build_id(parsed)
+
+def header_line(fields):
+    ''' The first line of an output, carrying its provenance. '''
+    return HEADER_PREFIX + json.dumps(fields, sort_keys=True) + '\n'
+
+def read_header(output):
+    ''' The provenance recorded in the first line of an output, or None. '''
+    try:
+        with open(output, 'rb') as rfp:
+            line = rfp.readline(1 << 16).decode('utf-8', 'replace')
+    except OSError:
+        return None
+    if not line.startswith(HEADER_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(HEADER_PREFIX):])
+    except ValueError:
+        return None
+
+class Provenance:
+    '''
+    The current identities of binaries, configurations, sources and traces, each computed once.
+
+    :param champsim_dir: the directory containing ``bin/`` and the sources
+    :param cache_dir: where trace digests are kept between runs (the result store directory)
+    '''
+
+    def __init__(self, champsim_dir=jobs_mod.CHAMPSIM_DIR, cache_dir=None):
+        self.champsim_dir = champsim_dir
+        self.cache_dir = cache_dir or os.path.join(jobs_mod.RESULTS_ROOT, result_store.STORE_DIR_NAME)
+        self._makefile_ids = None
+        self._binary_ids = {}
+        self._config_ids = {}
+        self._revision = None
+        self._trace_digests = {}
+
+    def executable(self, binary):
+        return os.path.join(self.champsim_dir, 'bin', binary)
+
+    def binary_build_id(self, binary):
+        ''' The build ID of a binary: from the binary itself, or from ``_configuration.mk``. '''
+        if binary not in self._binary_ids:
+            if self._makefile_ids is None:
+                self._makefile_ids = jobs_mod.build_ids(self.champsim_dir)
+            self._binary_ids[binary] = binary_build_id(self.executable(binary)) or self._makefile_ids.get(binary)
+        return self._binary_ids[binary]
+
+    def config_build_id(self, config_path):
+        if config_path not in self._config_ids:
+            try:
+                self._config_ids[config_path] = config_build_id(config_path)
+            except (OSError, ValueError, KeyError):
+                self._config_ids[config_path] = None
+        return self._config_ids[config_path]
+
+    @property
+    def source_revision(self):
+        if self._revision is None:
+            self._revision = result_store.source_revision(self.champsim_dir)
+        return self._revision
+
+    def trace_digest(self, trace):
+        if trace not in self._trace_digests:
+            try:
+                self._trace_digests[trace] = result_store.trace_digest(trace, self.cache_dir)
+            except OSError:
+                self._trace_digests[trace] = None
+        return self._trace_digests[trace]
+
+    def of_job(self, job):
+        ''' The provenance fields of a run of the job starting now. '''
+        return {'build_id': self.binary_build_id(job.binary),
+                'config_id': self.config_build_id(job.config) if job.config is not None else None,
+                'source_revision': self.source_revision, 'trace_digests': [self.trace_digest(t) for t in job.traces]}
+
+    def recorded(self, job, entry=None):
+        ''' The provenance recorded for a job's output: from its registry entry, else from its header. '''
+        if entry and entry.get('source_revision') is not None:
+            return entry
+        return read_header(job.output)
+
+    def check(self, job, recorded):
+        '''
+        Why the output of a job is stale.
+
+        :param recorded: the provenance recorded for the output (see :meth:`recorded`), or None
+        :returns: the list of reasons, empty if the output is current
+        '''
+        if not recorded:
+            try:
+                newer = os.path.getmtime(self.executable(job.binary)) > os.path.getmtime(job.output)
+            except OSError:
+                newer = False
+            return [BINARY] if newer else [UNRECORDED]
+
+        reasons = []
+        was_config, was = recorded.get('config_id'), recorded.get('build_id')
+        expected = self.config_build_id(job.config) if job.config is not None and was_config is not None else None
+        if expected is not None:
+            if was_config != expected:
+                reasons.append(CONFIG)
+        elif was is not None and self.binary_build_id(job.binary) not in (None, was):
+            reasons.append(BINARY)
+        if recorded.get('source_revision') not in (None, self.source_revision):
+            reasons.append(SOURCE)
+        digests = recorded.get('trace_digests')
+        if digests is not None and digests != [self.trace_digest(t) for t in job.traces]:
+            reasons.append(TRACE)
+        return reasons
@@ -0,0 +1,218 @@
+'''
+A shared cache of decompressed traces.
+
+Every job of a sweep reads the same handful of ``.xz`` traces, and each simulator process otherwise decompresses its
+trace again with LZMA, which costs more CPU than a large part of the simulation itself. The cache decompresses each
+trace once into a local directory and hands the runner the path of that copy, which the tracereader opens by its
+extension: ``.zst`` when the ``zstd`` tool is installed (fast to decode, small on disk), otherwise a raw
+``.champsimtrace`` that is read directly.
+
+The cache is bounded in size. Entries are evicted least-recently-used first, and never while a job still holds a
+reference. Several runners on one machine may share a cache directory: the index is updated under an exclusive lock,
+and references held by runners that have since exited are dropped.
+'''
+
+import bz2
+import contextlib
+import fcntl
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import shutil
+import subprocess
+import time
+
+INDEX_NAME = 'index.json'
+LOCK_NAME = '.lock'
+DEFAULT_CACHE_DIR = os.environ.get('TRACE_CACHE_DIR', os.path.join('/tmp', f'champsim-trace-cache-{os.getuid()}'))
+
+FORMATS = ('auto', 'raw', 'zstd')
+
+_OPENERS = {'.xz': lzma.open, '.gz': gzip.open, '.bz2': bz2.open}
+
+def parse_size(text):
+    ''' Parse a size such as ``200G``, ``512M``, ``1.5T`` or a bare number of bytes. '''
+    text = str(text).strip().upper().rstrip('B')
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def is_cacheable(trace):
+    ''' Whether the trace is compressed in a form the cache knows how to decompress. '''
+    return os.path.splitext(trace)[1] in _OPENERS
+
+class TraceCache:
+    '''
+    Decompressed copies of traces, keyed by the source path, size and modification time.
+
+    :param root: the cache directory
+    :param max_bytes: the total size the cache may occupy
+    :param fmt: ``raw``, ``zstd``, or ``auto`` to use zstd when the tool is available
+    :param zstd_level: the compression level passed to ``zstd``
+    '''
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=parse_size('100G'), fmt='auto', zstd_level=3):
+        if fmt not in FORMATS:
+            raise ValueError(f'Unknown trace cache format {fmt!r}')
+        self.root = root
+        self.max_bytes = max_bytes
+        self.zstd = shutil.which('zstd') if fmt in ('auto', 'zstd') else None
+        if fmt == 'zstd' and self.zstd is None:
+            raise ValueError('zstd format requested, but the zstd tool is not installed')
+        self.zstd_level = zstd_level
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.root, INDEX_NAME)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        ''' Hold the cache lock and yield the index; it is written back when the block exits normally. '''
+        with open(os.path.join(self.root, LOCK_NAME), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.index_path) as rfp:
+                        index = json.load(rfp)
+                except (OSError, ValueError):
+                    index = {}
+                self._drop_dead_refs(index)
+                yield index
+                tmp = self.index_path + '.tmp'
+                with open(tmp, 'w') as wfp:
+                    json.dump(index, wfp, indent=1, sort_keys=True)
+                os.replace(tmp, self.index_path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _drop_dead_refs(index):
+        for key, entry in list(index.items()):
+            entry['refs'] = {holder: pid for holder, pid in entry.get('refs', {}).items() if _pid_alive(pid)}
+            if entry.get('builder') is not None and not _pid_alive(entry['builder']):
+                # The process filling this entry died; whatever it left behind is incomplete
+                with contextlib.suppress(OSError):
+                    os.remove(entry['path'] + '.part')
+                del index[key]
+
+    def key_of(self, trace):
+        ''' The cache key of a trace. A trace that is rewritten in place gets a new key. '''
+        st = os.stat(trace)
+        ident = f'{os.path.abspath(trace)}\0{st.st_size}\0{st.st_mtime_ns}'
+        return hashlib.sha1(ident.encode()).hexdigest()[:16]
+
+    def _cached_name(self, trace, key):
+        stem = os.path.splitext(os.path.basename(trace))[0]
+        if not stem.endswith('.champsimtrace'):
+            stem += '.champsimtrace'
+        return f'{key}-{stem}' + ('.zst' if self.zstd else '')
+
+    def _decompress(self, trace, dest):
+        ''' Decompress a trace into ``dest``, re-encoding it with zstd when enabled. '''
+        opener = _OPENERS[os.path.splitext(trace)[1]]
+        with opener(trace, 'rb') as src:
+            if self.zstd is None:
+                with open(dest, 'wb') as wfp:
+                    shutil.copyfileobj(src, wfp, 1 << 20)
+                return
+            with subprocess.Popen([self.zstd, '-q', '-f', f'-{self.zstd_level}', '-T0', '-o', dest], stdin=subprocess.PIPE) as proc:
+                try:
+                    shutil.copyfileobj(src, proc.stdin, 1 << 20)
+                finally:
+                    proc.stdin.close()
+            if proc.returncode != 0:
+                raise OSError(f'zstd exited with {proc.returncode} while caching {trace}')
+
+    def _evict(self, index, keep=()):
+        ''' Remove unreferenced entries, least recently used first, until the cache fits its size. '''
+        total = sum(e['size'] for e in index.values() if e.get('size') is not None)
+        victims = sorted((e['last_used'], k) for k, e in index.items() if not e['refs'] and e.get('builder') is None and k not in keep)
+        for _, key in victims:
+            if total <= self.max_bytes:
+                break
+            entry = index.pop(key)
+            with contextlib.suppress(OSError):
+                os.remove(entry['path'])
+            total -= entry['size']
+        return total
+
+    def acquire(self, trace, holder, poll_interval=1.0):
+        '''
+        The path of the decompressed copy of ``trace``, decompressing it first if it is not cached.
+
+        The copy is referenced by ``holder`` (e.g. a job id) until :meth:`release` is called.
+        Traces that are not compressed, or cannot be found, are returned unchanged.
+        '''
+        if not is_cacheable(trace) or not os.path.exists(trace):
+            return trace
+        key = self.key_of(trace)
+        while True:
+            with self._locked() as index:
+                entry = index.get(key)
+                if entry is not None and entry.get('builder') is None and os.path.exists(entry['path']):
+                    entry['refs'][holder] = os.getpid()
+                    entry['last_used'] = time.time()
+                    return entry['path']
+                if entry is None or entry.get('builder') is None:
+                    path = os.path.join(self.root, self._cached_name(trace, key))
+                    index[key] = {'source': os.path.abspath(trace), 'path': path, 'size': None, 'refs': {}, 'last_used': time.time(),
+                                  'builder': os.getpid()}
+                    break
+            # Another process is decompressing this trace; wait for it rather than doing the work twice
+            time.sleep(poll_interval)
+
+        try:
+            self._decompress(trace, path + '.part')
+            os.replace(path + '.part', path)
+        except BaseException:
+            with self._locked() as index:
+                index.pop(key, None)
+            with contextlib.suppress(OSError):
+                os.remove(path + '.part')
+            raise
+
+        with self._locked() as index:
+            entry = index[key]
+            entry.update(size=os.path.getsize(path), builder=None, last_used=time.time())
+            entry['refs'][holder] = os.getpid()
+            self._evict(index, keep=(key,))
+        return path
+
+    def release(self, holder):
+        ''' Drop every reference held by ``holder``, and evict if the cache is over its size. '''
+        with self._locked() as index:
+            for entry in index.values():
+                entry['refs'].pop(holder, None)
+            self._evict(index)
+
+    def prepare(self, traces):
+        ''' Make sure every trace is cached before jobs start, without holding references. '''
+        holder = f'prepare-{os.getpid()}'
+        for trace in dict.fromkeys(traces):
+            self.acquire(trace, holder)
+        self.release(holder)
+
+    def entries(self):
+        ''' A snapshot of the index: ``{key: entry}``. '''
+        with self._locked() as index:
+            return {k: dict(e) for k, e in index.items()}
+
+    def clear(self):
+        ''' Remove every entry that no job is using. '''
+        with self._locked() as index:
+            for key in [k for k, e in index.items() if not e['refs'] and e.get('builder') is None]:
+                with contextlib.suppress(OSError):
+                    os.remove(index.pop(key)['path'])
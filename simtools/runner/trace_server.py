@@ -0,0 +1,354 @@
+'''
+Shared-memory trace fan-out.
+
+A sweep column runs one trace on many binaries at the same time. Instead of every simulator decoding the trace, a trace
+server decodes it once and publishes the bytes into a ring buffer in ``/dev/shm``; each simulator reads the ring through
+the ``shm:<segment>:<trace>`` source of the tracereader (``inc/shm_istream.h``, which also documents the layout).
+
+Every consumer has its own cursor. The server stays at most one ring ahead of the slowest active consumer, so each run
+proceeds at its own pace within that window. When the window is full because of a slow consumer while another
+consumer is waiting for data, the server waits ``lag_timeout`` seconds and then evicts the slowest consumer, which
+continues with a private decoder. A consumer that joins after the beginning of the trace has been overwritten, or finds
+the server gone, does the same.
+
+Waiting on both sides uses futexes on words of the header, with a short timeout so that a vanished peer is noticed.
+The header words are written with single aligned stores and the data is copied before ``write_pos`` is published,
+which relies on the store ordering of x86-64.
+
+The runner starts servers itself (``run --fanout``); one can also be started by hand::
+
+    python3 -m simtools.runner serve --segment champsim-mcf --consumers 28 /path/to/mcf.champsimtrace.xz
+'''
+
+import ctypes
+import mmap
+import os
+import platform
+import subprocess
+import time
+
+from .trace_cache import _OPENERS
+
+SHM_DIR = '/dev/shm'
+
+MAGIC = 0x314d485352545343 # "CSTRSHM1"
+VERSION = 1
+HEADER_SIZE = 4096
+SLOT_OFFSET = 128
+SLOT_SIZE = 32
+MAX_CONSUMERS = 64
+
+FREE, ACTIVE, EVICTED, DONE = range(4)
+
+# Byte offsets of the header fields, matching champsim::shm_trace::header
+_MAGIC, _VERSION, _CAPACITY, _MAX_CONSUMERS, _RESERVE_POS, _WRITE_POS = 0, 8, 16, 24, 32, 40
+_EOF, _SERVER_WAITING, _WRITE_SEQ, _READ_SEQ, _SERVER_PID = 48, 52, 56, 60, 64
+
+_SYS_FUTEX = {'x86_64': 202, 'aarch64': 98}.get(platform.machine())
+_FUTEX_WAIT, _FUTEX_WAKE = 0, 1
+
+class _timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+_libc = ctypes.CDLL(None, use_errno=True)
+
+def futex_wait(word, expected, timeout=0.1):
+    ''' Sleep until the 32-bit ``word`` no longer holds ``expected``, a wake-up, or the timeout. '''
+    if _SYS_FUTEX is None:
+        time.sleep(min(timeout, 0.001))
+        return
+    ts = _timespec(int(timeout), int((timeout % 1) * 1e9))
+    _libc.syscall(ctypes.c_long(_SYS_FUTEX), ctypes.c_void_p(ctypes.addressof(word)), ctypes.c_int(_FUTEX_WAIT),
+                  ctypes.c_uint32(expected), ctypes.byref(ts), None, ctypes.c_int(0))
+
+def futex_wake(word):
+    if _SYS_FUTEX is not None:
+        _libc.syscall(ctypes.c_long(_SYS_FUTEX), ctypes.c_void_p(ctypes.addressof(word)), ctypes.c_int(_FUTEX_WAKE),
+                      ctypes.c_int(2**31 - 1), None, None, ctypes.c_int(0))
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def descriptor(segment, trace):
+    ''' The trace argument that makes a simulator read ``segment``, falling back to ``trace``. '''
+    return f'shm:{segment}:{trace}'
+
+def open_trace(path):
+    ''' Open a trace for reading its decoded bytes, choosing the decoder by extension as the tracereader does. '''
+    ext = os.path.splitext(path)[1]
+    if ext in _OPENERS:
+        return _OPENERS[ext](path, 'rb')
+    if ext == '.zst':
+        proc = subprocess.Popen(['zstd', '-dc', path], stdout=subprocess.PIPE)
+        return proc.stdout
+    return open(path, 'rb')
+
+class Segment:
+    ''' A mapped fan-out segment with typed views of its header words. '''
+
+    def __init__(self, path, mm):
+        self.path = path
+        self.mm = mm
+        u32 = lambda off: ctypes.c_uint32.from_buffer(mm, off)
+        u64 = lambda off: ctypes.c_uint64.from_buffer(mm, off)
+        self.magic = u64(_MAGIC)
+        self.version = u32(_VERSION)
+        self.capacity = u64(_CAPACITY)
+        self.max_consumers = u64(_MAX_CONSUMERS)
+        self.reserve_pos = u64(_RESERVE_POS)
+        self.write_pos = u64(_WRITE_POS)
+        self.eof = u32(_EOF)
+        self.server_waiting = u32(_SERVER_WAITING)
+        self.write_seq = u32(_WRITE_SEQ)
+        self.read_seq = u32(_READ_SEQ)
+        self.server_pid = u64(_SERVER_PID)
+        self.slots = [(u32(SLOT_OFFSET + i * SLOT_SIZE), u64(SLOT_OFFSET + i * SLOT_SIZE + 8), u64(SLOT_OFFSET + i * SLOT_SIZE + 16))
+                      for i in range(MAX_CONSUMERS)]
+
+    @classmethod
+    def create(cls, name, capacity, shm_dir=SHM_DIR):
+        path = os.path.join(shm_dir, name)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            os.ftruncate(fd, HEADER_SIZE + capacity)
+            mm = mmap.mmap(fd, HEADER_SIZE + capacity)
+        finally:
+            os.close(fd)
+        seg = cls(path, mm)
+        seg.version.value = VERSION
+        seg.capacity.value = capacity
+        seg.max_consumers.value = MAX_CONSUMERS
+        seg.server_pid.value = os.getpid()
+        seg.magic.value = MAGIC
+        return seg
+
+    @classmethod
+    def open(cls, name, shm_dir=SHM_DIR):
+        path = os.path.join(shm_dir, name)
+        fd = os.open(path, os.O_RDWR)
+        try:
+            mm = mmap.mmap(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+        seg = cls(path, mm)
+        if seg.magic.value != MAGIC or seg.version.value != VERSION:
+            seg.close()
+            raise ValueError(f'{path} is not a trace segment')
+        return seg
+
+    def reap(self):
+        ''' Mark the slots of consumers that exited without detaching (e.g. killed by the watchdog) as done. '''
+        for state, pid, _ in self.slots:
+            if state.value == ACTIVE and not _pid_alive(pid.value):
+                state.value = DONE
+
+    def consumers(self, *states):
+        ''' ``(index, cursor)`` of the slots in one of the given states. '''
+        return [(i, cursor.value) for i, (state, _, cursor) in enumerate(self.slots) if state.value in states]
+
+    def close(self):
+        # The ctypes views hold exports of the mapping; they must go before it can be closed
+        self.__dict__ = {'path': self.path, 'mm': self.mm}
+        self.mm.close()
+
+class LostSegment(Exception):
+    ''' The consumer was evicted, or the data it wanted was overwritten. '''
+
+class Consumer:
+    '''
+    A Python reader of a fan-out segment, following the same protocol as ``champsim::shm_istream``.
+
+    It does not fall back to a private decoder; :class:`LostSegment` is raised instead. Slots are claimed without an
+    atomic compare-and-swap, so it must not attach concurrently with other consumers; it is meant for checking a server.
+    '''
+
+    def __init__(self, name, shm_dir=SHM_DIR):
+        self.seg = Segment.open(name, shm_dir)
+        self.cursor = 0
+        self.slot = self._claim()
+        if self.slot is None or self.seg.reserve_pos.value > self.seg.capacity.value:
+            self.close()
+            raise LostSegment(f'{name}: too late to join')
+
+    def _claim(self):
+        for idx, (state, pid, cursor) in enumerate(self.seg.slots[:self.seg.max_consumers.value]):
+            if state.value == FREE:
+                cursor.value = 0
+                pid.value = os.getpid()
+                state.value = ACTIVE
+                return idx
+        return None
+
+    def read(self, size):
+        ''' Up to ``size`` bytes; fewer only at the end of the trace. '''
+        seg = self.seg
+        state, _, cursor = seg.slots[self.slot]
+        capacity = seg.capacity.value
+        out = bytearray()
+        while len(out) < size:
+            if state.value != ACTIVE:
+                raise LostSegment(f'evicted at byte {self.cursor}')
+            write_pos = seg.write_pos.value
+            if write_pos == self.cursor:
+                if seg.eof.value:
+                    break
+                seq = seg.write_seq.value
+                if seg.write_pos.value == write_pos:
+                    futex_wait(seg.write_seq, seq)
+                continue
+            n = min(write_pos - self.cursor, size - len(out))
+            offset = self.cursor % capacity
+            first = min(n, capacity - offset)
+            chunk = seg.mm[HEADER_SIZE + offset:HEADER_SIZE + offset + first] + seg.mm[HEADER_SIZE:HEADER_SIZE + n - first]
+            if seg.reserve_pos.value > self.cursor + capacity:
+                raise LostSegment(f'overwritten at byte {self.cursor}')
+            out += chunk
+            self.cursor += n
+            cursor.value = self.cursor
+            if seg.server_waiting.value:
+                seg.read_seq.value = (seg.read_seq.value + 1) & 0xffffffff
+                futex_wake(seg.read_seq)
+        return bytes(out)
+
+    def close(self):
+        if self.slot is not None:
+            self.seg.slots[self.slot][0].value = DONE
+            self.seg.read_seq.value = (self.seg.read_seq.value + 1) & 0xffffffff
+            futex_wake(self.seg.read_seq)
+        self.seg.close()
+
+class TraceServer:
+    '''
+    Decode a trace once into a fan-out segment.
+
+    :param trace: the trace to decode
+    :param segment: the segment name under ``/dev/shm``
+    :param capacity: the ring size in bytes, i.e. how far the fastest consumer may run ahead of the slowest
+    :param consumers: start decoding once this many consumers have attached (or ``attach_timeout`` has passed)
+    :param lag_timeout: seconds a consumer may hold up a waiting one before it is evicted
+    :param chunk_size: bytes decoded and published at a time
+    '''
+
+    def __init__(self, trace, segment, capacity=256 << 20, consumers=1, attach_timeout=60.0, lag_timeout=30.0, chunk_size=1 << 20,
+                 shm_dir=SHM_DIR, log=print):
+        self.trace = trace
+        self.capacity = capacity
+        self.consumers = consumers
+        self.attach_timeout = attach_timeout
+        self.lag_timeout = lag_timeout
+        self.chunk_size = min(chunk_size, capacity // 4)
+        self.log = log
+        self.seg = Segment.create(segment, capacity, shm_dir)
+        self.evicted = 0
+        self.stalled_since = None
+
+    def _wait_for_consumers(self):
+        deadline = time.time() + self.attach_timeout
+        while len(self.seg.consumers(ACTIVE, DONE)) < self.consumers and time.time() < deadline:
+            time.sleep(0.05)
+
+    def _wake_consumers(self):
+        self.seg.write_seq.value = (self.seg.write_seq.value + 1) & 0xffffffff
+        futex_wake(self.seg.write_seq)
+
+    def _make_room(self, size):
+        '''
+        Wait until ``size`` more bytes fit in front of every active consumer.
+
+        The time during which a full window leaves some consumer with nothing to read accumulates over successive
+        calls, so that a consumer which keeps the others pacing at its speed is evicted as well as one that stops.
+
+        :returns: False when there is no active consumer left
+        '''
+        seg = self.seg
+        while True:
+            seg.reap()
+            active = seg.consumers(ACTIVE)
+            if not active:
+                return False
+            write_pos = seg.write_pos.value
+            slowest = min(cursor for _, cursor in active)
+            if write_pos + size - slowest <= self.capacity:
+                return True
+
+            if max(cursor for _, cursor in active) < write_pos:
+                # Everybody still has data: the consumers are simply slower than the decoder
+                self.stalled_since = None
+            elif self.stalled_since is None:
+                self.stalled_since = time.time()
+            elif time.time() - self.stalled_since > self.lag_timeout:
+                for idx, cursor in active:
+                    if cursor == slowest:
+                        seg.slots[idx][0].value = EVICTED
+                        self.evicted += 1
+                        self.log(f'Evicted consumer {idx} (pid {seg.slots[idx][1].value}) at byte {cursor}')
+                self._wake_consumers()
+                self.stalled_since = None
+                continue
+
+            seq = seg.read_seq.value
+            seg.server_waiting.value = 1
+            futex_wait(seg.read_seq, seq)
+            seg.server_waiting.value = 0
+
+    def publish(self, data):
+        '''
+        Append decoded bytes to the ring, waiting for room.
+
+        :returns: False when there is no active consumer left
+        '''
+        if not self._make_room(len(data)):
+            return False
+        seg = self.seg
+        write_pos = seg.write_pos.value
+        end = write_pos + len(data)
+        seg.reserve_pos.value = end
+
+        offset = write_pos % self.capacity
+        first = min(len(data), self.capacity - offset)
+        seg.mm[HEADER_SIZE + offset:HEADER_SIZE + offset + first] = data[:first]
+        seg.mm[HEADER_SIZE:HEADER_SIZE + len(data) - first] = data[first:]
+
+        seg.write_pos.value = end
+        self._wake_consumers()
+        return True
+
+    def serve(self):
+        '''
+        Decode the whole trace into the segment, then wait for the consumers to finish with it.
+
+        :returns: the number of bytes published
+        '''
+        try:
+            self._wait_for_consumers()
+            with open_trace(self.trace) as src:
+                while True:
+                    data = src.read(self.chunk_size)
+                    if not data:
+                        break
+                    if not self.publish(data):
+                        self.log('No consumers left')
+                        break
+            self.seg.eof.value = 1
+            self._wake_consumers()
+            while self.seg.reap() or self.seg.consumers(ACTIVE):
+                seq = self.seg.read_seq.value
+                self.seg.server_waiting.value = 1
+                futex_wait(self.seg.read_seq, seq, timeout=1.0)
+            return self.seg.write_pos.value
+        finally:
+            self.remove()
+            self.seg.close()
+
+    def remove(self):
+        ''' Unlink the segment. Consumers that have it mapped keep reading their mapping. '''
+        try:
+            os.remove(self.seg.path)
+        except FileNotFoundError:
+            pass
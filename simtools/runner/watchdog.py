@@ -0,0 +1,150 @@
+'''
+Watchdog for collapsed simulator runs.
+
+``do_phase`` in ``src/champsim.cc`` no longer aborts when the interval IPC drops below 0.01; it prints
+``panic: IPC ... < 0.01`` every livelock period instead. A run that has collapsed (e.g. a 1e-8 pinning-off run taking
+repeated page-offline penalties) therefore occupies a core for days. The watchdog reads each job's output
+incrementally and decides when such a run should be terminated.
+'''
+
+import dataclasses
+import time
+from typing import Optional
+
+from .. import progress
+from . import registry
+from .capture import RE_SUPPRESSED
+
+@dataclasses.dataclass
+class WatchdogPolicy:
+    '''
+    Termination policies. A policy set to None is disabled.
+
+    :param panic_lines: terminate after this many panic lines with no heartbeat in between
+    :param budget: wall-clock seconds a job may take; terminate once the projected total exceeds it
+    :param stall_minutes: terminate if no new heartbeat appears for this long
+    :param grace: seconds after start before the projected total is trusted
+    '''
+    panic_lines: Optional[int] = 500
+    budget: Optional[float] = None
+    stall_minutes: Optional[float] = None
+    grace: float = 1800.0
+
+@dataclasses.dataclass
+class Verdict:
+    state: str
+    reason: str
+
+class OutputTail:
+    '''
+    Incremental reader of a file that is still being written.
+
+    Only the bytes appended since the previous call are read. An incomplete trailing line is held back until its
+    newline arrives.
+    '''
+
+    def __init__(self, path, offset=0, chunk_size=1 << 22):
+        self.path = path
+        self.offset = offset
+        self.chunk_size = chunk_size
+        self._partial = b''
+
+    def read_lines(self):
+        ''' Yield each complete line appended since the last call, decoded and without its newline. '''
+        try:
+            rfp = open(self.path, 'rb')
+        except OSError:
+            return
+        with rfp:
+            rfp.seek(self.offset)
+            while True:
+                chunk = rfp.read(self.chunk_size)
+                if not chunk:
+                    break
+                self.offset += len(chunk)
+                lines = (self._partial + chunk).split(b'\n')
+                self._partial = lines.pop()
+                for line in lines:
+                    yield line.decode('utf-8', 'replace')
+
+class JobWatch:
+    '''
+    The watchdog's view of one running job.
+
+    :param job: the :class:`~simtools.runner.jobs.Job` being watched
+    :param policy: the :class:`WatchdogPolicy` to apply
+    :param started: the wall-clock time the job was launched
+    '''
+
+    def __init__(self, job, policy, started=None):
+        self.job = job
+        self.policy = policy
+        self.started = time.time() if started is None else started
+        self.tail = OutputTail(job.output)
+        self.beats = {}             # cpu -> [(instructions, elapsed seconds), ...]
+        self.panic_run = 0          # panic lines since the last heartbeat
+        self.panic_total = 0
+        self.last_beat = self.started
+
+    def consume(self, now=None):
+        ''' Parse whatever the job has written since the last call. '''
+        now = time.time() if now is None else now
+        for line in self.tail.read_lines():
+            if line.startswith('Heartbeat CPU'):
+                m = progress.RE_HEARTBEAT.match(line)
+                if m:
+                    beat = (int(m.group(2)), progress.hms_to_sec(m.group(3), m.group(4), m.group(5)))
+                    self.beats.setdefault(int(m.group(1)), []).append(beat)
+                    self.panic_run = 0
+                    self.last_beat = now
+            elif progress.RE_PANIC.search(line):
+                # A capped output stands for the panic lines it dropped with one note
+                m = RE_SUPPRESSED.match(line)
+                count = int(m.group(1)) if m else 1
+                self.panic_run += count
+                self.panic_total += count
+
+    @property
+    def last_instr(self):
+        ''' Progress of the slowest CPU. '''
+        if not self.beats:
+            return 0
+        return min(b[-1][0] for b in self.beats.values())
+
+    def eta(self, now=None):
+        ''' Remaining seconds for the slowest CPU, or None if no rate is known yet. '''
+        if self.job.total_instr is None:
+            return None
+        now = time.time() if now is None else now
+        elapsed = now - self.started
+        etas = [progress.compute_eta(b, b[-1][0], elapsed, self.job.warmup or 0, self.job.total_instr) for b in self.beats.values()]
+        if not etas or any(e is None for e in etas):
+            return None
+        return max(etas)
+
+    def check(self, now=None):
+        '''
+        Read new output and apply the policies.
+
+        :returns: a :class:`Verdict` if the job should be terminated, otherwise None
+        '''
+        now = time.time() if now is None else now
+        self.consume(now)
+        policy = self.policy
+
+        if policy.panic_lines is not None and self.panic_run >= policy.panic_lines:
+            return Verdict(registry.PANIC, f'{self.panic_run} consecutive panic lines at {self.last_instr} instructions')
+
+        if policy.stall_minutes is not None and (now - self.last_beat) > policy.stall_minutes * 60:
+            return Verdict(registry.PANIC, f'no heartbeat for {progress.fmt_dur(now - self.last_beat)}')
+
+        elapsed = now - self.started
+        if policy.budget is not None:
+            if elapsed > policy.budget:
+                return Verdict(registry.OVER_BUDGET, f'ran {progress.fmt_dur(elapsed)}, budget {progress.fmt_dur(policy.budget)}')
+            eta = self.eta(now)
+            if elapsed >= policy.grace and eta is not None and elapsed + eta > policy.budget:
+                return Verdict(registry.OVER_BUDGET,
+                               f'projected {progress.fmt_dur(elapsed + eta)} exceeds budget {progress.fmt_dur(policy.budget)}')
+
+        return None
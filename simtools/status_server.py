@@ -0,0 +1,219 @@
+'''
+A local HTTP server for the progress of job manifests.
+
+Everyone watching a sweep through their own monitor re-scans the same output files. This server owns a single
+:class:`~simtools.monitor.Monitor`, refreshes it in the background, and answers every request from the latest
+snapshot, so any number of terminals and scripts can follow a sweep without adding filesystem load.
+
+Endpoints (all ``GET``):
+
+``/summary``
+    Job counts per state, completions per hour and when the snapshot was taken.
+``/experiments``
+    The same counts for each experiment.
+``/jobs``
+    One entry per job: state, instructions done, ETA, panic and stall flags. ``?experiment=``, ``?state=`` filter it.
+``/``
+    A plain HTML page of the above.
+
+Example::
+
+    python3 -m simtools.status_server gap.json mixes.json --port 8765
+    curl -s localhost:8765/summary
+    python3 -m simtools.monitor --url http://localhost:8765
+'''
+
+import argparse
+import html
+import http.server
+import json
+import sys
+import threading
+import time
+import urllib.parse
+
+from . import monitor as monitor_mod
+from . import progress
+from .runner import jobs as jobs_mod
+
+def completions_per_hour(statuses, now, window=6 * 3600):
+    ''' The rate at which jobs completed over the last ``window`` seconds, per hour. '''
+    done = sum(1 for s in statuses if s.state == monitor_mod.DONE and s.finished is not None and now - s.finished <= window)
+    return done * 3600 / window
+
+class StatusSnapshot:
+    '''
+    The JSON documents served for one refresh.
+
+    :param statuses: the :class:`~simtools.monitor.JobStatus` list of the refresh
+    :param now: when the refresh was taken
+    :param window: seconds over which completions per hour are averaged
+    '''
+
+    def __init__(self, statuses, now, window=6 * 3600, bytes_read=0, scan_seconds=0.0):
+        self.time = now
+        self.jobs = [s.to_dict() for s in statuses]
+
+        per_experiment = monitor_mod.summarize(statuses)
+        by_experiment = {}
+        for s in statuses:
+            by_experiment.setdefault(s.job.experiment, []).append(s)
+        self.experiments = [{'experiment': e, **counts, 'completions_per_hour': completions_per_hour(by_experiment[e], now, window)}
+                            for e, counts in per_experiment.items()]
+
+        states = (monitor_mod.PENDING, monitor_mod.RUNNING, monitor_mod.DONE, monitor_mod.PANIC, monitor_mod.STALLED,
+                  monitor_mod.FAILED, monitor_mod.KILLED)
+        unfinished = [s.eta for s in statuses if s.state == monitor_mod.RUNNING]
+        self.summary = {
+            'time': now,
+            'total': len(statuses),
+            **{state: sum(c[state] for c in per_experiment.values()) for state in states},
+            'completions_per_hour': completions_per_hour(statuses, now, window),
+            'longest_eta': max((e for e in unfinished if e is not None), default=None),
+            'bytes_read': bytes_read,
+            'scan_seconds': scan_seconds
+        }
+
+    def select_jobs(self, query):
+        ''' The ``/jobs`` document, filtered by the ``experiment`` and ``state`` query parameters. '''
+        jobs = self.jobs
+        for key in ('experiment', 'state'):
+            if key in query:
+                wanted = set(query[key])
+                jobs = [j for j in jobs if j[key] in wanted]
+        return {'time': self.time, 'jobs': jobs}
+
+    def to_html(self):
+        ''' A plain page with the summary, the experiments and the jobs that are not done or pending. '''
+        def row(cells, tag='td'):
+            return '<tr>' + ''.join(f'<{tag}>{html.escape(str(c))}</{tag}>' for c in cells) + '</tr>'
+
+        s = self.summary
+        parts = [
+            '<!DOCTYPE html><html><head><meta charset="utf-8"><meta http-equiv="refresh" content="30">',
+            '<title>ChampSim progress</title>',
+            '<style>body{font-family:monospace} table{border-collapse:collapse} td,th{padding:2px 8px;text-align:right}'
+            ' td:first-child,th:first-child{text-align:left}</style></head><body>',
+            f'<h2>ChampSim progress, {html.escape(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.time)))}</h2>',
+            f'<p>done {s["done"]}/{s["total"]}, running {s["running"]}, pending {s["pending"]}, panic {s["panic"]}, '
+            f'stalled {s["stalled"]}, failed {s["failed"]}, killed {s["killed"]}; '
+            f'{s["completions_per_hour"]:.1f} completions/hour</p>',
+            '<table>', row(('experiment', 'done', 'total', 'running', 'pending', 'panic', 'stalled', 'failed', 'killed', 'per hour'), 'th')
+        ]
+        for e in self.experiments:
+            parts.append(row((e['experiment'], e['done'], e['total'], e['running'], e['pending'], e['panic'], e['stalled'],
+                              e['failed'], e['killed'], f'{e["completions_per_hour"]:.1f}')))
+        parts += ['</table><h3>Active</h3><table>', row(('job', 'state', 'progress', 'instructions', 'elapsed', 'remaining'), 'th')]
+        for j in self.jobs:
+            if j['state'] in (monitor_mod.DONE, monitor_mod.PENDING):
+                continue
+            parts.append(row((j['job_id'], j['state'], f'{j["fraction"] * 100:.1f}%', j['instructions'],
+                              progress.fmt_dur(j['elapsed']), progress.fmt_dur(j['eta']))))
+        parts.append('</table></body></html>')
+        return ''.join(parts)
+
+class StatusServer(http.server.ThreadingHTTPServer):
+    '''
+    An HTTP server answering from the latest snapshot of a monitor, refreshed by a background thread.
+
+    :param address: the ``(host, port)`` to listen on
+    :param monitor: the :class:`~simtools.monitor.Monitor` to refresh
+    :param interval: seconds between refreshes
+    :param window: seconds over which completions per hour are averaged
+    '''
+
+    daemon_threads = True
+
+    def __init__(self, address, monitor, interval=10.0, window=6 * 3600):
+        super().__init__(address, StatusHandler)
+        self.monitor = monitor
+        self.interval = interval
+        self.window = window
+        self.snapshot = None
+        self._stop = threading.Event()
+        self.refresh()
+        self._refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+
+    def refresh(self):
+        ''' Rescan the job outputs and replace the snapshot. '''
+        start = time.time()
+        statuses = self.monitor.refresh(start)
+        # Swapping the reference is atomic; handlers never see a partially built snapshot
+        self.snapshot = StatusSnapshot(statuses, start, self.window, self.monitor.bytes_read, time.time() - start)
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as err: # keep serving the last snapshot
+                print(f'refresh failed: {err!r}', file=sys.stderr)
+
+    def serve_forever(self, poll_interval=0.5):
+        if not self._refresher.is_alive():
+            self._refresher.start()
+        super().serve_forever(poll_interval)
+
+    def server_close(self):
+        self._stop.set()
+        super().server_close()
+
+class StatusHandler(http.server.BaseHTTPRequestHandler):
+    ''' Routes requests to the documents of the server's current snapshot. '''
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        snapshot = self.server.snapshot
+        path = url.path.rstrip('/') or '/'
+        if path == '/summary':
+            self._send_json(snapshot.summary)
+        elif path == '/experiments':
+            self._send_json({'time': snapshot.time, 'experiments': snapshot.experiments})
+        elif path == '/jobs':
+            self._send_json(snapshot.select_jobs(query))
+        elif path in ('/', '/index.html'):
+            self._send(200, 'text/html; charset=utf-8', snapshot.to_html().encode())
+        else:
+            self._send_json({'error': f'no such endpoint: {url.path}'}, 404)
+
+    def _send_json(self, document, status=200):
+        self._send(status, 'application/json', json.dumps(document).encode())
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m simtools.status_server', description='Serve the progress of job manifests over HTTP')
+    parser.add_argument('manifests', nargs='+', help='Job manifests written by "python3 -m simtools.runner manifest"')
+    parser.add_argument('--host', default='127.0.0.1', help='The address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='The port to listen on')
+    parser.add_argument('-i', '--interval', type=float, default=10.0, help='Seconds between rescans')
+    parser.add_argument('--window', default='6h', help='The period completions per hour are averaged over')
+    parser.add_argument('--stall-min', type=float, default=45.0,
+                        help='Minutes without new output after which an unfinished job counts as stalled')
+    parser.add_argument('--results-root', default=jobs_mod.RESULTS_ROOT, help='The results root holding the job registry')
+    parser.add_argument('--state', help='The state file (default: under <results root>/.monitor)')
+    args = parser.parse_args(argv)
+
+    jobs = [j for m in args.manifests for j in jobs_mod.load_manifest(m)]
+    monitor = monitor_mod.Monitor(jobs, state_path=args.state or monitor_mod.default_state_path(args.manifests, args.results_root),
+                                  results_root=args.results_root, stall_min=args.stall_min)
+    server = StatusServer((args.host, args.port), monitor, interval=args.interval, window=progress.parse_duration(args.window))
+    print(f'Serving {len(jobs)} jobs on http://{args.host}:{server.server_address[1]}/')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    sys.exit(main())
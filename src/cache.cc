@@ -922,6 +922,23 @@ void CACHE::impl_replacement_cache_fill(uint32_t triggering_cpu, long set, long
 
 void CACHE::impl_replacement_final_stats() const { repl_module_pimpl->impl_replacement_final_stats(); }
 
+void CACHE::checkpoint(champsim::checkpoint::archive& ar)
+{
+  ar.expect(NUM_SET, NAME + " sets");
+  ar.expect(NUM_WAY, NAME + " ways");
+  for (auto& b : block) {
+    b.checkpoint(ar);
+  }
+
+  // The ways handed over to error data
+  ar.io(error_way_count);
+  ar.io(error_way_last_used_cycles);
+  ar.io(error_way_cycle);
+
+  pref_module_pimpl->impl_prefetcher_checkpoint(ar);
+  repl_module_pimpl->impl_replacement_checkpoint(ar);
+}
+
 bool CACHE::is_address_in_cache(champsim::address addr) const
 {
   auto [set_begin, set_end] = get_set_span(addr);
@@ -1322,6 +1339,69 @@ long CACHE::get_max_error_way_limit() const
   return std::min<long>(configured, static_cast<long>(NUM_WAY) - 1);
 }
 
+std::pair<std::unordered_set<uint64_t>, std::unordered_set<uint64_t>> CACHE::error_way_residency() const
+{
+  std::unordered_set<uint64_t> pinned_addrs;
+  std::unordered_set<uint64_t> normal_addrs;
+  long error_way_start = get_error_way_start();
+  long normal_end = get_normal_way_end();
+  for (long set_idx = 0; set_idx < NUM_SET; ++set_idx) {
+    for (long way_offset = 0; way_offset < error_way_count; ++way_offset) {
+      const auto& blk = block[set_idx * NUM_WAY + error_way_start + way_offset];
+      if (blk.valid) {
+        pinned_addrs.insert(blk.address.to<uint64_t>() & ~0x3FULL);
+      }
+    }
+    for (long way_idx = 0; way_idx < normal_end; ++way_idx) {
+      const auto& blk = block[set_idx * NUM_WAY + way_idx];
+      if (blk.valid) {
+        normal_addrs.insert(blk.address.to<uint64_t>() & ~0x3FULL);
+      }
+    }
+  }
+  return {std::move(pinned_addrs), std::move(normal_addrs)};
+}
+
+std::optional<error_way_stats> CACHE::error_way_snapshot() const
+{
+  auto& epm = ErrorPageManager::get_instance();
+  if (!epm.is_cache_pinning_enabled() || error_way_count == 0) {
+    return std::nullopt;
+  }
+
+  error_way_stats stats;
+  stats.name = NAME;
+  stats.sets = NUM_SET;
+  stats.ways = error_way_count;
+  stats.max_ways = get_max_error_way_limit();
+  stats.hits = stat_error_way_hit;
+  stats.fills = stat_error_way_miss;
+  stats.evictions = stat_error_way_eviction;
+
+  long error_way_start = get_error_way_start();
+  for (long set_idx = 0; set_idx < NUM_SET; ++set_idx) {
+    for (long way_offset = 0; way_offset < error_way_count; ++way_offset) {
+      if (block[set_idx * NUM_WAY + error_way_start + way_offset].valid) {
+        ++stats.used_slots;
+      }
+    }
+  }
+
+  const auto [pinned_addrs, normal_addrs] = error_way_residency();
+  const auto& error_addr_snapshot = epm.get_error_addresses();
+  stats.known_addresses = error_addr_snapshot.size();
+  for (uint64_t addr : error_addr_snapshot) {
+    if (pinned_addrs.count(addr)) {
+      stats.pinned++;
+    } else if (normal_addrs.count(addr)) {
+      stats.in_normal_way++;
+    } else {
+      stats.not_in_llc++;
+    }
+  }
+  return stats;
+}
+
 void CACHE::print_error_way_stats() const
 {
   auto& epm = ErrorPageManager::get_instance();
@@ -1351,23 +1431,11 @@ void CACHE::print_error_way_stats() const
     return;
   }
 
+  const auto ways = error_way_snapshot();
+
   // 총 Error Way 슬롯 개수 (Way 수 × Set 수)
   long total_error_way_slots = NUM_SET * error_way_count;
-  long used_error_way_slots = 0;
-
-  // Error Way 범위 확인
-  long error_way_start = get_error_way_start();
-
-  // 모든 Set 순회하면서 Error Way의 valid 비트 체크
-  for (long set_idx = 0; set_idx < NUM_SET; ++set_idx) {
-    for (long way_offset = 0; way_offset < error_way_count; ++way_offset) {
-      long way_idx = error_way_start + way_offset;
-      const auto& blk = block[set_idx * NUM_WAY + way_idx];
-      if (blk.valid) {
-        ++used_error_way_slots;
-      }
-    }
-  }
+  long used_error_way_slots = static_cast<long>(ways->used_slots);
 
   // 사용되지 않는 Error Way 슬롯 개수 및 비율 계산
   long unused_error_way_slots = total_error_way_slots - used_error_way_slots;
@@ -1382,7 +1450,7 @@ void CACHE::print_error_way_stats() const
   fmt::print("[LLC]\n");
   fmt::print("[LLC] [Configuration]\n");
   fmt::print("[LLC]   Allocated Error Ways per Set:    {}\n", error_way_count);
-  fmt::print("[LLC]   Max Error Ways per Set:          {}\n", get_max_error_way_limit());
+  fmt::print("[LLC]   Max Error Ways per Set:          {}\n", ways->max_ways);
   fmt::print("[LLC]   Total Error Way Slots:           {} (= {} Sets x {} Ways)\n",
              total_error_way_slots, NUM_SET, error_way_count);
   fmt::print("[LLC]\n");
@@ -1402,58 +1470,19 @@ void CACHE::print_error_way_stats() const
   fmt::print("[LLC]\n");
   fmt::print("[LLC] [Protection Coverage (end of sim)]\n");
   {
-    uint64_t pinned_count = 0;
-    uint64_t in_normal_way = 0;
-    uint64_t not_in_llc = 0;
-    uint64_t total_error_addrs = 0;
-
-    // Collect all addresses currently in error ways
-    std::unordered_set<uint64_t> pinned_addrs;
-    for (long set_idx = 0; set_idx < NUM_SET; ++set_idx) {
-      for (long way_offset = 0; way_offset < error_way_count; ++way_offset) {
-        long way_idx = error_way_start + way_offset;
-        const auto& blk = block[set_idx * NUM_WAY + way_idx];
-        if (blk.valid) {
-          pinned_addrs.insert(blk.address.to<uint64_t>() & ~0x3FULL);
-        }
-      }
-    }
+    double coverage = (ways->known_addresses > 0)
+        ? (static_cast<double>(ways->pinned) / static_cast<double>(ways->known_addresses) * 100.0) : 0.0;
 
-    // Collect all addresses in normal ways
-    long normal_end = get_normal_way_end();
-    std::unordered_set<uint64_t> normal_addrs;
-    for (long set_idx = 0; set_idx < NUM_SET; ++set_idx) {
-      for (long way_idx = 0; way_idx < normal_end; ++way_idx) {
-        const auto& blk = block[set_idx * NUM_WAY + way_idx];
-        if (blk.valid) {
-          normal_addrs.insert(blk.address.to<uint64_t>() & ~0x3FULL);
-        }
-      }
-    }
-
-    const auto& error_addr_snapshot = epm.get_error_addresses();
-    total_error_addrs = error_addr_snapshot.size();
-
-    for (uint64_t addr : error_addr_snapshot) {
-      if (pinned_addrs.count(addr)) {
-        pinned_count++;
-      } else if (normal_addrs.count(addr)) {
-        in_normal_way++;
-      } else {
-        not_in_llc++;
-      }
-    }
-
-    double coverage = (total_error_addrs > 0)
-        ? (static_cast<double>(pinned_count) / static_cast<double>(total_error_addrs) * 100.0) : 0.0;
-
-    fmt::print("[LLC]   Total Known Error Addresses:     {}\n", total_error_addrs);
-    fmt::print("[LLC]   Pinned in Error Way:             {} ({:.2f}%)\n", pinned_count, coverage);
-    fmt::print("[LLC]   In Normal Way (unprotected):     {}\n", in_normal_way);
-    fmt::print("[LLC]   Not in LLC (DRAM exposed):       {}\n", not_in_llc);
+    fmt::print("[LLC]   Total Known Error Addresses:     {}\n", ways->known_addresses);
+    fmt::print("[LLC]   Pinned in Error Way:             {} ({:.2f}%)\n", ways->pinned, coverage);
+    fmt::print("[LLC]   In Normal Way (unprotected):     {}\n", ways->in_normal_way);
+    fmt::print("[LLC]   Not in LLC (DRAM exposed):       {}\n", ways->not_in_llc);
 
     // Debug dump: enumerate every valid error-way block and known-set membership
     if (epm.get_debug() == 1) {
+      const auto [pinned_addrs, normal_addrs] = error_way_residency();
+      const auto& error_addr_snapshot = epm.get_error_addresses();
+      long error_way_start = get_error_way_start();
       fmt::print("[LLC] [Debug] error-way valid block dump:\n");
       uint64_t mismatch_in_eway = 0;
       for (long set_idx = 0; set_idx < NUM_SET; ++set_idx) {
@@ -18,12 +18,14 @@
 
 #include <algorithm>
 #include <chrono>
+#include <functional>
 #include <numeric>
 #include <vector>
 #include <fmt/chrono.h>
 #include <fmt/core.h>
 
 #include "environment.h"
+#include "error_page_manager.h"
 #include "ooo_cpu.h"
 #include "operable.h"
 #include "phase_info.h"
@@ -135,7 +137,7 @@ phase_stats do_phase(const phase_info& phase, environment& env, std::vector<trac
     // Check for phase finish
     for (O3_CPU& cpu : env.cpu_view()) {
       // Phase complete
-      next_phase_complete[cpu.cpu] = next_phase_complete[cpu.cpu] || (cpu.sim_instr() >= length);
+      next_phase_complete[cpu.cpu] = next_phase_complete[cpu.cpu] || (cpu.sim_instr() >= length) || cpu.converged();
     }
 
     for (O3_CPU& cpu : env.cpu_view()) {
@@ -146,6 +148,9 @@ phase_stats do_phase(const phase_info& phase, environment& env, std::vector<trac
 
         fmt::print("{} finished CPU {} instructions: {} cycles: {} cumulative IPC: {:.4g} (Simulation time: {:%H hr %M min %S sec})\n", phase_name, cpu.cpu,
                    cpu.sim_instr(), cpu.sim_cycle(), std::ceil(cpu.sim_instr()) / std::ceil(cpu.sim_cycle()), elapsed_time());
+        if (cpu.converged() && cpu.sim_instr() < length) {
+          fmt::print("{} stopped early CPU {}: cumulative IPC converged after {} of {} instructions\n", phase_name, cpu.cpu, cpu.sim_instr(), length);
+        }
       }
     }
 
@@ -178,15 +183,23 @@ phase_stats do_phase(const phase_info& phase, environment& env, std::vector<trac
   std::transform(std::begin(dram.channels), std::end(dram.channels), std::back_inserter(stats.roi_dram_stats),
                  [](const DRAM_CHANNEL& chan) { return chan.roi_stats; });
 
+  stats.error_model = ErrorPageManager::get_instance().error_stats(std::size(cpus));
+  for (const CACHE& cache : caches) {
+    if (auto ways = cache.error_way_snapshot(); ways.has_value()) {
+      stats.error_model.error_ways.push_back(*ways);
+    }
+  }
+
   return stats;
 }
 
-// simulation entry point
-std::vector<phase_stats> main(environment& env, std::vector<phase_info>& phases, std::vector<tracereader>& traces)
+// simulation entry point, calling the hooks after initialization and at the end of each phase
+std::vector<phase_stats> main(environment& env, std::vector<phase_info>& phases, std::vector<tracereader>& traces, const phase_hooks& hooks)
 {
   for (champsim::operable& op : env.operable_view()) {
     op.initialize();
   }
+  hooks.after_initialize();
 
   champsim::chrono::clock global_clock;
   std::vector<phase_stats> results;
@@ -195,8 +208,16 @@ std::vector<phase_stats> main(environment& env, std::vector<phase_info>& phases,
     if (!phase.is_warmup) {
       results.push_back(stats);
     }
+    if (!hooks.after_phase(phase)) {
+      break;
+    }
   }
 
   return results;
 }
+
+std::vector<phase_stats> main(environment& env, std::vector<phase_info>& phases, std::vector<tracereader>& traces)
+{
+  return main(env, phases, traces, phase_hooks{});
+}
 } // namespace champsim
@@ -0,0 +1,202 @@
+/*
+ *    Copyright 2023 The ChampSim Contributors
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#include "checkpoint.h"
+
+#include <algorithm>
+#include <cstdio>
+#include <fstream>
+#include <iterator>
+#include <limits>
+#include <sstream>
+#include <zlib.h>
+
+#include "cache.h"
+#include "champsim.h"
+#include "dram_controller.h"
+#include "environment.h"
+#include "error_page_manager.h"
+#include "ooo_cpu.h"
+#include "ptw.h"
+#include "vmem.h"
+
+namespace
+{
+constexpr std::size_t footer_size = 4;
+
+uint32_t crc32_of(const unsigned char* data, std::size_t size)
+{
+  auto crc = ::crc32(0L, Z_NULL, 0);
+  while (size > 0) {
+    auto chunk = static_cast<uInt>(std::min<std::size_t>(size, std::numeric_limits<uInt>::max()));
+    crc = ::crc32(crc, data, chunk);
+    data += chunk;
+    size -= chunk;
+  }
+  return static_cast<uint32_t>(crc);
+}
+
+std::string file_name(const std::string& path) { return path.substr(path.find_last_of('/') + 1); }
+
+// The sections, in the order they are written and read
+void sections(champsim::checkpoint::archive& ar, champsim::environment& env)
+{
+  using archive = champsim::checkpoint::archive;
+  for (O3_CPU& cpu : env.cpu_view()) {
+    ar.section(fmt::format("cpu{}", cpu.cpu), [&](archive& a) { cpu.checkpoint(a); });
+  }
+  for (CACHE& cache : env.cache_view()) {
+    ar.section("cache " + cache.NAME, [&](archive& a) { cache.checkpoint(a); });
+  }
+  for (PageTableWalker& ptw : env.ptw_view()) {
+    ar.section("ptw " + ptw.NAME, [&](archive& a) { ptw.checkpoint(a); });
+  }
+  auto& dram = env.dram_view();
+  ar.section("dram", [&](archive& a) { dram.checkpoint(a); });
+  if (auto* vmem = dram.get_vmem(); vmem != nullptr) {
+    ar.section("vmem", [&](archive& a) { vmem->checkpoint(a); });
+  }
+  ar.section("error_page_manager", [&](archive& a) { ErrorPageManager::get_instance().checkpoint(a); });
+}
+} // namespace
+
+std::string champsim::checkpoint::describe(environment& env)
+{
+  std::ostringstream geometry;
+  geometry << fmt::format("block {} page {} cpus {}\n", BLOCK_SIZE, PAGE_SIZE, std::size(env.cpu_view()));
+  for (CACHE& cache : env.cache_view()) {
+    geometry << fmt::format("cache {} {}x{}\n", cache.NAME, cache.NUM_SET, cache.NUM_WAY);
+  }
+  for (PageTableWalker& ptw : env.ptw_view()) {
+    geometry << fmt::format("ptw {} {}\n", ptw.NAME, std::size(ptw.pscl));
+  }
+  auto& dram = env.dram_view();
+  geometry << fmt::format("dram {} {}x{}\n", dram.size().count(), std::size(dram.channels),
+                          std::empty(dram.channels) ? 0 : dram.channels.front().bank_request_capacity());
+  if (auto* vmem = dram.get_vmem(); vmem != nullptr) {
+    geometry << fmt::format("vmem {} {}\n", vmem->pt_levels, champsim::data::bytes{vmem->pte_page_size}.count());
+  }
+  return geometry.str();
+}
+
+uint64_t champsim::checkpoint::geometry_hash(const std::string& geometry)
+{
+  // FNV-1a
+  uint64_t hash = 0xcbf29ce484222325ull; // NOLINT(readability-magic-numbers)
+  for (unsigned char c : geometry) {
+    hash ^= c;
+    hash *= 0x100000001b3ull; // NOLINT(readability-magic-numbers)
+  }
+  return hash;
+}
+
+void champsim::checkpoint::save(const std::string& path, environment& env, const std::vector<std::string>& trace_names, long long warmup_instructions,
+                                uint64_t build_id)
+{
+  header head;
+  head.build_id = build_id;
+  head.geometry = describe(env);
+  head.geometry_hash = geometry_hash(head.geometry);
+  head.warmup_instructions = warmup_instructions;
+  for (O3_CPU& cpu : env.cpu_view()) {
+    head.traces.emplace_back(file_name(trace_names.at(cpu.cpu)), cpu.num_retired);
+  }
+
+  auto ar = archive::for_saving();
+  head.checkpoint(ar);
+  sections(ar, env);
+
+  std::vector<unsigned char> bytes{std::begin(magic), std::end(magic)};
+  bytes.insert(std::end(bytes), std::begin(ar.bytes()), std::end(ar.bytes()));
+  auto crc = crc32_of(std::data(bytes), std::size(bytes));
+  for (std::size_t i = 0; i < footer_size; ++i) {
+    bytes.push_back(static_cast<unsigned char>(crc >> (8 * i))); // NOLINT(readability-magic-numbers)
+  }
+
+  // Written aside and renamed, so that a checkpoint is either complete or absent
+  const auto partial = path + ".partial";
+  {
+    std::ofstream file{partial, std::ios::binary | std::ios::trunc};
+    file.write(reinterpret_cast<const char*>(std::data(bytes)), static_cast<std::streamsize>(std::size(bytes))); // NOLINT(cppcoreguidelines-pro-type-reinterpret-cast)
+    if (!file) {
+      throw std::runtime_error{fmt::format("cannot write the checkpoint {}", partial)};
+    }
+  }
+  if (std::rename(partial.c_str(), path.c_str()) != 0) {
+    throw std::runtime_error{fmt::format("cannot move the checkpoint to {}", path)};
+  }
+}
+
+namespace
+{
+// Check a checkpoint file and read its header, leaving the archive at the first section
+std::pair<champsim::checkpoint::header, champsim::checkpoint::archive> open_checkpoint(const std::string& path)
+{
+  using champsim::checkpoint::magic;
+  using champsim::checkpoint::mismatch;
+
+  std::ifstream file{path, std::ios::binary};
+  if (!file) {
+    throw mismatch{fmt::format("cannot open the checkpoint {}", path)};
+  }
+  std::vector<unsigned char> bytes{std::istreambuf_iterator<char>{file}, std::istreambuf_iterator<char>{}};
+
+  if (std::size(bytes) < std::size(magic) + footer_size || !std::equal(std::begin(magic), std::end(magic), std::begin(bytes))) {
+    throw mismatch{fmt::format("{} is not a checkpoint", path)};
+  }
+  const auto body_end = std::size(bytes) - footer_size;
+  uint32_t stored_crc = 0;
+  for (std::size_t i = 0; i < footer_size; ++i) {
+    stored_crc |= static_cast<uint32_t>(bytes.at(body_end + i)) << (8 * i); // NOLINT(readability-magic-numbers)
+  }
+  if (stored_crc != crc32_of(std::data(bytes), body_end)) {
+    throw mismatch{fmt::format("{} is damaged (its checksum does not match)", path)};
+  }
+
+  auto ar = champsim::checkpoint::archive::for_loading(
+      {std::next(std::begin(bytes), static_cast<long>(std::size(magic))), std::next(std::begin(bytes), static_cast<long>(body_end))});
+  champsim::checkpoint::header head;
+  head.checkpoint(ar);
+  return {std::move(head), std::move(ar)};
+}
+} // namespace
+
+champsim::checkpoint::header champsim::checkpoint::read_header(const std::string& path) { return open_checkpoint(path).first; }
+
+champsim::checkpoint::header champsim::checkpoint::restore(const std::string& path, environment& env, const std::vector<std::string>& trace_names)
+{
+  auto [head, ar] = open_checkpoint(path);
+
+  const auto geometry = describe(env);
+  if (head.geometry_hash != geometry_hash(geometry) || head.geometry != geometry) {
+    throw mismatch{fmt::format("{} was written for another geometry.\nCheckpoint:\n{}This simulator:\n{}", path, head.geometry, geometry)};
+  }
+
+  if (std::size(head.traces) != std::size(trace_names)) {
+    throw mismatch{fmt::format("{} was written for {} traces, not {}", path, std::size(head.traces), std::size(trace_names))};
+  }
+  for (std::size_t i = 0; i < std::size(trace_names); ++i) {
+    if (head.traces.at(i).first != file_name(trace_names.at(i))) {
+      throw mismatch{fmt::format("{} was written for trace {} on CPU {}, not {}", path, head.traces.at(i).first, i, file_name(trace_names.at(i)))};
+    }
+  }
+
+  sections(ar, env);
+  if (!ar.at_end()) {
+    throw mismatch{fmt::format("{} has sections this simulator does not read", path)};
+  }
+  return head;
+}
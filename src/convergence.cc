@@ -0,0 +1,110 @@
+/*
+ *    Copyright 2023 The ChampSim Contributors
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#include "convergence.h"
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+
+double champsim::convergence::estimate::relative() const
+{
+  if (value == 0) {
+    return std::numeric_limits<double>::infinity();
+  }
+  return half_width / std::abs(value);
+}
+
+void champsim::convergence::ratio_estimator::add(double x, double y)
+{
+  ++n;
+  sum_x += x;
+  sum_y += y;
+  sum_xx += x * x;
+  sum_xy += x * y;
+  sum_yy += y * y;
+}
+
+champsim::convergence::estimate champsim::convergence::ratio_estimator::at(double z) const
+{
+  if (n == 0 || sum_y <= 0) {
+    return {0, std::numeric_limits<double>::infinity()};
+  }
+  const auto ratio = sum_x / sum_y;
+  if (n < 2) {
+    return {ratio, std::numeric_limits<double>::infinity()};
+  }
+  const auto count = static_cast<double>(n);
+  const auto mean_y = sum_y / count;
+  const auto residual = std::max(0.0, sum_xx - 2 * ratio * sum_xy + ratio * ratio * sum_yy);
+  const auto variance = residual / ((count - 1) * count * mean_y * mean_y);
+  return {ratio, z * std::sqrt(variance)};
+}
+
+double champsim::convergence::z_score(double confidence)
+{
+  // Solve erf(z / sqrt(2)) = confidence by bisection; erf is monotonic
+  double low = 0;
+  double high = 10; // NOLINT(readability-magic-numbers)
+  for (int i = 0; i < 100; ++i) {
+    auto mid = (low + high) / 2;
+    if (std::erf(mid / std::sqrt(2.0)) < confidence) {
+      low = mid;
+    } else {
+      high = mid;
+    }
+  }
+  return (low + high) / 2;
+}
+
+champsim::convergence::tracker::tracker(policy p) : pol(p), z(z_score(p.confidence)) {}
+
+void champsim::convergence::tracker::begin(long long instr, long long cycle, uint64_t error_count)
+{
+  ipc = {};
+  errors = {};
+  begin_instr = instr;
+  last_instr = instr;
+  last_cycle = cycle;
+  last_errors = error_count;
+  narrow = false;
+}
+
+void champsim::convergence::tracker::sample(long long instr, long long cycle, uint64_t error_count)
+{
+  const auto interval_instr = static_cast<double>(instr - last_instr);
+  ipc.add(interval_instr, static_cast<double>(cycle - last_cycle));
+  errors.add(static_cast<double>(error_count - last_errors), interval_instr);
+  last_instr = instr;
+  last_cycle = cycle;
+  last_errors = error_count;
+
+  narrow = pol.relative_width > 0 && ipc.count() >= min_intervals && ipc.at(z).relative() <= pol.relative_width
+           && (!pol.include_errors || errors.at(z).relative() <= pol.relative_width);
+}
+
+champsim::convergence::summary champsim::convergence::tracker::summarize(long long instr) const
+{
+  summary result;
+  result.confidence = pol.confidence;
+  result.intervals = ipc.count();
+  result.ipc = ipc.at(z);
+  if (pol.include_errors) {
+    result.error_rate = errors.at(z);
+  }
+  result.converged = converged(instr);
+  return result;
+}
@@ -1032,6 +1032,24 @@ std::size_t DRAM_ADDRESS_MAPPING::bankgroups() const { return std::size_t{1} <<
 std::size_t DRAM_ADDRESS_MAPPING::banks() const { return std::size_t{1} << champsim::size(get<SLICER_BANK_IDX>(address_slicer)); }
 std::size_t DRAM_ADDRESS_MAPPING::channels() const { return std::size_t{1} << champsim::size(get<SLICER_CHANNEL_IDX>(address_slicer)); }
 std::size_t DRAM_CHANNEL::bank_request_capacity() const { return std::size(bank_request); }
+
+void DRAM_CHANNEL::checkpoint(champsim::checkpoint::archive& ar)
+{
+  ar.expect(std::size(bank_request), "DRAM banks per channel");
+  for (auto& bank : bank_request) {
+    ar.io(bank.open_row);
+  }
+  ar.io(refresh_row);
+  ar.io(write_mode);
+}
+
+void MEMORY_CONTROLLER::checkpoint(champsim::checkpoint::archive& ar)
+{
+  ar.expect(std::size(channels), "DRAM channels");
+  for (auto& chan : channels) {
+    chan.checkpoint(ar);
+  }
+}
 std::size_t DRAM_CHANNEL::bankgroup_request_capacity() const { return std::size(bankgroup_readytime); };
 
 // LCOV_EXCL_START Exclude the following function from LCOV
@@ -959,6 +959,94 @@ void ErrorPageManager::print_per_cpu_error_stats() const {
     }
 }
 
+error_model_stats ErrorPageManager::error_stats(std::size_t num_cpus) const {
+    error_model_stats stats;
+    switch (mode) {
+        case ErrorPageManagerMode::ALL_ON: stats.mode = "ALL_ON"; break;
+        case ErrorPageManagerMode::RANDOM: stats.mode = "RANDOM"; break;
+        case ErrorPageManagerMode::CYCLE:  stats.mode = "CYCLE"; break;
+        case ErrorPageManagerMode::OFF:    stats.mode = "OFF"; break;
+    }
+    switch (spatial_model) {
+        case ErrorSpatialModel::UNIFORM:   stats.spatial_model = "uniform"; break;
+        case ErrorSpatialModel::CLUSTERED: stats.spatial_model = "clustered"; break;
+        case ErrorSpatialModel::STICKY:    stats.spatial_model = "sticky"; break;
+    }
+    stats.cache_pinning = cache_pinning_enabled;
+    stats.care = care_enabled;
+    stats.error_cycle_interval = error_cycle_interval;
+    stats.bit_error_rate = bit_error_rate;
+    stats.page_error_rate = page_error_rate;
+    stats.total_error_accesses = total_error_count;
+
+    stats.retirement_threshold = retirement_threshold;
+    stats.first_errors = stat_first_error_count;
+    stats.added_errors = stat_added_error_count;
+    stats.retirements = stat_retirement_count;
+    stats.already_known = stat_already_known_count;
+    stats.lines_invalidated = stat_retirement_invalidated_lines;
+    stats.active_pages = page_error_counters.size();
+    stats.multi_error_pages = static_cast<std::size_t>(
+        std::count_if(page_error_counters.begin(), page_error_counters.end(), [](const auto& entry) { return entry.second >= 2; }));
+    stats.tracked_addresses = error_addresses.size();
+    stats.retired_addresses = retired_error_addresses.size();
+    stats.baseline_retirement_threshold = baseline_retirement_threshold;
+    stats.baseline_retirements = stat_baseline_retirement_count;
+
+    stats.cores.resize(num_cpus);
+    for (const auto& [cpu_idx, s] : per_cpu_error_stats) {
+        if (cpu_idx >= stats.cores.size()) stats.cores.resize(cpu_idx + 1);
+        stats.cores[cpu_idx] = s;
+    }
+
+    // Mirrors print_spatial_fault_stats(): present whenever the text output has a spatial block
+    if (spatial_model != ErrorSpatialModel::UNIFORM || location_stats_enabled) {
+        spatial_fault_stats spatial;
+        spatial.seed = error_seed;
+        std::copy(std::begin(stat_faults_created), std::end(stat_faults_created), spatial.faults_created.begin());
+        std::copy(std::begin(stat_faults_killed), std::end(stat_faults_killed), spatial.faults_killed.begin());
+        std::copy(std::begin(stat_manifests), std::end(stat_manifests), spatial.manifests.begin());
+        spatial.anchor_manifests = stat_anchor_manifests;
+        spatial.colocated_faults = stat_colocated_faults;
+        spatial.widened_bank = stat_widened_bank;
+        spatial.widened_any = stat_widened_any;
+        spatial.resampled_manifests = stat_resampled_manifests;
+        spatial.pending = pending_manifests.size();
+        spatial.pending_peak = stat_pending_peak;
+        spatial.retired_pages = clustered_retired_pages.size();
+        for (const auto& f : faults) {
+            if (!f.dead && !f.anchored) spatial.unanchored++;
+            spatial.max_manifests_per_fault = std::max(spatial.max_manifests_per_fault, f.manifest_count);
+        }
+
+        auto max_count = [](const auto& hist) {
+            uint64_t m = 0;
+            for (const auto& [k, v] : hist) m = std::max(m, v);
+            return m;
+        };
+        spatial.distinct_lines = line_manifest_hist.size();
+        spatial.distinct_rows = row_manifest_hist.size();
+        spatial.distinct_banks = bank_manifest_hist.size();
+        spatial.max_errors_per_line = max_count(line_manifest_hist);
+        spatial.max_errors_per_row = max_count(row_manifest_hist);
+        spatial.max_errors_per_bank = max_count(bank_manifest_hist);
+        stats.spatial = spatial;
+    }
+
+    if (care_enabled && care_cache) {
+        care_stats care;
+        care.sets = care_ecc_sets;
+        care.ways = care_ecc_ways;
+        care.resident = care_cache->occupancy();
+        care.bch_decode_cycles = care_bch_decode_cycles;
+        care.retirements = stat_care_retirement_count;
+        care.proactive_pages = stat_care_proactive_page_count;
+        care.cache = care_cache->stats();
+        stats.care_scheme = care;
+    }
+    return stats;
+}
+
 // ============================================================
 // Existing implementations (unchanged)
 // ============================================================
@@ -0,0 +1,274 @@
+/*
+ *    Copyright 2023 The ChampSim Contributors
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#include "fork_sweep.h"
+
+#include <algorithm>
+#include <array>
+#include <cerrno>
+#include <cstdlib>
+#include <cstring>
+#include <dirent.h>
+#include <fcntl.h>
+#include <fmt/core.h>
+#include <fstream>
+#include <iostream>
+#include <set>
+#include <stdexcept>
+#include <sys/stat.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+#include "chrono.h"
+#include "error_page_manager.h"
+
+const std::vector<std::string> champsim::fork_sweep::settable_keys{
+    "error_cycle_interval",          "retirement_threshold",   "baseline_retirement_threshold", "max_error_ways_per_set",
+    "cache_pinning",                 "dynamic_error_latency",  "error_latency_penalty",         "pte_error_latency_penalty",
+    "error_location_stats",          "debug"};
+
+namespace
+{
+void write_all(int fd, const char* buf, std::size_t count)
+{
+  while (count > 0) {
+    auto written = ::write(fd, buf, count);
+    if (written < 0) {
+      if (errno == EINTR) {
+        continue;
+      }
+      return;
+    }
+    buf += written;
+    count -= static_cast<std::size_t>(written);
+  }
+}
+
+// A forked child shares the open file descriptions of its parent, and with them the file offsets: children reading
+// the same trace would take turns consuming it. Give every read-only regular file its own description at the same
+// offset, under the same descriptor number, so the trace readers never notice.
+bool reopen_read_only_files()
+{
+  DIR* fds = ::opendir("/proc/self/fd");
+  if (fds == nullptr) {
+    return false;
+  }
+
+  std::vector<int> to_reopen;
+  while (auto* entry = ::readdir(fds)) {
+    char* end = nullptr;
+    long fd = std::strtol(entry->d_name, &end, 10);
+    if (*end != '\0' || end == entry->d_name || fd <= STDERR_FILENO || fd == ::dirfd(fds)) {
+      continue;
+    }
+    struct stat st{};
+    if (::fstat(static_cast<int>(fd), &st) == 0 && S_ISREG(st.st_mode) && (::fcntl(static_cast<int>(fd), F_GETFL) & O_ACCMODE) == O_RDONLY) {
+      to_reopen.push_back(static_cast<int>(fd));
+    }
+  }
+  ::closedir(fds);
+
+  for (int fd : to_reopen) {
+    auto offset = ::lseek(fd, 0, SEEK_CUR);
+    int fresh = ::open(fmt::format("/proc/self/fd/{}", fd).c_str(), O_RDONLY);
+    if (offset < 0 || fresh < 0 || ::lseek(fresh, offset, SEEK_SET) != offset) {
+      return false;
+    }
+    int fd_flags = ::fcntl(fd, F_GETFD);
+    ::dup2(fresh, fd);
+    ::fcntl(fd, F_SETFD, fd_flags);
+    ::close(fresh);
+  }
+  return true;
+}
+} // namespace
+
+std::vector<champsim::fork_sweep::point> champsim::fork_sweep::read_points(const std::string& path)
+{
+  std::ifstream file{path};
+  if (!file) {
+    throw std::runtime_error{fmt::format("cannot open the point list {}", path)};
+  }
+
+  nlohmann::json list;
+  try {
+    list = nlohmann::json::parse(file);
+  } catch (const nlohmann::json::exception& e) {
+    throw std::runtime_error{fmt::format("{}: {}", path, e.what())};
+  }
+  if (!list.contains("points") || !list.at("points").is_array() || list.at("points").empty()) {
+    throw std::runtime_error{fmt::format("{}: expected a non-empty \"points\" list", path)};
+  }
+
+  std::vector<point> points;
+  std::set<std::string> outputs;
+  for (const auto& entry : list.at("points")) {
+    if (!entry.contains("output") || !entry.at("output").is_string()) {
+      throw std::runtime_error{fmt::format("{}: every point needs an \"output\" file", path)};
+    }
+    point p{entry.at("output").get<std::string>(), entry.value("error_page_manager", nlohmann::json::object()), entry.value("json", std::string{})};
+    if (!outputs.insert(p.output).second) {
+      throw std::runtime_error{fmt::format("{}: two points write {}", path, p.output)};
+    }
+    for (const auto& [key, value] : p.error_page_manager.items()) {
+      if (std::find(std::begin(settable_keys), std::end(settable_keys), key) == std::end(settable_keys)) {
+        throw std::runtime_error{fmt::format("{}: error_page_manager.{} cannot differ between the points of a fork group", path, key)};
+      }
+    }
+    points.push_back(std::move(p));
+  }
+  return points;
+}
+
+void champsim::fork_sweep::apply(ErrorPageManager& epm, const nlohmann::json& settings)
+{
+  const auto period = epm.get_cpu_clock_period();
+
+  epm.rewind_injection_stream();
+  epm.set_error_cycle_interval(settings.value("error_cycle_interval", epm.get_error_cycle_interval()));
+
+  if (settings.contains("retirement_threshold")) {
+    epm.set_retirement_threshold(settings.at("retirement_threshold").get<std::size_t>());
+  }
+  if (settings.contains("baseline_retirement_threshold")) {
+    epm.set_baseline_retirement_threshold(settings.at("baseline_retirement_threshold").get<std::size_t>());
+  }
+  if (settings.contains("max_error_ways_per_set")) {
+    epm.set_max_error_ways_per_set(settings.at("max_error_ways_per_set").get<uint32_t>());
+  }
+  if (settings.contains("cache_pinning")) {
+    epm.set_cache_pinning_enabled(settings.at("cache_pinning").get<bool>());
+  }
+  if (settings.contains("dynamic_error_latency")) {
+    epm.set_dynamic_error_latency_enabled(settings.at("dynamic_error_latency").get<bool>());
+  }
+  // Latencies are in cycles, as in the configuration file
+  if (settings.contains("error_latency_penalty")) {
+    epm.set_error_latency(period * settings.at("error_latency_penalty").get<long long>());
+  }
+  if (settings.contains("pte_error_latency_penalty")) {
+    epm.set_pte_error_latency(period * settings.at("pte_error_latency_penalty").get<long long>());
+  }
+  if (settings.contains("error_location_stats")) {
+    epm.set_location_stats_enabled(settings.at("error_location_stats").get<bool>());
+  }
+  if (settings.contains("debug")) {
+    epm.set_debug(settings.at("debug").get<int>());
+  }
+}
+
+champsim::fork_sweep::group::group(std::vector<point> points) : points_(std::move(points)) {}
+
+champsim::fork_sweep::group::~group()
+{
+  if (prologue_ != nullptr) {
+    std::fclose(prologue_);
+  }
+  if (group_stdout_ >= 0) {
+    ::close(group_stdout_);
+  }
+}
+
+void champsim::fork_sweep::group::begin_warmup()
+{
+  std::cout.flush();
+  std::fflush(stdout);
+
+  prologue_ = std::tmpfile();
+  if (prologue_ == nullptr) {
+    throw std::runtime_error{fmt::format("cannot create a file for the warmup output: {}", std::strerror(errno))};
+  }
+  group_stdout_ = ::dup(STDOUT_FILENO);
+  ::dup2(::fileno(prologue_), STDOUT_FILENO);
+}
+
+void champsim::fork_sweep::group::copy_prologue(int fd) const
+{
+  std::array<char, 1 << 16> buf{};
+  off_t offset = 0;
+  for (ssize_t count; (count = ::pread(::fileno(prologue_), std::data(buf), std::size(buf), offset)) > 0; offset += count) {
+    write_all(fd, std::data(buf), static_cast<std::size_t>(count));
+  }
+}
+
+void champsim::fork_sweep::group::enter_point(const point& p)
+{
+  int fd = ::open(p.output.c_str(), O_WRONLY | O_CREAT | O_APPEND, 0644); // NOLINT(cppcoreguidelines-avoid-magic-numbers,readability-magic-numbers)
+  if (fd < 0) {
+    fmt::print(stderr, "cannot open {}: {}\n", p.output, std::strerror(errno));
+    std::_Exit(EXIT_FAILURE);
+  }
+  copy_prologue(fd);
+  ::dup2(fd, STDOUT_FILENO);
+  ::close(fd);
+
+  if (!reopen_read_only_files()) {
+    fmt::print(stderr, "cannot give {} its own trace file offsets: {}\n", p.output, std::strerror(errno));
+    std::_Exit(EXIT_FAILURE);
+  }
+
+  apply(ErrorPageManager::get_instance(), p.error_page_manager);
+  fmt::print("Forked after the shared warmup with error_page_manager {}\n", p.error_page_manager.dump());
+}
+
+bool champsim::fork_sweep::group::fork_points()
+{
+  std::cout.flush();
+  std::fflush(stdout);
+
+  // The group's own output gets the warmup too
+  copy_prologue(group_stdout_);
+  ::dup2(group_stdout_, STDOUT_FILENO);
+
+  for (std::size_t i = 0; i < std::size(points_); ++i) {
+    std::fflush(stdout);
+    pid_t pid = ::fork();
+    if (pid < 0) {
+      fmt::print("Cannot fork point {} ({}): {}\n", i, points_.at(i).output, std::strerror(errno));
+      break;
+    }
+    if (pid == 0) {
+      children_.clear();
+      current_ = &points_.at(i);
+      enter_point(points_.at(i));
+      return true;
+    }
+    children_.emplace_back(pid, i);
+    fmt::print("Forked point {} (pid {}): {}\n", i, pid, points_.at(i).output);
+  }
+  return false;
+}
+
+int champsim::fork_sweep::group::wait()
+{
+  std::fflush(stdout);
+
+  int result = std::size(children_) == std::size(points_) ? EXIT_SUCCESS : EXIT_FAILURE;
+  for (auto [pid, i] : children_) {
+    int status = 0;
+    while (::waitpid(pid, &status, 0) < 0 && errno == EINTR) {
+    }
+    if (WIFEXITED(status) && WEXITSTATUS(status) == EXIT_SUCCESS) {
+      fmt::print("Point {} (pid {}) complete: {}\n", i, pid, points_.at(i).output);
+    } else {
+      fmt::print("Point {} (pid {}) failed with status {}: {}\n", i, pid, status, points_.at(i).output);
+      result = EXIT_FAILURE;
+    }
+  }
+  return result;
+}
+
+std::string champsim::fork_sweep::group::json_output() const { return current_ != nullptr ? current_->json : std::string{}; }
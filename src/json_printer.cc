@@ -37,6 +37,18 @@ void to_json(nlohmann::json& j, const O3_CPU::stats_type& stats)
                      {"cycles", stats.cycles()},
                      {"Avg ROB occupancy at mispredict", std::ceil(stats.total_rob_occupancy_at_branch_mispredict) / std::ceil(total_mispredictions)},
                      {"mispredict", mpki}};
+  if (stats.convergence.has_value()) {
+    const auto& conv = *stats.convergence;
+    j["convergence"] = nlohmann::json{{"confidence", conv.confidence},
+                                      {"intervals", conv.intervals},
+                                      {"converged", conv.converged},
+                                      {"IPC", conv.ipc.value},
+                                      {"IPC half-width", conv.ipc.half_width}};
+    if (conv.error_rate.has_value()) {
+      j["convergence"]["error rate"] = conv.error_rate->value;
+      j["convergence"]["error rate half-width"] = conv.error_rate->half_width;
+    }
+  }
 }
 
 void to_json(nlohmann::json& j, const CACHE::stats_type& stats)
@@ -84,6 +96,125 @@ void to_json(nlohmann::json& j, const DRAM_CHANNEL::stats_type stats)
                      {"REFRESHES ISSUED", stats.refresh_cycles}};
 }
 
+void to_json(nlohmann::json& j, const PerCpuErrorStats& stats)
+{
+  j = nlohmann::json{{"absorbed", stats.errors_absorbed},
+                     {"first", stats.first_errors},
+                     {"added", stats.added_errors},
+                     {"known", stats.already_known},
+                     {"retired", stats.retirements},
+                     {"baseline_retired", stats.baseline_retirements},
+                     {"care_registered", stats.care_registered},
+                     {"care_dropped", stats.care_dropped},
+                     {"care_retired", stats.care_retirements},
+                     {"care_celog_retired", stats.care_celog_retirements}};
+}
+
+void to_json(nlohmann::json& j, const error_way_stats& stats)
+{
+  j = nlohmann::json{{"sets", stats.sets},
+                     {"ways", stats.ways},
+                     {"max_ways", stats.max_ways},
+                     {"total_slots", stats.sets * stats.ways},
+                     {"used_slots", stats.used_slots},
+                     {"hits", stats.hits},
+                     {"fills", stats.fills},
+                     {"evictions", stats.evictions},
+                     {"known_addresses", stats.known_addresses},
+                     {"pinned", stats.pinned},
+                     {"in_normal_way", stats.in_normal_way},
+                     {"not_in_llc", stats.not_in_llc}};
+}
+
+void to_json(nlohmann::json& j, const spatial_fault_stats& stats)
+{
+  auto by_mode = [](const std::array<uint64_t, 3>& counts) {
+    return nlohmann::json{{"cell", counts[0]}, {"row", counts[1]}, {"bank", counts[2]}};
+  };
+
+  j = nlohmann::json{{"seed", stats.seed},
+                     {"faults_created", by_mode(stats.faults_created)},
+                     {"faults_killed", by_mode(stats.faults_killed)},
+                     {"manifests", by_mode(stats.manifests)},
+                     {"anchor_manifests", stats.anchor_manifests},
+                     {"colocated_faults", stats.colocated_faults},
+                     {"widened_bank", stats.widened_bank},
+                     {"widened_any", stats.widened_any},
+                     {"resampled_manifests", stats.resampled_manifests},
+                     {"pending", stats.pending},
+                     {"pending_peak", stats.pending_peak},
+                     {"unanchored", stats.unanchored},
+                     {"retired_pages", stats.retired_pages},
+                     {"max_manifests_per_fault", stats.max_manifests_per_fault},
+                     {"distinct_lines", stats.distinct_lines},
+                     {"distinct_rows", stats.distinct_rows},
+                     {"distinct_banks", stats.distinct_banks},
+                     {"max_errors_per_line", stats.max_errors_per_line},
+                     {"max_errors_per_row", stats.max_errors_per_row},
+                     {"max_errors_per_bank", stats.max_errors_per_bank}};
+}
+
+void to_json(nlohmann::json& j, const care_stats& stats)
+{
+  const auto& cache = stats.cache;
+  j = nlohmann::json{{"sets", stats.sets},
+                     {"ways", stats.ways},
+                     {"resident", stats.resident},
+                     {"bch_decode_cycles", stats.bch_decode_cycles},
+                     {"retirements", stats.retirements},
+                     {"proactive_pages", stats.proactive_pages},
+                     {"registered", cache.registered},
+                     {"dropped", cache.dropped},
+                     {"errors_on_tracked", cache.errors_on_tracked},
+                     {"decode_reads", cache.decode_reads},
+                     {"writes_s1_to_s2", cache.writes_s1_to_s2},
+                     {"reads_s2_to_s3", cache.reads_s2_to_s3},
+                     {"retires", cache.retires},
+                     {"retires_celog", cache.retires_celog},
+                     {"invalidated_entries", cache.invalidated_entries},
+                     {"proactive_triggers", cache.proactive_triggers},
+                     {"gc_accumulations", cache.gc_accumulations},
+                     {"gc_resets", cache.gc_resets},
+                     {"gc_peak_value", cache.gc_peak_value},
+                     {"gc_peak_bias", cache.gc_peak_bias}};
+}
+
+void to_json(nlohmann::json& j, const error_model_stats& stats)
+{
+  std::map<std::string, nlohmann::json> error_ways;
+  for (const auto& x : stats.error_ways) {
+    error_ways.emplace(x.name, x);
+  }
+
+  j = nlohmann::json{{"mode", stats.mode},
+                     {"spatial_model", stats.spatial_model},
+                     {"cache_pinning", stats.cache_pinning},
+                     {"care_enabled", stats.care},
+                     {"error_cycle_interval", stats.error_cycle_interval},
+                     {"bit_error_rate", stats.bit_error_rate},
+                     {"page_error_rate", stats.page_error_rate},
+                     {"total_error_accesses", stats.total_error_accesses},
+                     {"recording",
+                      {{"retirement_threshold", stats.retirement_threshold},
+                       {"first_errors", stats.first_errors},
+                       {"added_errors", stats.added_errors},
+                       {"retirements", stats.retirements},
+                       {"already_known", stats.already_known},
+                       {"lines_invalidated", stats.lines_invalidated},
+                       {"active_pages", stats.active_pages},
+                       {"multi_error_pages", stats.multi_error_pages}}},
+                     {"addresses", {{"tracked", stats.tracked_addresses}, {"retired", stats.retired_addresses}}},
+                     {"baseline", {{"retirement_threshold", stats.baseline_retirement_threshold}, {"retirements", stats.baseline_retirements}}},
+                     {"cores", stats.cores},
+                     {"error_ways", error_ways}};
+  if (stats.spatial.has_value()) {
+    j["spatial"] = *stats.spatial;
+  }
+  if (stats.care_scheme.has_value()) {
+    j["care"] = *stats.care_scheme;
+  }
+}
+
 namespace champsim
 {
 void to_json(nlohmann::json& j, const champsim::phase_stats stats)
@@ -105,6 +236,7 @@ void to_json(nlohmann::json& j, const champsim::phase_stats stats)
   std::map<std::string, nlohmann::json> statsmap{{"name", stats.name}, {"traces", stats.trace_names}};
   statsmap.emplace("roi", roi_stats);
   statsmap.emplace("sim", sim_stats);
+  statsmap.emplace("error_model", stats.error_model);
   j = statsmap;
 }
 } // namespace champsim
@@ -16,7 +16,9 @@
 
 #include <algorithm>
 #include <fstream>
+#include <functional>
 #include <numeric>
+#include <optional>
 #include <string>
 #include <vector>
 #include <CLI/CLI.hpp>
@@ -24,20 +26,24 @@
 
 #include "cache.h" // for CACHE
 #include "champsim.h"
+#include "checkpoint.h"
 #ifndef CHAMPSIM_TEST_BUILD
 #include "core_inst.inc"
 #endif
 #include "defaults.hpp"
 #include "environment.h"
+#include "error_page_manager.h"
+#include "fork_sweep.h"
 #include "ooo_cpu.h" // for O3_CPU
 #include "phase_info.h"
+#include "shm_istream.h"
 #include "stats_printer.h"
 #include "tracereader.h"
 #include "vmem.h"
 
 namespace champsim
 {
-std::vector<phase_stats> main(environment& env, std::vector<phase_info>& phases, std::vector<tracereader>& traces);
+std::vector<phase_stats> main(environment& env, std::vector<phase_info>& phases, std::vector<tracereader>& traces, const phase_hooks& hooks);
 }
 
 #ifndef CHAMPSIM_TEST_BUILD
@@ -62,7 +68,11 @@ int main(int argc, char** argv) // NOLINT(bugprone-exception-escape)
   long long warmup_instructions = 0;
   long long simulation_instructions = std::numeric_limits<long long>::max();
   std::string json_file_name;
+  std::string fork_points_file;
+  std::string checkpoint_out_file;
+  std::string checkpoint_in_file;
   std::vector<std::string> trace_names;
+  champsim::convergence::policy stop_policy;
 
   auto set_heartbeat_callback = [&](auto) {
     for (O3_CPU& cpu : gen_environment.cpu_view()) {
@@ -83,6 +93,28 @@ int main(int argc, char** argv) // NOLINT(bugprone-exception-escape)
   auto* json_option =
       app.add_option("--json", json_file_name, "The name of the file to receive JSON output. If no name is specified, stdout will be used")->expected(0, 1);
 
+  auto* fork_option = app.add_option("--fork-points", fork_points_file,
+                                     "Simulate the warmup once, then fork one child per Error Page Manager setting listed in this file")
+                          ->check(CLI::ExistingFile);
+
+  auto* checkpoint_out_option =
+      app.add_option("--checkpoint-out", checkpoint_out_file, "Save the warmed-up state of the simulator to this file at the end of the warmup");
+  auto* checkpoint_in_option = app.add_option("--checkpoint-in", checkpoint_in_file,
+                                              "Restore the warmed-up state saved by --checkpoint-out from this file, and skip the warmup")
+                                   ->check(CLI::ExistingFile)
+                                   ->excludes(fork_option)
+                                   ->excludes(checkpoint_out_option);
+
+  auto* stop_option = app.add_option("--stop-at-ci", stop_policy.relative_width,
+                                     "End a core's simulation phase once the confidence interval of its cumulative IPC is within this fraction of "
+                                     "it (e.g. 0.01)")
+                          ->check(CLI::Range(0.0, 1.0));
+  app.add_option("--stop-confidence", stop_policy.confidence, "The confidence level of --stop-at-ci")->check(CLI::Range(0.5, 0.9999))->needs(stop_option);
+  app.add_option("--stop-min-instructions", stop_policy.min_instructions, "The instructions a core simulates before --stop-at-ci may end its phase")
+      ->needs(stop_option);
+  app.add_option("--stop-interval", stop_policy.interval, "The instructions per sample of --stop-at-ci")->check(CLI::PositiveNumber)->needs(stop_option);
+  app.add_flag("--stop-on-errors", stop_policy.include_errors, "With --stop-at-ci, also wait for the DRAM error rate to converge")->needs(stop_option);
+
   app.add_option("traces", trace_names, "The paths to the traces")->required()->expected(NUM_CPUS)->check(CLI::ExistingFile);
 
   CLI11_PARSE(app, argc, argv);
@@ -104,6 +136,49 @@ int main(int argc, char** argv) // NOLINT(bugprone-exception-escape)
     warmup_instructions = simulation_instructions / 5;
   }
 
+  std::optional<champsim::fork_sweep::group> fork_group;
+  if (fork_option->count() > 0) {
+    if (auto mode = ErrorPageManager::get_instance().get_mode(); mode != ErrorPageManagerMode::CYCLE && mode != ErrorPageManagerMode::OFF) {
+      fmt::print(stderr, "--fork-points needs an Error Page Manager that injects nothing during warmup (CYCLE or OFF mode)\n");
+      return 1;
+    }
+    if (std::any_of(std::begin(trace_names), std::end(trace_names), [](const auto& name) { return champsim::shm_istream::is_descriptor(name); })) {
+      fmt::print(stderr, "--fork-points cannot share a trace server's stream between points\n");
+      return 1;
+    }
+    if (json_option->count() > 0 && !json_file_name.empty()) {
+      fmt::print(stderr, "--fork-points writes one output per point; use --json without a file name, and name each point's \"json\" file in the point list\n");
+      return 1;
+    }
+    try {
+      fork_group.emplace(champsim::fork_sweep::read_points(fork_points_file));
+    } catch (const std::runtime_error& e) {
+      fmt::print(stderr, "{}\n", e.what());
+      return 1;
+    }
+    fork_group->begin_warmup();
+  }
+
+  std::optional<champsim::checkpoint::header> restored;
+  if (checkpoint_in_option->count() > 0) {
+    try {
+      restored = champsim::checkpoint::read_header(checkpoint_in_file);
+    } catch (const champsim::checkpoint::mismatch& e) {
+      fmt::print(stderr, "{}\n", e.what());
+      return 1;
+    }
+    if (warmup_given && warmup_instructions != restored->warmup_instructions) {
+      fmt::print("WARNING: {} holds a warmup of {} instructions, not {}\n", checkpoint_in_file, restored->warmup_instructions, warmup_instructions);
+    }
+    warmup_instructions = restored->warmup_instructions;
+  }
+
+  if (stop_option->count() > 0) {
+    for (O3_CPU& cpu : gen_environment.cpu_view()) {
+      cpu.convergence.emplace(stop_policy);
+    }
+  }
+
   std::vector<champsim::tracereader> traces;
   std::transform(
       std::begin(trace_names), std::end(trace_names), std::back_inserter(traces),
@@ -120,7 +195,49 @@ int main(int argc, char** argv) // NOLINT(bugprone-exception-escape)
   fmt::print("\n*** ChampSim Multicore Out-of-Order Simulator ***\nWarmup Instructions: {}\nSimulation Instructions: {}\nNumber of CPUs: {}\nPage size: {}\n\n",
              phases.at(0).length, phases.at(1).length, std::size(gen_environment.cpu_view()), PAGE_SIZE);
 
-  auto phase_stats = champsim::main(gen_environment, phases, traces);
+  champsim::phase_hooks hooks;
+  if (restored.has_value()) {
+    // The checkpoint replaces the warmup: restore it, then skip each trace to where the warmup left it
+    phases.erase(std::begin(phases));
+    hooks.after_initialize = [&] {
+      restored = champsim::checkpoint::restore(checkpoint_in_file, gen_environment, trace_names);
+      for (std::size_t i = 0; i < std::size(traces); ++i) {
+        for (long long skipped = 0; skipped < restored->traces.at(i).second && !traces.at(i).eof(); ++skipped) {
+          traces.at(i)();
+        }
+      }
+      fmt::print("Restored the warmed-up state from {}\n", checkpoint_in_file);
+    };
+  }
+
+  bool is_point = false;
+  hooks.after_phase = [&](const champsim::phase_info& phase) {
+    if (phase.is_warmup && checkpoint_out_option->count() > 0) {
+      try {
+        champsim::checkpoint::save(checkpoint_out_file, gen_environment, trace_names, phase.length, CHAMPSIM_BUILD);
+        fmt::print("Saved the warmed-up state to {}\n", checkpoint_out_file);
+      } catch (const std::runtime_error& e) {
+        fmt::print("WARNING: {}\n", e.what());
+      }
+    }
+    if (!fork_group.has_value() || !phase.is_warmup) {
+      return true;
+    }
+    is_point = fork_group->fork_points();
+    return is_point;
+  };
+
+  std::vector<champsim::phase_stats> phase_stats;
+  try {
+    phase_stats = champsim::main(gen_environment, phases, traces, hooks);
+  } catch (const champsim::checkpoint::mismatch& e) {
+    fmt::print(stderr, "Cannot restore the checkpoint: {}\n", e.what());
+    return 1;
+  }
+
+  if (fork_group.has_value() && !is_point) {
+    return fork_group->wait();
+  }
 
   fmt::print("\nChampSim completed all CPUs\n\n");
 
@@ -139,6 +256,9 @@ int main(int argc, char** argv) // NOLINT(bugprone-exception-escape)
   }
 
   if (json_option->count() > 0) {
+    if (is_point) {
+      json_file_name = fork_group->json_output();
+    }
     if (json_file_name.empty()) {
       champsim::json_printer{std::cout}.print(phase_stats);
     } else {
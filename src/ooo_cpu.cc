@@ -72,6 +72,10 @@ long O3_CPU::operate()
     last_heartbeat_time = current_time;
   }
 
+  if (!warmup && convergence.has_value() && convergence->due(num_retired)) {
+    convergence->sample(num_retired, current_time.time_since_epoch() / clock_period, ErrorPageManager::get_instance().get_total_error_count());
+  }
+
   return progress;
 }
 
@@ -93,6 +97,10 @@ void O3_CPU::begin_phase()
   stats.begin_instrs = num_retired;
   stats.begin_cycles = begin_phase_time.time_since_epoch() / clock_period;
   sim_stats = stats;
+
+  if (convergence.has_value()) {
+    convergence->begin(num_retired, stats.begin_cycles, ErrorPageManager::get_instance().get_total_error_count());
+  }
 }
 
 void O3_CPU::end_phase(unsigned finished_cpu)
@@ -105,6 +113,9 @@ void O3_CPU::end_phase(unsigned finished_cpu)
     finish_phase_instr = num_retired;
     finish_phase_time = current_time;
 
+    if (!warmup && convergence.has_value()) {
+      sim_stats.convergence = convergence->summarize(num_retired);
+    }
     roi_stats = sim_stats;
   }
 }
@@ -758,6 +769,13 @@ std::pair<champsim::address, bool> O3_CPU::impl_btb_prediction(champsim::address
   return btb_module_pimpl->impl_btb_prediction(ip, branch_type);
 }
 
+void O3_CPU::checkpoint(champsim::checkpoint::archive& ar)
+{
+  DIB.checkpoint(ar);
+  branch_module_pimpl->impl_branch_checkpoint(ar);
+  btb_module_pimpl->impl_btb_checkpoint(ar);
+}
+
 // LCOV_EXCL_START Exclude the following function from LCOV
 void O3_CPU::print_deadlock()
 {
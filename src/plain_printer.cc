@@ -50,6 +50,15 @@ std::vector<std::string> champsim::plain_printer::format(O3_CPU::stats_type stat
   std::vector<std::string> lines{};
   lines.push_back(fmt::format("{} cumulative IPC: {} instructions: {} cycles: {}", stats.name, ::print_ratio(stats.instrs(), stats.cycles()), stats.instrs(),
                               stats.cycles()));
+  if (stats.convergence.has_value()) {
+    const auto& conv = *stats.convergence;
+    lines.push_back(fmt::format("{} IPC confidence interval: +-{:.3g}% ({:.3g}% confidence, {} intervals, {})", stats.name, 100 * conv.ipc.relative(),
+                                100 * conv.confidence, conv.intervals, conv.converged ? "converged" : "not converged"));
+    if (conv.error_rate.has_value()) {
+      lines.push_back(fmt::format("{} DRAM error rate: {:.4g} per billion instructions +-{:.3g}%", stats.name, std::giga::num * conv.error_rate->value,
+                                  100 * conv.error_rate->relative()));
+    }
+  }
 
   lines.push_back(fmt::format("{} Branch Prediction Accuracy: {}% MPKI: {} Average ROB Occupancy at Mispredict: {}", stats.name,
                               ::print_ratio(100 * (total_branch - total_mispredictions), total_branch),
@@ -270,6 +270,14 @@ void PageTableWalker::print_deadlock()
 }
 // LCOV_EXCL_STOP
 
+void PageTableWalker::checkpoint(champsim::checkpoint::archive& ar)
+{
+  ar.expect(std::size(pscl), NAME + " paging-structure caches");
+  for (auto& pscl_cache : pscl) {
+    pscl_cache.checkpoint(ar);
+  }
+}
+
 std::optional<std::size_t> PageTableWalker::get_psc_cached_level(champsim::address vaddr) const
 {
   std::optional<std::size_t> lowest_level;
@@ -0,0 +1,281 @@
+/*
+ *    Copyright 2023 The ChampSim Contributors
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ * http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+#include "shm_istream.h"
+
+#include <algorithm>
+#include <array>
+#include <cerrno>
+#include <climits>
+#include <cstring>
+#include <fcntl.h>
+#include <fmt/core.h>
+#include <fstream>
+#include <signal.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#ifdef __linux__
+#include <linux/futex.h>
+#include <sys/syscall.h>
+#endif
+
+#include "inf_stream.h"
+
+namespace
+{
+template <typename S>
+struct byte_source_model final : champsim::shm_istream::byte_source {
+  S intern_;
+  explicit byte_source_model(const std::string& fname) : intern_(fname) {}
+
+  void read(char* s, std::streamsize count) override { intern_.read(s, count); }
+  [[nodiscard]] std::streamsize gcount() const override { return intern_.gcount(); }
+  [[nodiscard]] bool eof() const override { return intern_.eof(); }
+};
+
+bool ends_with(std::string_view str, std::string_view suffix)
+{
+  return std::size(str) >= std::size(suffix) && str.substr(std::size(str) - std::size(suffix)) == suffix;
+}
+
+// Wait until the futex word no longer holds `expected`, or the timeout passes
+void futex_wait(std::atomic<uint32_t>* word, uint32_t expected)
+{
+#ifdef __linux__
+  struct timespec timeout = {0, 100'000'000};
+  syscall(SYS_futex, reinterpret_cast<uint32_t*>(word), FUTEX_WAIT, expected, &timeout, nullptr, 0);
+#else
+  (void)word;
+  (void)expected;
+  usleep(1000);
+#endif
+}
+
+void futex_wake(std::atomic<uint32_t>* word)
+{
+#ifdef __linux__
+  syscall(SYS_futex, reinterpret_cast<uint32_t*>(word), FUTEX_WAKE, INT_MAX, nullptr, nullptr, 0);
+#else
+  (void)word;
+#endif
+}
+
+champsim::shm_trace::consumer_slot* slot_at(champsim::shm_trace::header* hdr, std::size_t idx)
+{
+  auto* base = reinterpret_cast<char*>(hdr) + champsim::shm_trace::SLOT_OFFSET;
+  return reinterpret_cast<champsim::shm_trace::consumer_slot*>(base) + idx;
+}
+
+const char* ring_of(const champsim::shm_trace::header* hdr) { return reinterpret_cast<const char*>(hdr) + champsim::shm_trace::HEADER_SIZE; }
+} // namespace
+
+std::unique_ptr<champsim::shm_istream::byte_source> champsim::open_private_trace(const std::string& fname)
+{
+  if (ends_with(fname, "gz")) {
+    return std::make_unique<byte_source_model<champsim::inf_istream<champsim::decomp_tags::gzip_tag_t<>>>>(fname);
+  }
+  if (ends_with(fname, "xz")) {
+    return std::make_unique<byte_source_model<champsim::inf_istream<champsim::decomp_tags::lzma_tag_t<>>>>(fname);
+  }
+  if (ends_with(fname, "bz2")) {
+    return std::make_unique<byte_source_model<champsim::inf_istream<champsim::decomp_tags::bzip2_tag_t>>>(fname);
+  }
+  if (ends_with(fname, "zst")) {
+    return std::make_unique<byte_source_model<champsim::inf_istream<champsim::decomp_tags::zstd_tag_t<>>>>(fname);
+  }
+  return std::make_unique<byte_source_model<std::ifstream>>(fname);
+}
+
+void champsim::shm_istream::mapping_deleter::operator()(shm_trace::header* hdr)
+{
+  if (slot != nullptr) {
+    slot->state.store(shm_trace::DONE, std::memory_order_release);
+  }
+  if (hdr != nullptr) {
+    // Let a server waiting for this consumer move on
+    hdr->read_seq.fetch_add(1, std::memory_order_release);
+    futex_wake(&hdr->read_seq);
+    munmap(hdr, length);
+  }
+}
+
+champsim::shm_istream::shm_istream(std::string descriptor)
+{
+  auto spec = std::string_view{descriptor}.substr(std::size(shm_trace::PREFIX));
+  auto sep = spec.find(':');
+  std::string segment{spec.substr(0, sep)};
+  fallback_path = (sep == std::string_view::npos) ? std::string{} : std::string{spec.substr(sep + 1)};
+
+  if (!attach(segment)) {
+    fmt::print("*** Trace segment {} unavailable, decoding {} privately\n", segment, fallback_path);
+    switch_to_private();
+  }
+}
+
+bool champsim::shm_istream::attach(const std::string& segment)
+{
+  auto fd = open(("/dev/shm/" + segment).c_str(), O_RDWR);
+  if (fd < 0) {
+    return false;
+  }
+
+  struct stat st {};
+  if (fstat(fd, &st) != 0 || static_cast<std::size_t>(st.st_size) < shm_trace::HEADER_SIZE) {
+    close(fd);
+    return false;
+  }
+
+  auto length = static_cast<std::size_t>(st.st_size);
+  auto* addr = mmap(nullptr, length, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+  close(fd);
+  if (addr == MAP_FAILED) {
+    return false;
+  }
+
+  auto* hdr = static_cast<shm_trace::header*>(addr);
+  if (hdr->magic.load(std::memory_order_acquire) != shm_trace::MAGIC || hdr->version != shm_trace::VERSION
+      || shm_trace::HEADER_SIZE + hdr->capacity > length) {
+    munmap(addr, length);
+    return false;
+  }
+
+  // Claim a free consumer slot, starting at the beginning of the trace
+  shm_trace::consumer_slot* slot = nullptr;
+  for (std::size_t i = 0; i < std::min<std::size_t>(hdr->max_consumers, shm_trace::MAX_CONSUMERS) && slot == nullptr; ++i) {
+    auto* candidate = slot_at(hdr, i);
+    auto expected = static_cast<uint32_t>(shm_trace::FREE);
+    if (candidate->state.load(std::memory_order_relaxed) == shm_trace::FREE) {
+      candidate->cursor.store(0, std::memory_order_relaxed);
+      candidate->pid.store(static_cast<uint64_t>(getpid()), std::memory_order_relaxed);
+      if (candidate->state.compare_exchange_strong(expected, shm_trace::ACTIVE, std::memory_order_acq_rel)) {
+        slot = candidate;
+      }
+    }
+  }
+
+  mapping = decltype(mapping){hdr, mapping_deleter{length, slot}};
+
+  // Too late to join if the beginning of the trace has already been overwritten
+  return slot != nullptr && hdr->reserve_pos.load(std::memory_order_acquire) <= hdr->capacity;
+}
+
+void champsim::shm_istream::switch_to_private()
+{
+  mapping.reset();
+  fallback = open_private_trace(fallback_path);
+
+  // Skip what has already been read from the segment
+  std::array<char, 1 << 16> scratch;
+  auto to_skip = cursor;
+  while (to_skip > 0 && !fallback->eof()) {
+    auto chunk = std::min<uint64_t>(to_skip, std::size(scratch));
+    fallback->read(std::data(scratch), static_cast<std::streamsize>(chunk));
+    auto got = fallback->gcount();
+    if (got <= 0) {
+      break;
+    }
+    to_skip -= static_cast<uint64_t>(got);
+  }
+}
+
+bool champsim::shm_istream::wait_for_data(uint64_t write_pos)
+{
+  auto seq = mapping->write_seq.load(std::memory_order_acquire);
+  if (mapping->write_pos.load(std::memory_order_acquire) != write_pos || mapping->eof.load(std::memory_order_acquire) != 0) {
+    return true;
+  }
+
+  futex_wait(&mapping->write_seq, seq);
+
+  // A timeout with no progress: check that the server is still there
+  if (mapping->write_seq.load(std::memory_order_acquire) == seq && kill(static_cast<pid_t>(mapping->server_pid), 0) != 0 && errno == ESRCH) {
+    return false;
+  }
+  return true;
+}
+
+std::size_t champsim::shm_istream::read_shared(char* s, std::size_t count)
+{
+  auto capacity = mapping->capacity;
+  auto* slot = mapping.get_deleter().slot;
+  std::size_t copied = 0;
+  while (copied < count) {
+    if (slot->state.load(std::memory_order_acquire) != shm_trace::ACTIVE) {
+      break;
+    }
+
+    auto write_pos = mapping->write_pos.load(std::memory_order_acquire);
+    if (write_pos == cursor) {
+      if (mapping->eof.load(std::memory_order_acquire) != 0 && mapping->write_pos.load(std::memory_order_acquire) == cursor) {
+        eof_ = true;
+        return copied;
+      }
+      if (!wait_for_data(write_pos)) {
+        break;
+      }
+      continue;
+    }
+
+    auto n = std::min<uint64_t>(write_pos - cursor, count - copied);
+    auto offset = cursor % capacity;
+    auto first = std::min<uint64_t>(n, capacity - offset);
+    std::memcpy(s + copied, ring_of(mapping.get()) + offset, first);
+    std::memcpy(s + copied + first, ring_of(mapping.get()), n - first);
+
+    // The copy is only good if the server did not start overwriting it meanwhile
+    std::atomic_thread_fence(std::memory_order_acquire);
+    if (mapping->reserve_pos.load(std::memory_order_relaxed) > cursor + capacity) {
+      break;
+    }
+
+    cursor += n;
+    copied += n;
+    slot->cursor.store(cursor, std::memory_order_release);
+    if (mapping->server_waiting.load(std::memory_order_acquire) != 0) {
+      mapping->read_seq.fetch_add(1, std::memory_order_release);
+      futex_wake(&mapping->read_seq);
+    }
+  }
+
+  if (copied < count) {
+    fmt::print("*** Trace segment lost at byte {}, decoding {} privately\n", cursor, fallback_path);
+    switch_to_private();
+  }
+  return copied;
+}
+
+champsim::shm_istream& champsim::shm_istream::read(char* s, std::streamsize count)
+{
+  std::size_t copied = 0;
+  if (mapping != nullptr) {
+    copied = read_shared(s, static_cast<std::size_t>(count));
+    if (eof_) {
+      gcount_ = static_cast<std::streamsize>(copied);
+      return *this;
+    }
+  }
+
+  if (fallback != nullptr && static_cast<std::streamsize>(copied) < count) {
+    fallback->read(s + copied, count - static_cast<std::streamsize>(copied));
+    cursor += static_cast<uint64_t>(fallback->gcount());
+    copied += static_cast<std::size_t>(fallback->gcount());
+    eof_ = fallback->eof();
+  }
+
+  gcount_ = static_cast<std::streamsize>(copied);
+  return *this;
+}
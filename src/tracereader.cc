@@ -21,6 +21,7 @@
 
 #include "inf_stream.h"
 #include "repeatable.h"
+#include "shm_istream.h"
 
 namespace champsim
 {
@@ -35,6 +36,10 @@ ooo_model_instr apply_branch_target(ooo_model_instr branch, const ooo_model_inst
 template <template <class, class> typename R, typename T>
 champsim::tracereader get_tracereader_for_type(std::string fname, uint8_t cpu)
 {
+  if (champsim::shm_istream::is_descriptor(fname)) {
+    return champsim::tracereader{R<T, champsim::shm_istream>(cpu, fname)};
+  }
+
   if (bool is_gzip_compressed = (fname.substr(std::size(fname) - 2) == "gz"); is_gzip_compressed) {
     return champsim::tracereader{R<T, champsim::inf_istream<champsim::decomp_tags::gzip_tag_t<>>>(cpu, fname)};
   }
@@ -47,6 +52,10 @@ champsim::tracereader get_tracereader_for_type(std::string fname, uint8_t cpu)
     return champsim::tracereader{R<T, champsim::inf_istream<champsim::decomp_tags::bzip2_tag_t>>(cpu, fname)};
   }
 
+  if (bool is_zstd_compressed = (fname.substr(std::size(fname) - 3) == "zst"); is_zstd_compressed) {
+    return champsim::tracereader{R<T, champsim::inf_istream<champsim::decomp_tags::zstd_tag_t<>>>(cpu, fname)};
+  }
+
   return champsim::tracereader{R<T, std::ifstream>(cpu, fname)};
 }
 } // namespace champsim
@@ -233,3 +233,56 @@ std::optional<champsim::page_number> VirtualMemory::get_vpage_for_ppage(uint32_t
   }
   return std::nullopt;
 }
+
+void VirtualMemory::checkpoint(champsim::checkpoint::archive& ar)
+{
+  ar.expect(pt_levels, "page table levels");
+  ar.expect(randomization_seed.has_value() ? fmt::format("{}", randomization_seed.value()) : std::string{"none"}, "page randomization seed");
+
+  ar.io(vpage_to_ppage_map);
+  ar.io(ppage_to_vpage_map);
+
+  // The keys of the page table are slices whose extent follows from their level
+  auto entries = static_cast<uint64_t>(std::size(page_table));
+  ar.io(entries);
+  if (ar.loading()) {
+    page_table.clear();
+    for (uint64_t i = 0; i < entries; ++i) {
+      uint32_t cpu_num = 0;
+      uint32_t level = 0;
+      uint64_t vpage = 0;
+      champsim::address paddr{};
+      ar.io(cpu_num);
+      ar.io(level);
+      ar.io(vpage);
+      ar.io(paddr);
+      champsim::dynamic_extent pte_table_entry_extent{champsim::address::bits, shamt(level)};
+      page_table.try_emplace({cpu_num, level, champsim::address_slice{pte_table_entry_extent, vpage}}, paddr);
+    }
+  } else {
+    for (auto& [key, paddr] : page_table) {
+      auto [cpu_num, level, vpage] = key;
+      auto raw_vpage = vpage.to<uint64_t>();
+      ar.io(cpu_num);
+      ar.io(level);
+      ar.io(raw_vpage);
+      ar.io(paddr);
+    }
+  }
+
+  auto free_pages = static_cast<uint64_t>(available_ppages());
+  ar.io(free_pages);
+  if (ar.loading()) {
+    populate_pages();
+    shuffle_pages();
+    if (free_pages == 0 || free_pages > available_ppages()) {
+      throw champsim::checkpoint::mismatch{fmt::format("physical pages: the checkpoint has {} free, this simulator has {}", free_pages, available_ppages())};
+    }
+    ppage_free_list.erase(std::begin(ppage_free_list), std::next(std::begin(ppage_free_list), static_cast<long>(available_ppages() - free_pages)));
+  }
+
+  ar.io(active_pte_page);
+  auto next_pte_offset = next_pte_page.to<uint64_t>();
+  ar.io(next_pte_offset);
+  next_pte_page = champsim::address_slice{champsim::dynamic_extent{next_pte_page.upper_extent(), next_pte_page.lower_extent()}, next_pte_offset};
+}
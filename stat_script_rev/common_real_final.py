@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import re
+import sys
 from dataclasses import dataclass
 from typing import List, Optional, Sequence, Tuple, Union
 
@@ -11,13 +12,27 @@ RESULTS_DIR_SPEC = os.path.join(BASE_DIR, "results/0219_finished/real_final_spec
 RESULTS_DIR_GAP = os.path.join(BASE_DIR, "results/0219_finished/real_final_gap")
 RESULTS_DIRS = (RESULTS_DIR_SPEC, RESULTS_DIR_GAP)
 
-FILE_RE = re.compile(
-    r"^champsim_(?:(?P<llc>[248])mb_)?(?P<page>4kb|2mb)_(?:(?:error_32gb_(?P<er>1e-\d+)(?P<pin>_cache_pinning)?)|32gb)_(?P<trace>.+)\.txt$"
-)
+CONFIG_ROOT = os.path.join(BASE_DIR, "sim_configs/real_final")
+
+# The configuration of each result comes from its binary's entry in sim_configs/real_final;
+# the CE rate is not a configuration value, so it is read off the executable name
+RATE_TOKEN_RE = re.compile(r"(?:^|_)(1e-\d+)(?=_|$)")
 WORKLOAD_RE = re.compile(r"^(\d+\.[^-_]+)")
-IPC_RE = re.compile(r"CPU 0 cumulative IPC:\s+([\d.]+)")
-ALLOC_RE = re.compile(r"Allocated Error Ways per Set:\s+(\d+)")
-USED_RE = re.compile(r"Used Error Way Slots:\s+\d+\s+\(([\d.]+)%\)")
+PAGE_NAMES = {4096: "4kb", 2 * 1024 * 1024: "2mb"}
+
+sys.path.insert(0, BASE_DIR)
+from simtools.results import cpu_value, parsed  # noqa: E402
+from simtools.results.configs import ConfigIndex  # noqa: E402
+
+_index: Optional[ConfigIndex] = None
+
+
+def config_index() -> ConfigIndex:
+    """The index of the real_final binaries, built on first use."""
+    global _index
+    if _index is None:
+        _index = ConfigIndex.build(CONFIG_ROOT)
+    return _index
 
 
 @dataclass
@@ -34,16 +49,19 @@ class Record:
 
 
 def parse_filename(filename: str) -> Optional[Record]:
-    m = FILE_RE.match(filename)
-    if not m:
+    if not filename.endswith(".txt"):
+        return None
+    index = config_index()
+    executable, trace = index.split(filename)
+    if executable is None:
         return None
 
-    llc = m.group("llc")
-    llc_mb = int(llc) if llc else 2
-    page = m.group("page")
-    er = m.group("er")
-    pinning = m.group("pin") is not None
-    trace = m.group("trace")
+    config = index[executable].config
+    llc_mb = config["LLC.sets"] * config["LLC.ways"] * config["block_size"] // (1024 * 1024)
+    page = PAGE_NAMES.get(config["page_size"], str(config["page_size"]))
+    rate = RATE_TOKEN_RE.search(executable)
+    er = rate.group(1) if rate else None
+    pinning = bool(config.get("error_page_manager.cache_pinning"))
 
     wm = WORKLOAD_RE.match(trace)
     workload = wm.group(1) if wm else trace
@@ -97,22 +115,16 @@ def load_records(results_dir: Union[str, Sequence[str], None] = None) -> List[Re
 
 def extract_ipc(path: str) -> Optional[float]:
     try:
-        with open(path, "r") as f:
-            txt = f.read()
-        m = IPC_RE.search(txt)
-        return float(m.group(1)) if m else None
+        return cpu_value(parsed(path), "ipc")
     except Exception:
         return None
 
 
 def extract_cache_way_stats(path: str) -> Optional[Tuple[int, float]]:
     try:
-        with open(path, "r") as f:
-            txt = f.read()
-        ma = ALLOC_RE.search(txt)
-        mu = USED_RE.search(txt)
-        if not ma or not mu:
+        stats = parsed(path)
+        if "err_way_alloc" not in stats or "used_error_way_slots_pct" not in stats:
             return None
-        return int(ma.group(1)), float(mu.group(1))
+        return stats["err_way_alloc"], stats["used_error_way_slots_pct"]
     except Exception:
         return None
@@ -2,22 +2,26 @@
 """Compare multicore Exp1 uniform vs clustered fault injection.
 
 Inputs : results/multicore/1_error_rate_sweep/           (uniform, incl. noerr baseline)
-         results/multicore/1_error_rate_sweep_clustered/ (champsim_4core_8mb_{off,pin}_clu_{rate}_{MIX}.txt)
+         results/multicore/1_error_rate_sweep_clustered/ (champsim_{N}core_{LLC}_{off,pin}_clu_{rate}_{MIX}.txt)
 Outputs: stat_script_rev/multicore_clu_compare_summary.csv (one row per mix/scheme/rate/model)
          console markdown pivots (weighted speedup, retirements, spatial stats)
 
 Weighted speedup uses the SAME-mix uniform noerr run as the alone-reference
-for both models (noerr has no injection, so it is model-independent).
-Reuses parse_file/MIXES from parse_multicore_exp1.py.
+for both models (noerr has no injection, so it is model-independent), core by
+core, whatever the number of cores. Reuses load() from parse_multicore_exp1.py.
 """
 
+import argparse
 import csv
 import os
 import re
 import sys
 
+import pandas as pd
+
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from parse_multicore_exp1 import parse_file, MIX_ORDER, gmean  # noqa: E402
+from parse_multicore_exp1 import MIX_ORDER, REFERENCE_KEYS, load, order  # noqa: E402
+from simtools.results.multicore import speedups  # noqa: E402
 
 BASE = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 UNI_DIR = os.path.join(BASE, "results", "multicore", "1_error_rate_sweep")
@@ -26,9 +30,9 @@ CLU_DIR = os.path.join(BASE, "results", "multicore", "1_error_rate_sweep_cluster
 RATES = ["1e-7", "1e-8"]
 SCHEMES = ["off", "pin"]
 
-RE_UNI = re.compile(r"^champsim_4core_8mb_(?P<scheme>off|pin)_(?P<rate>1e-\d)_(?P<mix>[MCH]\d)\.txt$")
-RE_NOERR = re.compile(r"^champsim_4core_8mb_noerr_(?P<mix>[MCH]\d)\.txt$")
-RE_CLU = re.compile(r"^champsim_4core_8mb_(?P<scheme>off|pin)_clu_(?P<rate>1e-\d)_(?P<mix>[MCH]\d)\.txt$")
+RE_UNI = re.compile(r"^champsim_(?P<num_cpus>\d+)core_(?P<llc>[^_]+)_(?P<scheme>off|pin)_(?P<rate>1e-\d+)_(?P<mix>\w+)\.txt$")
+RE_NOERR = re.compile(r"^champsim_(?P<num_cpus>\d+)core_(?P<llc>[^_]+)_noerr_(?P<mix>\w+)\.txt$")
+RE_CLU = re.compile(r"^champsim_(?P<num_cpus>\d+)core_(?P<llc>[^_]+)_(?P<scheme>off|pin)_clu_(?P<rate>1e-\d+)_(?P<mix>\w+)\.txt$")
 
 # Clustered-only spatial stats
 SPATIAL_RES = {
@@ -57,61 +61,49 @@ def parse_spatial(path):
     return out
 
 
-def collect(dirpath, fname_re, model):
-    runs = {}
-    if not os.path.isdir(dirpath):
-        return runs
-    for fname in sorted(os.listdir(dirpath)):
-        m = fname_re.match(fname)
-        if not m:
-            continue
-        path = os.path.join(dirpath, fname)
-        d = parse_file(path)
-        if len(d["complete_cpus"]) < 4:
-            print(f"  [incomplete] {fname}", file=sys.stderr)
-            continue
-        key = (m.group("mix"), m.group("scheme"), m.group("rate"))
-        d["model"] = model
-        if model == "clustered":
-            d["spatial"] = parse_spatial(path)
-        runs[key] = d
-    return runs
+def collect(dirpath, fname_re, model, jobs=1):
+    """Return (runs, cores) of the runs of a directory that completed on every CPU."""
+    runs, cores = load(dirpath, fname_re, jobs)
+    for path in runs.loc[~runs["completed"], "path"]:
+        print(f"  [incomplete] {os.path.basename(path)}", file=sys.stderr)
+    runs = runs[runs["completed"]].assign(model=model)
+    return runs, cores[cores["run"].isin(runs.index)]
+
+
+def _value(x):
+    return None if pd.isna(x) else x
 
 
 def main():
-    noerr = {}
-    for fname in sorted(os.listdir(UNI_DIR)):
-        m = RE_NOERR.match(fname)
-        if m:
-            d = parse_file(os.path.join(UNI_DIR, fname))
-            if len(d["complete_cpus"]) == 4:
-                noerr[m.group("mix")] = d
-
-    uni = collect(UNI_DIR, RE_UNI, "uniform")
-    clu = collect(CLU_DIR, RE_CLU, "clustered")
-    print(f"parsed: noerr={len(noerr)} uniform={len(uni)} clustered={len(clu)}", file=sys.stderr)
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", "-j", type=int, default=1,
+                    help="Worker processes parsing the result files (0: one per CPU)")
+    jobs = ap.parse_args().jobs or None
+
+    _, noerr = collect(UNI_DIR, RE_NOERR, "uniform", jobs)
+    uni = collect(UNI_DIR, RE_UNI, "uniform", jobs)
+    clu = collect(CLU_DIR, RE_CLU, "clustered", jobs)
+    print(f"parsed: noerr={noerr['run'].nunique()} uniform={len(uni[0])} clustered={len(clu[0])}", file=sys.stderr)
 
     rows = []
-    for model, runs in (("uniform", uni), ("clustered", clu)):
-        for (mix, scheme, rate), d in sorted(runs.items()):
-            if rate not in RATES:
-                continue
-            base = noerr.get(mix)
-            ws = None
-            if base:
-                ratios = [d["cpu_ipc"].get(c, 0) / base["cpu_ipc"][c]
-                          for c in range(4) if base["cpu_ipc"].get(c)]
-                ws = sum(ratios) if len(ratios) == 4 else None
-            absorbed = [d["cpu_err"].get(c, {}).get("absorbed", 0) for c in range(4)]
+    for runs, cores in (uni, clu):
+        if not len(runs):
+            continue
+        absorbed = cores["errors_absorbed"].astype("float64").fillna(0).groupby(cores["run"])
+        total = absorbed.sum()
+        runs = runs.join(speedups(cores, noerr, on=REFERENCE_KEYS)["weighted_speedup"]).join(
+            (absorbed.max() / total.where(total > 0)).rename("absorbed_max_share"))
+        for run in runs[runs["rate"].isin(RATES)].sort_values(["mix", "scheme", "rate"]).itertuples():
+            ws, share = _value(run.weighted_speedup), _value(run.absorbed_max_share)
             row = {
-                "mix": mix, "scheme": scheme, "rate": rate, "model": model,
+                "mix": run.mix, "scheme": run.scheme, "rate": run.rate, "model": run.model,
                 "weighted_speedup": round(ws, 4) if ws else None,
-                "total_errors": d.get("total_errors"),
-                "pages_retired": d.get("pages_retired"),
-                "baseline_retired": d.get("baseline_retired"),
-                "absorbed_max_share": round(max(absorbed) / sum(absorbed), 3) if sum(absorbed) else None,
+                "total_errors": _value(run.total_dram_errors),
+                "pages_retired": _value(run.pages_retired),
+                "baseline_retired": _value(run.baseline_page_retirements),
+                "absorbed_max_share": round(share, 3) if share is not None else None,
             }
-            sp = d.get("spatial", {})
+            sp = parse_spatial(run.path) if run.model == "clustered" else {}
             if sp:
                 faults = sp.get("faults")
                 row.update({
@@ -146,7 +138,7 @@ def main():
             print("| mix | uniform | clustered | Δ (clu−uni) |")
             print("|---|---|---|---|")
             deltas = []
-            for mix in MIX_ORDER:
+            for mix in order({r["mix"] for r in rows}, MIX_ORDER):
                 u = next((r for r in rows if r["model"] == "uniform" and r["mix"] == mix
                           and r["scheme"] == scheme and r["rate"] == rate), None)
                 c = next((r for r in rows if r["model"] == "clustered" and r["mix"] == mix
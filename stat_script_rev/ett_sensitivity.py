@@ -3,6 +3,7 @@
 
 import os
 import re
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -21,60 +22,35 @@ FILE_RE = re.compile(
 
 WORKLOAD_RE = re.compile(r"^(\d+\.\w+)")
 
-# Regex patterns for extracting metrics
-IPC_RE = re.compile(r"CPU 0 cumulative IPC:\s+([\d.eE+\-]+)")
-ETT_ENTRIES_RE = re.compile(r"ETT Entries:\s+(\d+)")
-RETIREMENT_THRESHOLD_RE = re.compile(r"Retirement Threshold:\s+(\d+)")
-ETT_EVICTIONS_RE = re.compile(r"ETT Evictions:\s+(\d+)")
-PAGE_RETIREMENTS_RE = re.compile(r"Page Retirements.*?:\s+(\d+)")
-TOTAL_ERRORS_RE = re.compile(r"Total DRAM Error Events:\s+(\d+)")
-FIRST_ERROR_RE = re.compile(r"First Error \(per page\):\s+(\d+)")
-ADDED_ERROR_RE = re.compile(r"Additional Errors:\s+(\d+)")
-ALREADY_KNOWN_RE = re.compile(r"Already Known \(bloom hit\):\s+(\d+)")
-ERROR_WAY_HITS_RE = re.compile(r"Error Way Hits:\s+(\d+)")
-ERROR_WAY_FILLS_RE = re.compile(r"Error Way Fills.*?:\s+(\d+)")
-ERROR_WAY_EVICTIONS_RE = re.compile(r"Error Way Evictions.*?:\s+(\d+)")
-ALLOC_ERROR_WAYS_RE = re.compile(r"Allocated Error Ways per Set:\s+(\d+)")
-# ETT Eviction Invalidation (second occurrence of "Cache Lines Invalidated")
-ETT_EVICT_INVAL_RE = re.compile(r"\[ETT Eviction Invalidation Detail\].*?Cache Lines Invalidated:\s+(\d+)", re.DOTALL)
-
-
-def extract_metrics(path):
-    """Extract all relevant metrics from a result file."""
-    try:
-        with open(path, "r") as f:
-            txt = f.read()
-    except Exception:
-        return None
-
-    def _search(regex, default=None):
-        m = regex.search(txt)
-        return m.group(1) if m else default
-
-    ipc = _search(IPC_RE)
+# Column name -> field of the shared metric registry (simtools.results.stats)
+sys.path.insert(0, BASE_DIR)
+from simtools.results import cpu_value, parse_dir, parsed  # noqa: E402
+
+METRIC_COLUMNS = {
+    "ett_entries": "ett_entries",
+    "retirement_threshold": "retire_threshold",
+    "ett_evictions": "ett_evictions",
+    "page_retirements": "page_retirements",
+    "total_errors": "total_dram_errors",
+    "first_errors": "first_errors",
+    "added_errors": "additional_errors",
+    "already_known": "already_known",
+    "error_way_hits": "err_way_hits",
+    "error_way_fills": "err_way_fills",
+    "error_way_evictions": "err_way_evictions",
+    "alloc_error_ways": "err_way_alloc",
+    # ETT Eviction Invalidation (second occurrence of "Cache Lines Invalidated")
+    "ett_evict_inval_lines": "ett_evict_lines_invalidated",
+}
+
+
+def metrics_from(stats):
+    """The relevant metrics of a result file's parsed values, or None if it has no ROI IPC."""
+    ipc = cpu_value(stats, "ipc")
     if ipc is None:
         return None
 
-    return {
-        "ipc": float(ipc),
-        "ett_entries": _int(_search(ETT_ENTRIES_RE)),
-        "retirement_threshold": _int(_search(RETIREMENT_THRESHOLD_RE)),
-        "ett_evictions": _int(_search(ETT_EVICTIONS_RE)),
-        "page_retirements": _int(_search(PAGE_RETIREMENTS_RE)),
-        "total_errors": _int(_search(TOTAL_ERRORS_RE)),
-        "first_errors": _int(_search(FIRST_ERROR_RE)),
-        "added_errors": _int(_search(ADDED_ERROR_RE)),
-        "already_known": _int(_search(ALREADY_KNOWN_RE)),
-        "error_way_hits": _int(_search(ERROR_WAY_HITS_RE)),
-        "error_way_fills": _int(_search(ERROR_WAY_FILLS_RE)),
-        "error_way_evictions": _int(_search(ERROR_WAY_EVICTIONS_RE)),
-        "alloc_error_ways": _int(_search(ALLOC_ERROR_WAYS_RE)),
-        "ett_evict_inval_lines": _int(_search(ETT_EVICT_INVAL_RE)),
-    }
-
-
-def _int(val):
-    return int(val) if val is not None else None
+    return {"ipc": ipc, **{column: cpu_value(stats, field) for column, field in METRIC_COLUMNS.items()}}
 
 
 def gmean(values):
@@ -84,16 +60,25 @@ def gmean(values):
     return float(np.exp(np.mean(np.log(vals))))
 
 
-def load_all():
-    """Load all results and return a DataFrame."""
+def extract_metrics(path):
+    """Extract all relevant metrics from a result file."""
+    try:
+        stats = parsed(path)
+    except Exception:
+        return None
+    return metrics_from(stats)
+
+
+def load_all(jobs=1):
+    """Load all results and return a DataFrame. Files are parsed over `jobs` processes."""
     rows = []
     if not os.path.isdir(RESULTS_DIR):
         print(f"Results directory not found: {RESULTS_DIR}")
         return pd.DataFrame()
 
-    for fname in sorted(os.listdir(RESULTS_DIR)):
-        m = FILE_RE.match(fname)
-        if not m:
+    for m, result in parse_dir(RESULTS_DIR, FILE_RE.match, jobs=jobs):
+        if result.error is not None:
+            print(f"  skipping {os.path.basename(result.path)}: {result.error}")
             continue
 
         category = m.group("category")
@@ -104,8 +89,7 @@ def load_all():
         wm = WORKLOAD_RE.match(trace)
         workload = wm.group(1) if wm else trace
 
-        path = os.path.join(RESULTS_DIR, fname)
-        metrics = extract_metrics(path)
+        metrics = metrics_from(result.values)
         if metrics is None:
             continue
 
@@ -2,12 +2,12 @@
 """RBMPKI + IPC parsing for real_final_{spec,gap} results."""
 
 import os
-import re
 import csv
 import numpy as np
 import matplotlib.pyplot as plt
 
 from common_real_final import load_records
+from simtools.results import cpu_value, parsed  # common_real_final puts the repo root on sys.path
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUT_CSV = os.path.join(SCRIPT_DIR, "baseline_workloads_rbmpki_ipc.csv")
@@ -17,19 +17,13 @@ OUT_CAT = os.path.join(SCRIPT_DIR, "baseline_rbmpki_category_comparison.png")
 
 
 def parse_metrics(path):
-    txt = open(path, "r").read()
-    ipc = None
-    m = re.search(r'CPU 0 cumulative IPC:\s+([\d.]+)', txt)
-    if m:
-        ipc = float(m.group(1))
-
-    instr_m = re.search(r'CPU 0 cumulative IPC:.*?instructions:\s*(\d+)', txt)
-    rb_matches = re.findall(r'^\s*ROW_BUFFER_MISS:\s*(\d+)', txt, re.MULTILINE)
+    stats = parsed(path)
+    ipc = cpu_value(stats, "ipc")
+
+    instr = cpu_value(stats, "instructions")
     rbmpki = None
-    if instr_m and rb_matches:
-        instr = int(instr_m.group(1))
-        total_rb = sum(int(x) for x in rb_matches)
-        rbmpki = (total_rb / instr) * 1000 if instr > 0 else None
+    if instr is not None and "row_buffer_misses" in stats:
+        rbmpki = (stats["row_buffer_misses"] / instr) * 1000 if instr > 0 else None
     return ipc, rbmpki
 
 
@@ -14,7 +14,9 @@ RESULT_DIR = os.path.join(os.path.dirname(__file__), "..",
 
 # Parse filename: comb_e{entries}_t{threshold}_w{ways}_{rate}_du_sh_trace.txt
 FNAME_RE = re.compile(r"comb_e(\d+)_t(\d+)_w(\d+)_(1e-\d+)_du_sh_trace\.txt$")
-IPC_RE = re.compile(r"cumulative IPC:\s+([\d.]+)")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from simtools.results import cpu_value, parsed  # noqa: E402
 
 
 def parse_results():
@@ -25,13 +27,9 @@ def parse_results():
             continue
         entries, threshold, ways, rate = int(m[1]), int(m[2]), int(m[3]), m[4]
         path = os.path.join(RESULT_DIR, fname)
-        with open(path) as f:
-            text = f.read()
-        # Get last IPC (Simulation complete line)
-        ipcs = IPC_RE.findall(text)
-        if not ipcs:
+        ipc = cpu_value(parsed(path), "ipc")
+        if ipc is None:
             continue
-        ipc = float(ipcs[-1])
         rows.append({"ett_entries": entries, "threshold": threshold,
                       "max_ways": ways, "error_rate": rate, "ipc": ipc})
     return pd.DataFrame(rows)
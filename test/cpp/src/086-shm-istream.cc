@@ -0,0 +1,138 @@
+#include <catch.hpp>
+
+#include <array>
+#include <cstdio>
+#include <fcntl.h>
+#include <fstream>
+#include <string>
+#include <sys/mman.h>
+#include <unistd.h>
+
+#include "shm_istream.h"
+
+namespace
+{
+std::string make_payload(std::size_t size)
+{
+  std::string payload(size, '\0');
+  for (std::size_t i = 0; i < size; ++i) {
+    payload[i] = static_cast<char>(i * 7 + 3);
+  }
+  return payload;
+}
+
+std::string read_all(champsim::shm_istream& uut, std::size_t chunk)
+{
+  std::string result;
+  std::array<char, 4096> buf;
+  while (!uut.eof()) {
+    uut.read(std::data(buf), static_cast<std::streamsize>(std::min(chunk, std::size(buf))));
+    result.append(std::data(buf), static_cast<std::size_t>(uut.gcount()));
+  }
+  return result;
+}
+
+struct test_segment {
+  std::string name;
+  std::size_t length;
+  champsim::shm_trace::header* hdr;
+
+  test_segment(std::string n, std::size_t capacity) : name(std::move(n)), length(champsim::shm_trace::HEADER_SIZE + capacity)
+  {
+    auto fd = open(("/dev/shm/" + name).c_str(), O_RDWR | O_CREAT | O_TRUNC, 0600);
+    REQUIRE(fd >= 0);
+    REQUIRE(ftruncate(fd, static_cast<off_t>(length)) == 0);
+    hdr = static_cast<champsim::shm_trace::header*>(mmap(nullptr, length, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0));
+    close(fd);
+    REQUIRE(hdr != MAP_FAILED);
+    hdr->version = champsim::shm_trace::VERSION;
+    hdr->capacity = capacity;
+    hdr->max_consumers = champsim::shm_trace::MAX_CONSUMERS;
+    hdr->server_pid = static_cast<uint64_t>(getpid());
+    hdr->magic.store(champsim::shm_trace::MAGIC);
+  }
+
+  ~test_segment()
+  {
+    munmap(hdr, length);
+    unlink(("/dev/shm/" + name).c_str());
+  }
+
+  void publish(std::string_view data)
+  {
+    auto pos = hdr->write_pos.load();
+    hdr->reserve_pos.store(pos + std::size(data));
+    for (auto c : data) {
+      reinterpret_cast<char*>(hdr)[champsim::shm_trace::HEADER_SIZE + (pos++ % hdr->capacity)] = c;
+    }
+    hdr->write_pos.store(pos);
+  }
+};
+} // namespace
+
+TEST_CASE("A shm_istream without a segment decodes the trace privately")
+{
+  auto payload = make_payload(10000);
+  std::string fname{"086-shm-istream-private.champsimtrace"};
+  std::ofstream{fname, std::ios::binary}.write(std::data(payload), static_cast<std::streamsize>(std::size(payload)));
+
+  champsim::shm_istream uut{"shm:champsim-test-missing-segment:" + fname};
+  REQUIRE_FALSE(uut.is_shared());
+  REQUIRE(read_all(uut, 640) == payload);
+  std::remove(fname.c_str());
+}
+
+TEST_CASE("A shm_istream reads the published bytes of a segment")
+{
+  auto payload = make_payload(3000);
+  test_segment seg{"champsim-test-086-shared", 1 << 12};
+  seg.publish(payload);
+  seg.hdr->eof.store(1);
+
+  champsim::shm_istream uut{"shm:champsim-test-086-shared:/nonexistent"};
+  REQUIRE(uut.is_shared());
+  REQUIRE(read_all(uut, 640) == payload);
+}
+
+TEST_CASE("A shm_istream that joins too late falls back and skips nothing")
+{
+  auto payload = make_payload(10000);
+  std::string fname{"086-shm-istream-late.champsimtrace"};
+  std::ofstream{fname, std::ios::binary}.write(std::data(payload), static_cast<std::streamsize>(std::size(payload)));
+
+  test_segment seg{"champsim-test-086-late", 1 << 12};
+  seg.publish(std::string_view{payload}.substr(0, 5000));
+
+  champsim::shm_istream uut{"shm:champsim-test-086-late:" + fname};
+  REQUIRE_FALSE(uut.is_shared());
+  REQUIRE(read_all(uut, 640) == payload);
+  std::remove(fname.c_str());
+}
+
+TEST_CASE("An evicted shm_istream continues from its position with a private decoder")
+{
+  auto payload = make_payload(10000);
+  std::string fname{"086-shm-istream-evicted.champsimtrace"};
+  std::ofstream{fname, std::ios::binary}.write(std::data(payload), static_cast<std::streamsize>(std::size(payload)));
+
+  test_segment seg{"champsim-test-086-evicted", 1 << 12};
+  seg.publish(std::string_view{payload}.substr(0, 2048));
+
+  champsim::shm_istream uut{"shm:champsim-test-086-evicted:" + fname};
+  REQUIRE(uut.is_shared());
+
+  std::array<char, 1024> buf;
+  uut.read(std::data(buf), std::size(buf));
+  REQUIRE(uut.gcount() == 1024);
+  std::string result{std::data(buf), 1024};
+
+  // The server gives up on this consumer
+  auto* slot = reinterpret_cast<champsim::shm_trace::consumer_slot*>(reinterpret_cast<char*>(seg.hdr) + champsim::shm_trace::SLOT_OFFSET);
+  REQUIRE(slot->state.load() == champsim::shm_trace::ACTIVE);
+  slot->state.store(champsim::shm_trace::EVICTED);
+
+  result += read_all(uut, 640);
+  REQUIRE_FALSE(uut.is_shared());
+  REQUIRE(result == payload);
+  std::remove(fname.c_str());
+}
@@ -0,0 +1,74 @@
+#include <catch.hpp>
+
+#include <cstdio>
+#include <fstream>
+#include <stdexcept>
+#include <string>
+#include <unistd.h>
+
+#include "error_page_manager.h"
+#include "fork_sweep.h"
+
+namespace
+{
+struct point_list {
+  std::string name{"087-fork-sweep-" + std::to_string(::getpid()) + ".json"};
+
+  explicit point_list(const std::string& contents)
+  {
+    std::ofstream file{name};
+    file << contents;
+  }
+
+  ~point_list() { std::remove(name.c_str()); }
+};
+} // namespace
+
+TEST_CASE("A point list gives each point its output and settings")
+{
+  point_list list{R"({"points": [{"output": "a.txt", "error_page_manager": {"error_cycle_interval": 144000000, "cache_pinning": true}},
+                                  {"output": "b.txt", "json": "b.json"}]})"};
+
+  auto points = champsim::fork_sweep::read_points(list.name);
+  REQUIRE(std::size(points) == 2);
+  REQUIRE(points.at(0).output == "a.txt");
+  REQUIRE(points.at(0).error_page_manager.at("error_cycle_interval") == 144000000);
+  REQUIRE(points.at(0).json.empty());
+  REQUIRE(points.at(1).error_page_manager.empty());
+  REQUIRE(points.at(1).json == "b.json");
+}
+
+TEST_CASE("A point list rejects settings that would change the warmup")
+{
+  point_list list{R"({"points": [{"output": "a.txt", "error_page_manager": {"error_spatial_model": "clustered"}}]})"};
+  REQUIRE_THROWS_AS(champsim::fork_sweep::read_points(list.name), std::runtime_error);
+}
+
+TEST_CASE("A point list rejects two points writing the same output")
+{
+  point_list list{R"({"points": [{"output": "a.txt"}, {"output": "a.txt"}]})"};
+  REQUIRE_THROWS_AS(champsim::fork_sweep::read_points(list.name), std::runtime_error);
+}
+
+TEST_CASE("A point's settings are applied through the Error Page Manager setters")
+{
+  auto& epm = ErrorPageManager::get_instance();
+  const auto old_period = epm.get_cpu_clock_period();
+  const auto old_threshold = epm.get_retirement_threshold();
+  const auto old_interval = epm.get_error_cycle_interval();
+  const auto old_latency = epm.get_error_latency();
+
+  epm.set_cpu_clock_period(champsim::chrono::picoseconds{250});
+  epm.set_error_cycle_interval(1000);
+
+  champsim::fork_sweep::apply(epm, {{"retirement_threshold", 64}, {"error_latency_penalty", 4}, {"error_cycle_interval", 5000}});
+  REQUIRE(epm.get_retirement_threshold() == 64);
+  REQUIRE(epm.get_error_latency() == champsim::chrono::picoseconds{1000});
+  REQUIRE(epm.get_error_cycle_interval() == 5000);
+
+  epm.set_cpu_clock_period(old_period);
+  epm.set_retirement_threshold(old_threshold);
+  epm.set_error_latency(old_latency);
+  epm.rewind_injection_stream();
+  epm.set_error_cycle_interval(old_interval);
+}
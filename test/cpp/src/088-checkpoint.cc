@@ -0,0 +1,223 @@
+#include <catch.hpp>
+
+#include <bitset>
+#include <cstdio>
+#include <fstream>
+#include <map>
+#include <optional>
+#include <string>
+#include <unistd.h>
+#include <vector>
+#include <zlib.h>
+
+#include "checkpoint.h"
+#include "dram_controller.h"
+#include "msl/lru_table.h"
+#include "vmem.h"
+
+namespace
+{
+struct same_value {
+  auto operator()(uint64_t value) const { return value; }
+};
+
+template <typename T>
+T round_trip(T value)
+{
+  auto saved = champsim::checkpoint::archive::for_saving();
+  saved.io(value);
+  auto loaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+  T result{};
+  loaded.io(result);
+  REQUIRE(loaded.at_end());
+  return result;
+}
+
+VirtualMemory make_vmem(MEMORY_CONTROLLER& dram, uint64_t seed)
+{
+  return VirtualMemory{champsim::data::bytes{1 << 12}, 5, std::chrono::nanoseconds{640}, std::chrono::nanoseconds{640}, std::chrono::nanoseconds{640}, dram,
+                       seed};
+}
+
+struct checkpoint_file {
+  std::string name{"088-checkpoint-" + std::to_string(::getpid()) + ".ckpt"};
+
+  explicit checkpoint_file(champsim::checkpoint::header head)
+  {
+    auto ar = champsim::checkpoint::archive::for_saving();
+    head.checkpoint(ar);
+    std::string bytes{champsim::checkpoint::magic};
+    bytes.append(std::begin(ar.bytes()), std::end(ar.bytes()));
+    auto crc = ::crc32(0L, reinterpret_cast<const Bytef*>(bytes.data()), static_cast<uInt>(bytes.size()));
+    for (int i = 0; i < 4; ++i) {
+      bytes.push_back(static_cast<char>((crc >> (8 * i)) & 0xff));
+    }
+    std::ofstream{name, std::ios::binary} << bytes;
+  }
+
+  ~checkpoint_file() { std::remove(name.c_str()); }
+};
+} // namespace
+
+TEST_CASE("A checkpoint archive restores what it saved")
+{
+  REQUIRE(round_trip<long long>(-5) == -5);
+  REQUIRE(round_trip<uint64_t>(0xffffffffffffffffull) == 0xffffffffffffffffull);
+  REQUIRE(round_trip(true));
+  REQUIRE(round_trip(std::string{"LLC"}) == "LLC");
+  REQUIRE(round_trip(std::optional<std::size_t>{7}) == std::optional<std::size_t>{7});
+  REQUIRE(round_trip(std::optional<std::size_t>{}) == std::nullopt);
+  REQUIRE(round_trip(std::bitset<12>{0xabc}) == std::bitset<12>{0xabc});
+  REQUIRE(round_trip(champsim::address{0xdeadbeef}) == champsim::address{0xdeadbeef});
+
+  std::map<std::pair<uint32_t, uint64_t>, std::vector<int>> map{{{0, 1}, {1, -2}}, {{1, 0}, {}}};
+  REQUIRE(round_trip(map) == map);
+}
+
+TEST_CASE("Small values take little space")
+{
+  auto saved = champsim::checkpoint::archive::for_saving();
+  std::vector<uint64_t> zeros(100, 0);
+  saved.io(zeros);
+  REQUIRE(std::size(saved.bytes()) == 101);
+}
+
+TEST_CASE("A checkpoint archive rejects what does not match")
+{
+  auto saved = champsim::checkpoint::archive::for_saving();
+  saved.expect(uint32_t{2048}, "LLC sets");
+  auto loaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+  REQUIRE_THROWS_AS(loaded.expect(uint32_t{1024}, "LLC sets"), champsim::checkpoint::mismatch);
+}
+
+TEST_CASE("A section must be read exactly as it was written")
+{
+  auto saved = champsim::checkpoint::archive::for_saving();
+  saved.section("cache LLC", [](auto& ar) {
+    uint64_t a = 1;
+    uint64_t b = 2;
+    ar.io(a);
+    ar.io(b);
+  });
+
+  SECTION("Reading all of it succeeds")
+  {
+    auto loaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+    uint64_t a = 0;
+    uint64_t b = 0;
+    loaded.section("cache LLC", [&](auto& ar) {
+      ar.io(a);
+      ar.io(b);
+    });
+    REQUIRE(a == 1);
+    REQUIRE(b == 2);
+  }
+
+  SECTION("Reading less is a mismatch")
+  {
+    auto loaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+    REQUIRE_THROWS_AS(loaded.section("cache LLC", [](auto& ar) {
+      uint64_t a = 0;
+      ar.io(a);
+    }),
+                      champsim::checkpoint::mismatch);
+  }
+
+  SECTION("Another section is a mismatch")
+  {
+    auto loaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+    REQUIRE_THROWS_AS(loaded.section("cache L2C", [](auto&) {}), champsim::checkpoint::mismatch);
+  }
+}
+
+TEST_CASE("An LRU table keeps its entries and their order across a checkpoint")
+{
+  champsim::msl::lru_table<uint64_t, ::same_value, ::same_value> table{1, 2};
+  table.fill(1);
+  table.fill(2);
+  table.check_hit(1);
+
+  auto saved = champsim::checkpoint::archive::for_saving();
+  table.checkpoint(saved);
+
+  champsim::msl::lru_table<uint64_t, ::same_value, ::same_value> restored{1, 2};
+  auto loaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+  restored.checkpoint(loaded);
+
+  restored.fill(3); // evicts 2, the least recently used
+  REQUIRE(restored.check_hit(1) == 1);
+  REQUIRE(restored.check_hit(2) == std::nullopt);
+
+  champsim::msl::lru_table<uint64_t, ::same_value, ::same_value> smaller{1, 1};
+  auto reloaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+  REQUIRE_THROWS_AS(smaller.checkpoint(reloaded), champsim::checkpoint::mismatch);
+}
+
+TEST_CASE("The header of a checkpoint file is read after checking the file")
+{
+  champsim::checkpoint::header head;
+  head.build_id = 0x0123456789abcdef;
+  head.geometry = "cache LLC 2048x16\n";
+  head.geometry_hash = champsim::checkpoint::geometry_hash(head.geometry);
+  head.warmup_instructions = 200000000;
+  head.traces = {{"649.fotonik3d_s-10881B.champsimtrace.xz", 200000000}};
+  checkpoint_file file{head};
+
+  auto read = champsim::checkpoint::read_header(file.name);
+  REQUIRE(read.build_id == head.build_id);
+  REQUIRE(read.geometry_hash == head.geometry_hash);
+  REQUIRE(read.warmup_instructions == 200000000);
+  REQUIRE(read.traces == head.traces);
+
+  {
+    std::fstream damaged{file.name, std::ios::binary | std::ios::in | std::ios::out};
+    damaged.seekp(10);
+    damaged.put('\x7f');
+  }
+  REQUIRE_THROWS_AS(champsim::checkpoint::read_header(file.name), champsim::checkpoint::mismatch);
+}
+
+TEST_CASE("Virtual memory translates as before after a checkpoint")
+{
+  MEMORY_CONTROLLER dram{champsim::chrono::picoseconds{3200},
+                         champsim::chrono::picoseconds{6400},
+                         std::size_t{18},
+                         std::size_t{18},
+                         std::size_t{18},
+                         std::size_t{38},
+                         champsim::chrono::microseconds{64000},
+                         {},
+                         64,
+                         64,
+                         1,
+                         champsim::data::bytes{8},
+                         1024,
+                         1024,
+                         4,
+                         4,
+                         4,
+                         8192};
+  const champsim::page_number warm{0xdeadbeef};
+  const champsim::page_number cold{0xcafe};
+
+  auto original = make_vmem(dram, 17);
+  auto warm_ppage = original.va_to_pa(0, warm).first;
+  auto warm_pte = original.get_pte_pa(0, warm, 1).first;
+
+  auto saved = champsim::checkpoint::archive::for_saving();
+  original.checkpoint(saved);
+
+  auto restored = make_vmem(dram, 17);
+  auto loaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+  restored.checkpoint(loaded);
+  REQUIRE(loaded.at_end());
+
+  REQUIRE(restored.available_ppages() == original.available_ppages());
+  REQUIRE(restored.va_to_pa(0, warm).first == warm_ppage);
+  REQUIRE(restored.va_to_pa(0, cold).first == original.va_to_pa(0, cold).first);
+  REQUIRE(restored.get_pte_pa(0, warm, 1).first == warm_pte);
+
+  auto reshuffled = make_vmem(dram, 18);
+  auto reloaded = champsim::checkpoint::archive::for_loading(saved.bytes());
+  REQUIRE_THROWS_AS(reshuffled.checkpoint(reloaded), champsim::checkpoint::mismatch);
+}
@@ -0,0 +1,118 @@
+#include <catch.hpp>
+
+#include <cmath>
+
+#include "convergence.h"
+
+TEST_CASE("The z-score matches the normal quantiles")
+{
+  REQUIRE(champsim::convergence::z_score(0.95) == Approx(1.95996).epsilon(1e-4));
+  REQUIRE(champsim::convergence::z_score(0.99) == Approx(2.57583).epsilon(1e-4));
+}
+
+TEST_CASE("A ratio estimator estimates the ratio of the sums")
+{
+  champsim::convergence::ratio_estimator est;
+  est.add(100, 100);
+  est.add(300, 100);
+  auto result = est.at(1);
+  REQUIRE(result.value == Approx(2));
+
+  // Residuals are -100 and +100 around R = 2; Var(R) = 20000 / (1 * 2 * 100^2)
+  REQUIRE(result.half_width == Approx(1));
+  REQUIRE(result.relative() == Approx(0.5));
+}
+
+TEST_CASE("A ratio estimator without samples has an unbounded interval")
+{
+  champsim::convergence::ratio_estimator est;
+  REQUIRE(std::isinf(est.at(1).relative()));
+  est.add(10, 5);
+  REQUIRE(est.at(1).value == Approx(2));
+  REQUIRE(std::isinf(est.at(1).half_width));
+}
+
+SCENARIO("A tracker stops once the IPC has converged")
+{
+  champsim::convergence::policy policy;
+  policy.relative_width = 0.01;
+  policy.interval = 1000;
+
+  GIVEN("A core running at a steady IPC")
+  {
+    champsim::convergence::tracker tracker{policy};
+    tracker.begin(0, 0, 0);
+
+    long long instr = 0;
+    long long cycle = 0;
+    auto run = [&](std::size_t intervals) {
+      for (std::size_t i = 0; i < intervals; ++i) {
+        instr += 1000;
+        cycle += (i % 2 == 0) ? 499 : 501;
+        REQUIRE(tracker.due(instr));
+        tracker.sample(instr, cycle, 0);
+      }
+    };
+
+    THEN("It does not stop before it has enough intervals")
+    {
+      run(champsim::convergence::min_intervals - 1);
+      REQUIRE_FALSE(tracker.converged(instr));
+    }
+
+    THEN("It stops once it has")
+    {
+      run(champsim::convergence::min_intervals);
+      REQUIRE(tracker.converged(instr));
+
+      auto summary = tracker.summarize(instr);
+      REQUIRE(summary.converged);
+      REQUIRE(summary.intervals == champsim::convergence::min_intervals);
+      REQUIRE(summary.ipc.value == Approx(2).epsilon(1e-3));
+      REQUIRE(summary.ipc.relative() <= 0.01);
+      REQUIRE_FALSE(summary.error_rate.has_value());
+    }
+  }
+
+  GIVEN("A minimum instruction count")
+  {
+    policy.min_instructions = 100000;
+    champsim::convergence::tracker tracker{policy};
+    tracker.begin(5000, 0, 0);
+    for (long long i = 1; i <= 20; ++i) {
+      tracker.sample(5000 + i * 1000, i * 500, 0);
+    }
+
+    THEN("It does not stop before the minimum")
+    {
+      REQUIRE_FALSE(tracker.converged(25000));
+    }
+
+    THEN("It stops once past the minimum, without waiting for another sample")
+    {
+      REQUIRE(tracker.converged(105000));
+    }
+
+    THEN("A new phase starts over")
+    {
+      tracker.begin(105000, 10000, 0);
+      REQUIRE_FALSE(tracker.converged(300000));
+    }
+  }
+
+  GIVEN("A tracker that waits for the error rate too")
+  {
+    policy.include_errors = true;
+    champsim::convergence::tracker tracker{policy};
+    tracker.begin(0, 0, 0);
+    for (long long i = 1; i <= 20; ++i) {
+      tracker.sample(i * 1000, i * 500, 0);
+    }
+
+    THEN("A run without errors never converges")
+    {
+      REQUIRE_FALSE(tracker.converged(20000));
+      REQUIRE(tracker.summarize(20000).error_rate.has_value());
+    }
+  }
+}
@@ -0,0 +1,119 @@
+#include <catch.hpp>
+
+#include <sstream>
+#include <nlohmann/json.hpp>
+
+#include "stats_printer.h"
+
+namespace
+{
+nlohmann::json print_one(const champsim::phase_stats& phase)
+{
+  std::vector<champsim::phase_stats> phases{phase};
+  std::stringstream stream;
+  champsim::json_printer{stream}.print(phases);
+  return nlohmann::json::parse(stream).at(0);
+}
+} // namespace
+
+SCENARIO("The JSON output carries the error model")
+{
+  GIVEN("A phase whose error model recorded errors with pinning")
+  {
+    champsim::phase_stats phase;
+    phase.name = "Simulation";
+    phase.error_model.mode = "CYCLE";
+    phase.error_model.spatial_model = "uniform";
+    phase.error_model.cache_pinning = true;
+    phase.error_model.total_error_accesses = 12;
+    phase.error_model.retirement_threshold = 4;
+    phase.error_model.first_errors = 5;
+    phase.error_model.retirements = 2;
+    phase.error_model.cores.resize(2);
+    phase.error_model.cores[1].errors_absorbed = 7;
+
+    error_way_stats llc;
+    llc.name = "LLC";
+    llc.sets = 2048;
+    llc.ways = 2;
+    llc.used_slots = 100;
+    llc.hits = 30;
+    llc.pinned = 9;
+    phase.error_model.error_ways.push_back(llc);
+
+    WHEN("it is printed")
+    {
+      auto doc = print_one(phase);
+      const auto& model = doc.at("error_model");
+
+      THEN("the counters appear under stable keys")
+      {
+        REQUIRE(model.at("mode") == "CYCLE");
+        REQUIRE(model.at("cache_pinning") == true);
+        REQUIRE(model.at("total_error_accesses") == 12);
+        REQUIRE(model.at("recording").at("retirement_threshold") == 4);
+        REQUIRE(model.at("recording").at("first_errors") == 5);
+        REQUIRE(model.at("recording").at("retirements") == 2);
+      }
+
+      THEN("each CPU has its attribution")
+      {
+        REQUIRE(model.at("cores").size() == 2);
+        REQUIRE(model.at("cores").at(0).at("absorbed") == 0);
+        REQUIRE(model.at("cores").at(1).at("absorbed") == 7);
+      }
+
+      THEN("the error ways are keyed by cache")
+      {
+        const auto& ways = model.at("error_ways").at("LLC");
+        REQUIRE(ways.at("total_slots") == 4096);
+        REQUIRE(ways.at("used_slots") == 100);
+        REQUIRE(ways.at("hits") == 30);
+        REQUIRE(ways.at("pinned") == 9);
+      }
+
+      THEN("the optional blocks are left out")
+      {
+        REQUIRE_FALSE(model.contains("spatial"));
+        REQUIRE_FALSE(model.contains("care"));
+      }
+    }
+  }
+
+  GIVEN("A phase of the sticky model with CARE")
+  {
+    champsim::phase_stats phase;
+    spatial_fault_stats spatial;
+    spatial.faults_created = {3, 2, 1};
+    spatial.distinct_banks = 4;
+    phase.error_model.spatial = spatial;
+
+    care_stats care;
+    care.sets = 1024;
+    care.retirements = 6;
+    care.cache.registered = 11;
+    phase.error_model.care = true;
+    phase.error_model.care_scheme = care;
+
+    WHEN("it is printed")
+    {
+      auto doc = print_one(phase);
+      const auto& model = doc.at("error_model");
+
+      THEN("the spatial faults are broken down by mode")
+      {
+        REQUIRE(model.at("spatial").at("faults_created").at("cell") == 3);
+        REQUIRE(model.at("spatial").at("faults_created").at("bank") == 1);
+        REQUIRE(model.at("spatial").at("distinct_banks") == 4);
+      }
+
+      THEN("the ECC cache statistics appear")
+      {
+        REQUIRE(model.at("care_enabled") == true);
+        REQUIRE(model.at("care").at("sets") == 1024);
+        REQUIRE(model.at("care").at("retirements") == 6);
+        REQUIRE(model.at("care").at("registered") == 11);
+      }
+    }
+  }
+}
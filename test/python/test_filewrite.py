@@ -76,3 +76,16 @@ class FragmentTests(unittest.TestCase):
         a_frag = config.filewrite.Fragment(a_parts)
         b_frag = config.filewrite.Fragment(b_parts)
         self.assertEqual(list(iter(config.filewrite.Fragment.join(a_frag, b_frag))), expected)
+
+class ContentIdTests(unittest.TestCase):
+    def parsed(self, name, ways=16, modules=('a', 'b')):
+        return (name, {'caches': [{'name': 'LLC', 'ways': ways}]}, list(modules), {}, {'num_cores': 1})
+
+    def test_name_is_ignored(self):
+        self.assertEqual(config.filewrite.content_id(self.parsed('one')), config.filewrite.content_id(self.parsed('two')))
+
+    def test_module_order_is_ignored(self):
+        self.assertEqual(config.filewrite.content_id(self.parsed('x', modules=('b', 'a'))), config.filewrite.content_id(self.parsed('x')))
+
+    def test_parameters_are_not_ignored(self):
+        self.assertNotEqual(config.filewrite.content_id(self.parsed('x', ways=8)), config.filewrite.content_id(self.parsed('x')))
@@ -0,0 +1,214 @@
+import unittest
+import tempfile
+import os
+
+import simtools.monitor
+import simtools.runner.jobs
+import simtools.runner.registry
+
+HEARTBEAT = 'Heartbeat CPU {} instructions: {} cycles: 1 heartbeat IPC: 1 cumulative IPC: 1 total_errors: 0 (Simulation time: 00 hr {:02d} min 00 sec)\n'
+PANIC = 'Simulation CPU 0 panic: IPC 0.001 < 0.01\n'
+COMPLETE = 'Simulation complete CPU 0 instructions: 1000 cycles: 1000 cumulative IPC: 1 (Simulation time: 00 hr 50 min 00 sec)\n'
+
+def make_job(path, name='job', experiment='exp', warmup=100, sim=900):
+    return simtools.runner.jobs.Job(job_id=f'{experiment}/{name}', experiment=experiment, binary='fake', traces=['t.xz'],
+                                    output=path, warmup=warmup, sim=sim)
+
+class FileStateTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dtemp.name, 'out.txt')
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def append(self, text):
+        with open(self.path, 'a') as wfp:
+            wfp.write(text)
+
+    def test_reads_only_appended_bytes(self):
+        state = simtools.monitor.FileState()
+        self.append(HEARTBEAT.format(0, 50, 1) + HEARTBEAT.format(0, 200, 2))
+        first = state.update(self.path, warmup=100)
+        self.assertEqual(first, os.path.getsize(self.path))
+        self.assertEqual(state.cpus['0'], [200, 120, 200, 120])
+        self.assertEqual(state.update(self.path, warmup=100), 0)
+
+        self.append(HEARTBEAT.format(0, 400, 4))
+        self.assertEqual(state.update(self.path, warmup=100), os.path.getsize(self.path) - first)
+        self.assertEqual(state.cpus['0'], [200, 120, 400, 240])
+
+    def test_partial_line_is_read_again(self):
+        state = simtools.monitor.FileState()
+        line = HEARTBEAT.format(0, 200, 2)
+        self.append(line[:20])
+        state.update(self.path)
+        self.assertEqual(state.offset, 0)
+        self.append(line[20:])
+        state.update(self.path)
+        self.assertEqual(state.offset, len(line))
+        self.assertEqual(state.last_instr, 200)
+
+    def test_panic_run_resets_on_heartbeat(self):
+        state = simtools.monitor.FileState()
+        self.append(PANIC * 3)
+        state.update(self.path)
+        self.append(PANIC + HEARTBEAT.format(0, 200, 2) + PANIC * 2)
+        state.update(self.path)
+        self.assertEqual(state.panic_run, 2)
+        self.assertEqual(state.panic_total, 6)
+
+    def test_small_chunks(self):
+        state = simtools.monitor.FileState()
+        self.append(''.join(HEARTBEAT.format(0, i * 100, i) for i in range(1, 20)) + COMPLETE)
+        state.update(self.path, warmup=100, chunk_size=64)
+        self.assertEqual(state.last_instr, 1900)
+        self.assertTrue(state.complete)
+        self.assertEqual(state.duration, 3000)
+
+    def test_rewritten_file_starts_over(self):
+        state = simtools.monitor.FileState()
+        self.append(HEARTBEAT.format(0, 500, 5) * 4)
+        state.update(self.path)
+        os.remove(self.path)
+        self.append(HEARTBEAT.format(0, 100, 1))
+        state.update(self.path)
+        self.assertEqual(state.last_instr, 100)
+
+    def test_slowest_cpu(self):
+        state = simtools.monitor.FileState()
+        self.append(HEARTBEAT.format(0, 500, 5) + HEARTBEAT.format(1, 300, 5))
+        state.update(self.path)
+        self.assertEqual(state.last_instr, 300)
+
+class MonitorTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.dtemp.name, 'state.json')
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def output(self, name, text):
+        path = os.path.join(self.dtemp.name, f'{name}.txt')
+        with open(path, 'a') as wfp:
+            wfp.write(text)
+        return path
+
+    def monitor(self, jobs):
+        return simtools.monitor.Monitor(jobs, state_path=self.state_path, results_root=self.dtemp.name)
+
+    def test_states(self):
+        jobs = [
+            make_job(self.output('done', HEARTBEAT.format(0, 500, 10) + COMPLETE), 'done'),
+            make_job(self.output('run', HEARTBEAT.format(0, 100, 10) + HEARTBEAT.format(0, 400, 40)), 'run'),
+            make_job(self.output('panic', HEARTBEAT.format(0, 300, 10) + PANIC), 'panic'),
+            make_job(os.path.join(self.dtemp.name, 'pending.txt'), 'pending')
+        ]
+        statuses = self.monitor(jobs).refresh()
+        self.assertEqual([s.state for s in statuses], ['done', 'running', 'panic', 'pending'])
+
+        running = statuses[1]
+        self.assertEqual(running.last_instr, 400)
+        self.assertIsNotNone(running.eta)
+        self.assertEqual(running.eta_source, 'self')
+
+    def test_state_file_round_trip(self):
+        path = self.output('run', HEARTBEAT.format(0, 200, 2))
+        job = make_job(path)
+        first = self.monitor([job])
+        first.refresh()
+        self.assertEqual(first.bytes_read, os.path.getsize(path))
+
+        second = self.monitor([job])
+        second.refresh()
+        self.assertEqual(second.bytes_read, 0)
+        self.assertEqual(second.files[path].last_instr, 200)
+
+    def test_stalled(self):
+        path = self.output('old', HEARTBEAT.format(0, 200, 2))
+        os.utime(path, (0, 0))
+        status, = self.monitor([make_job(path)]).refresh()
+        self.assertEqual(status.state, 'stalled')
+
+    def test_registry_marks_killed(self):
+        path = self.output('killed', HEARTBEAT.format(0, 200, 2))
+        simtools.runner.registry.JobRegistry(self.dtemp.name).record('exp/job', simtools.runner.registry.PANIC)
+        status, = self.monitor([make_job(path)]).refresh()
+        self.assertEqual(status.state, 'killed')
+
+    def test_peer_eta_without_heartbeat(self):
+        jobs = [
+            make_job(self.output('done', COMPLETE), 'done'),
+            make_job(self.output('fresh', 'Warmup started\n'), 'fresh')
+        ]
+        statuses = self.monitor(jobs).refresh()
+        self.assertEqual(statuses[1].eta_source, 'peer')
+        self.assertEqual(statuses[1].eta, 3000)
+
+    def test_unknown_total_has_no_eta(self):
+        path = self.output('real', HEARTBEAT.format(0, 200, 2))
+        status, = self.monitor([make_job(path, warmup=None, sim=None)]).refresh()
+        self.assertEqual(status.state, 'running')
+        self.assertEqual(status.fraction, 0.0)
+        self.assertIsNone(status.eta)
+
+class ManifestScriptTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def script(self, text):
+        path = os.path.join(self.dtemp.name, 'run.sh')
+        with open(path, 'w') as wfp:
+            wfp.write(text)
+        return path
+
+    def test_script_experiments(self):
+        path = self.script('queue_experiment "a" "a_gap"\n# queue_experiment "b" "b"\nrun_experiments_merged "c" "d"\n')
+        self.assertEqual(simtools.runner.jobs.script_experiments(path), [('a', 'a_gap'), ('c', 'c'), ('d', 'd')])
+
+    def test_multicore_jobs(self):
+        path = self.script('\n'.join((
+            'RESULT_DIR="${RESULT_DIR:-${CHAMPSIM_DIR}/results/multicore/sweep}"',
+            'WARMUP="${WARMUP:-10}"',
+            'SIM="${SIM:-20}"',
+            'BINARIES=(',
+            '  bin_a',
+            '  # bin_b',
+            ')',
+            'declare -A T=(',
+            '  [mcf]="605.mcf_s-994B.champsimtrace.xz"',
+            '  [gcc]="602.gcc_s-1850B.champsimtrace.xz"',
+            ')',
+            'declare -A MIXES=(',
+            '  # memory-intensive',
+            '  [M1]="mcf gcc"   # two',
+            '  [M2]="gcc mcf"',
+            ')',
+            'MIX_ORDER=(M2 M1)',
+            ''
+        )))
+        jobs = simtools.runner.jobs.multicore_jobs(path, champsim_dir='/cs')
+        self.assertEqual([j.job_id for j in jobs], ['multicore/sweep/bin_a_M2', 'multicore/sweep/bin_a_M1'])
+        self.assertEqual(jobs[1].output, '/cs/results/multicore/sweep/bin_a_M1.txt')
+        self.assertEqual([os.path.basename(t) for t in jobs[1].traces],
+                         ['605.mcf_s-994B.champsimtrace.xz', '602.gcc_s-1850B.champsimtrace.xz'])
+        self.assertEqual((jobs[0].warmup, jobs[0].sim), (10, 20))
+
+    def test_real_final_filter(self):
+        self.assertFalse(simtools.runner.jobs.real_final_selected('x/no_cache_pinning/_2MBLLC_4KBPage_DRAM_Error_1e-9.json'))
+        self.assertFalse(simtools.runner.jobs.real_final_selected('x/no_cache_pinning/_2MBLLC_2MBPage_DRAM_Error_1e-8.json'))
+        self.assertTrue(simtools.runner.jobs.real_final_selected('x/no_cache_pinning/_2MBLLC_4KBPage_DRAM_Error_1e-8.json'))
+        self.assertTrue(simtools.runner.jobs.real_final_selected('x/cache_pinning/_2MBLLC_4KBPage_DRAM_Error_1e-9.json'))
+
+    def test_command_without_budgets(self):
+        job = make_job('/o.txt', warmup=None, sim=None)
+        self.assertEqual(job.command('/cs'), ['/cs/bin/fake', 't.xz'])
+        self.assertIsNone(job.total_instr)
+
+    def test_command_with_json(self):
+        job = make_job('/r/o.txt', warmup=None, sim=None)
+        self.assertEqual(job.command('/cs', json_stats=True), ['/cs/bin/fake', '--json', '/r/o.json', 't.xz'])
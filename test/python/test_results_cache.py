@@ -0,0 +1,110 @@
+import unittest
+from unittest import mock
+import tempfile
+import os
+
+import simtools.results.cache as cache
+import simtools.results.stats as stats
+
+OUTPUT = '''Page size: 4096
+CPU 0 cumulative IPC: 1.234 instructions: 1000 cycles: 810
+CPU 1 cumulative IPC: 0.5 instructions: 500 cycles: 1000
+[LLC]   Error Way Hits:                  7
+'''
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.dtemp.name, 'results', cache.CACHE_NAME)
+        self.output = os.path.join(self.dtemp.name, 'out.txt')
+        self.write(OUTPUT)
+        self.reads = mock.patch.object(cache, 'parse_file', side_effect=stats.parse_file)
+        self.parse_file = self.reads.start()
+
+    def tearDown(self):
+        self.reads.stop()
+        self.dtemp.cleanup()
+
+    def write(self, text, mtime_ns=None):
+        with open(self.output, 'w') as wfp:
+            wfp.write(text)
+        if mtime_ns is not None:
+            os.utime(self.output, ns=(mtime_ns, mtime_ns))
+
+    def test_unchanged_output_is_not_read(self):
+        first = cache.ResultCache(self.db).get(self.output)
+        again = cache.ResultCache(self.db)
+        self.assertEqual(again.get(self.output), first)
+        self.assertEqual(self.parse_file.call_count, 1)
+        self.assertEqual((again.hits, again.misses), (1, 0))
+
+    def test_same_as_parse(self):
+        cache.ResultCache(self.db).get(self.output)
+        values = cache.ResultCache(self.db).get(self.output)
+        self.assertEqual(values, stats.parse_file(self.output))
+        self.assertEqual(values['ipc'], {0: 1.234, 1: 0.5})
+
+    def test_changed_output_is_read_again(self):
+        self.write(OUTPUT, mtime_ns=1_000_000_000)
+        cache.ResultCache(self.db).get(self.output)
+        # Another size at the same time
+        self.write(OUTPUT.replace('Hits:                  7', 'Hits:                  18'), mtime_ns=1_000_000_000)
+        self.assertEqual(cache.ResultCache(self.db).get(self.output)['err_way_hits'], 18)
+        # The same size at another time
+        self.write(OUTPUT.replace('Hits:                  7', 'Hits:                  19'), mtime_ns=2_000_000_000)
+        self.assertEqual(cache.ResultCache(self.db).get(self.output)['err_way_hits'], 19)
+        self.assertEqual(self.parse_file.call_count, 3)
+
+    def test_parser_version(self):
+        cache.ResultCache(self.db).get(self.output)
+        cache.ResultCache(self.db, version='other').get(self.output)
+        self.assertEqual(self.parse_file.call_count, 2)
+        extra = stats.Metric(('extra',), '', r'Extra:\s+(\d+)')
+        self.assertNotEqual(cache.parser_version(stats.METRICS + (extra,)), cache.PARSER_VERSION)
+
+    def test_off(self):
+        off = cache.ResultCache(cache.DISABLED)
+        off.get(self.output)
+        off.get(self.output)
+        self.assertEqual(self.parse_file.call_count, 2)
+        self.assertFalse(os.path.exists(self.db))
+
+    def test_unusable_database(self):
+        # A file where the results directory should be
+        with open(os.path.join(self.dtemp.name, 'results'), 'w'):
+            pass
+        self.assertEqual(cache.ResultCache(self.db).get(self.output)['page_size'], 4096)
+
+    def test_missing_output(self):
+        with self.assertRaises(OSError):
+            cache.ResultCache(self.db).get(os.path.join(self.dtemp.name, 'missing.txt'))
+
+    def test_prune(self):
+        store = cache.ResultCache(self.db)
+        store.get(self.output)
+        self.assertEqual(store.prune(), 0)
+        os.remove(self.output)
+        self.assertEqual(store.prune(), 1)
+        self.assertEqual(store.entries(), {})
+
+    def test_get_many(self):
+        other = os.path.join(self.dtemp.name, 'other.txt')
+        with open(other, 'w') as wfp:
+            wfp.write('Page size: 2097152\n')
+        values = cache.ResultCache(self.db).get_many([self.output, other])
+        self.assertEqual(values[other], {'page_size': 2097152})
+        self.assertEqual(cache.ResultCache(self.db).entries(), {cache.PARSER_VERSION: 2})
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'no fork on this platform')
+    def test_forked_process(self):
+        shared = cache.ResultCache(self.db)
+        values = shared.get(self.output)
+        conn = shared._connection()
+        pid = os.fork()
+        if pid == 0:
+            # The child reads the cache through a connection of its own
+            ok = shared.get(self.output) == values and shared._connection() is not conn and shared.hits == 1
+            os._exit(0 if ok else 1)
+        self.assertEqual(os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]), 0)
+        self.assertEqual(shared.get(self.output), values)
+        self.assertIs(shared._connection(), conn)
@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+import importlib.util
+import tempfile
+import json
+import os
+
+import simtools.results.configs as configs
+import simtools.results.cache as cache
+import simtools.results.parallel as parallel
+
+HAVE_PANDAS = importlib.util.find_spec('pandas') is not None
+
+def config(name, ways=16, pinning=True, threshold=32):
+    return {'block_size': 64, 'ooo_cpu': [{'rob_size': 352}], 'LLC': {'sets': 2048, 'ways': ways},
+            'error_page_manager': {'cache_pinning': pinning, 'retirement_threshold': threshold}, 'executable_name': name}
+
+class FlattenTests(unittest.TestCase):
+    def test_flatten(self):
+        flat = configs.flatten({'a': 1, 'b': {'c': [4, {'d': 'x'}], 'e': {}}, 'f': []})
+        self.assertEqual(flat, {'a': 1, 'b.c.0': 4, 'b.c.1.d': 'x'})
+
+class ConfigIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.dtemp.name, 'sim_configs')
+        self.db = os.path.join(self.dtemp.name, 'results', cache.CACHE_NAME)
+        self.mk = os.path.join(self.dtemp.name, '_configuration.mk')
+        self.write('1_sweep/on/a.json', config('pin_on_1e-5'))
+        self.write('1_sweep/off/a.json', config('pin_off_1e-5', pinning=False))
+        self.write('2_retire/r.json', config('retire_on_2_1e-5', threshold=2))
+        self.write('2_retire/run.json', {'jobs': []})
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def write(self, name, doc, mtime_ns=None):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as wfp:
+            json.dump(doc, wfp)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def build(self):
+        return configs.ConfigIndex.build(self.root, cache_path=self.db, configuration_mk=self.mk)
+
+    def test_entries(self):
+        index = self.build()
+        self.assertEqual(len(index), 3)
+        entry = index['pin_off_1e-5']
+        self.assertIs(entry.config['error_page_manager.cache_pinning'], False)
+        self.assertEqual(entry.config['ooo_cpu.0.rob_size'], 352)
+        self.assertNotIn('executable_name', entry.config)
+        self.assertTrue(entry.source.endswith(os.path.join('off', 'a.json')))
+        self.assertIsNone(entry.build_id)
+
+    def test_split(self):
+        index = self.build()
+        self.assertEqual(index.split('pin_on_1e-5_605.mcf_s-665B.txt'), ('pin_on_1e-5', '605.mcf_s-665B'))
+        self.assertEqual(index.split('retire_on_2_1e-5_bfs_twitter.trace.gz.txt'), ('retire_on_2_1e-5', 'bfs_twitter.trace.gz'))
+        self.assertEqual(index.split('pin_on_1e-6_605.mcf_s-665B.txt'), (None, None))
+        self.assertEqual(index.resolve('/r/1/pin_on_1e-5_x.txt').executable, 'pin_on_1e-5')
+
+    def test_unchanged_files_are_not_read(self):
+        self.build()
+        self.write('2_retire/r.json', config('retire_on_4_1e-5', threshold=4))
+        with mock.patch.object(configs, '_read', side_effect=configs._read) as read:
+            index = self.build()
+        self.assertEqual(read.call_count, 1)
+        self.assertIn('retire_on_4_1e-5', index)
+        self.assertNotIn('retire_on_2_1e-5', index)
+
+    def test_removed_files_leave_the_index(self):
+        self.build()
+        os.remove(os.path.join(self.root, '1_sweep', 'on', 'a.json'))
+        self.assertNotIn('pin_on_1e-5', self.build())
+        self.assertNotIn('pin_on_1e-5', configs.ConfigIndex.build(self.root, cache_path=cache.DISABLED, configuration_mk=self.mk))
+
+    def test_duplicates(self):
+        self.write('temp/a.json', config('pin_on_1e-5', ways=8), mtime_ns=4 * 10**18)
+        self.write('temp/same.json', config('pin_off_1e-5', pinning=False), mtime_ns=4 * 10**18)
+        index = self.build()
+        self.assertEqual(index['pin_on_1e-5'].config['LLC.ways'], 8)
+        self.assertEqual(list(index.duplicates), ['pin_on_1e-5'])
+
+    def test_build_ids(self):
+        with open(self.mk, 'w') as wfp:
+            wfp.write('######\n# Build ID: 0123abcd\n# Executable: /cs/bin/pin_on_1e-5\n# Module Names: ()\n######\n')
+        self.assertEqual(self.build()['pin_on_1e-5'].build_id, '0123abcd')
+
+    @unittest.skipUnless(HAVE_PANDAS, 'pandas is not installed')
+    def test_join(self):
+        import simtools.results.frame as frame
+        runs = frame.ResultsFrame.from_parsed([
+            ({'trace': '605.mcf_s-665B'}, parallel.Parsed('/r/pin_off_1e-5_605.mcf_s-665B.txt', {'ipc': {0: 0.5}})),
+            ({'trace': '605.mcf_s-665B'}, parallel.Parsed('/r/unknown_605.mcf_s-665B.txt', {'ipc': {0: 0.7}})),
+            ({'trace': '605.mcf_s-665B'}, parallel.Parsed('/r/retire_on_2_1e-5_605.mcf_s-665B.txt', {'ipc': {0: 0.9}})),
+        ])
+        joined = runs.with_configs(self.build(), keys=['error_page_manager.retirement_threshold', 'LLC.ways'])
+        self.assertEqual(list(joined['executable'].astype(object).fillna('')), ['pin_off_1e-5', '', 'retire_on_2_1e-5'])
+        self.assertEqual(list(joined['ipc']), [0.5, 0.7, 0.9])
+        self.assertEqual(joined['error_page_manager.retirement_threshold'][2], 2)
+        self.assertIn('LLC.ways', joined.axes)
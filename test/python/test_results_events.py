@@ -0,0 +1,134 @@
+import unittest
+import importlib.util
+import tempfile
+import shutil
+import os
+
+HAVE_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+if HAVE_PYARROW:
+    import simtools.results.events as events
+
+def record_error(pa, count=None, threshold=2):
+    page, cl = pa & ~0xfff, pa & ~0x3f
+    lines = [f'[ERROR_REC] ---- record_error(pa=0x{pa:x}) ----', f'[ERROR_REC]   page_base=0x{page:x}  cl_addr=0x{cl:x}']
+    if count is None:
+        return lines + [f'[ERROR_REC]   ALREADY_KNOWN: address 0x{cl:x} already tracked']
+    reached = count >= threshold
+    lines.append(f'[ERROR_REC]   counter: {count - 1} -> {count}  ' + (f'(>= threshold {threshold})' if reached else f'(threshold={threshold})'))
+    if reached:
+        lines += [f'[ERROR_REC]   RETIRE page=0x{page:x}:', '[ERROR_REC]     1. page_error_counters: erased',
+                  '[FAULT] fault 2 (ROW) killed by retirement of page 0x1f2000', '[ERROR_REC]   => PAGE_RETIRED']
+    elif count == 1:
+        lines.append('[ERROR_REC]   => FIRST_ERROR')
+    else:
+        lines.append(f'[ERROR_REC]   => ADDED_ERROR (count={count})')
+    return lines
+
+LINES = [
+    '*** ChampSim Multicore Out-of-Order Simulator ***',
+    '[FAULT] new fault 0 mode=CELL chip=3',
+    '[FAULT] birth fault 1 mode=BANK chip=7 colocated->bank_key=0x2a',
+    '[FAULT] manifest fault 0 mode=CELL cl=0x1f2a40 bank_key=0x12 row=118 (anchor)',
+    *record_error(0x1f2a48, count=1),
+    '[ERR_LAT] begin emulate_ptw cpu=0 paddr=0x1f2a48 hint_vaddr=none',
+    '[ERR_LAT][CYCLE][DYNAMIC][FIRST] type=LOAD addr=0x1f2a48 cpu=0 latency=412 cycles',
+    'Heartbeat CPU 0 instructions: 10000002 cycles: 8000000 heartbeat IPC: 1.25 cumulative IPC: 1.25 (Simulation time: 00 hr 00 min 10 sec)',
+    '[FAULT] sticky CE fault 1 mode=BANK cl=0x1f2080 bank_key=0x2a row=9',
+    *record_error(0x1f2a48),
+    *record_error(0x1f2080, count=2),
+    '[ERR_LAT][CYCLE][RETIRED] addr=0x1f2080 cpu=1 latency=1000000 cycles',
+    '[ERR_LAT][CYCLE][NO_PINNING][RETIRED] type=TRANSLATION addr=0x3000 cpu=0 latency=5000 cycles',
+    '[ERR_LAT][CYCLE][CARE][BCH] addr=0x4000 cpu=0 latency=20 cycles',
+    '[ERROR_REC]   RETIRE page=0x5000:',
+    '[BASELINE_RETIRE] page=0x5000 retired (threshold=4) pa=0x5040',
+    'Heartbeat CPU 0 instructions: 20000002 cycles: 16000000 heartbeat IPC: 1.25 cumulative IPC: 1.25 (Simulation time: 00 hr 00 min 20 sec)',
+    '[FAULT] manifest fault 0 mode=CELL cl=0x1f2a40 bank_key=0x12 row=118 (widened)',
+]
+OUTPUT = ''.join(line + '\n' for line in LINES).encode()
+
+@unittest.skipUnless(HAVE_PYARROW, 'pyarrow is not installed')
+class ParseTests(unittest.TestCase):
+    def setUp(self):
+        self.tables = {name: table.to_pylist() for name, table in events.parse_events(OUTPUT).items()}
+
+    def test_errors(self):
+        errors = self.tables['errors']
+        self.assertEqual([e['outcome'] for e in errors], ['FIRST_ERROR', 'ALREADY_KNOWN', 'PAGE_RETIRED'])
+        self.assertEqual(errors[0]['pa'], 0x1f2a48)
+        self.assertEqual((errors[0]['page'], errors[0]['cl']), (0x1f2000, 0x1f2a40))
+        self.assertEqual((errors[2]['count_before'], errors[2]['count_after'], errors[2]['threshold']), (1, 2, 2))
+        self.assertIsNone(errors[1]['count_after'])
+        self.assertEqual([e['heartbeat'] for e in errors], [0, 1, 1])
+        self.assertEqual(OUTPUT[errors[1]['offset']:].split(b'\n', 1)[0], b'[ERROR_REC] ---- record_error(pa=0x1f2a48) ----')
+
+    def test_retirements(self):
+        self.assertEqual([r['page'] for r in self.tables['retirements']], [0x1f2000, 0x5000])
+        self.assertEqual(self.tables['baseline_retirements'][0]['threshold'], 4)
+        self.assertEqual(self.tables['baseline_retirements'][0]['pa'], 0x5040)
+        self.assertEqual(self.tables['fault_kills'][0]['mode'], 'ROW')
+
+    def test_faults(self):
+        faults = self.tables['faults']
+        self.assertEqual([(f['fault'], f['mode'], f['chip']) for f in faults], [(0, 'CELL', 3), (1, 'BANK', 7)])
+        self.assertEqual([f['colocated_bank_key'] for f in faults], [None, 0x2a])
+        manifests = self.tables['manifests']
+        self.assertEqual([(m['sticky'], m['anchor'], m['widened']) for m in manifests],
+                         [(False, True, False), (True, False, False), (False, False, True)])
+        self.assertEqual((manifests[1]['bank_key'], manifests[1]['row']), (0x2a, 9))
+        self.assertEqual([m['heartbeat'] for m in manifests], [0, 1, 2])
+
+    def test_latencies(self):
+        latencies = [(l['path'], l['outcome'], l['access_type'], l['cpu'], l['latency']) for l in self.tables['latencies']]
+        self.assertEqual(latencies, [('DYNAMIC', 'FIRST', 'LOAD', 0, 412), ('RETIRED', None, None, 1, 1000000),
+                                     ('NO_PINNING', 'RETIRED', 'TRANSLATION', 0, 5000), ('CARE', 'BCH', None, 0, 20)])
+
+@unittest.skipUnless(HAVE_PYARROW, 'pyarrow is not installed')
+class ExtractTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.dtemp.name, 'pin_on_1e-5_605.mcf_s-665B.txt')
+        with open(self.output, 'wb') as wfp:
+            wfp.write(OUTPUT * 50)
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def test_blocks_and_row_groups(self):
+        out = os.path.join(self.dtemp.name, 'events')
+        # Blocks of a few lines, and row groups smaller than a block, must give the tables of one pass
+        counts = events.extract_events(self.output, out, block_size=400, row_group_size=7)
+        self.assertEqual(counts['errors'], 150)
+        self.assertEqual(counts['latencies'], 200)
+        errors = events.load_events(out, 'errors')
+        expected = events.parse_events(OUTPUT * 50)['errors']
+        self.assertEqual(errors.to_pylist(), expected.to_pylist())
+        self.assertGreater(events.pq.ParquetFile(os.path.join(out, 'errors.parquet')).num_row_groups, 10)
+        self.assertEqual(events.load_events(out, 'manifests', columns=['row']).column_names, ['row'])
+
+    def test_empty_tables(self):
+        out = os.path.join(self.dtemp.name, 'events')
+        with open(self.output, 'wb') as wfp:
+            wfp.write(b'Heartbeat CPU 0 instructions: 1\n')
+        events.extract_events(self.output, out)
+        self.assertEqual(events.load_events(out, 'faults').schema, events.SCHEMAS['faults'])
+        self.assertEqual(events.load_events(out, 'faults').num_rows, 0)
+
+    def test_suppressed_events(self):
+        import io
+        from simtools.runner import capture
+        lines = [b'[ERR_LAT][CYCLE][RETIRED] addr=0x1f2080 cpu=0 latency=%d cycles\n' % i for i in range(250)]
+        lines += [b'CPU 0 panic: IPC 0.001 < 0.01 at cycle %d\n' % i for i in range(250)]
+        capture.capture(io.BytesIO(b''.join(lines)), self.output, max_repeats=100)
+        counts = events.extract_events(self.output, os.path.join(self.dtemp.name, 'events'))
+        # The panic lines a note stands for are not events
+        self.assertEqual((counts['latencies'], counts['suppressed']), (100, 150))
+
+    @unittest.skipUnless(shutil.which('zstd'), 'zstd is not installed')
+    def test_zstd_stream(self):
+        import subprocess
+        subprocess.run(['zstd', '-q', self.output, '-o', self.output + '.zst'], check=True)
+        with open(self.output, 'wb') as wfp:
+            wfp.write(b'')
+        out = os.path.join(self.dtemp.name, 'events')
+        self.assertEqual(events.extract_events(self.output, out)['manifests'], 150)
@@ -0,0 +1,71 @@
+import unittest
+import importlib.util
+import tempfile
+import os
+
+HAVE_PANDAS = all(importlib.util.find_spec(name) is not None for name in ('pandas', 'pyarrow'))
+HAVE_OPENPYXL = importlib.util.find_spec('openpyxl') is not None
+
+if HAVE_PANDAS:
+    import pandas as pd
+    import simtools.results.export as export
+
+def table(n):
+    return pd.DataFrame({'workload': [f'6{i:02d}.w_s' for i in range(n)],
+                         'ipc': [1.0 / (i + 1) if i % 3 else None for i in range(n)],
+                         'pages_retired': pd.array([i if i % 2 else None for i in range(n)], dtype='Int64'),
+                         'completed': [i % 3 != 0 for i in range(n)]})
+
+@unittest.skipUnless(HAVE_PANDAS, 'pandas or pyarrow is not installed')
+class ParquetTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def test_round_trip(self):
+        tables = {'Threshold sweep': table(5), 'Way sweep in No error': table(0)}
+        paths = export.write_parquet(tables, self.dtemp.name)
+        self.assertEqual([os.path.basename(p) for p in paths], ['threshold_sweep.parquet', 'way_sweep_in_no_error.parquet'])
+        back = export.load_table(self.dtemp.name, 'Threshold sweep')
+        pd.testing.assert_frame_equal(back, tables['Threshold sweep'], check_dtype=False)
+        self.assertEqual(str(back['pages_retired'].dtype), 'Int64')
+        self.assertEqual(len(export.load_table(self.dtemp.name, 'Way sweep in No error', columns=['ipc']).columns), 1)
+        self.assertEqual(sorted(os.listdir(self.dtemp.name)), ['threshold_sweep.parquet', 'way_sweep_in_no_error.parquet'])
+
+    def test_build_tables_in_order(self):
+        tables = export.build_tables(table, [3, 1, 2], jobs=2)
+        self.assertEqual([len(t) for t in tables], [3, 1, 2])
+
+@unittest.skipUnless(HAVE_PANDAS and HAVE_OPENPYXL, 'pandas, pyarrow or openpyxl is not installed')
+class WorkbookTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dtemp.name, 'raw.xlsx')
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def test_streamed_sheet(self):
+        import openpyxl
+        wb = export.open_workbook()
+        # Chunks smaller than the table must stream the same rows
+        export.write_sheet(wb, 'A sheet whose name is longer than Excel allows', table(7),
+                           formats={'ipc': '0.0000'}, widths={'workload': 40}, chunk=3)
+        export.save_workbook(wb, self.path)
+        self.assertEqual(os.listdir(self.dtemp.name), ['raw.xlsx'])
+
+        ws = openpyxl.load_workbook(self.path).active
+        self.assertEqual(ws.title, 'A sheet whose name is longer th')
+        rows = list(ws.values)
+        self.assertEqual(rows[0], ('workload', 'ipc', 'pages_retired', 'completed'))
+        self.assertEqual(len(rows), 8)
+        self.assertEqual(rows[1], ('600.w_s', None, None, False))
+        self.assertEqual(rows[2], ('601.w_s', 0.5, 1, True))
+        self.assertTrue(ws['A1'].font.b)
+        self.assertEqual(ws['B3'].number_format, '0.0000')
+        self.assertEqual(ws['C3'].number_format, 'General')
+        self.assertEqual(ws.column_dimensions['A'].width, 40)
+        self.assertEqual(ws.column_dimensions['C'].width, 15)
+        self.assertEqual((ws.freeze_panes, ws.auto_filter.ref), ('A2', 'A1:D8'))
@@ -0,0 +1,101 @@
+import unittest
+import importlib.util
+import tempfile
+import math
+import os
+
+import simtools.results.parallel as parallel
+
+HAVE_PANDAS = importlib.util.find_spec('pandas') is not None
+HAVE_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+if HAVE_PANDAS:
+    import simtools.results.frame as frame
+
+def run(trace, rate, ipc, pinning=True, evictions=None, error=None):
+    values = {} if error else {'ipc': {0: ipc, 1: ipc / 2}, 'instructions': {0: 1000}, 'page_size': 4096}
+    if evictions is not None:
+        values['err_way_evictions'] = evictions
+    return ({'experiment': 'err_sweep', 'rate': rate, 'pinning': pinning, 'trace': trace},
+            parallel.Parsed(f'{trace}_{rate}.txt', values, error))
+
+RUNS = [
+    run('605.mcf_s-994B.champsimtrace.xz', '1e-9', 1.0, evictions=0),
+    run('605.mcf_s-994B.champsimtrace.xz', '1e-8', 0.8, evictions=4),
+    run('620.omnetpp_s-141B.champsimtrace.xz', '1e-9', 2.0, evictions=1),
+    run('620.omnetpp_s-141B.champsimtrace.xz', '1e-8', 0.5, pinning=False),
+    run('bfs.trace.gz', '1e-10', 4.0),
+    run('bfs.trace.gz', '1e-8', 0.0, error='FileNotFoundError: gone'),
+]
+
+@unittest.skipUnless(HAVE_PANDAS, 'pandas is not installed')
+class ResultsFrameTests(unittest.TestCase):
+    def setUp(self):
+        self.frame = frame.ResultsFrame.from_parsed(RUNS)
+
+    def test_columns(self):
+        self.assertEqual(len(self.frame), 6)
+        self.assertEqual(self.frame.axes, ['experiment', 'rate', 'pinning'])
+        self.assertEqual(list(self.frame['workload'][:3]), ['605.mcf_s', '605.mcf_s', '620.omnetpp_s'])
+        self.assertEqual(str(self.frame['instructions'].dtype), 'Int64')
+        self.assertEqual(str(self.frame['ipc'].dtype), 'float64')
+        self.assertTrue(math.isnan(self.frame['ipc'][5]))
+        self.assertEqual(self.frame['error'][5], 'FileNotFoundError: gone')
+        self.assertIn('err_way_evictions', self.frame.metrics)
+
+    def test_categories(self):
+        self.assertEqual(self.frame['workload'].dtype.name, 'category')
+        self.assertEqual(list(self.frame['rate'].cat.categories), ['1e-10', '1e-9', '1e-8'])
+
+    def test_per_cpu(self):
+        second = frame.ResultsFrame.from_parsed(RUNS, metrics=('ipc',), cpu=1)
+        self.assertEqual(second.metrics, ['ipc'])
+        self.assertEqual(second['ipc'][0], 0.5)
+
+    def test_select(self):
+        self.assertEqual(len(self.frame.select(rate='1e-8')), 3)
+        self.assertEqual(len(self.frame.select(rate=['1e-9', '1e-10'], pinning=True)), 3)
+        self.assertEqual(len(self.frame.select(ipc=lambda c: c > 0.9)), 3)
+        self.assertEqual(len(self.frame.ok()), 5)
+
+    def test_group(self):
+        means = self.frame.group('rate', 'ipc')
+        self.assertEqual(list(means.index), ['1e-10', '1e-9', '1e-8'])
+        self.assertAlmostEqual(means['1e-9'], 1.5)
+        self.assertAlmostEqual(self.frame.group('rate', 'ipc', agg='gmean')['1e-9'], math.sqrt(2.0))
+        self.assertAlmostEqual(self.frame.group('rate', 'ipc', agg='gmean')['1e-8'], math.sqrt(0.4))
+        sums = self.frame.group(['rate', 'pinning'], ['err_way_evictions'], agg='sum')
+        self.assertEqual(sums.loc[('1e-8', True), 'err_way_evictions'], 4)
+
+    def test_pivot(self):
+        table = self.frame.pivot('workload', 'rate', 'ipc')
+        self.assertEqual(list(table.columns), ['1e-10', '1e-9', '1e-8'])
+        self.assertEqual(table.loc['620.omnetpp_s', '1e-8'], 0.5)
+        self.assertTrue(math.isnan(table.loc['605.mcf_s', '1e-10']))
+
+    def test_normalized(self):
+        baseline = self.frame.select(rate='1e-9')
+        relative = self.frame.normalized('ipc', baseline)
+        self.assertEqual(list(relative[:4]), [1.0, 0.8, 1.0, 0.25])
+        self.assertTrue(math.isnan(relative[4]))
+
+    def test_concat(self):
+        other = frame.ResultsFrame.from_parsed([run('bfs.trace.gz', '1e-5', 3.0)])
+        both = frame.ResultsFrame.concat([self.frame, other])
+        self.assertEqual(len(both), 7)
+        self.assertEqual(list(both['rate'].cat.categories), ['1e-10', '1e-9', '1e-8', '1e-5'])
+
+    def test_empty(self):
+        empty = frame.ResultsFrame.from_parsed([])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(len(empty.select()), 0)
+
+    @unittest.skipUnless(HAVE_PYARROW, 'pyarrow is not installed')
+    def test_parquet(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            path = os.path.join(dtemp, 'runs.parquet')
+            self.frame.to_parquet(path)
+            back = frame.ResultsFrame.read_parquet(path)
+        self.assertEqual(list(back['rate'].cat.categories), ['1e-10', '1e-9', '1e-8'])
+        self.assertEqual(str(back['instructions'].dtype), 'Int64')
+        self.assertEqual(list(back['workload']), list(self.frame['workload']))
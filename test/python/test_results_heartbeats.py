@@ -0,0 +1,113 @@
+import unittest
+from unittest import mock
+import importlib.util
+import tempfile
+import math
+import os
+
+HAVE_NUMPY = importlib.util.find_spec('numpy') is not None
+HAVE_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+if HAVE_NUMPY:
+    import numpy as np
+    import simtools.results.heartbeats as heartbeats
+
+def beat(cpu, instructions, cycles, ipc, cumulative, seconds, errors=None):
+    total_errors = '' if errors is None else f' total_errors: {errors}'
+    return (f'Heartbeat CPU {cpu} instructions: {instructions} cycles: {cycles} heartbeat IPC: {ipc} cumulative IPC: {cumulative}'
+            f'{total_errors} (Simulation time: {seconds // 3600:02} hr {seconds // 60 % 60:02} min {seconds % 60:02} sec)\n')
+
+OUTPUT = ''.join((
+    '*** ChampSim Multicore Out-of-Order Simulator ***\n',
+    beat(0, 10000002, 8000000, 1.25, 1.25, 10),
+    beat(1, 10000001, 9000000, 1.111, 1.111, 10),
+    'Warmup finished CPU 0 instructions: 20000000 cycles: 16000000 cumulative IPC: 1.25 (Simulation time: 00 hr 00 min 20 sec)\n',
+    'Warmup complete CPU 0 instructions: 20000000 cycles: 16000000 cumulative IPC: 1.25 (Simulation time: 00 hr 00 min 20 sec)\n',
+    beat(0, 30000002, 24000000, 1.25, 1.25, 40, errors=0),
+    beat(1, 30000001, 27000000, 1.111, 1.111, 45, errors=1),
+    beat(0, 40000002, 44000000, 0.5, 0.8333, 3661, errors=7),
+))
+
+@unittest.skipUnless(HAVE_NUMPY, 'numpy is not installed')
+class ParseTests(unittest.TestCase):
+    def test_columns(self):
+        beats = heartbeats.parse_heartbeats(OUTPUT.encode())
+        self.assertEqual(len(beats), 5)
+        self.assertEqual(list(beats['cpu']), [0, 1, 0, 1, 0])
+        self.assertEqual(beats['instructions'][4], 40000002)
+        self.assertEqual(beats['ipc'][4], 0.5)
+        self.assertEqual(list(beats['total_errors']), [-1, -1, 0, 1, 7])
+        self.assertEqual(beats['seconds'][4], 3661)
+        self.assertEqual(list(beats['warmup']), [True, True, False, False, False])
+        self.assertEqual(list(beats.cpu(1)['cycles']), [9000000, 27000000])
+
+    def test_without_warmup(self):
+        beats = heartbeats.parse_heartbeats(beat(0, 10, 10, 1.0, 1.0, 1).encode())
+        self.assertEqual(list(beats['warmup']), [False])
+        self.assertEqual(len(heartbeats.parse_heartbeats(b'nothing here\n')), 0)
+
+@unittest.skipUnless(HAVE_NUMPY, 'numpy is not installed')
+class TableTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.paths = [self.write('a.txt', OUTPUT), self.write('b.txt', beat(0, 10000000, 5000000, 2.0, 2.0, 5)),
+                      self.write('empty.txt', '')]
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.dtemp.name, name)
+        with open(path, 'w') as wfp:
+            wfp.write(text)
+        return path
+
+    def test_matrix(self):
+        table, errors = heartbeats.extract(self.paths + [os.path.join(self.dtemp.name, 'gone.txt')])
+        self.assertEqual(list(errors), [os.path.join(self.dtemp.name, 'gone.txt')])
+        self.assertEqual(len(table), 3)
+        ipc = table.matrix('ipc', cpu=0)
+        self.assertEqual(ipc.shape, (3, 3))
+        self.assertEqual(list(ipc[0]), [1.25, 1.25, 0.5])
+        self.assertEqual(ipc[1, 0], 2.0)
+        self.assertTrue(np.isnan(ipc[1, 1:]).all() and np.isnan(ipc[2]).all())
+        self.assertEqual(list(table.matrix('instructions', cpu=1, warmup=False)[0, :1]), [30000001])
+
+    def test_kips(self):
+        table, _ = heartbeats.extract(self.paths)
+        kips = table.matrix('kips', cpu=0)
+        self.assertAlmostEqual(kips[0, 0], 10000.002 / 10)
+        self.assertAlmostEqual(kips[0, 1], 20000.0 / 30)
+        self.assertAlmostEqual(kips[0, 2], 10000.0 / 3621)
+        self.assertAlmostEqual(table.matrix('kips', cpu=1)[0, 1], 20000.0 / 35)
+
+    def test_resample(self):
+        table, _ = heartbeats.extract(self.paths)
+        cycles = table.resample('cycles', [20000002, 35000002, 50000000])
+        self.assertEqual(cycles[0, 0], 16000000)
+        self.assertEqual(cycles[0, 1], 34000000)
+        self.assertTrue(math.isnan(cycles[0, 2]))
+        self.assertTrue(np.isnan(cycles[1:]).all())
+
+    def test_npz_is_incremental(self):
+        out = os.path.join(self.dtemp.name, 'beats.npz')
+        heartbeats.extract(self.paths, out)
+        self.write('b.txt', beat(0, 10000000, 4000000, 2.5, 2.5, 5))
+        with mock.patch.object(heartbeats, '_read_chunk', side_effect=heartbeats._read_chunk) as read:
+            heartbeats.extract(self.paths, out)
+        self.assertEqual(read.call_args.args[0], [self.paths[1]])
+        table = heartbeats.load(out)
+        self.assertEqual(table.paths, self.paths)
+        self.assertEqual(table.run(1)['ipc'][0], 2.5)
+        self.assertEqual(list(table.run(0)['warmup']), [True, True, False, False, False])
+
+    @unittest.skipUnless(HAVE_PYARROW, 'pyarrow is not installed')
+    def test_parquet(self):
+        out = os.path.join(self.dtemp.name, 'beats.parquet')
+        table, _ = heartbeats.extract(self.paths, out)
+        back = heartbeats.load(out)
+        self.assertEqual(back.paths, self.paths)
+        self.assertEqual(list(back.offsets), list(table.offsets))
+        for name, column in table.columns.items():
+            self.assertEqual(back.columns[name].dtype, column.dtype)
+            self.assertEqual(list(back.columns[name]), list(column))
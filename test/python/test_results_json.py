@@ -0,0 +1,171 @@
+import unittest
+import tempfile
+import json
+import os
+
+import simtools.results.json_stats as json_stats
+import simtools.results.stats as stats
+
+def document(absorbed=(7, 3), spatial=None, pinning=True):
+    ''' The document of a two-core run, with pinning unless told otherwise, as json_printer writes it. '''
+    model = {
+        'mode': 'CYCLE', 'spatial_model': 'uniform', 'cache_pinning': pinning, 'care_enabled': False,
+        'error_cycle_interval': 1000, 'bit_error_rate': 0.0, 'page_error_rate': 0.0, 'total_error_accesses': 12,
+        'recording': {'retirement_threshold': 4, 'first_errors': 5, 'added_errors': 3, 'retirements': 2, 'already_known': 1,
+                      'lines_invalidated': 64, 'active_pages': 6, 'multi_error_pages': 2},
+        'addresses': {'tracked': 8, 'retired': 4},
+        'baseline': {'retirement_threshold': 32, 'retirements': 0},
+        'cores': [{'absorbed': n, 'first': 0, 'added': 0, 'known': 0, 'retired': 0, 'baseline_retired': 0, 'care_registered': 0,
+                   'care_dropped': 0, 'care_retired': 0, 'care_celog_retired': 0} for n in absorbed],
+        'error_ways': {'LLC': {'sets': 2048, 'ways': 2, 'max_ways': 4, 'total_slots': 4096, 'used_slots': 1024, 'hits': 30,
+                               'fills': 10, 'evictions': 5, 'known_addresses': 8, 'pinned': 6, 'in_normal_way': 1, 'not_in_llc': 1}},
+    }
+    if not pinning:
+        model['error_ways'] = {}
+    if spatial is not None:
+        model['spatial'] = spatial
+    phase = {'name': 'Simulation', 'traces': ['a.xz', 'b.xz'],
+             'roi': {'cores': [{'instructions': 1000, 'cycles': 800}, {'instructions': 500, 'cycles': 1000}],
+                     'LLC': {'LOAD': {'hit': [40, 20], 'miss': [4, 2], 'mshr_merge': [0, 0]}},
+                     'DRAM': [{'RQ ROW_BUFFER_MISS': 10, 'WQ ROW_BUFFER_MISS': 2}, {'RQ ROW_BUFFER_MISS': 5, 'WQ ROW_BUFFER_MISS': 0}]},
+             'sim': {},
+             'error_model': model}
+    return [{'name': 'Warmup', 'roi': {}, 'sim': {}, 'error_model': {}}, phase]
+
+# The same run, as the text output prints it
+TEXT_OUTPUT = '''=== ERROR PAGE STATISTICS ===
+Total Error Accesses: 12
+==============================
+Simulation finished CPU 1 instructions: 500 cycles: 1000 cumulative IPC: 0.5 (Simulation time: 00 hr 00 min 01 sec)
+Simulation complete CPU 0 instructions: 1000 cycles: 800 cumulative IPC: 1.25 (Simulation time: 00 hr 00 min 01 sec)
+Simulation complete CPU 1 instructions: 500 cycles: 1000 cumulative IPC: 0.5 (Simulation time: 00 hr 00 min 01 sec)
+
+ChampSim completed all CPUs
+
+Region of Interest Statistics
+
+CPU 0 cumulative IPC: 1.25 instructions: 1000 cycles: 800
+CPU 1 cumulative IPC: 0.5 instructions: 500 cycles: 1000
+
+[LLC]   Allocated Error Ways per Set:    2
+[LLC]   Max Error Ways per Set:          4
+[LLC]   Total Error Way Slots:           4096 (= 2048 Sets x 2 Ways)
+[LLC]   Used Slots:                      1024 (25.00%)
+[LLC]   Unused Slots:                    3072 (75.00%)
+[LLC]   Error Way Hits:                  30
+[LLC]   Error Way Fills (from DRAM):     10
+[LLC]   Error Way Hit Rate:              75.00%
+[LLC]   Error Way Evictions (LRU):       5
+[LLC]   Total Known Error Addresses:     8
+[LLC]   Pinned in Error Way:             6 (75.00%)
+[LLC]   In Normal Way (unprotected):     1
+[LLC]   Not in LLC (DRAM exposed):       1
+[ERROR]   Retirement Threshold:           4
+[ERROR]   Total DRAM Error Events:        11
+[ERROR]     New Error Recordings:         8
+[ERROR]       First Error (per page):     5
+[ERROR]       Additional Errors:          3
+[ERROR]     Page Retirements (4th err): 2
+[ERROR]     Already Known:                1
+[ERROR]   Active Pages (tracked):         6
+[ERROR]     Single-error pages:           4
+[ERROR]     Multi-error pages:            2
+[ERROR]   Pages Retired:                  2
+[ERROR]   Cache Lines Invalidated:        64
+[ERROR]   CPU 0: absorbed=7 first=0 added=0 known=0 retired=0 baseline_retired=0
+[ERROR]   CPU 1: absorbed=3 first=0 added=0 known=0 retired=0 baseline_retired=0
+'''
+
+# The run with pinning OFF, which prints the Baseline Protection Coverage block in place of the error ways
+PIN_OFF_TEXT_OUTPUT = TEXT_OUTPUT[:TEXT_OUTPUT.index('[LLC]')] + '''[LLC] ========== Baseline Protection Coverage ==========
+[LLC]   Total Known Error Addresses:    12
+[LLC]   Retired (page offline):         4 (33.33%)
+[LLC]   Live (still tracked):           8
+[LLC] ==================================================
+''' + TEXT_OUTPUT[TEXT_OUTPUT.index('[ERROR]   Retirement'):]
+
+class LoadJsonTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def write(self, name, doc):
+        path = os.path.join(self.dtemp.name, name)
+        with open(path, 'w') as wfp:
+            if isinstance(doc, str):
+                wfp.write(doc)
+            else:
+                json.dump(doc, wfp)
+        return path
+
+    def test_fields(self):
+        values = json_stats.load_json(self.write('run.json', document()))
+        self.assertEqual(values['ipc'], {0: 1.25, 1: 0.5})
+        self.assertEqual(values['errors_absorbed'], {0: 7, 1: 3})
+        self.assertEqual(values['llc_load_hit'], {0: 40, 1: 20})
+        self.assertEqual(values['row_buffer_misses'], 17)
+        self.assertEqual(values['mode'], 'CYCLE')
+        self.assertIs(values['cache_pinning'], True)
+        self.assertEqual(values['total_known_errors'], 8)
+        self.assertNotIn('pin_off_retired_count', values)
+        self.assertNotIn('faults_created_cell', values)
+
+    def test_pinning_off(self):
+        values = json_stats.load_json(self.write('run.json', document(pinning=False)))
+        self.assertEqual((values['pin_off_retired_count'], values['pin_off_live_count'], values['total_known_errors']), (4, 8, 12))
+        self.assertAlmostEqual(values['pin_off_retired_pct'], 100 / 3)
+        self.assertNotIn('pinned_pct', values)
+
+    def test_same_as_text(self):
+        ''' The error-model fields of either output are those of the other, with the same values. '''
+        for pinning, output in ((True, TEXT_OUTPUT), (False, PIN_OFF_TEXT_OUTPUT)):
+            values = json_stats.load_json(self.write('run.json', document(pinning=pinning)))
+            text = stats.parse_text(output)
+            for name in ('total_known_errors', 'pinned_count', 'pinned_pct', 'pin_off_retired_count', 'pin_off_retired_pct',
+                         'pin_off_live_count'):
+                with self.subTest(pinning=pinning, field=name):
+                    self.assertEqual(name in values, name in text)
+            shared = set(values) & set(text)
+            self.assertGreater(len(shared), 20)
+            for field in shared:
+                with self.subTest(pinning=pinning, field=field):
+                    if isinstance(text[field], float):
+                        self.assertAlmostEqual(values[field], text[field], places=2)
+                    else:
+                        self.assertEqual(values[field], text[field])
+
+    def test_spatial(self):
+        spatial = {'faults_created': {'cell': 3, 'row': 2, 'bank': 1}, 'distinct_banks': 4}
+        values = json_stats.load_json(self.write('run.json', document(spatial=spatial)))
+        self.assertEqual((values['faults_created_cell'], values['faults_created_bank']), (3, 1))
+        self.assertEqual(values['distinct_banks'], 4)
+
+    def test_empty_document(self):
+        self.assertEqual(json_stats.load_json(self.write('run.json', [])), {})
+
+    def test_load_dir(self):
+        self.write('b.json', document(absorbed=(1, 2)))
+        self.write('a.json', document())
+        self.write('c.json', '[{"name": "Warm')
+        self.write('a.txt', TEXT_OUTPUT)
+        table = json_stats.load_dir(self.dtemp.name)
+        self.assertEqual([os.path.basename(p) for p in table.paths], ['a.json', 'b.json', 'c.json'])
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table['errors_absorbed'][:2], [{0: 7, 1: 3}, {0: 1, 1: 2}])
+        self.assertIsNone(table['err_way_hits'][2])
+        self.assertEqual(table.errors[:2], [None, None])
+        self.assertTrue(table.errors[2].startswith('JSONDecodeError'))
+        self.assertEqual(table.row(0), json_stats.load_json(table.paths[0]))
+        self.assertEqual(set(table.columns), set(json_stats.SCHEMA))
+
+    def test_load_dir_match(self):
+        self.write('a.json', document())
+        self.write('b.json', document())
+        table = json_stats.load_dir(self.dtemp.name, match=lambda name: name.startswith('b'))
+        self.assertEqual([os.path.basename(p) for p in table.paths], ['b.json'])
+        self.assertEqual(len(json_stats.load_dir(os.path.join(self.dtemp.name, 'missing'))), 0)
+
+    def test_json_path(self):
+        self.assertEqual(json_stats.json_path('results/e/pin_on_1e-5_mcf.txt'), 'results/e/pin_on_1e-5_mcf.json')
@@ -0,0 +1,88 @@
+import unittest
+import importlib.util
+import math
+
+import simtools.results.parallel as parallel
+import simtools.results.stats as stats
+
+HAVE_PANDAS = importlib.util.find_spec('pandas') is not None
+
+if HAVE_PANDAS:
+    import simtools.results.multicore as multicore
+
+TRACES = ('/traces/605.mcf_s-665B.champsimtrace.xz', '/traces/623.xalancbmk_s-10B.champsimtrace.xz',
+          '/traces/bfs_twitter.trace.gz')
+
+def output(ipcs, complete=None, absorbed=()):
+    ''' The ROI statistics of a multicore run, as plain_printer.cc and cache.cc print them. '''
+    complete = range(len(ipcs)) if complete is None else complete
+    lines = [f'Simulation complete CPU {cpu} instructions: 1000 cycles: 1000 cumulative IPC: 1 (Simulation time: 00 hr 00 min 0{cpu} sec)'
+             for cpu in complete]
+    lines += [f'[ERROR]   CPU {cpu}: absorbed={n} first={n} added=0 known=0 retired=0 baseline_retired=0' for cpu, n in absorbed]
+    lines += ['=== Simulation ===', *(f'CPU {cpu} runs {TRACES[cpu % len(TRACES)]}' for cpu in range(len(ipcs)))]
+    for cpu, ipc in enumerate(ipcs):
+        lines.append(f'CPU {cpu} cumulative IPC: {ipc} instructions: 2000 cycles: {int(2000 / ipc)}')
+        lines.append(f'cpu{cpu}->LLC TOTAL        ACCESS:        100  HIT:         60  MISS:         {10 * (cpu + 1)}')
+    return '\n'.join(lines) + '\n'
+
+def run(mix, scheme, ipcs, **kwargs):
+    return {'mix': mix, 'scheme': scheme}, parallel.Parsed(f'{mix}_{scheme}.txt', stats.parse_text(output(ipcs, **kwargs)))
+
+@unittest.skipUnless(HAVE_PANDAS, 'pandas is not installed')
+class PerCpuTests(unittest.TestCase):
+    def test_rows(self):
+        cores = multicore.per_cpu([run('M1', 'noerr', [1.0, 2.0, 0.5, 1.0]), run('M1', 'pin_1e-7', [0.5, 2.0, 0.25, 1.0],
+                                                                                  absorbed=[(2, 7)])])
+        self.assertEqual(len(cores), 8)
+        self.assertEqual(list(cores['run']), [0] * 4 + [1] * 4)
+        self.assertEqual(list(cores['cpu'][:4]), [0, 1, 2, 3])
+        self.assertEqual(list(cores['workload'][:4]), ['605.mcf_s', '623.xalancbmk_s', 'bfs_twitter.trace.gz', '605.mcf_s'])
+        self.assertEqual(cores['trace'][1], '623.xalancbmk_s-10B.champsimtrace.xz')
+        self.assertEqual(cores['llc_mpki'][1], 10.0)
+        self.assertEqual(list(cores['errors_absorbed'][4:].fillna(0)), [0, 0, 7, 0])
+        self.assertEqual(str(cores['instructions'].dtype), 'Int64')
+        self.assertTrue(cores['completed'].all())
+
+    def test_any_core_count(self):
+        cores = multicore.per_cpu([run('E1', 'noerr', [1.0] * 8, complete=range(7)), run('S', 'noerr', [2.0])])
+        self.assertEqual(list(cores.groupby('run').size()), [8, 1])
+        self.assertEqual(list(cores['complete'][6:8]), [True, False])
+        self.assertEqual(list(cores['completed']), [False] * 8 + [True])
+
+    def test_failed_runs_have_no_rows(self):
+        cores = multicore.per_cpu([({'mix': 'M1'}, parallel.Parsed('gone.txt', {}, 'FileNotFoundError: gone'))])
+        self.assertEqual(len(cores), 0)
+
+@unittest.skipUnless(HAVE_PANDAS, 'pandas is not installed')
+class SpeedupTests(unittest.TestCase):
+    def setUp(self):
+        self.cores = multicore.per_cpu([
+            run('M1', 'noerr', [1.0, 2.0, 0.5, 1.0]),
+            run('M1', 'pin_1e-7', [0.5, 2.0, 0.25, 1.0]),
+            run('M2', 'pin_1e-7', [1.0, 1.0]),
+            run('M1', 'off_1e-7', [1.0, 2.0, 0.5]),
+        ])
+
+    def test_same_mix_reference(self):
+        noerr = self.cores[self.cores['scheme'] == 'noerr']
+        summary = multicore.speedups(self.cores, noerr, on=('mix', 'cpu'))
+        self.assertEqual(list(summary.index), [0, 1, 2, 3])
+        self.assertEqual(summary['weighted_speedup'][0], 4.0)
+        self.assertEqual(summary['weighted_speedup'][1], 3.0)
+        self.assertAlmostEqual(summary['harmonic_speedup'][1], 4 / 6)
+        self.assertEqual(summary['max_slowdown'][1], 2.0)
+        self.assertAlmostEqual(summary['norm_throughput'][1], 3.75 / 4.5)
+        self.assertAlmostEqual(summary['gmean_norm_ipc'][1], 0.5 ** 0.5)
+        # M2 has no reference; the three cores of the last run pair with the first three of M1's
+        self.assertTrue(math.isnan(summary['weighted_speedup'][2]))
+        self.assertEqual(summary['sum_ipc'][2], 2.0)
+        self.assertEqual((summary['cores'][3], summary['weighted_speedup'][3]), (3, 3.0))
+
+    def test_alone_reference(self):
+        # The IPC of each workload alone, from single-core runs
+        alone = multicore.per_cpu([run('S', 'noerr', [2.0]), run('S', 'noerr', [4.0, 1.0, 1.0])])
+        summary = multicore.speedups(self.cores, alone, on=('workload',))
+        # mcf alone at 4.0 (the last run of it), xalancbmk at 1.0 and bfs at 1.0
+        self.assertEqual(summary['weighted_speedup'][0], 0.25 + 2.0 + 0.5 + 0.25)
+        self.assertEqual(summary['max_slowdown'][0], 4.0)
+        self.assertEqual(list(multicore.alone(self.cores, alone, on=('workload',))[:4]), [4.0, 1.0, 1.0, 4.0])
@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+import tempfile
+import os
+import re
+
+import simtools.results.cache as cache
+import simtools.results.parallel as parallel
+
+class ParseManyTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.cache = cache.ResultCache(os.path.join(self.dtemp.name, cache.CACHE_NAME))
+        self.paths = []
+        for i in range(7):
+            path = os.path.join(self.dtemp.name, f'run_{i}.txt')
+            with open(path, 'w') as wfp:
+                wfp.write(f'CPU 0 cumulative IPC: 1.{i} instructions: 1000 cycles: 900\nPage size: {4096 * (i + 1)}\n')
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.cache.close()
+        self.dtemp.cleanup()
+
+    def test_order(self):
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs):
+                results = parallel.parse_many(reversed(self.paths), jobs=jobs, cache=cache.ResultCache(cache.DISABLED))
+                self.assertEqual([r.path for r in results], self.paths[::-1])
+                self.assertEqual([r.values['page_size'] for r in results], [4096 * (i + 1) for i in range(6, -1, -1)])
+
+    def test_chunks(self):
+        results = parallel.parse_many(self.paths, jobs=2, cache=self.cache, chunksize=2)
+        self.assertEqual([r.values['ipc'] for r in results], [{0: float(f'1.{i}')} for i in range(7)])
+
+    def test_errors(self):
+        missing = os.path.join(self.dtemp.name, 'missing.txt')
+        results = parallel.parse_many([self.paths[0], missing, self.dtemp.name], jobs=2, cache=self.cache)
+        self.assertIsNone(results[0].error)
+        self.assertEqual(results[1].values, {})
+        self.assertTrue(results[1].error.startswith('FileNotFoundError'))
+        self.assertIsNotNone(results[2].error)
+        # Only the output that was parsed is cached
+        self.assertEqual(self.cache.entries(), {cache.PARSER_VERSION: 1})
+
+    def test_cached(self):
+        parallel.parse_many(self.paths[:4], jobs=2, cache=self.cache)
+        again = cache.ResultCache(self.cache.path)
+        results = parallel.parse_many(self.paths, jobs=2, cache=again)
+        self.assertEqual((again.hits, again.misses), (4, 3))
+        self.assertEqual(results[5].values['page_size'], 4096 * 6)
+
+    def test_refresh(self):
+        parallel.parse_many(self.paths[:4], jobs=2, cache=self.cache)
+        with open(self.paths[0], 'a') as wfp:
+            wfp.write('CPU 0 cumulative IPC: 9.5 instructions: 1000 cycles: 100\n')
+        again = cache.ResultCache(self.cache.path)
+        # The outputs already cached are not decoded, only the changed and new ones are parsed
+        with mock.patch.object(cache, '_decode', side_effect=cache._decode) as decode:
+            self.assertEqual(parallel.refresh(self.paths, jobs=2, cache=again), 4)
+        decode.assert_not_called()
+        self.assertEqual(parallel.refresh(self.paths, cache=again), 0)
+        results = parallel.parse_many(self.paths, cache=again)
+        self.assertEqual(results[0].values['ipc'], {0: 9.5})
+        self.assertEqual(again.misses, 4)
+
+    def test_parse_dir(self):
+        with open(os.path.join(self.dtemp.name, 'run_log.txt'), 'w'):
+            pass
+        pattern = re.compile(r'^run_(?P<n>[135])\.txt$')
+        results = parallel.parse_dir(self.dtemp.name, pattern.match, jobs=2, cache=self.cache)
+        self.assertEqual([m.group('n') for m, _ in results], ['1', '3', '5'])
+        self.assertEqual([r.values['page_size'] for _, r in results], [8192, 16384, 24576])
+        self.assertEqual(parallel.parse_dir(os.path.join(self.dtemp.name, 'missing'), pattern.match), [])
@@ -0,0 +1,255 @@
+import unittest
+import tempfile
+import os
+
+import simtools.results.stats as stats
+
+# Lines as the simulator prints them (plain_printer.cc, cache.cc, error_page_manager.cc, dram_controller.cc)
+OUTPUT = '''Page size: 4096
+[ERROR_PAGE_MANAGER] Errors per interval: 2
+Heartbeat CPU 0 instructions: 10000000 cycles: 7000000 heartbeat IPC: 1.42 cumulative IPC: 1.41 (Simulation time: 00 hr 01 min 00 sec)
+[DRAM] error access at 0x1234 page 0x1
+Total Error Accesses: 5
+Baseline Page Retirements: 1
+Simulation complete CPU 0 instructions: 1000 cycles: 810 cumulative IPC: 1.23 (Simulation time: 01 hr 02 min 03 sec)
+Total Error Accesses: 7
+Baseline Page Retirements: 3
+
+[LLC]   Used Slots:                      3 (12.50%)
+[LLC]   Error Way Fills (from DRAM):     9
+[LLC]   Total Known Error Addresses:     150
+[ERROR]   Retirement Threshold:           2
+[ERROR]     Page Retirements (2th err): 30
+[ERROR]   Cache Lines Invalidated:        4
+[ERROR]   CPU 1: absorbed=1 first=2 added=3 known=4 retired=5 baseline_retired=6
+
+=== Simulation ===
+CPU 0 runs /traces/605.mcf_s-665B.champsimtrace.xz
+CPU 1 runs /traces/bfs_twitter.trace.gz
+CPU 0 cumulative IPC: 1.234 instructions: 1000 cycles: 810
+CPU 0 Branch Prediction Accuracy: 95.5% MPKI: 3.2 Average ROB Occupancy at Mispredict: 1
+CPU 0 IPC confidence interval: +-0.8% (95% confidence, 12 intervals, converged)
+CPU 1 cumulative IPC: 0.5 instructions: 500 cycles: 1000
+cpu0->LLC TOTAL        ACCESS:        100  HIT:         60  MISS:         40
+cpu0->LLC LOAD         ACCESS:         80  HIT:         50  MISS:         30
+Channel 0 RQ ROW_BUFFER_HIT:         10
+  ROW_BUFFER_MISS:         10
+Channel 0 WQ ROW_BUFFER_HIT:         10
+  ROW_BUFFER_MISS:         15
+'''
+
+# The ETT era: error recording under another tag, bloom filter snapshots
+LEGACY_OUTPUT = '''[ETT]   ETT Entries:                 64
+[ETT]   ETT Entries Used:            12 / 64
+[ETT]   Retirement Threshold:        4
+  Cache Lines Invalidated: 99
+[Snapshot @ 100000000 instr]
+  Valid Entries: 12
+  Avg Occupancy: 18.75%
+  Est. FP Rate: 0.01%
+[Snapshot @ 200000000 instr]
+  Avg Occupancy: 21.00%
+[ETT Eviction Invalidation Detail]
+  Cache Lines Invalidated: 77
+'''
+
+# The order of a complete run: banner, warmup and simulation with debug prints, the error summary and "finished" line of
+# each phase, then the final statistics
+COMPLETE_OUTPUT = '''Page size: 4096
+[ERROR_PAGE_MANAGER] Errors per interval: 2
+Heartbeat CPU 0 instructions: 10000000 cycles: 7000000 heartbeat IPC: 1.42 cumulative IPC: 1.41 (Simulation time: 00 hr 01 min 00 sec)
+[ERROR_PAGE_MANAGER] Errors per interval: 9
+
+=== ERROR PAGE STATISTICS ===
+Total Error Accesses: 1
+==============================
+Warmup finished CPU 0 instructions: 1000 cycles: 900 cumulative IPC: 1.1 (Simulation time: 00 hr 01 min 00 sec)
+  ROW_BUFFER_MISS:       1000
+Simulation CPU 0 panic: IPC 0.001 < 0.01
+
+=== ERROR PAGE STATISTICS ===
+Total Error Accesses: 3
+==============================
+Simulation finished CPU 0 instructions: 2000 cycles: 1800 cumulative IPC: 1.1 (Simulation time: 00 hr 02 min 00 sec)
+Simulation complete CPU 0 instructions: 2000 cycles: 1800 cumulative IPC: 1.1 (Simulation time: 00 hr 02 min 00 sec)
+
+ChampSim completed all CPUs
+
+Region of Interest Statistics
+CPU 0 cumulative IPC: 1.111 instructions: 2000 cycles: 1800
+Channel 0 RQ ROW_BUFFER_HIT:         10
+  ROW_BUFFER_MISS:         10
+Channel 0 WQ ROW_BUFFER_HIT:         10
+  ROW_BUFFER_MISS:         15
+'''
+
+class ScanTests(unittest.TestCase):
+    def test_sections(self):
+        values = stats.parse_text(OUTPUT)
+        self.assertEqual(values['err_way_used'], 3)
+        self.assertEqual(values['err_way_used_pct'], 12.5)
+        self.assertEqual(values['err_way_fills'], 9)
+        self.assertEqual(values['total_known_errors'], 150)
+        self.assertEqual(values['retire_threshold'], 2)
+        self.assertEqual(values['page_retirements'], 30)
+        self.assertEqual(values['lines_invalidated'], 4)
+        self.assertEqual(values['errors_per_interval'], 2)
+
+    def test_line_prefix_is_anchored(self):
+        # "Baseline Page Retirements" is not the [ERROR] "Page Retirements"; heartbeats carry no ROI IPC
+        values = stats.parse_text(OUTPUT)
+        self.assertEqual(values['page_retirements'], 30)
+        self.assertEqual(values['ipc'], {0: 1.234, 1: 0.5})
+
+    def test_per_cpu(self):
+        values = stats.parse_text(OUTPUT)
+        self.assertEqual(values['instructions'], {0: 1000, 1: 500})
+        self.assertEqual(stats.cpu_value(values, 'ipc', 1), 0.5)
+        self.assertEqual(stats.cpu_value(values, 'llc_miss'), 40)
+        self.assertEqual(stats.cpu_value(values, 'llc_load_access'), 80)
+        self.assertEqual(values['errors_absorbed'], {1: 1})
+        self.assertEqual(values['baseline_retired_cpu'], {1: 6})
+        self.assertEqual(values['cpu_trace'], {0: '/traces/605.mcf_s-665B.champsimtrace.xz', 1: '/traces/bfs_twitter.trace.gz'})
+        self.assertIsNone(stats.cpu_value(values, 'errors_absorbed', 0))
+        self.assertEqual(stats.cpu_value(values, 'page_size', 3), 4096)
+
+    def test_aggregates(self):
+        values = stats.parse_text(OUTPUT)
+        self.assertEqual(values['total_error_accesses'], 7)
+        self.assertEqual(values['baseline_page_retirements'], 3)
+        self.assertEqual(values['row_buffer_misses'], 25)
+
+    def test_roi_block_of_multicore_output(self):
+        ''' The whole-simulation block comes first, and the ROI block after it is read. '''
+        text = '''Total Simulation Statistics (not including warmup)
+CPU 0 cumulative IPC: 1.111 instructions: 2000 cycles: 1800
+cpu0->LLC TOTAL        ACCESS:        300  HIT:        200  MISS:        100
+
+Region of Interest Statistics
+CPU 0 cumulative IPC: 1.388 instructions: 1000 cycles: 720
+cpu0->LLC TOTAL        ACCESS:        100  HIT:         60  MISS:         40
+'''
+        values = stats.parse_text(text)
+        self.assertEqual((values['ipc'], values['llc_miss']), ({0: 1.388}, {0: 40}))
+
+    def test_already_known(self):
+        self.assertEqual(stats.parse_text('[ERROR]     Already Known:                1\n')['already_known'], 1)
+        self.assertEqual(stats.parse_text('[ETT]   Already Known (bloom hit):   2\n')['already_known'], 2)
+
+    def test_types(self):
+        values = stats.parse_text(OUTPUT)
+        self.assertEqual(values['branch_accuracy_pct'], {0: 95.5})
+        self.assertEqual(values['ipc_ci_pct'], {0: 0.8})
+        self.assertEqual(values['ci_intervals'], {0: 12})
+        self.assertEqual(values['converged'], {0: True})
+        self.assertEqual(values['complete'], {0: True})
+        self.assertEqual(values['sim_seconds'], {0: 3723})
+
+    def test_first_line(self):
+        self.assertEqual(stats.parse_text(OUTPUT)['page_size'], 4096)
+        self.assertEqual(stats.parse_text('  ROW_BUFFER_MISS: 3\n')['row_buffer_misses'], 3)
+
+    def test_absent_metrics(self):
+        values = stats.parse_text(OUTPUT)
+        self.assertNotIn('err_way_hits', values)
+        self.assertNotIn('panic', values)
+        self.assertEqual(stats.parse_text(''), {})
+
+    def test_legacy_tags(self):
+        values = stats.parse_text(LEGACY_OUTPUT)
+        self.assertEqual(values['ett_entries'], 64)
+        self.assertEqual((values['ett_used'], values['ett_total']), (12, 64))
+        self.assertEqual(values['retire_threshold'], 4)
+
+    def test_blocks(self):
+        values = stats.parse_text(LEGACY_OUTPUT)
+        self.assertEqual(values['bf_avg_occupancy'], 18.75)
+        self.assertEqual(values['bf_fp_rate'], 0.01)
+        self.assertEqual(values['ett_evict_lines_invalidated'], 77)
+        # Outside the block the same line is the plain metric
+        self.assertEqual(values['lines_invalidated'], 99)
+
+    def test_str_and_bytes(self):
+        self.assertEqual(stats.parse_text(OUTPUT), stats.parse_text(OUTPUT.encode()))
+
+class ScannerTests(unittest.TestCase):
+    def test_for_fields(self):
+        scanner = stats.Scanner.for_fields('ipc', 'err_way_fills')
+        self.assertEqual(scanner.scan(OUTPUT), {'ipc': {0: 1.234, 1: 0.5}, 'instructions': {0: 1000, 1: 500}, 'cycles': {0: 810, 1: 1000},
+                                                'err_way_fills': 9})
+
+    def test_only_block_metrics(self):
+        scanner = stats.Scanner([m for m in stats.METRICS if m.after is not None])
+        self.assertEqual(scanner.scan(LEGACY_OUTPUT), {'bf_avg_occupancy': 18.75, 'bf_fp_rate': 0.01, 'ett_evict_lines_invalidated': 77})
+
+    def test_custom_metric(self):
+        scanner = stats.Scanner([stats.Metric(('refreshes',), 'Channel {cpu}', r'REFRESHES ISSUED:\s+(\d+)', aggregate='sum')])
+        values = scanner.scan('Channel 0 REFRESHES ISSUED: 4\nChannel 1 REFRESHES ISSUED: 5\nChannel 0 REFRESHES ISSUED: 6\n')
+        self.assertEqual(values, {'refreshes': {0: 10, 1: 5}})
+
+    def test_unknown_aggregate(self):
+        with self.assertRaises(ValueError):
+            stats.Metric(('x',), '', r'x:\s+(\d+)', aggregate='mean')
+
+    def test_unique_fields(self):
+        fields = [f for m in stats.METRICS for f in m.fields]
+        self.assertEqual(len(fields), len(set(fields)))
+
+class RegionTests(unittest.TestCase):
+    def test_regions(self):
+        values = stats.parse_text(COMPLETE_OUTPUT)
+        # Debug lines in the middle of the run are not read
+        self.assertEqual(values['row_buffer_misses'], 25)
+        self.assertEqual(values['errors_per_interval'], 2)
+        self.assertEqual(values['total_error_accesses'], 3)
+        self.assertEqual(values['page_size'], 4096)
+        self.assertEqual(values['panic'], {0: True})
+        self.assertEqual(values['ipc'], {0: 1.111})
+        self.assertEqual(values['sim_seconds'], {0: 120})
+
+    def test_tail_start(self):
+        data = COMPLETE_OUTPUT.encode()
+        self.assertTrue(data[stats.tail_start(data):].startswith(b'\n=== ERROR PAGE STATISTICS ===\nTotal Error Accesses: 3'))
+        self.assertIsNone(stats.tail_start(OUTPUT.encode()))
+
+    def test_incomplete_output(self):
+        # Without final statistics the whole output is read
+        cut = COMPLETE_OUTPUT[:COMPLETE_OUTPUT.index('Simulation finished')]
+        self.assertEqual(stats.parse_text(cut)['row_buffer_misses'], 1000)
+        self.assertEqual(stats.parse_text(cut), stats.Scanner().scan(cut))
+
+    def test_no_panic(self):
+        values = stats.parse_text(COMPLETE_OUTPUT.replace('Simulation CPU 0 panic', 'Simulation CPU 0 warning'))
+        self.assertNotIn('panic', values)
+        self.assertIsNone(stats.Scanner.for_fields('panic').first_line(b'Heartbeat CPU 0\n'))
+
+    def test_literal(self):
+        self.assertEqual(stats._literal(stats.Metric(('x',), '', r'Est\. FP Rate:\s+(\d+)')), 'Est. FP Rate:')
+        self.assertEqual(stats._literal(stats.Metric(('x',), '', r'Fills?:\s+(\d+)')), 'Fill')
+        self.assertEqual(stats._literal(stats.Metric(('x',), 'cpu{cpu}->LLC', r'TOTAL\s+(\d+)')), 'cpu')
+
+    def test_unknown_region(self):
+        with self.assertRaises(ValueError):
+            stats.Metric(('x',), '', r'x:\s+(\d+)', region='middle')
+
+class ParseFileTests(unittest.TestCase):
+    def test_parse_file(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            path = os.path.join(dtemp, 'out.txt')
+            with open(path, 'w') as wfp:
+                wfp.write(OUTPUT)
+            self.assertEqual(stats.parse_file(path), stats.parse_text(OUTPUT))
+            self.assertEqual(stats.parse_file(path, stats.Scanner.for_fields('page_size')), {'page_size': 4096})
+
+    def test_complete_output(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            path = os.path.join(dtemp, 'out.txt')
+            with open(path, 'w') as wfp:
+                wfp.write(COMPLETE_OUTPUT)
+            self.assertEqual(stats.parse_file(path), stats.parse_text(COMPLETE_OUTPUT))
+
+    def test_empty_file(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            path = os.path.join(dtemp, 'out.txt')
+            open(path, 'w').close()
+            self.assertEqual(stats.parse_file(path), {})
@@ -0,0 +1,129 @@
+import unittest
+import tempfile
+import io
+import os
+import shutil
+import stat
+from unittest import mock
+
+import simtools.runner.capture as capture
+import simtools.runner.jobs
+import simtools.runner.registry as registry
+from simtools.runner.scheduler import Runner
+from simtools.runner.watchdog import JobWatch, WatchdogPolicy
+
+HEARTBEAT = b'Heartbeat CPU 0 instructions: %d cycles: 1 heartbeat IPC: 1 cumulative IPC: 1 total_errors: 0 (Simulation time: 00 hr 01 min 00 sec)\n'
+PANIC = b'CPU 0 panic: IPC 0.001 < 0.01 at cycle %d\n'
+STATS = [b'Simulation complete CPU 0 instructions: 1000 cycles: 1000 cumulative IPC: 1 (Simulation time: 00 hr 50 min 00 sec)\n', b'\n',
+         b'Region of Interest Statistics\n', b'\n', b'CPU 0 cumulative IPC: 1 instructions: 1000 cycles: 1000\n', b'\n',
+         b'[ERROR] ========== Error Recording Statistics ==========\n', b'[ERROR]   Total Errors: 7\n']
+
+def run_lines(n_panic=0, n_debug=0):
+    lines = [HEARTBEAT % 100]
+    lines += [PANIC % i for i in range(n_panic)]
+    lines += [b'[ERROR_REC]   page_base=0x%x  cl_addr=0x%x\n' % (i, i) for i in range(n_debug)]
+    return lines + [HEARTBEAT % 200] + STATS
+
+class CaptureTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.dtemp.name, 'out.txt')
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def test_repeats_are_capped(self):
+        writer = capture.capture(io.BytesIO(b''.join(run_lines(n_panic=2500))), self.output, max_repeats=1000)
+        self.assertEqual(writer.suppressed, 1500)
+        with open(self.output, 'rb') as rfp:
+            text = rfp.read()
+        self.assertEqual(text.count(b' panic: IPC'), 1000 + 2)
+        self.assertIn(b'[capture] suppressed 1000 lines like: CPU 0 panic', text)
+        self.assertIn(b'[capture] suppressed 500 lines like: CPU 0 panic', text)
+
+    def test_watchdog_counts_suppressed_lines(self):
+        lines = [HEARTBEAT % 100] + [PANIC % i for i in range(2500)]
+        capture.capture(io.BytesIO(b''.join(lines)), self.output, max_repeats=100)
+        job = simtools.runner.jobs.Job(job_id='a', experiment='e', binary='b', traces=['t'], output=self.output, warmup=10, sim=100)
+        watch = JobWatch(job, WatchdogPolicy(panic_lines=2500))
+        self.assertEqual(watch.check().state, registry.PANIC)
+        self.assertEqual(watch.panic_run, 2500)
+
+    def test_sections_and_final_stats(self):
+        capture.capture(io.BytesIO(b''.join(run_lines())), self.output)
+        captured = capture.CapturedOutput(self.output)
+        self.assertEqual([s[0] for s in captured.sections()],
+                         ['Heartbeat', 'Heartbeat', 'Simulation complete', capture.ROI, '[ERROR] Error Recording Statistics'])
+        _, offset, _ = captured.sections('[ERROR] Error Recording Statistics')[0]
+        self.assertTrue(captured.read(offset, 10).startswith(b'[ERROR] ='))
+        stats = capture.final_stats(self.output)
+        self.assertTrue(stats.startswith(capture.ROI))
+        self.assertIn('Total Errors: 7', stats)
+
+    def test_final_stats_without_index(self):
+        with open(self.output, 'wb') as wfp:
+            wfp.write(b''.join(run_lines()))
+        self.assertIn('cumulative IPC: 1 instructions: 1000', capture.final_stats(self.output))
+        self.assertEqual(capture.final_stats(os.path.join(self.dtemp.name, 'missing.txt')), '')
+
+    @unittest.skipUnless(shutil.which('zstd'), 'the zstd tool is not installed')
+    def test_zstd_frames(self):
+        lines = run_lines(n_debug=5000)
+        writer = capture.capture(io.BytesIO(b''.join(lines)), self.output, fmt='zstd', max_repeats=None, frame_size=16 << 10)
+        self.assertGreater(len(writer.frames), 2)
+        with open(self.output, 'rb') as rfp:
+            self.assertNotIn(b'[ERROR_REC]', rfp.read())
+
+        captured = capture.CapturedOutput(self.output)
+        full = b''.join(lines)
+        self.assertEqual(captured.read(0), full)
+        self.assertEqual(captured.read(40000, 5000), full[40000:45000])
+        self.assertIn('Total Errors: 7', capture.final_stats(self.output))
+
+    @unittest.skipUnless(capture.zstd_available(), 'neither zstandard nor the zstd tool is installed')
+    def test_zstd_stream_is_not_capped(self):
+        # A hot retired line prints latency lines that differ only in their numbers, with a panic flood after them
+        lat = [b'[ERR_LAT][CYCLE][RETIRED] addr=0x1f2080 cpu=0 latency=%d cycles\n' % (1000 + i) for i in range(2500)]
+        lines = [HEARTBEAT % 100] + lat + [PANIC % i for i in range(2500)] + [HEARTBEAT % 200] + STATS
+        writer = capture.capture(io.BytesIO(b''.join(lines)), self.output, fmt='zstd', max_repeats=1000, frame_size=16 << 10)
+        self.assertEqual(writer.suppressed, 1500)
+
+        captured = capture.CapturedOutput(self.output)
+        stream = captured.read(0)
+        self.assertEqual(stream, b''.join(lines))
+        self.assertEqual(stream.count(b'[ERR_LAT]'), 2500)
+        with open(self.output, 'rb') as rfp:
+            text = rfp.read()
+        self.assertNotIn(b'[ERR_LAT]', text)
+        self.assertEqual(text.count(b' panic: IPC'), 1000 + 2)
+        self.assertIn(b'[capture] suppressed 1000 lines like: CPU 0 panic', text)
+        # The sections point into both files
+        _, offset, text_offset = captured.sections(capture.ROI)[-1]
+        roi = capture.ROI.encode()
+        self.assertEqual(captured.read(offset, len(roi)), roi)
+        self.assertEqual(captured.read_text(text_offset, len(roi)), roi)
+
+class RunnerCaptureTests(unittest.TestCase):
+    def test_runner_captures_output(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            os.makedirs(os.path.join(dtemp, 'bin'))
+            fake = os.path.join(dtemp, 'bin', 'fake')
+            with open(fake, 'w') as wfp:
+                wfp.write('#!/bin/sh\nfor i in $(seq 50); do echo "CPU 0 panic: IPC 0.001 < 0.01 at cycle $i"; done\n'
+                          'echo "Simulation complete CPU 0"\necho\necho "Region of Interest Statistics"\n')
+            os.chmod(fake, os.stat(fake).st_mode | stat.S_IEXEC)
+
+            output = os.path.join(dtemp, 'results', 'fake_t.txt')
+            job = simtools.runner.jobs.Job(job_id='a', experiment='e', binary='fake', traces=['t.xz'], output=output, warmup=None, sim=None)
+            Runner([job], results_root=dtemp, champsim_dir=dtemp, poll_interval=0.05, capture='text', max_repeats=10, log=lambda _: None).run()
+
+            self.assertEqual(registry.JobRegistry(dtemp).state_of('a'), registry.DONE)
+            self.assertTrue(os.path.exists(output + capture.INDEX_SUFFIX))
+            with open(output) as rfp:
+                self.assertIn('suppressed 10 lines', rfp.read())
+            self.assertTrue(capture.final_stats(output).startswith(capture.ROI))
+
+    def test_zstd_capture_needs_a_compressor(self):
+        with tempfile.TemporaryDirectory() as dtemp, mock.patch.object(capture, 'zstd_available', return_value=False):
+            with self.assertRaises(ValueError):
+                Runner([], results_root=dtemp, capture='zstd', log=lambda _: None)
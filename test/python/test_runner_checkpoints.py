@@ -0,0 +1,92 @@
+import unittest
+import tempfile
+import os
+import zlib
+
+import simtools.runner.checkpoints as checkpoints
+import simtools.runner.jobs
+
+def varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7f
+        value >>= 7
+        out.append(byte | 0x80 if value else byte)
+        if not value:
+            return bytes(out)
+
+def signed(value):
+    return varint((value << 1) ^ (value >> 63))
+
+def string(text):
+    return varint(len(text)) + text.encode()
+
+# Builds a checkpoint the way src/checkpoint.cc writes it
+def make_checkpoint(geometry='cache LLC 2048x16\n', warmup=200000000, traces=(('649.fotonik3d_s-10881B.champsimtrace.xz', 200000000),),
+                    sections=(('cpu0', b'\x00' * 10), ('cache LLC', b'\x01' * 100)), build_id=0x0123456789abcdef):
+    body = checkpoints.MAGIC + varint(checkpoints.VERSION) + varint(build_id) + varint(checkpoints.geometry_hash(geometry)) + string(geometry)
+    body += signed(warmup) + varint(len(traces)) + b''.join(string(name) + signed(n) for name, n in traces)
+    body += b''.join(string(name) + varint(len(payload)) + payload for name, payload in sections)
+    return body + zlib.crc32(body).to_bytes(4, 'little')
+
+class CheckpointTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def write(self, name, data, age=0):
+        path = os.path.join(self.dtemp.name, name)
+        with open(path, 'wb') as wfp:
+            wfp.write(data)
+        mtime = 1000000 - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_geometry_hash(self):
+        # FNV-1a 64 of the empty string and of "a"
+        self.assertEqual(checkpoints.geometry_hash(''), 0xcbf29ce484222325)
+        self.assertEqual(checkpoints.geometry_hash('a'), 0xaf63dc4c8601ec8c)
+
+    def test_read(self):
+        ckpt = checkpoints.read_checkpoint(self.write('a.ckpt', make_checkpoint()))
+        self.assertEqual(ckpt['build_id'], '0123456789abcdef')
+        self.assertEqual(ckpt['warmup'], 200000000)
+        self.assertEqual(ckpt['traces'], [('649.fotonik3d_s-10881B.champsimtrace.xz', 200000000)])
+        self.assertEqual(ckpt['sections'], [('cpu0', 10), ('cache LLC', 100)])
+        self.assertEqual(ckpt['geometry_hash'], checkpoints.geometry_hash('cache LLC 2048x16\n'))
+
+    def test_damaged(self):
+        data = bytearray(make_checkpoint())
+        data[20] ^= 0xff
+        with self.assertRaisesRegex(checkpoints.CheckpointError, 'checksum'):
+            checkpoints.read_checkpoint(self.write('a.ckpt', bytes(data)))
+        with self.assertRaisesRegex(checkpoints.CheckpointError, 'not a checkpoint'):
+            checkpoints.read_checkpoint(self.write('b.ckpt', b'CHAMPSIM'))
+
+    def test_garbage(self):
+        newest = self.write('new.ckpt', make_checkpoint(), age=10)
+        superseded = self.write('old.ckpt', make_checkpoint(), age=100)
+        other = self.write('other.ckpt', make_checkpoint(geometry='cache LLC 1024x16\n'), age=100)
+        # The same geometry, built with other modules
+        other_build = self.write('other_build.ckpt', make_checkpoint(build_id=0xff), age=100)
+        damaged = self.write('damaged.ckpt', make_checkpoint()[:-1], age=10)
+        partial = self.write('crashed.ckpt.partial', b'', age=checkpoints.PARTIAL_GRACE + 1)
+        self.write('saving.ckpt.partial', b'')
+
+        garbage, kept = checkpoints.collect_garbage([self.dtemp.name], now=1000000)
+        self.assertEqual({p for p, _ in garbage}, {superseded, damaged, partial})
+        self.assertEqual({c['path'] for c in kept}, {newest, other, other_build})
+
+        garbage, _ = checkpoints.collect_garbage([self.dtemp.name], max_age=50, now=1000000)
+        self.assertIn(other, {p for p, _ in garbage})
+        self.assertNotIn(newest, {p for p, _ in garbage})
+
+    def test_referenced_are_kept(self):
+        superseded = self.write('old.ckpt', make_checkpoint(), age=100)
+        self.write('new.ckpt', make_checkpoint(), age=10)
+        job = simtools.runner.jobs.Job(job_id='e/x', experiment='e', binary='x', traces=['t.xz'], output='x.txt', warmup=None, sim=10,
+                                       args=['--checkpoint-in', superseded])
+        garbage, _ = checkpoints.collect_garbage([self.dtemp.name], max_age=1, keep=checkpoints.referenced([job]), now=1000000)
+        self.assertNotIn(superseded, {p for p, _ in garbage})
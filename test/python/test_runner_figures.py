@@ -0,0 +1,68 @@
+import unittest
+import tempfile
+import os
+
+import simtools.monitor as monitor
+import simtools.runner.figures as figures
+import simtools.runner.jobs
+from simtools.runner.scheduler import Runner
+
+SCRIPT = '''
+import matplotlib.pyplot as plt
+
+INPUTS = [
+    {"experiment": "6_llc_way_sweep", "binary": "sweep_{size}_w{ways}_1e-8", "axes": {"size": ["2MB"], "ways": [1, 2]},
+     "suites": ["SPEC", "GAP"]},
+    {"experiment": "7_no_error_way_sweep", "binary": "noerr_2MB_w16", "workloads": ["mcf"]},
+]
+'''
+
+def make_job(experiment, binary, trace):
+    return simtools.runner.jobs.Job(job_id=f'normal_evaluation/{experiment}/{binary}_{trace}', experiment=f'normal_evaluation/{experiment}',
+                                    binary=binary, traces=[f'/t/{trace}.champsimtrace.xz'], output=f'/r/{binary}_{trace}.txt',
+                                    warmup=10, sim=100)
+
+JOBS = [
+    make_job('6_llc_way_sweep', 'sweep_2MB_w4_1e-8', 'mcf'),
+    make_job('6_llc_way_sweep', 'sweep_2MB_w1_1e-8', 'mcf'),
+    make_job('6_llc_way_sweep_gap', 'sweep_2MB_w2_1e-8', 'bfs'),
+    make_job('7_no_error_way_sweep', 'noerr_2MB_w16', 'gcc'),
+    make_job('7_no_error_way_sweep', 'noerr_2MB_w16', 'mcf'),
+]
+
+class FigureInputTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.script = os.path.join(self.dtemp.name, 'fig99_test.py')
+        with open(self.script, 'w') as wfp:
+            wfp.write(SCRIPT)
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def test_inputs_are_read_without_importing(self):
+        self.assertEqual(figures.find_figure('fig99', self.dtemp.name), self.script)
+        self.assertEqual(list(figures.declared_figures(self.dtemp.name)), ['fig99'])
+        self.assertEqual(len(figures.read_inputs(self.script)), 2)
+
+    def test_resolve(self):
+        jobs, unmatched = figures.resolve(figures.read_inputs(self.script), JOBS)
+        self.assertEqual([j.job_id for j in jobs], [JOBS[1].job_id, JOBS[2].job_id, JOBS[4].job_id])
+        self.assertEqual(unmatched, ['normal_evaluation/6_llc_way_sweep/sweep_2MB_w2_1e-8', 'normal_evaluation/6_llc_way_sweep_gap/sweep_2MB_w1_1e-8'])
+
+    def test_runner_starts_prioritized_jobs_first(self):
+        figures.write_priorities(self.dtemp.name, [('fig13', [JOBS[3].job_id]), ('fig11', [JOBS[2].job_id, JOBS[3].job_id])])
+        runner = Runner(JOBS, results_root=self.dtemp.name, log=lambda _: None)
+        queue = list(JOBS)
+        order = [runner.next_batch(queue)[0].job_id for _ in range(3)]
+        self.assertEqual(order, [JOBS[3].job_id, JOBS[2].job_id, JOBS[0].job_id])
+
+    def test_figure_progress(self):
+        done = [monitor.JobStatus(job=make_job('e', 'b', f'd{i}'), state=monitor.DONE, duration=d) for i, d in enumerate((100, 300))]
+        inputs = [monitor.JobStatus(job=make_job('e', 'b', 'r'), state=monitor.RUNNING, eta=50.0)] + \
+                 [monitor.JobStatus(job=make_job('e', 'b', f'p{i}'), state=monitor.PENDING) for i in range(3)]
+        report = figures.figure_progress(inputs + done[:1], done + inputs, slots=2)
+        self.assertEqual((report['done'], report['running'], report['pending']), (1, 1, 3))
+        self.assertEqual(report['eta'], (50 + 3 * 200) / 2)
+        inputs[0].eta = None
+        self.assertIsNone(figures.figure_progress(inputs, done, slots=2)['eta'])
@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+import json
+import os
+import stat
+
+import simtools.runner.fork_groups as fork_groups
+import simtools.runner.jobs
+import simtools.runner.registry as registry
+import simtools.runner.staleness as staleness
+from simtools.runner.scheduler import Runner
+
+# Stands in for a simulator started with --fork-points: one output per point, as the forked children write them
+FAKE_SIMULATOR = '''#!/usr/bin/env python3
+import json, os, sys
+points = json.load(open(sys.argv[sys.argv.index('--fork-points') + 1]))['points']
+assert sys.argv[-1] == '--json'
+for i, point in enumerate(points):
+    print(f'Forked point {i} (pid {os.getpid()}): {point["output"]}')
+    assert point['json'] == point['output'][:-len('.txt')] + '.json'
+    with open(point['output'], 'a') as wfp:
+        wfp.write(f'interval {point["error_page_manager"]["error_cycle_interval"]}\\nSimulation complete CPU 0\\n')
+'''
+
+def make_config(name, interval, llc_sets=2048, mode='CYCLE'):
+    return {'executable_name': name, 'LLC': {'sets': llc_sets, 'ways': 16},
+            'error_page_manager': {'mode': mode, 'cache_pinning': True, 'error_cycle_interval': interval}}
+
+class ForkGroupTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.dtemp.name, 'bin'))
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def job(self, config, trace='t.xz'):
+        path = os.path.join(self.dtemp.name, f'{config["executable_name"]}.json')
+        with open(path, 'w') as wfp:
+            json.dump(config, wfp)
+        binary = config['executable_name']
+        return simtools.runner.jobs.Job(job_id=f'e/{binary}_t', experiment='e', binary=binary, traces=[trace],
+                                        output=os.path.join(self.dtemp.name, 'results', 'e', f'{binary}_t.txt'), warmup=10, sim=100, config=path)
+
+    def test_warmup_key(self):
+        self.assertEqual(fork_groups.warmup_key(make_config('a', 100)), fork_groups.warmup_key(make_config('b', 200)))
+        self.assertNotEqual(fork_groups.warmup_key(make_config('a', 100)), fork_groups.warmup_key(make_config('b', 100, llc_sets=1024)))
+        self.assertIsNone(fork_groups.warmup_key(make_config('a', 100, mode='RANDOM')))
+
+    def test_point_settings_fill_defaults(self):
+        settings = fork_groups.point_settings(make_config('a', 100))
+        self.assertEqual(settings['error_cycle_interval'], 100)
+        self.assertEqual(settings['retirement_threshold'], 32)
+        self.assertEqual(set(settings), set(fork_groups.SETTABLE_KEYS))
+
+    def test_grouper(self):
+        grouper = fork_groups.ForkGrouper()
+        a, b = self.job(make_config('a', 100)), self.job(make_config('b', 200))
+        self.assertEqual(grouper.key(a), grouper.key(b))
+        self.assertNotEqual(grouper.key(a), grouper.key(self.job(make_config('c', 200), trace='u.xz')))
+        self.assertIsNone(grouper.key(simtools.runner.jobs.Job(job_id='x', experiment='e', binary='x', traces=['t.xz'], output='x.txt',
+                                                               warmup=None, sim=None)))
+
+    def test_child_pids(self):
+        log = os.path.join(self.dtemp.name, 'group.log')
+        with open(log, 'w') as wfp:
+            wfp.write('Heartbeat CPU 0\nForked point 0 (pid 12): a.txt\nForked point 1 (pid 13): b.txt\n')
+        self.assertEqual(fork_groups.child_pids(log), {0: 12, 1: 13})
+        self.assertFalse(fork_groups.is_alive(2**22 + 1))
+
+    def test_runner_forks_a_sweep(self):
+        jobs = [self.job(make_config(f'p{i}', 100 * (i + 1))) for i in range(3)]
+        with open(os.path.join(self.dtemp.name, 'bin', 'p0'), 'w') as wfp:
+            wfp.write(FAKE_SIMULATOR)
+        os.chmod(os.path.join(self.dtemp.name, 'bin', 'p0'), stat.S_IRWXU)
+
+        root = os.path.join(self.dtemp.name, 'results')
+        Runner(jobs, results_root=root, champsim_dir=self.dtemp.name, max_parallel=4, poll_interval=0.05, fork=2, log=lambda _: None).run()
+
+        reg = registry.JobRegistry(root)
+        for i, job in enumerate(jobs):
+            entry = reg.get(job.job_id)
+            self.assertEqual(entry['state'], registry.DONE)
+            self.assertEqual(entry['forked_from'], 'p0')
+            self.assertIsNotNone(staleness.read_header(job.output))
+            with open(job.output) as rfp:
+                self.assertIn(f'interval {100 * (i + 1)}', rfp.read())
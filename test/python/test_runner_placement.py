@@ -0,0 +1,94 @@
+import unittest
+import tempfile
+import os
+
+import simtools.progress
+import simtools.runner.placement
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as wfp:
+        wfp.write(text)
+
+def fake_sysfs(root):
+    # Two nodes, two physical cores per node, two hardware threads per core:
+    #   node0: cores {0,4} {1,5}    node1: cores {2,6} {3,7}
+    write(os.path.join(root, 'node', 'node0', 'cpulist'), '0-1,4-5\n')
+    write(os.path.join(root, 'node', 'node1', 'cpulist'), '2-3,6-7\n')
+    write(os.path.join(root, 'node', 'online'), '0-1\n')
+    for cpu in range(8):
+        write(os.path.join(root, 'cpu', f'cpu{cpu}', 'topology', 'thread_siblings_list'), f'{cpu % 4},{cpu % 4 + 4}\n')
+    return os.path.join(root, 'node'), os.path.join(root, 'cpu')
+
+class CpulistTests(unittest.TestCase):
+    def test_ranges_and_singletons(self):
+        self.assertEqual(simtools.runner.placement.parse_cpulist('0-3,8,10-11\n'), [0, 1, 2, 3, 8, 10, 11])
+
+    def test_empty(self):
+        self.assertEqual(simtools.runner.placement.parse_cpulist(''), [])
+
+class TopologyTests(unittest.TestCase):
+    def test_read_from_sysfs(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            node_root, cpu_root = fake_sysfs(dtemp)
+            topo = simtools.runner.placement.Topology.from_sysfs(node_root, cpu_root, allowed=range(8))
+            self.assertEqual(topo.nodes, {0: [0, 1, 4, 5], 1: [2, 3, 6, 7]})
+            self.assertEqual(topo.siblings[5], frozenset((1, 5)))
+            self.assertEqual(len(topo.physical_cores), 4)
+
+    def test_affinity_mask_restricts_cpus(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            node_root, cpu_root = fake_sysfs(dtemp)
+            topo = simtools.runner.placement.Topology.from_sysfs(node_root, cpu_root, allowed={0, 4})
+            self.assertEqual(topo.nodes, {0: [0, 4]})
+
+    def test_missing_node_directory(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            topo = simtools.runner.placement.Topology.from_sysfs(os.path.join(dtemp, 'none'), os.path.join(dtemp, 'none'), allowed={0, 1})
+            self.assertEqual(topo.nodes, {0: [0, 1]})
+            self.assertEqual(topo.siblings[1], frozenset((1,)))
+
+class CorePlacerTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        node_root, cpu_root = fake_sysfs(self.dtemp.name)
+        self.topo = simtools.runner.placement.Topology.from_sysfs(node_root, cpu_root, allowed=range(8))
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def test_physical_cores_before_siblings(self):
+        placer = simtools.runner.placement.CorePlacer(self.topo, bind_memory=False)
+        first = [placer.acquire() for _ in range(4)]
+        self.assertEqual({cpu for cpu, _ in first}, {0, 1, 2, 3})
+        self.assertEqual(sorted(node for _, node in first), [0, 0, 1, 1])
+        rest = [placer.acquire() for _ in range(4)]
+        self.assertEqual({cpu for cpu, _ in rest}, {4, 5, 6, 7})
+        self.assertIsNone(placer.acquire())
+
+    def test_alternates_nodes(self):
+        placer = simtools.runner.placement.CorePlacer(self.topo, bind_memory=False)
+        self.assertEqual(placer.acquire(), (0, 0))
+        self.assertEqual(placer.acquire(), (2, 1))
+
+    def test_release_frees_core(self):
+        placer = simtools.runner.placement.CorePlacer(self.topo, bind_memory=False)
+        for _ in range(4):
+            placer.acquire()
+        placer.release(1)
+        self.assertEqual(placer.acquire(), (1, 0))
+
+    def test_no_prefix_without_numactl(self):
+        placer = simtools.runner.placement.CorePlacer(self.topo, bind_memory=False)
+        self.assertEqual(placer.command_prefix(1), [])
+
+class KipsTests(unittest.TestCase):
+    def test_simulated_kips(self):
+        text = (
+            'Heartbeat CPU 0 instructions: 1000000 cycles: 1 heartbeat IPC: 1 cumulative IPC: 1 total_errors: 0 (Simulation time: 00 hr 00 min 05 sec)\n'
+            'Heartbeat CPU 0 instructions: 2000000 cycles: 1 heartbeat IPC: 1 cumulative IPC: 1 total_errors: 0 (Simulation time: 00 hr 00 min 10 sec)\n'
+        )
+        self.assertAlmostEqual(simtools.progress.simulated_kips(text), 200.0)
+
+    def test_no_heartbeat(self):
+        self.assertIsNone(simtools.progress.simulated_kips('nothing'))
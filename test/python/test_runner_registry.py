@@ -0,0 +1,97 @@
+import unittest
+import tempfile
+import json
+import os
+import stat
+
+import simtools.runner.__main__
+import simtools.runner.jobs
+import simtools.runner.registry as registry
+
+class JobRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.registry = registry.JobRegistry(self.dtemp.name)
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def test_reading_creates_nothing(self):
+        self.assertEqual(self.registry.latest(), {})
+        self.assertIsNone(self.registry.state_of('a'))
+        self.assertFalse(os.path.exists(self.registry.path))
+
+    def test_later_fields_override(self):
+        self.registry.record('a', registry.RUNNING, output='/r/a.txt', traces=['t.xz'], kips=None, pid=5)
+        self.registry.record('a', registry.DONE, exit_code=0, kips=12.5)
+        entry = self.registry.get('a')
+        self.assertEqual(entry['state'], registry.DONE)
+        self.assertEqual((entry['output'], entry['traces'], entry['pid'], entry['exit_code'], entry['kips']),
+                         ('/r/a.txt', ['t.xz'], 5, 0, 12.5))
+
+    def test_queueing_starts_a_new_attempt(self):
+        self.registry.record('a', registry.FAILED, output='/r/a.txt', exit_code=1, cpu=3)
+        self.registry.record('a', registry.QUEUED)
+        entry = self.registry.get('a')
+        self.assertEqual(entry['output'], '/r/a.txt')
+        self.assertNotIn('exit_code', entry)
+        self.assertNotIn('cpu', entry)
+
+    def test_in_state_and_history(self):
+        self.registry.record_many(registry.QUEUED, [('a', {'output': '/r/a.txt'}), ('b', {'output': '/r/b.txt'})])
+        self.registry.record('a', registry.PANIC)
+        self.assertEqual(set(self.registry.in_state(registry.QUEUED)), {'b'})
+        self.assertEqual(set(self.registry.in_state(*registry.KILLED_STATES)), {'a'})
+        self.assertEqual([e['state'] for e in self.registry.history('a')], [registry.QUEUED, registry.PANIC])
+        self.assertEqual(list(self.registry.by_output('/r/b.txt')), ['b'])
+        self.assertEqual(registry.excluded_outputs(self.dtemp.name), {'/r/a.txt'})
+
+    def test_unknown_state(self):
+        with self.assertRaises(ValueError):
+            self.registry.record('a', 'exploded')
+
+    def test_legacy_registry_is_imported(self):
+        with open(os.path.join(self.dtemp.name, registry.LEGACY_REGISTRY_NAME), 'w') as wfp:
+            wfp.write(json.dumps({'job_id': 'a', 'state': 'running', 'time': 1.0, 'output': '/r/a.txt'}) + '\n')
+            wfp.write(json.dumps({'job_id': 'a', 'state': 'panic', 'time': 2.0, 'reason': 'spam'}) + '\n')
+            wfp.write('{"job_id": "trunc')
+        self.registry.record('b', registry.QUEUED)
+        self.assertEqual(self.registry.get('a')['reason'], 'spam')
+        self.assertEqual(registry.excluded_outputs(self.dtemp.name), {'/r/a.txt'})
+
+class ExecTests(unittest.TestCase):
+    def test_exec_records_resources(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            fake = os.path.join(dtemp, 'fake')
+            with open(fake, 'w') as wfp:
+                wfp.write('#!/bin/sh\necho "Simulation complete CPU 0"\n')
+            os.chmod(fake, os.stat(fake).st_mode | stat.S_IEXEC)
+            trace = os.path.join(dtemp, 't.xz')
+            open(trace, 'w').close()
+
+            root = os.path.join(dtemp, 'results')
+            output = os.path.join(root, 'fam', 'exp', 'fake_t.txt')
+            code = simtools.runner.__main__.main(['exec', '-o', output, '--results-root', root, '--',
+                                                  fake, '--warmup-instructions', '10', trace])
+            self.assertEqual(code, 0)
+
+            entry = registry.JobRegistry(root).get('fam/exp/fake_t')
+            self.assertEqual(entry['state'], registry.DONE)
+            self.assertEqual((entry['binary'], entry['traces'], entry['warmup']), ('fake', [trace], 10))
+            self.assertGreater(entry['max_rss'], 0)
+            self.assertIn('cpu_time', entry)
+
+    def test_exec_timeout(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            root = os.path.join(dtemp, 'results')
+            output = os.path.join(root, 'exp', 'sleep.txt')
+            code = simtools.runner.__main__.main(['exec', '-o', output, '--results-root', root, '--timeout', '0.2', '--', 'sleep', '30'])
+            self.assertEqual(code, 124)
+            self.assertEqual(registry.JobRegistry(root).state_of('exp/sleep'), registry.TIMEOUT)
+
+class BuildIdTests(unittest.TestCase):
+    def test_build_ids_from_configuration_makefile(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            with open(os.path.join(dtemp, '_configuration.mk'), 'w') as wfp:
+                wfp.write('######\n# Build ID: 0123abcd\n# Executable: /cs/bin/champsim_a\n# Module Names: ()\n######\n')
+            self.assertEqual(simtools.runner.jobs.build_ids(dtemp), {'champsim_a': '0123abcd'})
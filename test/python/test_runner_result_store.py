@@ -0,0 +1,81 @@
+import unittest
+import tempfile
+import glob
+import os
+import stat
+
+import simtools.runner.__main__
+import simtools.runner.jobs
+import simtools.runner.registry as registry
+import simtools.runner.result_store as result_store
+from simtools.runner.scheduler import Runner
+
+CONFIGS = sorted(glob.glob(os.path.join(simtools.runner.jobs.CHAMPSIM_DIR, 'sim_configs', 'normal_evaluation', '6_llc_way_sweep', '*.json')))
+
+class ResultStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.store = result_store.ResultStore(os.path.join(self.dtemp.name, '.store'))
+        self.trace = os.path.join(self.dtemp.name, 't.xz')
+        with open(self.trace, 'w') as wfp:
+            wfp.write('trace')
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def job(self, name, config=CONFIGS[0], trace=None, sim=900):
+        return simtools.runner.jobs.Job(job_id=name, experiment='e', binary='b', traces=[trace or self.trace],
+                                        output=os.path.join(self.dtemp.name, name, 'b_t.txt'), warmup=100, sim=sim, config=config)
+
+    def complete(self, job):
+        os.makedirs(os.path.dirname(job.output), exist_ok=True)
+        with open(job.output, 'w') as wfp:
+            wfp.write('Simulation complete CPU 0\n')
+
+    def test_key_depends_on_inputs_not_location(self):
+        copy = os.path.join(self.dtemp.name, 'copy.xz')
+        with open(copy, 'w') as wfp:
+            wfp.write('trace')
+        key = self.store.key_of(self.job('a'))
+        self.assertIsNotNone(key)
+        self.assertEqual(self.store.key_of(self.job('b', trace=copy)), key)
+        self.assertNotEqual(self.store.key_of(self.job('a', sim=1000)), key)
+        self.assertNotEqual(self.store.key_of(self.job('a', config=CONFIGS[1])), key)
+
+    def test_key_needs_a_config(self):
+        self.assertIsNone(self.store.key_of(self.job('a', config=None)))
+
+    def test_ingest_and_link(self):
+        first, second = self.job('a'), self.job('b')
+        key = self.store.key_of(first)
+        self.complete(first)
+        obj = self.store.ingest(key, first.output, job_id='a')
+        self.assertTrue(os.path.islink(first.output))
+        self.assertFalse(os.stat(obj).st_mode & stat.S_IWUSR)
+        self.store.link(key, second.output)
+        with open(second.output) as rfp:
+            self.assertIn('Simulation complete', rfp.read())
+
+    def test_runner_links_stored_results(self):
+        first, second = self.job('a'), self.job('b')
+        key = self.store.key_of(first)
+        self.complete(first)
+        self.store.ingest(key, first.output)
+
+        logged = []
+        runner = Runner([second], results_root=self.dtemp.name, champsim_dir=self.dtemp.name, store=self.store, log=logged.append)
+        runner.run()
+        self.assertTrue(any('SKIP (stored)' in line for line in logged))
+        self.assertEqual(os.path.realpath(second.output), os.path.realpath(self.store.path_of(key)))
+        entry = registry.JobRegistry(self.dtemp.name).get('b')
+        self.assertEqual((entry['state'], entry['store_key'], entry['reused']), (registry.DONE, key, True))
+
+    def test_adopt_deduplicates(self):
+        jobs = [self.job('a'), self.job('b')]
+        for job in jobs:
+            self.complete(job)
+        manifest = os.path.join(self.dtemp.name, 'm.json')
+        simtools.runner.jobs.write_manifest(manifest, jobs)
+        simtools.runner.__main__.main(['store', manifest, '--adopt', '--results-root', self.dtemp.name, '--store', self.store.root])
+        self.assertTrue(all(os.path.islink(job.output) for job in jobs))
+        self.assertEqual(len(glob.glob(os.path.join(self.store.root, '*', '*.txt'))), 1)
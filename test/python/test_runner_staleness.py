@@ -0,0 +1,98 @@
+import unittest
+import tempfile
+import glob
+import json
+import os
+import stat
+import subprocess
+import sys
+
+import simtools.runner.__main__
+import simtools.runner.jobs
+import simtools.runner.registry as registry
+import simtools.runner.staleness as staleness
+from simtools.runner.scheduler import Runner
+
+CONFIG = sorted(glob.glob(os.path.join(simtools.runner.jobs.CHAMPSIM_DIR, 'sim_configs', 'normal_evaluation', '6_llc_way_sweep', '*.json')))[0]
+
+class StalenessTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.dtemp.name, 'bin'))
+        self.binary = os.path.join(self.dtemp.name, 'bin', 'fake')
+        with open(self.binary, 'wb') as wfp:
+            wfp.write(b'#!/bin/sh\necho "Simulation complete CPU 0"\n# N8champsim10configured21generated_environmentILy255EEE\n')
+        os.chmod(self.binary, os.stat(self.binary).st_mode | stat.S_IEXEC)
+        self.trace = os.path.join(self.dtemp.name, 't.xz')
+        with open(self.trace, 'w') as wfp:
+            wfp.write('trace')
+        self.provenance = staleness.Provenance(self.dtemp.name, os.path.join(self.dtemp.name, '.store'))
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def job(self, config=None):
+        return simtools.runner.jobs.Job(job_id='e/fake_t', experiment='e', binary='fake', traces=[self.trace],
+                                        output=os.path.join(self.dtemp.name, 'results', 'e', 'fake_t.txt'), warmup=10, sim=100, config=config)
+
+    def test_binary_build_id(self):
+        self.assertEqual(staleness.binary_build_id(self.binary), '00000000000000ff')
+        self.assertIsNone(staleness.binary_build_id(self.trace))
+
+    def test_current_output(self):
+        job = self.job()
+        self.assertEqual(self.provenance.check(job, self.provenance.of_job(job)), [])
+
+    def test_reasons(self):
+        job = self.job()
+        recorded = dict(self.provenance.of_job(job), build_id='0000000000000001', source_revision='old', trace_digests=['0' * 40])
+        self.assertEqual(self.provenance.check(job, recorded), [staleness.BINARY, staleness.SOURCE, staleness.TRACE])
+
+    def test_config_changed(self):
+        job = self.job(config=CONFIG)
+        recorded = self.provenance.of_job(job)
+        self.assertEqual(recorded['config_id'], staleness.config_build_id(CONFIG))
+        self.assertEqual(self.provenance.check(job, recorded), [])
+        # The binary's own ID is not compared with the configuration's
+        self.assertEqual(self.provenance.check(job, dict(recorded, build_id='0000000000000001')), [])
+        self.assertEqual(self.provenance.check(job, dict(recorded, config_id='0000000000000001')), [staleness.CONFIG])
+        self.assertEqual(self.provenance.check(job, dict(recorded, config_id=None, build_id='0000000000000001')), [staleness.BINARY])
+
+    def test_config_build_id_is_deterministic(self):
+        # The configure step runs in another process, with another hash seed
+        script = f'import simtools.runner.staleness as s; print(s.config_build_id({CONFIG!r}))'
+        for seed in ('1', '2'):
+            result = subprocess.run([sys.executable, '-c', script], cwd=simtools.runner.jobs.CHAMPSIM_DIR, capture_output=True,
+                                    text=True, check=True, env=dict(os.environ, PYTHONHASHSEED=seed))
+            self.assertEqual(result.stdout.strip(), staleness.config_build_id(CONFIG))
+
+    def test_unrecorded_output(self):
+        job = self.job()
+        os.makedirs(os.path.dirname(job.output))
+        open(job.output, 'w').close()
+        os.utime(job.output, (0, 0))
+        self.assertEqual(self.provenance.check(job, self.provenance.recorded(job)), [staleness.BINARY])
+        os.utime(self.binary, (0, 0))
+        self.assertEqual(self.provenance.check(job, None), [staleness.UNRECORDED])
+
+    def test_runner_records_provenance(self):
+        job = self.job()
+        root = os.path.join(self.dtemp.name, 'results')
+        Runner([job], results_root=root, champsim_dir=self.dtemp.name, poll_interval=0.05, log=lambda _: None).run()
+        entry = registry.JobRegistry(root).get(job.job_id)
+        self.assertEqual(entry['state'], registry.DONE)
+        self.assertEqual(entry['build_id'], '00000000000000ff')
+        self.assertEqual(staleness.read_header(job.output)['trace_digests'], entry['trace_digests'])
+
+    def test_stale_writes_rerun_manifest(self):
+        job = self.job()
+        os.makedirs(os.path.dirname(job.output))
+        with open(job.output, 'w') as wfp:
+            wfp.write(staleness.header_line({'build_id': None, 'source_revision': None, 'trace_digests': ['0' * 40]}))
+            wfp.write('Simulation complete CPU 0\n')
+        manifest = os.path.join(self.dtemp.name, 'm.json')
+        rerun = os.path.join(self.dtemp.name, 'rerun.json')
+        simtools.runner.jobs.write_manifest(manifest, [job])
+        simtools.runner.__main__.main(['stale', manifest, '-o', rerun, '--results-root', os.path.join(self.dtemp.name, 'results')])
+        with open(rerun) as rfp:
+            self.assertEqual([j['job_id'] for j in json.load(rfp)['jobs']], [job.job_id])
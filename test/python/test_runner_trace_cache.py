@@ -0,0 +1,99 @@
+import unittest
+import tempfile
+import lzma
+import os
+
+import simtools.runner.trace_cache
+
+def write_xz(path, payload):
+    with lzma.open(path, 'wb') as wfp:
+        wfp.write(payload)
+
+class ParseSizeTests(unittest.TestCase):
+    def test_units(self):
+        self.assertEqual(simtools.runner.trace_cache.parse_size('200G'), 200 << 30)
+        self.assertEqual(simtools.runner.trace_cache.parse_size('1.5k'), 1536)
+        self.assertEqual(simtools.runner.trace_cache.parse_size('512MB'), 512 << 20)
+        self.assertEqual(simtools.runner.trace_cache.parse_size('4096'), 4096)
+
+class TraceCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.trace_dir = os.path.join(self.dtemp.name, 'traces')
+        os.makedirs(self.trace_dir)
+        self.cache_dir = os.path.join(self.dtemp.name, 'cache')
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def trace(self, name, size):
+        path = os.path.join(self.trace_dir, f'{name}.champsimtrace.xz')
+        write_xz(path, bytes(range(256)) * (size // 256))
+        return path
+
+    def cache(self, max_bytes=1 << 20):
+        return simtools.runner.trace_cache.TraceCache(self.cache_dir, max_bytes=max_bytes, fmt='raw')
+
+    def test_decompresses_once(self):
+        trace = self.trace('mcf', 4096)
+        cache = self.cache()
+        first = cache.acquire(trace, 'a')
+        second = cache.acquire(trace, 'b')
+        self.assertEqual(first, second)
+        self.assertTrue(first.endswith('-mcf.champsimtrace'))
+        with open(first, 'rb') as rfp:
+            self.assertEqual(rfp.read(), bytes(range(256)) * 16)
+        entry, = cache.entries().values()
+        self.assertEqual(set(entry['refs']), {'a', 'b'})
+
+    def test_release_drops_references(self):
+        trace = self.trace('mcf', 4096)
+        cache = self.cache()
+        cache.acquire(trace, 'a')
+        cache.release('a')
+        entry, = cache.entries().values()
+        self.assertEqual(entry['refs'], {})
+
+    def test_uncompressed_trace_passes_through(self):
+        path = os.path.join(self.trace_dir, 'raw.champsimtrace')
+        with open(path, 'wb') as wfp:
+            wfp.write(b'\0' * 64)
+        self.assertEqual(self.cache().acquire(path, 'a'), path)
+
+    def test_evicts_least_recently_used(self):
+        cache = self.cache(max_bytes=10000)
+        old, new, third = (self.trace(n, 4096) for n in ('old', 'new', 'third'))
+        old_path = cache.acquire(old, 'a')
+        cache.release('a')
+        cache.acquire(new, 'b')
+        cache.release('b')
+        cache.acquire(third, 'c')
+        self.assertFalse(os.path.exists(old_path))
+        self.assertEqual(sorted(os.path.basename(e['source']) for e in cache.entries().values()),
+                         ['new.champsimtrace.xz', 'third.champsimtrace.xz'])
+
+    def test_referenced_entries_are_kept(self):
+        cache = self.cache(max_bytes=5000)
+        held = cache.acquire(self.trace('held', 4096), 'a')
+        cache.acquire(self.trace('other', 4096), 'b')
+        self.assertTrue(os.path.exists(held))
+        self.assertEqual(len(cache.entries()), 2)
+        cache.release('a')
+        self.assertFalse(os.path.exists(held))
+
+    def test_rewritten_trace_gets_new_key(self):
+        trace = self.trace('mcf', 4096)
+        cache = self.cache()
+        key = cache.key_of(trace)
+        os.utime(trace, ns=(0, 0))
+        self.assertNotEqual(cache.key_of(trace), key)
+
+    def test_dead_holders_are_dropped(self):
+        trace = self.trace('mcf', 4096)
+        cache = self.cache()
+        cache.acquire(trace, 'a')
+        with cache._locked() as index:
+            entry, = index.values()
+            entry['refs']['a'] = 2**22 + 1 # beyond pid_max, never alive
+        entry, = cache.entries().values()
+        self.assertEqual(entry['refs'], {})
@@ -0,0 +1,116 @@
+import unittest
+import tempfile
+import threading
+import lzma
+import os
+
+import simtools.runner.jobs
+import simtools.runner.scheduler
+import simtools.runner.trace_server as ts
+
+PAYLOAD = bytes((i * 7 + 3) % 256 for i in range(300000))
+
+class TraceServerTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.trace = os.path.join(self.dtemp.name, 'mcf.champsimtrace.xz')
+        with lzma.open(self.trace, 'wb') as wfp:
+            wfp.write(PAYLOAD)
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def serve(self, name, **kwargs):
+        server = ts.TraceServer(self.trace, name, shm_dir=self.dtemp.name, log=lambda *a: None, **kwargs)
+        thread = threading.Thread(target=server.serve, daemon=True)
+        return server, thread
+
+    def read_all(self, consumer, size=4096):
+        out = bytearray()
+        while True:
+            chunk = consumer.read(size)
+            out += chunk
+            if len(chunk) < size:
+                return bytes(out)
+
+    def test_consumers_share_one_decode(self):
+        server, thread = self.serve('shared', capacity=1 << 16, consumers=2, chunk_size=1 << 12)
+        first = ts.Consumer('shared', self.dtemp.name)
+        second = ts.Consumer('shared', self.dtemp.name)
+        thread.start()
+        # Alternate so that neither runs out of window
+        a, b = bytearray(), bytearray()
+        while len(a) < len(PAYLOAD) or len(b) < len(PAYLOAD):
+            a += first.read(min(5000, len(PAYLOAD) - len(a)))
+            b += second.read(min(5000, len(PAYLOAD) - len(b)))
+        self.assertEqual(first.read(100), b'')
+        first.close()
+        second.close()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(bytes(a), PAYLOAD)
+        self.assertEqual(bytes(b), PAYLOAD)
+        self.assertFalse(os.path.exists(os.path.join(self.dtemp.name, 'shared')))
+
+    def test_late_consumer_is_refused(self):
+        server, thread = self.serve('late', capacity=1 << 14, consumers=1, chunk_size=1 << 12)
+        early = ts.Consumer('late', self.dtemp.name)
+        thread.start()
+        early.read(1 << 15)
+        with self.assertRaises(ts.LostSegment):
+            ts.Consumer('late', self.dtemp.name)
+        self.read_all(early)
+        early.close()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+
+    def test_slow_consumer_is_evicted(self):
+        server, thread = self.serve('evict', capacity=1 << 14, consumers=2, chunk_size=1 << 12, lag_timeout=0.2)
+        fast = ts.Consumer('evict', self.dtemp.name)
+        slow = ts.Consumer('evict', self.dtemp.name)
+        thread.start()
+        self.assertEqual(self.read_all(fast), PAYLOAD)
+        self.assertEqual(server.evicted, 1)
+        with self.assertRaises(ts.LostSegment):
+            slow.read(1)
+        fast.close()
+        slow.close()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+
+    def test_server_stops_without_consumers(self):
+        server, thread = self.serve('alone', capacity=1 << 14, consumers=1, chunk_size=1 << 12, attach_timeout=0.1)
+        thread.start()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(os.path.join(self.dtemp.name, 'alone')))
+
+    def test_descriptor(self):
+        self.assertEqual(ts.descriptor('seg', '/t/mcf.xz'), 'shm:seg:/t/mcf.xz')
+
+class FanoutBatchTests(unittest.TestCase):
+    def jobs(self, traces):
+        return [simtools.runner.jobs.Job(job_id=f'e/{i}', experiment='e', binary=f'b{i}', traces=[t], output=f'/o/{i}.txt', warmup=1, sim=1)
+                for i, t in enumerate(traces)]
+
+    def runner(self, jobs, **kwargs):
+        return simtools.runner.scheduler.Runner(jobs, results_root=tempfile.gettempdir(), log=lambda *a: None, **kwargs)
+
+    def test_order_groups_traces(self):
+        jobs = self.jobs(['a', 'b', 'a', 'c', 'b'])
+        runner = self.runner(jobs, fanout=2)
+        self.assertEqual([j.traces[0] for j in runner._order(jobs)], ['a', 'a', 'b', 'b', 'c'])
+
+    def test_order_unchanged_without_fanout(self):
+        jobs = self.jobs(['a', 'b', 'a'])
+        self.assertEqual(self.runner(jobs)._order(jobs), jobs)
+
+    def test_batch_limited_by_slots(self):
+        queue = self.jobs(['a', 'a', 'a', 'b'])
+        runner = self.runner(queue, fanout=2, max_parallel=2)
+        self.assertEqual([j.binary for j in runner.next_batch(queue)], ['b0', 'b1'])
+        self.assertEqual([j.binary for j in queue], ['b2', 'b3'])
+
+    def test_single_job_without_fanout(self):
+        queue = self.jobs(['a', 'a'])
+        self.assertEqual(len(self.runner(queue, max_parallel=4).next_batch(queue)), 1)
@@ -0,0 +1,123 @@
+import unittest
+import tempfile
+import os
+import stat
+
+import simtools.runner.jobs
+import simtools.runner.registry
+import simtools.runner.scheduler
+import simtools.runner.watchdog
+
+HEARTBEAT = 'Heartbeat CPU 0 instructions: {} cycles: 1 heartbeat IPC: 1 cumulative IPC: 1 total_errors: 0 (Simulation time: 00 hr {:02d} min 00 sec)\n'
+PANIC = 'Simulation CPU 0 panic: IPC 0.001 < 0.01\n'
+
+def make_job(path, warmup=100, sim=900):
+    return simtools.runner.jobs.Job(job_id='exp/job', experiment='exp', binary='fake', traces=['t.xz'], output=path, warmup=warmup, sim=sim)
+
+class OutputTailTests(unittest.TestCase):
+    def test_partial_line_is_held_back(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            path = os.path.join(dtemp, 'out.txt')
+            tail = simtools.runner.watchdog.OutputTail(path)
+            with open(path, 'w') as wfp:
+                wfp.write('first\nsec')
+            self.assertEqual(list(tail.read_lines()), ['first'])
+            with open(path, 'a') as wfp:
+                wfp.write('ond\nthird\n')
+            self.assertEqual(list(tail.read_lines()), ['second', 'third'])
+            self.assertEqual(list(tail.read_lines()), [])
+
+    def test_missing_file_yields_nothing(self):
+        tail = simtools.runner.watchdog.OutputTail('/nonexistent/out.txt')
+        self.assertEqual(list(tail.read_lines()), [])
+        self.assertEqual(tail.offset, 0)
+
+class JobWatchTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dtemp.name, 'out.txt')
+        open(self.path, 'w').close()
+
+    def tearDown(self):
+        self.dtemp.cleanup()
+
+    def append(self, text):
+        with open(self.path, 'a') as wfp:
+            wfp.write(text)
+
+    def test_consecutive_panic_lines(self):
+        policy = simtools.runner.watchdog.WatchdogPolicy(panic_lines=3)
+        watch = simtools.runner.watchdog.JobWatch(make_job(self.path), policy, started=0)
+        self.append(PANIC * 2)
+        self.assertIsNone(watch.check(now=1))
+        self.append(HEARTBEAT.format(200, 1) + PANIC * 2)
+        self.assertIsNone(watch.check(now=2))
+        self.append(PANIC)
+        verdict = watch.check(now=3)
+        self.assertEqual(verdict.state, simtools.runner.registry.PANIC)
+        self.assertEqual(watch.panic_total, 5)
+
+    def test_stall_without_heartbeat(self):
+        policy = simtools.runner.watchdog.WatchdogPolicy(panic_lines=None, stall_minutes=10)
+        watch = simtools.runner.watchdog.JobWatch(make_job(self.path), policy, started=0)
+        self.append(HEARTBEAT.format(200, 1))
+        self.assertIsNone(watch.check(now=60))
+        self.assertIsNone(watch.check(now=60 + 599))
+        self.assertEqual(watch.check(now=60 + 601).state, simtools.runner.registry.PANIC)
+
+    def test_projected_over_budget(self):
+        # 100 instructions of simulation per minute with 800 left: ~8 more minutes
+        policy = simtools.runner.watchdog.WatchdogPolicy(panic_lines=None, budget=500, grace=0)
+        watch = simtools.runner.watchdog.JobWatch(make_job(self.path), policy, started=0)
+        self.append(HEARTBEAT.format(100, 1) + HEARTBEAT.format(200, 2))
+        verdict = watch.check(now=120)
+        self.assertEqual(verdict.state, simtools.runner.registry.OVER_BUDGET)
+
+    def test_within_budget(self):
+        policy = simtools.runner.watchdog.WatchdogPolicy(panic_lines=None, budget=3600, grace=0)
+        watch = simtools.runner.watchdog.JobWatch(make_job(self.path), policy, started=0)
+        self.append(HEARTBEAT.format(100, 1) + HEARTBEAT.format(200, 2))
+        self.assertIsNone(watch.check(now=120))
+
+class RunnerTests(unittest.TestCase):
+    def test_panicking_job_is_killed_and_recorded(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            os.mkdir(os.path.join(dtemp, 'bin'))
+            fake = os.path.join(dtemp, 'bin', 'fake')
+            with open(fake, 'w') as wfp:
+                wfp.write('#!/bin/sh\nwhile true; do echo "Simulation CPU 0 panic: IPC 0.001 < 0.01"; sleep 0.01; done\n')
+            os.chmod(fake, os.stat(fake).st_mode | stat.S_IEXEC)
+
+            job = make_job(os.path.join(dtemp, 'results', 'exp', 'fake_t.txt'))
+            policy = simtools.runner.watchdog.WatchdogPolicy(panic_lines=5)
+            runner = simtools.runner.scheduler.Runner([job], results_root=os.path.join(dtemp, 'results'), max_parallel=1, policy=policy,
+                                                      poll_interval=0.05, champsim_dir=dtemp, log=lambda msg: None)
+            runner.run()
+
+            self.assertEqual(runner.registry.state_of('exp/job'), simtools.runner.registry.PANIC)
+            self.assertEqual(simtools.runner.registry.excluded_outputs(os.path.join(dtemp, 'results')), {job.output})
+            with open(os.path.join(dtemp, 'results', 'exp', 'run_log.txt')) as rfp:
+                self.assertIn('KILL', rfp.read())
+
+            # A second run leaves the killed job alone
+            runner = simtools.runner.scheduler.Runner([job], results_root=os.path.join(dtemp, 'results'), champsim_dir=dtemp, log=lambda msg: None)
+            self.assertEqual(runner.pending_jobs(), [])
+
+class ManifestTests(unittest.TestCase):
+    def test_trace_tag_matches_run_common(self):
+        self.assertEqual(simtools.runner.jobs.trace_tag('/t/605.mcf_s-994B.champsimtrace.xz'), '605.mcf_s-994B')
+        self.assertEqual(simtools.runner.jobs.trace_tag('/t/gap/bc-3.trace.gz'), 'bc-3.trace.gz')
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            path = os.path.join(dtemp, 'm.json')
+            jobs = [make_job('/r/a.txt'), make_job('/r/b.txt', warmup=5)]
+            simtools.runner.jobs.write_manifest(path, jobs)
+            self.assertEqual(simtools.runner.jobs.load_manifest(path), jobs)
+
+    def test_shell_array_skips_comments(self):
+        with tempfile.TemporaryDirectory() as dtemp:
+            path = os.path.join(dtemp, 'common.sh')
+            with open(path, 'w') as wfp:
+                wfp.write('X=(\n  "${TRACE_DIR}/a.xz"\n  # "${TRACE_DIR}/b.xz"\n  "${TRACE_DIR}/c.xz"\n)\n')
+            self.assertEqual(simtools.runner.jobs.shell_array(path, 'X', {'TRACE_DIR': '/t'}), ['/t/a.xz', '/t/c.xz'])
@@ -0,0 +1,72 @@
+import unittest
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+import json
+import os
+
+import simtools.monitor
+import simtools.runner.jobs
+import simtools.status_server
+
+HEARTBEAT = 'Heartbeat CPU 0 instructions: {} cycles: 1 heartbeat IPC: 1 cumulative IPC: 1 total_errors: 0 (Simulation time: 00 hr {:02d} min 00 sec)\n'
+COMPLETE = 'Simulation complete CPU 0 instructions: 1000 cycles: 1000 cumulative IPC: 1 (Simulation time: 00 hr 50 min 00 sec)\n'
+
+class StatusServerTests(unittest.TestCase):
+    def setUp(self):
+        self.dtemp = tempfile.TemporaryDirectory()
+        jobs = []
+        for experiment, name, text in (('a', 'done', COMPLETE), ('a', 'run', HEARTBEAT.format(400, 4)), ('b', 'pending', None)):
+            path = os.path.join(self.dtemp.name, f'{name}.txt')
+            if text is not None:
+                with open(path, 'w') as wfp:
+                    wfp.write(text)
+            jobs.append(simtools.runner.jobs.Job(job_id=f'{experiment}/{name}', experiment=experiment, binary='fake',
+                                                 traces=['t.xz'], output=path, warmup=100, sim=900))
+        monitor = simtools.monitor.Monitor(jobs, results_root=self.dtemp.name)
+        self.server = simtools.status_server.StatusServer(('127.0.0.1', 0), monitor, interval=3600)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(timeout=10)
+        self.dtemp.cleanup()
+
+    def get(self, path):
+        with urllib.request.urlopen(self.url + path, timeout=10) as response:
+            return json.load(response)
+
+    def test_summary(self):
+        summary = self.get('/summary')
+        self.assertEqual(summary['total'], 3)
+        self.assertEqual((summary['done'], summary['running'], summary['pending']), (1, 1, 1))
+        self.assertAlmostEqual(summary['completions_per_hour'], 1 / 6)
+
+    def test_experiments(self):
+        experiments = self.get('/experiments')['experiments']
+        self.assertEqual([(e['experiment'], e['total'], e['done']) for e in experiments], [('a', 2, 1), ('b', 1, 0)])
+
+    def test_jobs_filter(self):
+        jobs = self.get('/jobs?state=running')['jobs']
+        self.assertEqual([j['job_id'] for j in jobs], ['a/run'])
+        self.assertEqual(jobs[0]['instructions'], 400)
+        self.assertFalse(jobs[0]['panic'])
+        self.assertEqual(len(self.get('/jobs?experiment=a')['jobs']), 2)
+
+    def test_html(self):
+        with urllib.request.urlopen(self.url + '/', timeout=10) as response:
+            self.assertIn(b'a/run', response.read())
+
+    def test_unknown_endpoint(self):
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            self.get('/nothing')
+        self.assertEqual(ctx.exception.code, 404)
+
+    def test_monitor_reads_server(self):
+        statuses = simtools.monitor.fetch(self.url)
+        self.assertEqual([s.state for s in statuses], ['done', 'running', 'pending'])
+        self.assertEqual(statuses[1].job.total_instr, 1000)